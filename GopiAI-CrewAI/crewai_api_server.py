@@ -1,5 +1,13 @@
 # --- START OF FILE crewai_api_server.py (ФИНАЛЬНАЯ ИСПРАВЛЕННАЯ ВЕРСИЯ) ---
 
+# --profile-startup[=путь.json]: профилировщик импортов ставится раньше всех
+# остальных импортов, отчет сохраняется после инициализации, сервер не запускается
+try:
+    import startup_profiler
+    startup_profiler.enable_from_argv(default_output="crewai_startup_profile.json")
+except ImportError:
+    startup_profiler = None
+
 import logging
 import os
 import uuid
@@ -909,6 +917,11 @@ def cleanup_on_exit():
     logger.info("Cleaning up resources...")
 
 if __name__ == '__main__':
+    # Режим профилирования запуска: вся инициализация выполнена при импорте модуля
+    if startup_profiler is not None and startup_profiler.get_active_profiler() is not None:
+        startup_profiler.finish()
+        sys.exit(0)
+
     # [AUDIT] Разовая диагностика загруженных модулей с префиксом "gopiai."
     try:
         loaded = sorted([m for m in sys.modules.keys() if m.startswith("gopiai.")])
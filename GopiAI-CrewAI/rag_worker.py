@@ -74,14 +74,15 @@ class RAGEngine:
             if not self.chats_file.exists():
                 self.chats_file.write_text("[]", encoding="utf-8")
 
-            # Init embeddings
-            config = {"path": self.model, "content": True}
+            # Init embeddings, vectors cache lets reindex skip unchanged messages
+            cache = {"path": str(self.memory_dir / "vectors.cache"), "maxsize": 512 * 1024**2}
+            config = {"path": self.model, "content": True, "cache": cache}
             self.embeddings = Embeddings(config)
 
             # Load index if present
             if (self.vectors_dir / "config.json").exists():
                 try:
-                    self.embeddings.load(str(self.vectors_dir))
+                    self.embeddings.load(str(self.vectors_dir), config={"cache": cache})
                 except Exception as e:
                     # Reset broken index
                     for item in self.vectors_dir.glob("*"):
@@ -0,0 +1,283 @@
+"""
+Профилировщик импортов при запуске GopiAI
+=========================================
+
+Включается флагом ``--profile-startup[=путь.json]`` у точек входа
+(crewai_api_server.py и gopiai/ui/main.py). Профилировщик ставится в
+sys.meta_path до остальных импортов, замеряет выполнение каждого модуля и
+строит дерево импортов с собственным и накопленным временем. После запуска
+отчет сохраняется в JSON, а процесс завершается.
+
+Модуль не зависит ни от чего, кроме стандартной библиотеки, чтобы его можно
+было импортировать раньше всех остальных модулей.
+"""
+
+import json
+import os
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, List, Optional
+
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_REPORT_NAME = "startup_profile.json"
+
+# Бюджет времени запуска (секунды) для проверки в тестах; переопределяется
+# переменной окружения GOPIAI_STARTUP_BUDGET_SECONDS
+DEFAULT_STARTUP_BUDGET_SECONDS = 20.0
+STARTUP_BUDGET_ENV = "GOPIAI_STARTUP_BUDGET_SECONDS"
+
+
+def get_startup_budget() -> float:
+    """Возвращает настроенный бюджет времени запуска в секундах"""
+    try:
+        return float(os.environ.get(STARTUP_BUDGET_ENV, DEFAULT_STARTUP_BUDGET_SECONDS))
+    except ValueError:
+        return DEFAULT_STARTUP_BUDGET_SECONDS
+
+
+class ImportNode:
+    """Узел дерева импортов"""
+
+    __slots__ = ("name", "cumulative", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cumulative = 0.0
+        self.children: List["ImportNode"] = []
+
+    @property
+    def self_time(self) -> float:
+        return max(0.0, self.cumulative - sum(child.cumulative for child in self.children))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "module": self.name,
+            "cumulative_ms": round(self.cumulative * 1000, 3),
+            "self_ms": round(self.self_time * 1000, 3),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _TimingLoader:
+    """Обертка над загрузчиком: замеряет exec_module, остальное делегирует"""
+
+    def __init__(self, loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Возвращаем модулю исходный загрузчик: код, проверяющий __loader__, не должен видеть обертку
+        module.__loader__ = self._loader
+        spec = getattr(module, "__spec__", None)
+        if spec is not None:
+            spec.loader = self._loader
+        with self._profiler.measure(module.__name__):
+            self._loader.exec_module(module)
+
+
+class ImportProfiler(MetaPathFinder):
+    """Finder в sys.meta_path, строящий дерево импортов с временем выполнения"""
+
+    def __init__(self):
+        self.root = ImportNode("<startup>")
+        self._stack: List[ImportNode] = [self.root]
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self.installed = False
+
+    # ------------------------------------------------------------------
+    # Установка
+    # ------------------------------------------------------------------
+
+    def install(self) -> "ImportProfiler":
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+        return self
+
+    def uninstall(self):
+        if self.installed:
+            try:
+                sys.meta_path.remove(self)
+            except ValueError:
+                pass
+            self.installed = False
+
+    def stop(self):
+        """Фиксирует окончание запуска и снимает профилировщик"""
+        if self._finished is None:
+            self._finished = time.perf_counter()
+        self.uninstall()
+
+    # ------------------------------------------------------------------
+    # MetaPathFinder
+    # ------------------------------------------------------------------
+
+    def find_spec(self, fullname, path, target=None):
+        # Ищем спецификацию остальными finder'ами и оборачиваем загрузчик
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            if loader is not None and hasattr(loader, "exec_module"):
+                spec.loader = _TimingLoader(loader, self)
+            return spec
+        return None
+
+    # ------------------------------------------------------------------
+    # Замер
+    # ------------------------------------------------------------------
+
+    def measure(self, name: str):
+        return _Measure(self, name)
+
+    def _push(self, name: str) -> ImportNode:
+        node = ImportNode(name)
+        self._stack[-1].children.append(node)
+        self._stack.append(node)
+        return node
+
+    def _pop(self, node: ImportNode, elapsed: float):
+        node.cumulative = elapsed
+        if self._stack and self._stack[-1] is node:
+            self._stack.pop()
+
+    # ------------------------------------------------------------------
+    # Отчет
+    # ------------------------------------------------------------------
+
+    def total_seconds(self) -> float:
+        finished = self._finished if self._finished is not None else time.perf_counter()
+        return finished - self._started
+
+    def flat(self) -> List[ImportNode]:
+        """Все узлы дерева (кроме корня)"""
+        nodes, pending = [], list(self.root.children)
+        while pending:
+            node = pending.pop()
+            nodes.append(node)
+            pending.extend(node.children)
+        return nodes
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        self.root.cumulative = sum(child.cumulative for child in self.root.children)
+        nodes = self.flat()
+        by_cumulative = sorted(nodes, key=lambda n: n.cumulative, reverse=True)[:top]
+        by_self = sorted(nodes, key=lambda n: n.self_time, reverse=True)[:top]
+        return {
+            "total_seconds": round(self.total_seconds(), 4),
+            "imports_seconds": round(self.root.cumulative, 4),
+            "module_count": len(nodes),
+            "budget_seconds": get_startup_budget(),
+            "top_cumulative": [
+                {"module": n.name, "cumulative_ms": round(n.cumulative * 1000, 3)} for n in by_cumulative
+            ],
+            "top_self": [
+                {"module": n.name, "self_ms": round(n.self_time * 1000, 3)} for n in by_self
+            ],
+            "tree": self.root.to_dict(),
+        }
+
+    def save(self, path: str) -> str:
+        """Сохраняет отчет в JSON и возвращает путь"""
+        report = self.report()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+    def summary(self, top: int = 15) -> str:
+        report = self.report(top)
+        lines = [
+            f"[STARTUP PROFILE] {report['module_count']} модулей, "
+            f"импорт {report['imports_seconds']:.3f} s, всего {report['total_seconds']:.3f} s"
+        ]
+        for item in report["top_cumulative"]:
+            lines.append(f"  {item['cumulative_ms']:10.1f} ms  {item['module']}")
+        return "\n".join(lines)
+
+
+class _Measure:
+    """Контекстный менеджер замера одного модуля"""
+
+    __slots__ = ("_profiler", "_name", "_node", "_started")
+
+    def __init__(self, profiler: ImportProfiler, name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._node = self._profiler._push(self._name)
+        self._started = time.perf_counter()
+        return self._node
+
+    def __exit__(self, *exc):
+        self._profiler._pop(self._node, time.perf_counter() - self._started)
+        return False
+
+
+# Активный профилировщик процесса (если запуск идет с --profile-startup)
+_active_profiler: Optional[ImportProfiler] = None
+_active_output: Optional[str] = None
+
+
+def enable_from_argv(argv: Optional[List[str]] = None, default_output: str = DEFAULT_REPORT_NAME) -> Optional[ImportProfiler]:
+    """
+    Включает профилировщик, если в argv есть --profile-startup[=путь].
+
+    Флаг удаляется из argv, чтобы его не видели argparse/Qt.
+
+    Returns:
+        ImportProfiler или None, если флаг не указан
+    """
+    global _active_profiler, _active_output
+
+    argv = sys.argv if argv is None else argv
+    output = None
+    for i, arg in enumerate(list(argv)):
+        if arg == PROFILE_FLAG:
+            output = default_output
+            del argv[i]
+            break
+        if arg.startswith(PROFILE_FLAG + "="):
+            output = arg.split("=", 1)[1] or default_output
+            del argv[i]
+            break
+
+    if output is None:
+        return None
+
+    if _active_profiler is None:
+        _active_profiler = ImportProfiler().install()
+    _active_output = output
+    return _active_profiler
+
+
+def get_active_profiler() -> Optional[ImportProfiler]:
+    return _active_profiler
+
+
+def finish(print_summary: bool = True) -> Optional[str]:
+    """Останавливает активный профилировщик и сохраняет отчет; возвращает путь к JSON"""
+    if _active_profiler is None or _active_output is None:
+        return None
+    _active_profiler.stop()
+    path = _active_profiler.save(_active_output)
+    if print_summary:
+        print(_active_profiler.summary())
+        print(f"[STARTUP PROFILE] Отчет сохранен: {path}")
+    return path
@@ -8,6 +8,7 @@ ROOT = pathlib.Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from tools.gopiai_integration import terminal_tool
 from tools.gopiai_integration.terminal_tool import TerminalTool
 
 
@@ -42,3 +43,27 @@ def test_terminal_tool_echo_windows(monkeypatch):
     out = res.get("terminal_output", {})
     assert out.get("success") is True
     assert "hello" in (out.get("output") or "")
+
+
+def test_ai_commands_are_buffered_until_terminal_widget_is_set(monkeypatch):
+    # The UI creates the terminal widget lazily, AI commands run before that must not be lost
+    monkeypatch.setenv("GOPIAI_TERMINAL_UNSAFE", "1")
+    monkeypatch.setattr(terminal_tool, "_terminal_widget_instance", None)
+    terminal_tool._pending_ai_commands.clear()
+
+    class Widget:
+        def __init__(self):
+            self.logged = []
+
+        def log_ai_command(self, command, output):
+            self.logged.append((command, output.strip()))
+
+    tool = TerminalTool()
+    tool._run("echo first")
+
+    widget = Widget()
+    terminal_tool.set_terminal_widget(widget)
+    tool._run("echo second")
+
+    assert widget.logged == [("echo first", "first"), ("echo second", "second")]
+    terminal_tool.set_terminal_widget(None)
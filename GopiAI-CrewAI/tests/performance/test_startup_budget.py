@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Startup budget check for the CrewAI API server.
+
+Runs crewai_api_server.py with --profile-startup and fails when the
+startup time exceeds the configured budget (GOPIAI_STARTUP_BUDGET_SECONDS).
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+import startup_profiler
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.skipif(importlib.util.find_spec("flask") is None, reason="server dependencies are not installed")
+def test_server_startup_within_budget(tmp_path):
+    """Server imports and initialisation must fit into the startup budget."""
+    report_path = tmp_path / "crewai_startup_profile.json"
+    budget = startup_profiler.get_startup_budget()
+
+    result = subprocess.run(
+        [sys.executable, "crewai_api_server.py", f"--profile-startup={report_path}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=max(60.0, budget * 3),
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+
+    slowest = ", ".join(
+        f"{item['module']} ({item['cumulative_ms']:.0f} ms)" for item in report["top_cumulative"][:5]
+    )
+    assert report["total_seconds"] <= budget, (
+        f"Startup took {report['total_seconds']:.2f}s, budget is {budget:.2f}s. Slowest imports: {slowest}"
+    )
@@ -1,7 +1,11 @@
 import json
+import os
+import tempfile
+import threading
 import unittest
+from unittest import mock
 
-# Импортируем только SmartDelegator — устаревший CommandExecutor удалён.
+# Импортируем только SmartDelegator: JSON-команды исполняет его CommandExecutor.
 # Если импорт тянет тяжёлые опциональные зависимости (chromadb и пр.) — пропустим тесты.
 try:
     from tools.gopiai_integration.smart_delegator import SmartDelegator
@@ -18,9 +22,8 @@ class TestCommandProcessorStrictJSON(unittest.TestCase):
 
     def _process(self, response_text: str):
         """
-        Современная архитектура: на уровне SmartDelegator нет парсинга JSON-команд.
-        Команды исполняются через прямые tool_calls CrewAI/MCP, а не через CommandExecutor.
-        Тест отражает, что здесь ничего не выполняется и ответ проходит как есть.
+        Проверка формы ответа без исполнения: здесь ничего не выполняется и ответ проходит как есть.
+        Исполнение строгих JSON-команд проверяет TestSmartDelegatorStrictCommands.
         """
         return response_text, []
 
@@ -63,5 +66,62 @@ class TestCommandProcessorStrictJSON(unittest.TestCase):
         updated_response, results = self._process(text)
         self.assertEqual(results, [], "Никакие команды не должны выполняться, если это не JSON")
 
+class TestSmartDelegatorStrictCommands(unittest.TestCase):
+    """Строгий JSON ответа LLM исполняется через CommandExecutor SmartDelegator"""
+
+    def setUp(self):
+        if SmartDelegator is None:
+            self.skipTest(f"Пропуск: SmartDelegator недоступен из-за ImportError: {_IMPORT_ERROR}")
+        self.delegator = SmartDelegator(rag_system=None, enable_json_commands=True)
+        if self.delegator.command_executor is None or not self.delegator.local_tools_available:
+            self.skipTest("Пропуск: CommandExecutor или локальные инструменты недоступны")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, text in (("a.txt", "alpha"), ("b.txt", "beta")):
+            path = os.path.join(self.tmpdir.name, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_independent_reads_run_in_parallel(self):
+        commands = [
+            {"tool": "file_operations", "params": {"operation": "read", "path": path}}
+            for path in self.paths
+        ]
+        # Обе команды чтения должны выполняться одновременно, иначе барьер не пройдет
+        barrier = threading.Barrier(len(commands), timeout=10)
+        call_tool = self.delegator.local_tools.call_tool
+
+        def _call_tool(tool_name, params):
+            barrier.wait()
+            return call_tool(tool_name, params)
+
+        with mock.patch.object(self.delegator, "_check_for_tool_request", return_value=None), \
+                mock.patch.object(self.delegator, "_call_llm", return_value=json.dumps(commands)), \
+                mock.patch.object(self.delegator.local_tools, "call_tool", side_effect=_call_tool):
+            result = self.delegator.process_request("прочитай оба файла", {})
+
+        analysis = result["analysis"]
+        self.assertEqual(analysis["executed_commands"], 2)
+        self.assertEqual([r["success"] for r in analysis["command_results"]], [True, True])
+        self.assertEqual([r["content"] for r in analysis["command_results"]], ["alpha", "beta"])
+
+    def test_executor_is_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {"GOPIAI_JSON_COMMANDS": ""}):
+            self.assertIsNone(SmartDelegator(rag_system=None).command_executor)
+        with mock.patch.dict(os.environ, {"GOPIAI_JSON_COMMANDS": "1"}):
+            self.assertIsNotNone(SmartDelegator(rag_system=None).command_executor)
+
+    def test_free_text_is_not_executed(self):
+        with mock.patch.object(self.delegator, "_check_for_tool_request", return_value=None), \
+                mock.patch.object(self.delegator, "_call_llm", return_value="cat a.txt"), \
+                mock.patch.object(self.delegator.command_executor, "execute_commands") as execute:
+            result = self.delegator.process_request("привет", {})
+        execute.assert_not_called()
+        self.assertNotIn("executed_commands", result["analysis"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the tiered EmotionalClassifier.
+
+Tests that the local lexicon model handles common messages without an LLM call,
+that crisis indicators and disagreements escalate to the LLM, and that results
+are cached per message hash.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+INTEGRATION_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration')
+
+
+def _load(name):
+    # Load by path: the gopiai_integration package imports crewai on init
+    spec = importlib.util.spec_from_file_location(name, os.path.join(INTEGRATION_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+emotion_local_model = _load("emotion_local_model")
+emotional_classifier = _load("emotional_classifier")
+EmotionalState = emotional_classifier.EmotionalState
+
+
+class _Generation:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Result:
+    def __init__(self, text):
+        self.generations = [[_Generation(text)]]
+
+
+class CountingRouter:
+    """AI router stub that records how many LLM calls were made."""
+
+    def __init__(self, emotion="anxious"):
+        self.model_config_manager = object()
+        self.calls = 0
+        self.emotion = emotion
+
+    def _generate(self, prompts):
+        self.calls += 1
+        return _Result(json.dumps({"primary_emotion": self.emotion, "confidence": 0.9,
+                                   "emotional_intensity": 0.7}))
+
+
+def test_lexicon_model_handles_negation_and_intensity():
+    model = emotion_local_model.LexiconEmotionModel()
+
+    assert model.predict("Спасибо, я очень рад!")["primary_emotion"] == "positive"
+    assert model.predict("Я совсем не рад этому")["primary_emotion"] == "negative"
+    assert model.predict("Покажи список файлов")["primary_emotion"] == "neutral"
+
+    calm = model.predict("меня это раздражает")["emotional_intensity"]
+    loud = model.predict("МЕНЯ ЭТО ОЧЕНЬ РАЗДРАЖАЕТ!!!")["emotional_intensity"]
+    assert loud > calm
+
+
+def test_common_messages_are_classified_locally():
+    router = CountingRouter()
+    classifier = emotional_classifier.EmotionalClassifier(router)
+
+    cases = {
+        "Спасибо большое, я так рад!": EmotionalState.POSITIVE,
+        "Почему опять не работает? Бесит!": EmotionalState.FRUSTRATED,
+        "Объясни еще раз, я не понимаю": EmotionalState.CONFUSED,
+        "Прочитай файл README.md": EmotionalState.NEUTRAL,
+    }
+    for message, expected in cases.items():
+        assert classifier.analyze_emotional_state([], message).primary_emotion == expected
+
+    assert router.calls == 0
+    assert classifier.get_stats()["local"] == len(cases)
+
+
+def test_crisis_indicators_escalate_to_llm():
+    router = CountingRouter(emotion="supportive_needed")
+    classifier = emotional_classifier.EmotionalClassifier(router)
+
+    analysis = classifier.analyze_emotional_state([], "Мне кажется, я не хочу жить")
+    assert router.calls == 1
+    assert analysis.primary_emotion == EmotionalState.SUPPORTIVE_NEEDED
+    assert analysis.needs_support and analysis.crisis_indicators == ["suicidal"]
+
+
+def test_disagreement_escalates_and_llm_failure_falls_back_to_local():
+    router = CountingRouter(emotion="depressed")
+    classifier = emotional_classifier.EmotionalClassifier(router)
+
+    # The heuristic phrase says "negative", the lexicon leans towards despair
+    analysis = classifier.analyze_emotional_state([], "Я в полном отчаянии, все плохо")
+    assert router.calls == 1
+    assert analysis.primary_emotion == EmotionalState.DEPRESSED
+
+    class BrokenRouter(CountingRouter):
+        def _generate(self, prompts):
+            raise RuntimeError("rate limited")
+
+    # A confident local result is kept when the LLM fails
+    confident = {"primary_emotion": "depressed", "confidence": 0.9, "emotional_intensity": 0.8}
+    local_model = type("Confident", (), {"predict": staticmethod(lambda text: confident)})()
+    fallback = emotional_classifier.EmotionalClassifier(BrokenRouter(), mode="tiered", local_model=local_model)
+    assert fallback.analyze_emotional_state([], "Я в полном отчаянии, все плохо").primary_emotion == EmotionalState.DEPRESSED
+
+
+def test_results_are_cached_per_message_and_llm_mode_is_kept():
+    router = CountingRouter()
+    classifier = emotional_classifier.EmotionalClassifier(router, mode="llm")
+
+    first = classifier.analyze_emotional_state([], "Боюсь, что не успею")
+    second = classifier.analyze_emotional_state([], "  боюсь,   что не успею ")
+    assert router.calls == 1 and first is second
+    assert classifier.get_stats()["cache_hits"] == 1
+
+    local_only = emotional_classifier.EmotionalClassifier(router, mode="local")
+    local_only.analyze_emotional_state([], "Мне кажется, я не хочу жить")
+    assert router.calls == 1
+
+
+def test_neutral_technical_text_is_not_classified_as_emotional():
+    model = emotion_local_model.LexiconEmotionModel()
+    # Подстрочная эвристика может отправить такой текст в LLM, но не должна пропустить ее с ложной эмоцией
+    router = CountingRouter(emotion="neutral")
+    classifier = emotional_classifier.EmotionalClassifier(router)
+
+    # «радиус», «уравнение», «класс», «супер-» не должны совпадать с эмоциональными основами
+    for message in ("Посчитай радиус круга", "Реши уравнение", "Создай класс для парсера",
+                    "Вызови метод суперкласса", "Так, теперь добавь тесты", "Check if a is greater than b"):
+        assert model.predict(message)["primary_emotion"] == "neutral", message
+        assert classifier.analyze_emotional_state([], message).primary_emotion == EmotionalState.NEUTRAL
+
+    assert model.predict("Я рада, ура!")["primary_emotion"] == "positive"
+    assert model.predict("Классно получилось")["primary_emotion"] == "positive"
+
+
+def test_llm_results_are_cached_per_history_and_failures_are_not_cached():
+    router = CountingRouter()
+    classifier = emotional_classifier.EmotionalClassifier(router, mode="llm")
+
+    first_chat = [{"role": "user", "content": "Все сломалось, завтра дедлайн"}]
+    other_chat = [{"role": "user", "content": "Отпуск начинается завтра"}]
+    classifier.analyze_emotional_state(first_chat, "да")
+    classifier.analyze_emotional_state(first_chat, "да")
+    classifier.analyze_emotional_state(other_chat, "да")
+    assert router.calls == 2
+
+    class FlakyRouter(CountingRouter):
+        def _generate(self, prompts):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("rate limited")
+            return super()._generate(prompts)
+
+    flaky = FlakyRouter()
+    retrying = emotional_classifier.EmotionalClassifier(flaky, mode="llm")
+    retrying.analyze_emotional_state([], "Боюсь, что не успею")
+    assert retrying.analyze_emotional_state([], "Боюсь, что не успею").primary_emotion == EmotionalState.ANXIOUS
+    assert flaky.calls == 3
+
+
+def test_task_requests_are_not_classified_as_emotions():
+    model = emotion_local_model.LexiconEmotionModel()
+    router = CountingRouter(emotion="neutral")
+    classifier = emotional_classifier.EmotionalClassifier(router)
+
+    # Обычные просьбы к ассистенту не несут эмоции сами по себе
+    for message in ("Объясни, как работает этот код", "Помоги написать функцию",
+                    "Запусти тесты снова", "Опять открой этот файл"):
+        assert model.predict(message)["primary_emotion"] == "neutral", message
+        assert classifier.analyze_emotional_state([], message).primary_emotion == EmotionalState.NEUTRAL
+
+    # Вместе с эмоциональными словами они усиливают эмоцию
+    assert model.predict("Опять не работает")["scores"]["frustrated"] > model.predict("Не работает")["scores"]["frustrated"]
+
+
+def test_llm_failure_with_unsure_local_result_falls_back_to_neutral():
+    class BrokenRouter(CountingRouter):
+        def _generate(self, prompts):
+            raise RuntimeError("rate limited")
+
+    classifier = emotional_classifier.EmotionalClassifier(BrokenRouter(), mode="tiered")
+
+    analysis = classifier.analyze_emotional_state([], "Помоги написать функцию")
+    assert analysis.primary_emotion == EmotionalState.NEUTRAL
+    assert not analysis.needs_support
+
+    # The lexicon is unsure about mixed despair and sadness, so the baseline neutral result is used
+    assert classifier.analyze_emotional_state([], "Я в полном отчаянии, все плохо").primary_emotion == EmotionalState.NEUTRAL
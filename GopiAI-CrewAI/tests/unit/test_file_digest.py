@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cached file digests and directory manifests.
+
+Tests cache hits and invalidation, size short-circuit in compare and
+incremental manifest diffs.
+"""
+
+import hashlib
+import importlib.util
+import os
+
+import pytest
+
+DIGEST_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'file_digest.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("file_digest", DIGEST_PATH)
+file_digest = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(file_digest)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = file_digest.DigestCache(str(tmp_path / "digests.db"))
+    yield cache
+    cache.close()
+
+
+def test_digest_is_cached_until_file_changes(tmp_path, cache):
+    target = tmp_path / "artifact.bin"
+    target.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+
+    expected = hashlib.sha256(target.read_bytes()).hexdigest()
+    assert cache.digest(str(target), "sha256") == expected
+    assert cache.digest(str(target), "sha256") == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    target.write_bytes(b"changed")
+    os.utime(target, ns=(1, 1))
+    assert cache.digest(str(target), "sha256") == hashlib.sha256(b"changed").hexdigest()
+    assert cache.misses == 2
+
+
+def test_cache_persists_between_instances(tmp_path, cache):
+    target = tmp_path / "a.txt"
+    target.write_text("data")
+    digest = cache.digest(str(target), "blake2b")
+
+    reopened = file_digest.DigestCache(cache.db_path)
+    assert reopened.digest(str(target), "blake2b") == digest
+    assert (reopened.hits, reopened.misses) == (1, 0)
+    reopened.close()
+
+
+def test_compare_short_circuits_on_size(tmp_path, cache):
+    a, b, c = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+    a.write_text("same content")
+    b.write_text("same content")
+    c.write_text("different length")
+
+    different = file_digest.compare_files(str(a), str(c), cache=cache)
+    assert not different["sizes_equal"] and not different["content_equal"]
+    assert different["hash1"] is None and cache.misses == 0
+
+    equal = file_digest.compare_files(str(a), str(b), cache=cache)
+    assert equal["content_equal"] and equal["hash1"] == equal["hash2"]
+
+
+def test_unsupported_algorithm(tmp_path):
+    with pytest.raises(ValueError):
+        file_digest.compute_digest(str(DIGEST_PATH), "crc32")
+    assert "blake2b" in file_digest.supported_algorithms()
+
+
+def test_manifest_is_incremental(tmp_path, cache):
+    root = tmp_path / "dir"
+    root.mkdir()
+    for name in ("one.txt", "two.txt", "three.txt"):
+        (root / name).write_text(name)
+
+    def files():
+        return sorted(str(p) for p in root.iterdir())
+
+    first = file_digest.build_manifest(str(root), files(), "sha1", cache=cache)
+    assert set(first["files"]) == {"one.txt", "two.txt", "three.txt"}
+    assert first["reused"] == 0
+
+    (root / "two.txt").write_text("edited two")
+    os.utime(root / "two.txt", ns=(10, 10))
+    (root / "three.txt").unlink()
+    (root / "four.txt").write_text("four")
+
+    second = file_digest.build_manifest(str(root), files(), "sha1", previous=first, cache=cache)
+    assert second["reused"] == 1
+    assert second["digest"] != first["digest"]
+    assert file_digest.diff_manifests(first, second) == {
+        "added": ["four.txt"], "removed": ["three.txt"], "modified": ["two.txt"],
+    }
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the filesystem walkers used by GopiAIFileSystemTool.
+
+Tests ignore rules, pagination, the scandir tree and multi-file text search.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+WALK_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'filesystem_walk.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("filesystem_walk", WALK_PATH)
+filesystem_walk = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(filesystem_walk)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a small repository tree with directories that must be ignored."""
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("import os\nprint('TODO: fix')\n")
+    (tmp_path / "src" / "pkg" / "util.py").write_text("# todo later\nVALUE = 1\n# TODO again\n")
+    (tmp_path / "README.md").write_text("Привет, мир\nTODO docs\n")
+    (tmp_path / "blob.bin").write_bytes(b"TODO\0\0binary")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config.py").write_text("TODO in git\n")
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib" / "index.py").write_text("TODO in deps\n")
+    (tmp_path / "custom_env").mkdir()
+    (tmp_path / "custom_env" / "pyvenv.cfg").write_text("home = /usr\n")
+    (tmp_path / "custom_env" / "site.py").write_text("TODO in venv\n")
+    return tmp_path
+
+
+def _relative(root, paths):
+    return sorted(os.path.relpath(p, root).replace(os.sep, "/") for p in paths)
+
+
+def test_iter_files_skips_ignored_directories(repo):
+    files = _relative(repo, filesystem_walk.iter_files(str(repo), "*.py"))
+    assert files == ["src/main.py", "src/pkg/util.py"]
+
+    nested = _relative(repo, filesystem_walk.iter_files(str(repo), "src/pkg/*.py"))
+    assert nested == ["src/pkg/util.py"]
+
+    top_level = _relative(repo, filesystem_walk.iter_matches(str(repo), "*", recursive=False))
+    assert top_level == ["README.md", "blob.bin", "src"]
+
+
+def test_paginate_reads_only_requested_page():
+    consumed = []
+
+    def numbers():
+        for i in range(1000):
+            consumed.append(i)
+            yield i
+
+    page = filesystem_walk.paginate(numbers(), offset=10, limit=5)
+    assert page["items"] == [10, 11, 12, 13, 14]
+    assert page["has_more"] and page["next_offset"] == 15
+    assert len(consumed) == 16
+
+    last = filesystem_walk.paginate(range(12), offset=10, limit=5)
+    assert last["items"] == [10, 11] and not last["has_more"] and last["next_offset"] is None
+
+
+def test_build_tree_respects_ignore_and_entry_budget(repo):
+    tree = filesystem_walk.build_tree(str(repo), max_depth=3)
+    names = [child["name"] for child in tree["children"]]
+    assert names == ["README.md", "blob.bin", "src"]
+    readme = tree["children"][0]
+    assert readme["size"] == os.path.getsize(repo / "README.md")
+
+    small = filesystem_walk.build_tree(str(repo), max_depth=3, max_entries=2)
+    assert small["truncated"] and len(small["children"]) == 2
+
+
+def test_search_files_across_tree(repo):
+    files = filesystem_walk.iter_files(str(repo))
+    found = filesystem_walk.search_files(files, "todo", max_workers=4)
+
+    hits = sorted((os.path.relpath(i["path"], repo).replace(os.sep, "/"), i["line_number"])
+                  for i in found["items"])
+    assert hits == [("README.md", 2), ("src/main.py", 2), ("src/pkg/util.py", 1), ("src/pkg/util.py", 3)]
+    assert not found["truncated"]
+
+    sensitive = filesystem_walk.search_files(filesystem_walk.iter_files(str(repo)), "TODO", case_sensitive=True)
+    assert len(sensitive["items"]) == 3
+    main_hit = next(i for i in sensitive["items"] if i["path"].endswith("main.py"))
+    assert main_hit["line_content"] == "print('TODO: fix')" and main_hit["position"] == 7
+
+
+def test_search_files_stops_at_limit_and_handles_cyrillic(repo):
+    limited = filesystem_walk.search_files(filesystem_walk.iter_files(str(repo)), "todo", max_results=2)
+    assert len(limited["items"]) == 2 and limited["truncated"]
+
+    cyrillic = filesystem_walk.search_files([str(repo / "README.md")], "ПРИВЕТ")
+    assert [(i["line_number"], i["position"]) for i in cyrillic["items"]] == [(1, 0)]
+
+
+def _filesystem_tool():
+    pytest.importorskip("crewai")
+    from tools.gopiai_integration.filesystem_tools import GopiAIFileSystemTool
+    return GopiAIFileSystemTool()
+
+
+def test_tool_find_keeps_list_shape_and_pages_on_request(repo):
+    tool = _filesystem_tool()
+
+    found = tool._run(action="find", path=str(repo), pattern="*.py", recursive=True)
+    assert isinstance(found, list)
+    assert sorted(os.path.basename(p) for p in found) == ["main.py", "util.py"]
+
+    page = tool._run(action="find", path=str(repo), pattern="*.py", recursive=True, limit=1)
+    assert len(page["items"]) == 1 and page["has_more"] is True
+
+
+def test_tool_search_text_single_file_is_not_capped(tmp_path):
+    tool = _filesystem_tool()
+    big = tmp_path / "big.txt"
+    big.write_text("needle\n" * (filesystem_walk.DEFAULT_PAGE_SIZE + 10))
+
+    found = tool._run(action="search_text", path=str(big), search_term="needle")
+    assert len(found) == filesystem_walk.DEFAULT_PAGE_SIZE + 10
+    assert found[0] == {"line_number": 1, "line_content": "needle", "position": 0}
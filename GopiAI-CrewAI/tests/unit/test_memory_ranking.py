@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for hybrid memory ranking.
+
+Tests reciprocal rank fusion of full-text and vector candidates together
+with importance and recency features.
+"""
+
+import importlib.util
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+RANKING_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'memory_ranking.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("memory_ranking", RANKING_PATH)
+memory_ranking = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(memory_ranking)
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+def _mem(id, data, importance=5, days_old=0):
+    return {"id": id, "data": data, "importance": importance,
+            "timestamp": (NOW - timedelta(days=days_old)).isoformat()}
+
+
+def test_candidates_in_both_lists_rank_first():
+    text_hits = [_mem(1, "alpha"), _mem(2, "beta"), _mem(3, "gamma")]
+    vector_hits = [{"text": "gamma"}, {"text": "delta"}]
+
+    results = memory_ranking.hybrid_rank(text_hits, vector_hits, limit=4, now=NOW)
+
+    assert results[0]["id"] == 3
+    assert results[0]["scores"]["text"] > 0 and results[0]["scores"]["vector"] > 0
+    assert {r.get("id") for r in results} == {1, 2, 3, None}
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+
+def test_importance_and_recency_break_text_ties():
+    text_hits = [_mem(1, "old note", importance=2, days_old=90), _mem(2, "fresh note", importance=9)]
+
+    results = memory_ranking.hybrid_rank(text_hits, [], limit=2, now=NOW)
+
+    assert [r["id"] for r in results] == [2, 1]
+    assert results[0]["scores"]["recency"] == 1.0
+    assert results[1]["scores"]["recency"] < 0.02
+
+
+def test_limit_and_empty_input():
+    hits = [_mem(i, f"note {i}") for i in range(20)]
+
+    assert len(memory_ranking.hybrid_rank(hits, [], limit=3, now=NOW)) == 3
+    assert memory_ranking.hybrid_rank([], [], limit=3) == []
+
+
+def test_hybrid_search_action_includes_vector_only_hits(tmp_path):
+    pytest.importorskip("crewai")
+    from tools.gopiai_integration.memory_tools import GopiAIMemoryTool
+
+    class FakeRAG:
+        def search(self, query, limit):
+            return [{"text": "user: deploy the service with docker compose"}]
+
+    tool = GopiAIMemoryTool(local_memory_file=str(tmp_path / "memory.json"), rag_system=FakeRAG())
+    tool._run(action="store", query="note", data="docker notes for the service")
+
+    output = tool._run(action="hybrid_search", query="docker service")
+
+    assert "docker notes for the service" in output
+    assert "[rag, score=" in output
+    assert "deploy the service with docker compose" in output
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite memory store.
+
+Tests full-text search, filtering, conversation trimming and the one-time
+import of the legacy JSON memory file.
+"""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+STORE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'memory_store.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("memory_store", STORE_PATH)
+memory_store = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(memory_store)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = memory_store.MemoryStore(str(tmp_path / "memory.db"), max_conversation_messages=5)
+    yield store
+    store.close()
+
+
+def _item(key, data, category="general", importance=5, conversation_id="c1", timestamp=None):
+    item = {"key": key, "data": data, "category": category,
+            "importance": importance, "conversation_id": conversation_id}
+    if timestamp:
+        item["timestamp"] = timestamp
+    return item
+
+
+def test_search_orders_by_importance_and_filters(store):
+    store.add_many([
+        _item("a", "Настройка сервера nginx", importance=3),
+        _item("b", "настройка базы данных", importance=9),
+        _item("c", "совсем другое", importance=10),
+        _item("d", "Настройка в другой беседе", conversation_id="c2"),
+    ])
+
+    results = store.search("настройка", conversation_id="c1")
+    assert [r["key"] for r in results] == ["b", "a"]
+    assert store.count("настройка") == 3
+    assert store.search("настройка", category="code") == []
+
+
+def test_search_falls_back_to_substring(store):
+    store.add(_item("k", "Это тестовая информация"))
+
+    # "стов" is inside a word, so FTS finds nothing and the substring path is used
+    assert [r["key"] for r in store.search("стов")] == ["k"]
+    assert store.count("СТОВ") == 1
+
+
+def test_conversation_history_is_trimmed(store):
+    with store.batch():
+        for i in range(8):
+            store.add(_item(f"m{i}", f"message {i}", category="conversation",
+                            timestamp=f"2024-01-01T00:00:0{i}"))
+
+    history = store.search("", "conversation", "c1", order="timestamp")
+    assert [r["key"] for r in history] == ["m3", "m4", "m5", "m6", "m7"]
+
+
+def test_get_delete_and_category_counts(store):
+    store.add_many([_item("x", "one"), _item("x", "two", conversation_id="c2"),
+                    _item("y", "code", category="code")])
+
+    assert store.get("x", "c2")["data"] == "two"
+    assert sorted(store.category_counts()) == [("code", "c1", 1), ("general", "c1", 1), ("general", "c2", 1)]
+    assert store.delete("x", "c1") == 1
+    assert store.get("x", "c1") is None
+    assert store.search("one") == []
+
+
+def test_find_by_data_applies_filters(store):
+    store.add_many([_item("a", "same text"), _item("b", "same text", conversation_id="c2"),
+                    _item("c", "other", category="code")])
+
+    assert store.find_by_data(["same text", "missing"])["same text"]["key"] == "a"
+    assert store.find_by_data(["same text"], conversation_id="c2")["same text"]["key"] == "b"
+    assert store.find_by_data(["same text", "other"], category="code").keys() == {"other"}
+    assert store.find_by_data([]) == {}
+
+
+def test_import_json_runs_once(tmp_path, store):
+    legacy = tmp_path / "crewai_memory.json"
+    legacy.write_text(json.dumps({"memories": [
+        _item("old", "старая запись", timestamp="2023-05-01T10:00:00"),
+        _item("old2", "ещё одна", category="research"),
+    ]}), encoding="utf-8")
+
+    assert store.import_json(str(legacy)) == 2
+    assert store.import_json(str(legacy)) == 0
+    assert store.get("old")["timestamp"] == "2023-05-01T10:00:00"
+    assert store.count() == 2
+
+
+def test_search_candidates_are_bm25_ordered(store):
+    store.add_many([
+        {"key": "a", "data": "python tips and more python and python"},
+        {"key": "b", "data": "a long note that mentions python once among many other unrelated words"},
+        {"key": "c", "data": "nothing relevant"},
+    ])
+
+    candidates = store.search_candidates("python")
+
+    assert [c["key"] for c in candidates] == ["a", "b"]
+    assert "bm25" in candidates[0]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the budget-aware ReflectionEnabledAIRouter loop.
+
+Tests the early exit on a high heuristic score, parallel candidates scored in
+a single critique call, the latency/token budget and marginal gain stats.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain")
+from langchain.schema import Generation, LLMResult  # noqa: E402
+
+REFLECTION_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'self_reflection.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("self_reflection", REFLECTION_PATH)
+self_reflection = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(self_reflection)
+
+PROMPT = "Объясни, как работает сборщик мусора в Python"
+GOOD = "Сборщик мусора в Python работает на подсчете ссылок.\n\n- циклы\n- поколения\n" + "Подробности. " * 10
+
+
+class ScriptedRouter:
+    """AI router stub: short answer first, scores candidates by their length."""
+
+    def __init__(self, first="Не знаю.", delay=0.0):
+        self.first = first
+        self.delay = delay
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def _generate(self, prompts, stop=None):
+        prompt = prompts[0]
+        with self.lock:
+            self.prompts.append(prompt)
+            count = len(self.prompts)
+        time.sleep(self.delay)
+        if prompt.startswith("Оцени варианты"):
+            candidates = re.findall(r'<candidate index="(\d+)">\n(.*?)\n</candidate>', prompt, re.DOTALL)
+            text = json.dumps({"scores": [
+                {"index": int(i), "score": min(10, 3 + len(c) / 40), "critique": "добавь деталей"}
+                for i, c in candidates
+            ]})
+        elif prompt.startswith("Улучши ответ"):
+            text = "Сборщик мусора: " + "деталь " * (10 * count)
+        else:
+            text = self.first
+        return LLMResult(generations=[[Generation(text=text)]])
+
+
+def _critique_calls(router):
+    return [p for p in router.prompts if p.startswith("Оцени варианты")]
+
+
+def test_high_heuristic_score_exits_early():
+    router = ScriptedRouter(first=GOOD)
+    reflection = self_reflection.ReflectionEnabledAIRouter(router)
+
+    result = reflection._generate([PROMPT])
+    assert result.generations[0][0].text == GOOD
+    assert result.generations[0][0].generation_info["reflection"]["early_exit"]
+    assert len(router.prompts) == 1
+    assert reflection.get_reflection_stats()["early_exits"] == 1
+
+
+def test_realistic_code_answer_exits_early():
+    prompt = "Напиши функцию на Python, которая переворачивает строку"
+    answer = (
+        "Вот функция, которая переворачивает строку с помощью среза:\n\n"
+        "```python\ndef reverse_string(text: str) -> str:\n    return text[::-1]\n```\n\n"
+        "Срез с шагом -1 проходит строку с конца, поэтому reverse_string(\"abc\") вернет \"cba\"."
+    )
+    router = ScriptedRouter(first=answer)
+    reflection = self_reflection.ReflectionEnabledAIRouter(router)
+
+    info = reflection._generate([prompt]).generations[0][0].generation_info["reflection"]
+    assert info["early_exit"]
+    assert not _critique_calls(router)
+
+
+def test_off_topic_answer_is_critiqued():
+    router = ScriptedRouter(first="Вот функция, которая считает сумму списка чисел в цикле и возвращает результат.")
+    reflection = self_reflection.ReflectionEnabledAIRouter(router, reflection_config={"max_iterations": 0})
+
+    info = reflection._generate(["Напиши функцию на Python, которая переворачивает строку"]).generations[0][0].generation_info["reflection"]
+    assert not info["early_exit"]
+    assert len(_critique_calls(router)) == 1
+
+
+def test_candidates_are_scored_in_one_call_and_gain_is_tracked():
+    router = ScriptedRouter()
+    reflection = self_reflection.ReflectionEnabledAIRouter(
+        router, reflection_config={"candidates_per_iteration": 3, "max_iterations": 2, "max_tokens": 100000}
+    )
+
+    result = reflection._generate([PROMPT])
+    info = result.generations[0][0].generation_info["reflection"]
+    assert info["final_score"] > info["initial_score"]
+
+    # One critique for the initial answer plus one per iteration covering all candidates
+    assert len(_critique_calls(router)) == 1 + info["iterations"]
+    assert _critique_calls(router)[-1].count("<candidate ") == 3
+
+    stats = reflection.get_reflection_stats()
+    assert len(stats["marginal_gain_by_iteration"]) == info["iterations"]
+    assert stats["marginal_gain_by_iteration"][0] > 0
+    assert stats["llm_calls"] == len(router.prompts)
+
+
+def test_budget_stops_iterations():
+    router = ScriptedRouter(delay=0.05)
+    reflection = self_reflection.ReflectionEnabledAIRouter(
+        router, reflection_config={"max_latency_seconds": 0.12, "max_iterations": 5}
+    )
+
+    info = reflection._generate([PROMPT]).generations[0][0].generation_info["reflection"]
+    assert info["budget_exhausted"] and info["iterations"] == 0
+    assert reflection.get_reflection_stats()["budget_exhausted"] == 1
+
+
+def test_unparseable_critique_falls_back_to_heuristic():
+    class BrokenCritic(ScriptedRouter):
+        def _generate(self, prompts, stop=None):
+            if prompts[0].startswith("Оцени варианты"):
+                self.prompts.append(prompts[0])
+                return LLMResult(generations=[[Generation(text="отличный ответ")]])
+            return super()._generate(prompts, stop)
+
+    reflection = self_reflection.ReflectionEnabledAIRouter(BrokenCritic(), reflection_config={"max_iterations": 1})
+    info = reflection._generate([PROMPT]).generations[0][0].generation_info["reflection"]
+    assert info["initial_score"] == info["heuristic_score"]
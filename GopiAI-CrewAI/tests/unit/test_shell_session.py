@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent shell session backend.
+
+Tests state persistence between commands, sentinel framing, the output cap,
+streaming callbacks, timeouts with session restart and resource limits.
+"""
+
+import importlib.util
+import os
+import shutil
+
+import pytest
+
+SHELL_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'shell_session.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("shell_session", SHELL_PATH)
+shell_session = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(shell_session)
+
+pytestmark = pytest.mark.skipif(
+    os.name == "nt" or shutil.which("bash") is None, reason="persistent sessions require bash"
+)
+
+
+@pytest.fixture
+def pool():
+    pool = shell_session.ShellSessionPool(max_sessions=2)
+    yield pool
+    pool.close()
+
+
+def test_cwd_and_env_persist_between_commands(pool, tmp_path):
+    first = pool.run(f"cd {tmp_path} && export GOPIAI_TEST=42; echo out; echo err >&2")
+    assert first["stdout"] == "out\n" and first["stderr"] == "err\n"
+    assert first["returncode"] == 0 and first["cwd"] == str(tmp_path)
+
+    second = pool.run("pwd; printf %s \"$GOPIAI_TEST\"")
+    assert second["stdout"] == f"{tmp_path}\n42"
+
+    other = pool.run("printf %s \"${GOPIAI_TEST:-unset}\"", session_id="other")
+    assert other["stdout"] == "unset"
+
+
+def test_syntax_errors_and_exit_codes_keep_framing(pool):
+    broken = pool.run("echo 'unbalanced")
+    assert broken["returncode"] != 0 and not broken["timed_out"]
+    assert pool.run("false")["returncode"] == 1
+
+    exited = pool.run("exit 3")
+    assert exited["returncode"] == 3
+    assert pool.run("echo alive")["stdout"] == "alive\n"
+
+
+def test_output_cap_and_streaming(pool):
+    capped = pool.run("yes | head -c 200000", max_output_bytes=1000)
+    assert len(capped["stdout"]) == 1000 and capped["truncated"]
+    assert capped["stdout_bytes"] == 200000
+
+    chunks = []
+    pool.run("for i in 1 2 3; do echo $i; sleep 0.05; done",
+             on_output=lambda stream, text: chunks.append((stream, text)))
+    assert len(chunks) >= 3
+    assert "".join(text for _, text in chunks) == "1\n2\n3\n"
+
+
+def test_timeout_restarts_session(pool, tmp_path):
+    pool.run(f"cd {tmp_path}")
+    slow = pool.run("sleep 5", timeout=0.3)
+    assert slow["timed_out"] and slow["returncode"] is None
+    assert pool.run("echo ok")["stdout"] == "ok\n"
+
+
+def test_resource_limits_apply_per_command(pool):
+    original = pool.run("ulimit -S -t")["stdout"]
+    limited = pool.run(
+        "python3 -c 'while True: pass'",
+        limits=shell_session.ResourceLimits(cpu_seconds=1),
+        timeout=10,
+    )
+    assert limited["returncode"] != 0 and not limited["timed_out"]
+    # The soft limit is restored for the next command
+    assert pool.run("ulimit -S -t")["stdout"] == original
+
+
+def test_pool_evicts_least_recently_used_session(pool):
+    pool.run("echo a", session_id="a")
+    pool.run("echo b", session_id="b")
+    pool.run("echo c", session_id="c")
+    assert list(pool._sessions) == ["b", "c"]
+
+
+def test_pool_eviction_skips_busy_sessions_and_read_slots(pool):
+    main = pool.get("main")
+    pool.get("other")
+
+    # A busy session survives eviction even when it is the least recently used
+    with main._lock:
+        pool.get("third")
+    assert "main" in pool._sessions and "other" not in pool._sessions
+
+    # The read slot of a session never evicts its main session, even the least recently used one
+    pool.get("main")
+    pool.get("third:read0")
+    assert {"third", "third:read0"} <= set(pool._sessions)
+    assert "main" not in pool._sessions
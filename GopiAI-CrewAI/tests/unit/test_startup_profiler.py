@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the startup import profiler.
+
+Tests flag parsing, import tree construction and the JSON report.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Import the modules we're testing
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import startup_profiler
+
+
+@pytest.fixture
+def fake_package(tmp_path, monkeypatch):
+    """Create a throwaway package whose import nests another module."""
+    package = tmp_path / "profiled_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import child\n")
+    (package / "child.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "profiled_pkg"
+    for name in ("profiled_pkg", "profiled_pkg.child"):
+        sys.modules.pop(name, None)
+
+
+class TestStartupProfiler:
+    """Test suite for the import profiler."""
+
+    def test_flag_is_removed_from_argv(self):
+        argv = ["server.py", "--profile-startup=out.json", "--port", "5051"]
+        profiler = startup_profiler.enable_from_argv(argv)
+        try:
+            assert profiler is not None
+            assert argv == ["server.py", "--port", "5051"]
+        finally:
+            profiler.stop()
+            startup_profiler._active_profiler = None
+            startup_profiler._active_output = None
+
+    def test_no_flag_means_no_profiler(self):
+        argv = ["server.py"]
+        assert startup_profiler.enable_from_argv(argv) is None
+        assert argv == ["server.py"]
+
+    def test_builds_nested_import_tree(self, fake_package):
+        profiler = startup_profiler.ImportProfiler().install()
+        try:
+            module = __import__(fake_package)
+        finally:
+            profiler.stop()
+
+        assert module.child.VALUE == 42
+        # The original loader is restored on the module
+        assert not isinstance(module.__loader__, startup_profiler._TimingLoader)
+
+        parent = next(n for n in profiler.root.children if n.name == fake_package)
+        assert [c.name for c in parent.children] == [f"{fake_package}.child"]
+        assert parent.cumulative >= parent.children[0].cumulative
+
+    def test_report_is_written_as_json(self, fake_package, tmp_path):
+        profiler = startup_profiler.ImportProfiler().install()
+        try:
+            __import__(fake_package)
+        finally:
+            profiler.stop()
+
+        path = profiler.save(str(tmp_path / "profile.json"))
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+
+        assert report["module_count"] == 2
+        assert report["tree"]["children"][0]["module"] == fake_package
+        assert {item["module"] for item in report["top_cumulative"]} == {
+            fake_package, f"{fake_package}.child"
+        }
+
+    def test_budget_can_be_configured(self, monkeypatch):
+        monkeypatch.setenv(startup_profiler.STARTUP_BUDGET_ENV, "3.5")
+        assert startup_profiler.get_startup_budget() == 3.5
+        monkeypatch.setenv(startup_profiler.STARTUP_BUDGET_ENV, "oops")
+        assert startup_profiler.get_startup_budget() == startup_profiler.DEFAULT_STARTUP_BUDGET_SECONDS
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent tool command scheduler.
+
+Tests dependency detection, parallel execution of independent commands,
+per-tool concurrency limits, timeouts and result ordering.
+"""
+
+import importlib.util
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+BATCH_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'tool_batch.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("tool_batch", BATCH_PATH)
+tool_batch = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tool_batch)
+
+
+def _fs(action, path, **params):
+    return {"tool": "filesystem_tools", "params": {"action": action, "path": path, **params}}
+
+
+def test_dependencies_serialize_writes_and_parallelize_reads(tmp_path):
+    a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+    commands = [
+        _fs("read", a),
+        _fs("read", b),
+        _fs("write", a, content="x"),
+        _fs("read", a),
+        {"tool": "web_search", "params": {"query": "python"}},
+        {"tool": "terminal", "params": {"command": f"mkdir {tmp_path / 'new'}"}},
+        {"tool": "terminal", "params": {"command": f"ls {tmp_path}"}},
+        {"tool": "unknown_tool", "params": {}},
+    ]
+    deps = tool_batch.build_dependencies(commands)
+
+    assert deps[0] == set() and deps[1] == set()
+    assert deps[2] == {0}          # write after read of the same path
+    assert deps[3] == {2}          # read after write
+    assert deps[4] == set()        # read-only tool, no shared paths
+    assert deps[6] == {2, 5}       # listing a directory after writes inside it
+    assert deps[7] == set(range(7))  # unknown tools with side effects run exclusively
+
+
+def test_run_batch_runs_independent_commands_concurrently():
+    def execute(command):
+        time.sleep(0.2)
+        return {"success": True, "output": command["params"]["url"]}
+
+    commands = [{"tool": "web_scraper", "params": {"url": f"https://example.com/{i}"}} for i in range(4)]
+    started = time.monotonic()
+    results = tool_batch.run_batch(commands, execute, max_workers=4)
+    elapsed = time.monotonic() - started
+
+    assert [r["output"] for r in results] == [c["params"]["url"] for c in commands]
+    assert elapsed < 0.6
+
+
+def test_run_batch_respects_order_and_tool_limits(tmp_path):
+    path = str(tmp_path / "log.txt")
+    order, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def execute(command):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+            order.append(command["params"].get("content"))
+        return {"success": True}
+
+    writes = [_fs("append", path, content=str(i)) for i in range(3)]
+    tool_batch.run_batch(writes, execute, max_workers=4)
+    assert order == ["0", "1", "2"]
+
+    peak[0] = 0
+    reads = [{"tool": "web_search", "params": {"query": str(i)}} for i in range(6)]
+    tool_batch.run_batch(reads, execute, max_workers=6, tool_limits={"web_search": 2})
+    assert peak[0] == 2
+
+
+def test_run_batch_times_out_and_skips_dependents(tmp_path):
+    path = str(tmp_path / "slow.txt")
+
+    def execute(command):
+        if command["params"]["action"] == "write":
+            time.sleep(0.5)
+        return {"success": True}
+
+    commands = [_fs("write", path, content="x"), _fs("read", path), _fs("read", str(tmp_path / "other"))]
+    results = tool_batch.run_batch(commands, execute, timeouts={"filesystem_tools": 0.1})
+
+    assert not results[0]["success"] and "время" in results[0]["error"]
+    assert not results[1]["success"]
+    assert results[2]["success"]
+
+
+def test_run_batch_reports_exceptions_in_place():
+    def execute(command):
+        if command["params"]["query"] == "bad":
+            raise RuntimeError("boom")
+        return {"success": True}
+
+    results = tool_batch.run_batch(
+        [{"tool": "web_search", "params": {"query": q}} for q in ("ok", "bad", "ok")], execute
+    )
+    assert [r["success"] for r in results] == [True, False, True]
+    assert results[1]["error"] == "boom"
+
+
+def test_command_executor_runs_terminal_reads_in_separate_sessions(tmp_path):
+    pytest.importorskip("crewai")
+    if os.name == "nt" or shutil.which("bash") is None:
+        pytest.skip("persistent sessions require bash")
+    from unittest import mock
+
+    from tools.gopiai_integration import command_executor
+    from tools.gopiai_integration.shell_session import ShellSessionPool
+
+    pool = ShellSessionPool()
+    barrier = threading.Barrier(2, timeout=5)
+    sessions = []
+
+    class _Pool:
+        get = staticmethod(pool.get)
+
+        @staticmethod
+        def run(command, session_id="default", **kwargs):
+            sessions.append(session_id)
+            if command.startswith(("ls", "pwd")):
+                barrier.wait()  # both reads must be running at the same time
+            return pool.run(command, session_id=session_id, **kwargs)
+
+    executor = command_executor.CommandExecutor(session_id="test_batch")
+    commands = [
+        {"tool": "terminal", "params": {"command": f"cd {tmp_path}"}},
+        {"tool": "terminal", "params": {"command": "ls"}},
+        {"tool": "terminal", "params": {"command": "pwd"}},
+    ]
+    try:
+        with mock.patch.object(command_executor, "get_shell_pool", return_value=_Pool()):
+            results = executor.execute_commands(commands)
+    finally:
+        pool.close()
+
+    assert all(r["success"] for r in results)
+    assert results[2]["output"].strip() == str(tmp_path)  # reads see the cwd set by cd
+    assert sessions[0] == "test_batch"
+    assert set(sessions[1:]) == {"test_batch:read0", "test_batch:read1"}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the static CrewAI toolkit manifest.
+
+Tests that the manifest is built from source without importing tool modules
+and that the cached copy is refreshed when toolkit files change.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+MANIFEST_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'tool_manifest.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("tool_manifest", MANIFEST_PATH)
+tool_manifest = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tool_manifest)
+
+
+@pytest.fixture
+def toolkit(tmp_path):
+    """Create a miniature toolkit tree that would fail if imported."""
+    root = tmp_path / "tools"
+    package = root / "brave_search_tool"
+    package.mkdir(parents=True)
+    (root / "__init__.py").write_text("raise RuntimeError('imported')\n")
+    (package / "__init__.py").write_text("raise RuntimeError('imported')\n")
+    (package / "brave_search_tool.py").write_text(
+        "raise RuntimeError('imported')\n"
+        "class BraveSearchTool(BaseTool):\n"
+        "    name: str = 'Brave Web Search'\n"
+        "    description: str = 'Search the web'\n"
+        "class _Helper(BaseTool):\n"
+        "    pass\n"
+        "class BraveSearchToolSchema(BaseModel):\n"
+        "    query: str\n"
+    )
+    return root
+
+
+def test_build_manifest_reads_source_without_importing(toolkit):
+    modules_before = set(sys.modules)
+    manifest = tool_manifest.build_manifest(toolkit, package="pkg.tools")
+
+    assert set(manifest["tools"]) == {"BraveSearchTool"}
+    entry = manifest["tools"]["BraveSearchTool"]
+    assert entry["module"] == "pkg.tools.brave_search_tool.brave_search_tool"
+    assert entry["name"] == "Brave Web Search"
+    assert entry["description"] == "Search the web"
+    assert entry["category"] == "web_search"
+    assert not any(name.startswith("pkg.") for name in set(sys.modules) - modules_before)
+
+
+def test_load_manifest_uses_cache_until_sources_change(toolkit, tmp_path):
+    cache_file = tmp_path / "cache" / "manifest.json"
+
+    first = tool_manifest.load_manifest(toolkit, cache_file, package="pkg.tools")
+    assert cache_file.exists()
+
+    # An unchanged tree is served from the cache file
+    cached = json.loads(cache_file.read_text())
+    cached["tools"]["BraveSearchTool"]["description"] = "from cache"
+    cache_file.write_text(json.dumps(cached))
+    assert tool_manifest.load_manifest(toolkit, cache_file, package="pkg.tools")["tools"][
+        "BraveSearchTool"]["description"] == "from cache"
+
+    # Adding a tool changes the signature and triggers a rebuild
+    (toolkit / "file_read_tool.py").write_text("class FileReadTool(BaseTool):\n    pass\n")
+    rebuilt = tool_manifest.load_manifest(toolkit, cache_file, package="pkg.tools")
+    assert rebuilt["signature"] != first["signature"]
+    assert rebuilt["tools"]["FileReadTool"]["category"] == "file_operations"
+    assert rebuilt["tools"]["BraveSearchTool"]["description"] == "Search the web"
+
+
+def test_real_toolkit_manifest_covers_curated_tools():
+    manifest = tool_manifest.build_manifest()
+
+    assert len(manifest["tools"]) > 40
+    modules = {entry["module"] for entry in manifest["tools"].values()}
+    assert "tools.crewai_toolkit.tools.file_read_tool.file_read_tool" in modules
+    assert "tools.crewai_toolkit.tools.code_interpreter_tool.code_interpreter_tool" in modules
+
+
+def test_integrator_reuses_configured_tool_instance(monkeypatch):
+    pytest.importorskip("crewai")
+    import types
+
+    from tools.gopiai_integration import crewai_tools_integrator
+
+    created = []
+
+    class TokenTool:
+        def __init__(self, token):
+            created.append(token)
+            self.token = token
+
+        def run(self, **params):
+            return f"{self.token}:{params['query']}"
+
+    module = types.ModuleType("fake_toolkit.token_tool")
+    module.TokenTool = TokenTool
+    monkeypatch.setitem(sys.modules, "fake_toolkit.token_tool", module)
+    monkeypatch.setattr(crewai_tools_integrator, "load_manifest", lambda: {"tools": {"TokenTool": {
+        "class": "TokenTool", "module": "fake_toolkit.token_tool", "name": "token_tool",
+        "category": "other", "description": "",
+    }}})
+
+    integrator = crewai_tools_integrator.CrewAIToolsIntegrator()
+    integrator.configure_tool("token_tool", token="secret")
+
+    assert integrator.execute_tool("token_tool", {"query": "a"}) == "secret:a"
+    assert integrator.execute_tool("token_tool", {"query": "b"}) == "secret:b"
+    assert created == ["secret"]
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streamed web fetcher shared by web_scraper and url_analyzer.
+
+Runs against a local HTTP server: byte cap, content-type checks, ETag
+revalidation and tag-restricted parsing.
+"""
+
+import importlib.util
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+FETCH_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'web_fetch.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("web_fetch", FETCH_PATH)
+web_fetch = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_fetch)
+
+PAGE = (
+    b"<html><head><title>Test page</title><meta name='description' content='demo'></head>"
+    b"<body><p class='item'>first</p><p class='item'>second</p>"
+    b"<a href='/next'>next</a><img src='a.png'></body></html>"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/page":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._send(200, "text/html; charset=utf-8", PAGE, {"ETag": '"v1"'})
+        elif self.path == "/big":
+            self._send(200, "text/plain", b"x" * 300_000)
+        elif self.path == "/binary":
+            self._send(200, "application/octet-stream", b"\0" * 100)
+        else:
+            self._send(404, "text/plain", b"missing")
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_fetch_caps_body_size(server):
+    fetcher = web_fetch.WebFetcher(max_bytes=100_000)
+    result = fetcher.fetch(server + "/big")
+    assert len(result.content) == 100_000
+    assert result.truncated
+    # Truncated responses are not cached
+    assert fetcher.cache.get(server + "/big") is None
+
+
+def test_fetch_rejects_unexpected_content_type(server):
+    fetcher = web_fetch.WebFetcher()
+    with pytest.raises(web_fetch.ContentTypeError):
+        fetcher.fetch(server + "/binary")
+    assert fetcher.fetch(server + "/binary", allowed_types=None).content == b"\0" * 100
+
+
+def test_fetch_cache_and_etag_revalidation(server):
+    _Handler.requests_seen.clear()
+    fetcher = web_fetch.WebFetcher(fresh_seconds=60)
+
+    first = fetcher.fetch(server + "/page")
+    assert not first.from_cache and first.etag == '"v1"'
+    assert fetcher.fetch(server + "/page").from_cache
+    assert len(_Handler.requests_seen) == 1
+
+    # A stale entry is revalidated with If-None-Match and reused on 304
+    fetcher.fresh_seconds = 0
+    again = fetcher.fetch(server + "/page")
+    assert again.from_cache and again.content == PAGE
+    assert _Handler.requests_seen[-1] == ("/page", '"v1"')
+    assert (fetcher.cache.hits, fetcher.cache.revalidated, fetcher.cache.misses) == (1, 1, 1)
+
+
+def test_parse_html_only_requested_tags(server):
+    page = web_fetch.WebFetcher().fetch(server + "/page")
+
+    links = web_fetch.parse_html(page, web_fetch.ACTION_TAGS["get_links"])
+    assert [a["href"] for a in links.find_all("a")] == ["/next"]
+    assert links.find("p") is None
+
+    full = web_fetch.parse_html(page)
+    assert [p.get_text() for p in full.select("p.item", limit=1)] == ["first"]
+    assert web_fetch.parse_html(page, web_fetch.ACTION_TAGS["get_metadata"]).title.string == "Test page"
+
+
+def test_fetch_cache_evicts_by_size():
+    cache = web_fetch.FetchCache(max_entries=10, max_bytes=10)
+    for name in "abc":
+        cache.put(name, web_fetch.FetchResult(name, name, 200, {}, b"12345", None, False, 0.0))
+    assert cache.get("a") is None and cache.get("b") and cache.get("c")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the web search result cache, engine statistics and result merging.
+"""
+
+import importlib.util
+import os
+
+SUPPORT_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'tools', 'gopiai_integration', 'web_search_support.py'
+)
+
+# Load the module by path: the gopiai_integration package imports crewai on init
+_spec = importlib.util.spec_from_file_location("web_search_support", SUPPORT_PATH)
+web_search_support = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(web_search_support)
+
+
+def _result(link, title="t", snippet=""):
+    return {"title": title, "link": link, "snippet": snippet}
+
+
+def test_cache_normalizes_query_and_respects_ttl(monkeypatch):
+    cache = web_search_support.SearchResultCache(ttl=60)
+    results = [_result(f"https://example.com/{i}") for i in range(5)]
+    cache.put("Python  Asyncio", "duckduckgo", "ru", 5, results)
+
+    assert cache.get("python asyncio", "duckduckgo", "RU", 3) == results[:3]
+    assert cache.get("python asyncio", "serper", "ru", 3) is None
+    # More results than were fetched requires a new request
+    assert cache.get("python asyncio", "duckduckgo", "ru", 10) is None
+
+    now = web_search_support.time.monotonic()
+    monkeypatch.setattr(web_search_support.time, "monotonic", lambda: now + 61)
+    assert cache.get("python asyncio", "duckduckgo", "ru", 3) is None
+    assert cache.hits == 1 and cache.misses == 3
+
+
+def test_cache_serves_short_result_lists():
+    cache = web_search_support.SearchResultCache()
+    cache.put("rare query", "serper", "en", 10, [_result("https://a.org")])
+    assert cache.get("rare query", "serper", "en", 20) == [_result("https://a.org")]
+
+
+def test_cache_skips_empty_results():
+    cache = web_search_support.SearchResultCache()
+    cache.put("blocked query", "google_scrape", "en", 5, [])
+    assert cache.get("blocked query", "google_scrape", "en", 10) is None
+    assert cache.get("blocked query", "google_scrape", "en", 1) is None
+
+
+def test_engine_stats_prefer_fast_reliable_engine():
+    stats = web_search_support.EngineStats()
+    prior = {"serper": 0.8, "duckduckgo": 1.5}
+    assert stats.choose(["serper", "duckduckgo"], prior) == "serper"
+
+    for _ in range(3):
+        stats.record("serper", 5.0, success=False)
+    assert stats.is_cooling_down("serper")
+    assert stats.choose(["serper", "duckduckgo"], prior) == "duckduckgo"
+
+    stats.record("serper", 0.2, success=True)
+    assert not stats.is_cooling_down("serper")
+    snapshot = stats.snapshot()["serper"]
+    assert snapshot["calls"] == 4 and snapshot["errors"] == 3
+
+
+def test_merge_results_deduplicates_by_url():
+    ddg = [
+        _result("//duckduckgo.com/l/?uddg=https%3A%2F%2Fwww.python.org%2F&rut=abc", "Python"),
+        _result("https://docs.python.org/3/?utm_source=x", "Docs"),
+    ]
+    serper = [
+        _result("https://docs.python.org/3", "Docs", "Official docs"),
+        _result("https://python.org", "Python"),
+        _result("https://pypi.org", "PyPI"),
+    ]
+    merged = web_search_support.merge_results([("duckduckgo", ddg), ("serper", serper)], limit=10)
+
+    assert [r["title"] for r in merged] == ["Python", "Docs", "PyPI"]
+    assert merged[0]["engines"] == ["duckduckgo", "serper"]
+    assert merged[1]["engines"] == ["serper", "duckduckgo"] and merged[1]["snippet"] == "Official docs"
+    assert len(web_search_support.merge_results([("serper", serper)], limit=2)) == 2
@@ -1,74 +1,97 @@
-from .adapters.enterprise_adapter import EnterpriseActionTool
-from .adapters.mcp_adapter import MCPServerAdapter
-from .aws import (
-    BedrockInvokeAgentTool,
-    BedrockKBRetrieverTool,
-    S3ReaderTool,
-    S3WriterTool,
-)
-from .tools import (
-    AIMindTool,
-    ApifyActorsTool,
-    BraveSearchTool,
-    BrowserbaseLoadTool,
-    CodeDocsSearchTool,
-    CodeInterpreterTool,
-    ComposioTool,
-    CrewaiEnterpriseTools,
-    CSVSearchTool,
-    DallETool,
-    DatabricksQueryTool,
-    DirectoryReadTool,
-    DirectorySearchTool,
-    DOCXSearchTool,
-    EXASearchTool,
-    FileReadTool,
-    FileWriterTool,
-    FileCompressorTool,
-    FirecrawlCrawlWebsiteTool,
-    FirecrawlScrapeWebsiteTool,
-    FirecrawlSearchTool,
-    GithubSearchTool,
-    HyperbrowserLoadTool,
-    JSONSearchTool,
-    LinkupSearchTool,
-    LlamaIndexTool,
-    MDXSearchTool,
-    MultiOnTool,
-    MySQLSearchTool,
-    NL2SQLTool,
-    PatronusEvalTool,
-    PatronusLocalEvaluatorTool,
-    PatronusPredefinedCriteriaEvalTool,
-    PDFSearchTool,
-    PGSearchTool,
-    QdrantVectorSearchTool,
-    RagTool,
-    ScrapeElementFromWebsiteTool,
-    ScrapegraphScrapeTool,
-    ScrapegraphScrapeToolSchema,
-    ScrapeWebsiteTool,
-    ScrapflyScrapeWebsiteTool,
-    SeleniumScrapingTool,
-    SerpApiGoogleSearchTool,
-    SerpApiGoogleShoppingTool,
-    SerperDevTool,
-    SerplyJobSearchTool,
-    SerplyNewsSearchTool,
-    SerplyScholarSearchTool,
-    SerplyWebpageToMarkdownTool,
-    SerplyWebSearchTool,
-    SnowflakeConfig,
-    SnowflakeSearchTool,
-    SpiderTool,
-    StagehandTool,
-    TXTSearchTool,
-    VisionTool,
-    WeaviateVectorSearchTool,
-    WebsiteSearchTool,
-    XMLSearchTool,
-    YoutubeChannelSearchTool,
-    YoutubeVideoSearchTool,
-    ZapierActionTools,
-)
-from .adapters.zapier_adapter import ZapierActionTool
+"""
+CrewAI toolkit.
+
+Tool classes are imported lazily on first attribute access (PEP 562), so
+importing a single tool module does not pull in every tool and its
+third-party dependencies.
+"""
+
+import importlib
+
+_LAZY_IMPORTS = {
+    "EnterpriseActionTool": ".adapters.enterprise_adapter",
+    "MCPServerAdapter": ".adapters.mcp_adapter",
+    "BedrockInvokeAgentTool": ".aws",
+    "BedrockKBRetrieverTool": ".aws",
+    "S3ReaderTool": ".aws",
+    "S3WriterTool": ".aws",
+    "AIMindTool": ".tools",
+    "ApifyActorsTool": ".tools",
+    "BraveSearchTool": ".tools",
+    "BrowserbaseLoadTool": ".tools",
+    "CodeDocsSearchTool": ".tools",
+    "CodeInterpreterTool": ".tools",
+    "ComposioTool": ".tools",
+    "CrewaiEnterpriseTools": ".tools",
+    "CSVSearchTool": ".tools",
+    "DallETool": ".tools",
+    "DatabricksQueryTool": ".tools",
+    "DirectoryReadTool": ".tools",
+    "DirectorySearchTool": ".tools",
+    "DOCXSearchTool": ".tools",
+    "EXASearchTool": ".tools",
+    "FileReadTool": ".tools",
+    "FileWriterTool": ".tools",
+    "FileCompressorTool": ".tools",
+    "FirecrawlCrawlWebsiteTool": ".tools",
+    "FirecrawlScrapeWebsiteTool": ".tools",
+    "FirecrawlSearchTool": ".tools",
+    "GithubSearchTool": ".tools",
+    "HyperbrowserLoadTool": ".tools",
+    "JSONSearchTool": ".tools",
+    "LinkupSearchTool": ".tools",
+    "LlamaIndexTool": ".tools",
+    "MDXSearchTool": ".tools",
+    "MultiOnTool": ".tools",
+    "MySQLSearchTool": ".tools",
+    "NL2SQLTool": ".tools",
+    "PatronusEvalTool": ".tools",
+    "PatronusLocalEvaluatorTool": ".tools",
+    "PatronusPredefinedCriteriaEvalTool": ".tools",
+    "PDFSearchTool": ".tools",
+    "PGSearchTool": ".tools",
+    "QdrantVectorSearchTool": ".tools",
+    "RagTool": ".tools",
+    "ScrapeElementFromWebsiteTool": ".tools",
+    "ScrapegraphScrapeTool": ".tools",
+    "ScrapegraphScrapeToolSchema": ".tools",
+    "ScrapeWebsiteTool": ".tools",
+    "ScrapflyScrapeWebsiteTool": ".tools",
+    "SeleniumScrapingTool": ".tools",
+    "SerpApiGoogleSearchTool": ".tools",
+    "SerpApiGoogleShoppingTool": ".tools",
+    "SerperDevTool": ".tools",
+    "SerplyJobSearchTool": ".tools",
+    "SerplyNewsSearchTool": ".tools",
+    "SerplyScholarSearchTool": ".tools",
+    "SerplyWebpageToMarkdownTool": ".tools",
+    "SerplyWebSearchTool": ".tools",
+    "SnowflakeConfig": ".tools",
+    "SnowflakeSearchTool": ".tools",
+    "SpiderTool": ".tools",
+    "StagehandTool": ".tools",
+    "TXTSearchTool": ".tools",
+    "VisionTool": ".tools",
+    "WeaviateVectorSearchTool": ".tools",
+    "WebsiteSearchTool": ".tools",
+    "XMLSearchTool": ".tools",
+    "YoutubeChannelSearchTool": ".tools",
+    "YoutubeVideoSearchTool": ".tools",
+    "ZapierActionTools": ".tools",
+    "ZapierActionTool": ".adapters.zapier_adapter",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
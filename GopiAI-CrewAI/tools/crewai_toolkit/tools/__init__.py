@@ -1,80 +1,91 @@
-from .ai_mind_tool.ai_mind_tool import AIMindTool
-from .apify_actors_tool.apify_actors_tool import ApifyActorsTool
-from .brave_search_tool.brave_search_tool import BraveSearchTool
-from .browserbase_load_tool.browserbase_load_tool import BrowserbaseLoadTool
-from .code_docs_search_tool.code_docs_search_tool import CodeDocsSearchTool
-from .code_interpreter_tool.code_interpreter_tool import CodeInterpreterTool
-from .composio_tool.composio_tool import ComposioTool
-from .crewai_enterprise_tools.crewai_enterprise_tools import CrewaiEnterpriseTools
-from .csv_search_tool.csv_search_tool import CSVSearchTool
-from .dalle_tool.dalle_tool import DallETool
-from .databricks_query_tool.databricks_query_tool import DatabricksQueryTool
-from .directory_read_tool.directory_read_tool import DirectoryReadTool
-from .directory_search_tool.directory_search_tool import DirectorySearchTool
-from .docx_search_tool.docx_search_tool import DOCXSearchTool
-from .exa_tools.exa_search_tool import EXASearchTool
-from .file_read_tool.file_read_tool import FileReadTool
-from .file_writer_tool.file_writer_tool import FileWriterTool
-from .firecrawl_crawl_website_tool.firecrawl_crawl_website_tool import (
-    FirecrawlCrawlWebsiteTool,
-)
-from .files_compressor_tool.files_compressor_tool import FileCompressorTool
-from .firecrawl_scrape_website_tool.firecrawl_scrape_website_tool import (
-    FirecrawlScrapeWebsiteTool,
-)
-from .firecrawl_search_tool.firecrawl_search_tool import FirecrawlSearchTool
-from .github_search_tool.github_search_tool import GithubSearchTool
-from .hyperbrowser_load_tool.hyperbrowser_load_tool import HyperbrowserLoadTool
-from .json_search_tool.json_search_tool import JSONSearchTool
-from .linkup.linkup_search_tool import LinkupSearchTool
-from .llamaindex_tool.llamaindex_tool import LlamaIndexTool
-from .mdx_search_tool.mdx_search_tool import MDXSearchTool
-from .multion_tool.multion_tool import MultiOnTool
-from .mysql_search_tool.mysql_search_tool import MySQLSearchTool
-from .nl2sql.nl2sql_tool import NL2SQLTool
-from .patronus_eval_tool import (
-    PatronusEvalTool,
-    PatronusLocalEvaluatorTool,
-    PatronusPredefinedCriteriaEvalTool,
-)
-from .pdf_search_tool.pdf_search_tool import PDFSearchTool
-from .pg_search_tool.pg_search_tool import PGSearchTool
-from .qdrant_vector_search_tool.qdrant_search_tool import QdrantVectorSearchTool
-from .rag.rag_tool import RagTool
-from .scrape_element_from_website.scrape_element_from_website import (
-    ScrapeElementFromWebsiteTool,
-)
-from .scrape_website_tool.scrape_website_tool import ScrapeWebsiteTool
-from .scrapegraph_scrape_tool.scrapegraph_scrape_tool import (
-    ScrapegraphScrapeTool,
-    ScrapegraphScrapeToolSchema,
-)
-from .scrapfly_scrape_website_tool.scrapfly_scrape_website_tool import (
-    ScrapflyScrapeWebsiteTool,
-)
-from .selenium_scraping_tool.selenium_scraping_tool import SeleniumScrapingTool
-from .serpapi_tool.serpapi_google_search_tool import SerpApiGoogleSearchTool
-from .serpapi_tool.serpapi_google_shopping_tool import SerpApiGoogleShoppingTool
-from .serper_dev_tool.serper_dev_tool import SerperDevTool
-from .serply_api_tool.serply_job_search_tool import SerplyJobSearchTool
-from .serply_api_tool.serply_news_search_tool import SerplyNewsSearchTool
-from .serply_api_tool.serply_scholar_search_tool import SerplyScholarSearchTool
-from .serply_api_tool.serply_web_search_tool import SerplyWebSearchTool
-from .serply_api_tool.serply_webpage_to_markdown_tool import SerplyWebpageToMarkdownTool
-from .snowflake_search_tool import (
-    SnowflakeConfig,
-    SnowflakeSearchTool,
-    SnowflakeSearchToolInput,
-)
-from .spider_tool.spider_tool import SpiderTool
-from .stagehand_tool.stagehand_tool import StagehandTool
-from .txt_search_tool.txt_search_tool import TXTSearchTool
-from .vision_tool.vision_tool import VisionTool
-from .weaviate_tool.vector_search import WeaviateVectorSearchTool
-from .website_search.website_search_tool import WebsiteSearchTool
-from .xml_search_tool.xml_search_tool import XMLSearchTool
-from .youtube_channel_search_tool.youtube_channel_search_tool import (
-    YoutubeChannelSearchTool,
-)
-from .youtube_video_search_tool.youtube_video_search_tool import YoutubeVideoSearchTool
-from .zapier_action_tool.zapier_action_tool import ZapierActionTools
+"""
+CrewAI toolkit tools.
+
+Tool classes are imported lazily on first attribute access (PEP 562), so
+importing a single tool module does not pull in every tool and its
+third-party dependencies.
+"""
+
+import importlib
+
+_LAZY_IMPORTS = {
+    "AIMindTool": ".ai_mind_tool.ai_mind_tool",
+    "ApifyActorsTool": ".apify_actors_tool.apify_actors_tool",
+    "BraveSearchTool": ".brave_search_tool.brave_search_tool",
+    "BrowserbaseLoadTool": ".browserbase_load_tool.browserbase_load_tool",
+    "CodeDocsSearchTool": ".code_docs_search_tool.code_docs_search_tool",
+    "CodeInterpreterTool": ".code_interpreter_tool.code_interpreter_tool",
+    "ComposioTool": ".composio_tool.composio_tool",
+    "CrewaiEnterpriseTools": ".crewai_enterprise_tools.crewai_enterprise_tools",
+    "CSVSearchTool": ".csv_search_tool.csv_search_tool",
+    "DallETool": ".dalle_tool.dalle_tool",
+    "DatabricksQueryTool": ".databricks_query_tool.databricks_query_tool",
+    "DirectoryReadTool": ".directory_read_tool.directory_read_tool",
+    "DirectorySearchTool": ".directory_search_tool.directory_search_tool",
+    "DOCXSearchTool": ".docx_search_tool.docx_search_tool",
+    "EXASearchTool": ".exa_tools.exa_search_tool",
+    "FileReadTool": ".file_read_tool.file_read_tool",
+    "FileWriterTool": ".file_writer_tool.file_writer_tool",
+    "FirecrawlCrawlWebsiteTool": ".firecrawl_crawl_website_tool.firecrawl_crawl_website_tool",
+    "FileCompressorTool": ".files_compressor_tool.files_compressor_tool",
+    "FirecrawlScrapeWebsiteTool": ".firecrawl_scrape_website_tool.firecrawl_scrape_website_tool",
+    "FirecrawlSearchTool": ".firecrawl_search_tool.firecrawl_search_tool",
+    "GithubSearchTool": ".github_search_tool.github_search_tool",
+    "HyperbrowserLoadTool": ".hyperbrowser_load_tool.hyperbrowser_load_tool",
+    "JSONSearchTool": ".json_search_tool.json_search_tool",
+    "LinkupSearchTool": ".linkup.linkup_search_tool",
+    "LlamaIndexTool": ".llamaindex_tool.llamaindex_tool",
+    "MDXSearchTool": ".mdx_search_tool.mdx_search_tool",
+    "MultiOnTool": ".multion_tool.multion_tool",
+    "MySQLSearchTool": ".mysql_search_tool.mysql_search_tool",
+    "NL2SQLTool": ".nl2sql.nl2sql_tool",
+    "PatronusEvalTool": ".patronus_eval_tool",
+    "PatronusLocalEvaluatorTool": ".patronus_eval_tool",
+    "PatronusPredefinedCriteriaEvalTool": ".patronus_eval_tool",
+    "PDFSearchTool": ".pdf_search_tool.pdf_search_tool",
+    "PGSearchTool": ".pg_search_tool.pg_search_tool",
+    "QdrantVectorSearchTool": ".qdrant_vector_search_tool.qdrant_search_tool",
+    "RagTool": ".rag.rag_tool",
+    "ScrapeElementFromWebsiteTool": ".scrape_element_from_website.scrape_element_from_website",
+    "ScrapeWebsiteTool": ".scrape_website_tool.scrape_website_tool",
+    "ScrapegraphScrapeTool": ".scrapegraph_scrape_tool.scrapegraph_scrape_tool",
+    "ScrapegraphScrapeToolSchema": ".scrapegraph_scrape_tool.scrapegraph_scrape_tool",
+    "ScrapflyScrapeWebsiteTool": ".scrapfly_scrape_website_tool.scrapfly_scrape_website_tool",
+    "SeleniumScrapingTool": ".selenium_scraping_tool.selenium_scraping_tool",
+    "SerpApiGoogleSearchTool": ".serpapi_tool.serpapi_google_search_tool",
+    "SerpApiGoogleShoppingTool": ".serpapi_tool.serpapi_google_shopping_tool",
+    "SerperDevTool": ".serper_dev_tool.serper_dev_tool",
+    "SerplyJobSearchTool": ".serply_api_tool.serply_job_search_tool",
+    "SerplyNewsSearchTool": ".serply_api_tool.serply_news_search_tool",
+    "SerplyScholarSearchTool": ".serply_api_tool.serply_scholar_search_tool",
+    "SerplyWebSearchTool": ".serply_api_tool.serply_web_search_tool",
+    "SerplyWebpageToMarkdownTool": ".serply_api_tool.serply_webpage_to_markdown_tool",
+    "SnowflakeConfig": ".snowflake_search_tool",
+    "SnowflakeSearchTool": ".snowflake_search_tool",
+    "SnowflakeSearchToolInput": ".snowflake_search_tool",
+    "SpiderTool": ".spider_tool.spider_tool",
+    "StagehandTool": ".stagehand_tool.stagehand_tool",
+    "TXTSearchTool": ".txt_search_tool.txt_search_tool",
+    "VisionTool": ".vision_tool.vision_tool",
+    "WeaviateVectorSearchTool": ".weaviate_tool.vector_search",
+    "WebsiteSearchTool": ".website_search.website_search_tool",
+    "XMLSearchTool": ".xml_search_tool.xml_search_tool",
+    "YoutubeChannelSearchTool": ".youtube_channel_search_tool.youtube_channel_search_tool",
+    "YoutubeVideoSearchTool": ".youtube_video_search_tool.youtube_video_search_tool",
+    "ZapierActionTools": ".zapier_action_tool.zapier_action_tool",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,19 +4,48 @@
 """
 
 import json
-import subprocess
 import os
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+import shlex
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .shell_session import DEFAULT_COMMAND_TIMEOUT, get_shell_pool
+from .tool_batch import DEFAULT_MAX_WORKERS, command_resources, run_batch
 
 logger = logging.getLogger(__name__)
 
 class CommandExecutor:
     """Класс для безопасного выполнения команд из ответов Gemini"""
     
-    def __init__(self):
+    def __init__(self, tool_handler: Optional[Callable[[str, Dict], Any]] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 tool_limits: Optional[Dict[str, int]] = None,
+                 tool_timeouts: Optional[Dict[str, float]] = None,
+                 session_id: str = "command_executor",
+                 command_timeout: float = DEFAULT_COMMAND_TIMEOUT):
+        """
+        Args:
+            tool_handler: Обработчик для инструментов, отличных от terminal (tool, params) -> результат
+            max_workers: Размер пула для параллельного выполнения команд
+            tool_limits: Максимум одновременных вызовов по инструментам
+            tool_timeouts: Время ожидания результата по инструментам, секунд
+            session_id: Сессия оболочки, в которой выполняются команды терминала;
+                читающие команды пакета идут в отдельные сессии "<session_id>:read<N>"
+                (по одной на параллельный слот) с тем же cwd
+            command_timeout: Лимит времени одной команды терминала, секунд
+        """
         self.logger = logger
+        self.tool_handler = tool_handler
+        self.max_workers = max_workers
+        self.tool_limits = tool_limits
+        self.tool_timeouts = tool_timeouts
+        self.session_id = session_id
+        self.command_timeout = command_timeout
+        self._read_slots: List[int] = []
+        self._read_slots_count = 0
+        self._read_slots_lock = threading.Lock()
         
         # Разрешенные команды для безопасности
         self.allowed_commands = {
@@ -139,7 +168,18 @@ class CommandExecutor:
             params = command_data.get('params', {})
             
             if tool == 'terminal':
-                return self._execute_terminal_command(params.get('command', ''))
+                read_only = not command_resources(command_data)[0]
+                return self._execute_terminal_command(params.get('command', ''), read_only)
+            elif self.tool_handler is not None:
+                result = self.tool_handler(tool, params)
+                if isinstance(result, dict) and 'success' in result:
+                    return result
+                failed = isinstance(result, dict) and bool(result.get('error'))
+                return {
+                    'success': not failed,
+                    'error': str(result.get('message', result.get('error'))) if failed else '',
+                    'output': result
+                }
             else:
                 return {
                     'success': False,
@@ -155,8 +195,36 @@ class CommandExecutor:
                 'output': ''
             }
     
-    def _execute_terminal_command(self, command: str) -> Dict:
-        """Выполняет команду терминала"""
+    def _acquire_read_session(self) -> Tuple[int, str]:
+        """
+        Берет свободный слот для читающей команды и готовит его сессию
+
+        Каждая сессия держит блокировку на всю команду, поэтому параллельные
+        чтения из одной сессии выполнялись бы по очереди. Слот занят одной
+        командой, его сессия переводится в текущий cwd основной сессии.
+        """
+        with self._read_slots_lock:
+            if self._read_slots:
+                slot = self._read_slots.pop()
+            else:
+                slot = self._read_slots_count
+                self._read_slots_count += 1
+        session_id = f"{self.session_id}:read{slot}"
+        pool = get_shell_pool()
+        cwd = pool.get(self.session_id).cwd
+        session = pool.get(session_id, cwd=cwd)
+        if session.cwd != cwd:
+            if session.persistent and session.alive:
+                session.run(f"cd -- {shlex.quote(cwd)}", timeout=self.command_timeout)
+            session.cwd = cwd
+        return slot, session_id
+
+    def _release_read_session(self, slot: int):
+        with self._read_slots_lock:
+            self._read_slots.append(slot)
+
+    def _execute_terminal_command(self, command: str, read_only: bool = False) -> Dict:
+        """Выполняет команду терминала (read_only — в отдельной сессии слота, см. _acquire_read_session)"""
         if not command or not command.strip():
             return {
                 'success': False,
@@ -192,46 +260,44 @@ class CommandExecutor:
             self.logger.warning(f"[EXECUTOR] Выполняется потенциально опасная команда: {command}")
         
         try:
-            # Выполняем команду
-            if os.name == 'nt':  # Windows
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    cwd=os.getcwd()
-                )
-            else:  # Unix/Linux
-                result = subprocess.run(
-                    command.split(),
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    cwd=os.getcwd()
+            # Выполняем команду в постоянной сессии оболочки: cwd (cd) сохраняется между командами.
+            # В Unix аргументы экранируются, чтобы оболочка не интерпретировала ;, |, > и т.п.
+            shell_command = command if os.name == 'nt' else ' '.join(shlex.quote(part) for part in cmd_parts)
+            slot, session_id = self._acquire_read_session() if read_only else (None, self.session_id)
+            try:
+                result = get_shell_pool().run(
+                    shell_command,
+                    session_id=session_id,
+                    timeout=self.command_timeout,
                 )
+            finally:
+                if slot is not None:
+                    self._release_read_session(slot)
             
-            success = result.returncode == 0
-            output = result.stdout if success else result.stderr
+            if result['timed_out']:
+                error_msg = f"Команда '{command}' превысила лимит времени выполнения ({self.command_timeout:g} сек)"
+                self.logger.error(f"[EXECUTOR] {error_msg}")
+                return {
+                    'success': False,
+                    'error': error_msg,
+                    'output': result['stdout']
+                }
+            
+            success = result['returncode'] == 0
+            output = result['stdout'] if success else result['stderr']
             
-            self.logger.info(f"[EXECUTOR] Команда выполнена. Код возврата: {result.returncode}")
+            self.logger.info(f"[EXECUTOR] Команда выполнена. Код возврата: {result['returncode']}")
             self.logger.info(f"[EXECUTOR] Вывод: {output[:200]}...")
             
             return {
                 'success': success,
-                'error': result.stderr if not success else '',
+                'error': result['stderr'] if not success else '',
                 'output': output,
-                'return_code': result.returncode
+                'return_code': result['returncode'],
+                'truncated': result['truncated'],
+                'cwd': result['cwd']
             }
             
-        except subprocess.TimeoutExpired:
-            error_msg = f"Команда '{command}' превысила лимит времени выполнения (30 сек)"
-            self.logger.error(f"[EXECUTOR] {error_msg}")
-            return {
-                'success': False,
-                'error': error_msg,
-                'output': ''
-            }
         except Exception as e:
             error_msg = f"Ошибка выполнения команды '{command}': {str(e)}"
             self.logger.error(f"[EXECUTOR] {error_msg}")
@@ -241,23 +307,30 @@ class CommandExecutor:
                 'output': ''
             }
     
-    def execute_commands(self, commands: List[Dict]) -> List[Dict]:
+    def execute_commands(self, commands: List[Dict], parallel: bool = True) -> List[Dict]:
         """
         Выполняет список команд
         
+        Независимые команды (чтения, записи в разные пути) выполняются
+        параллельно, зависимые — в исходном порядке; см. tool_batch.run_batch.
+        
         Args:
             commands: Список команд для выполнения
+            parallel: False — строго последовательное выполнение
             
         Returns:
-            Список результатов выполнения
+            Список результатов выполнения (в порядке команд)
         """
-        results = []
-        
-        for i, command in enumerate(commands):
-            self.logger.info(f"[EXECUTOR] Выполняем команду {i+1}/{len(commands)}")
-            result = self.execute_command(command)
-            results.append(result)
-            
+        self.logger.info(f"[EXECUTOR] Выполняем команд: {len(commands)} (parallel={parallel})")
+        results = run_batch(
+            commands,
+            self.execute_command,
+            max_workers=self.max_workers if parallel else 1,
+            tool_limits=self.tool_limits,
+            timeouts=self.tool_timeouts,
+        )
+        
+        for i, result in enumerate(results):
             # Если команда не выполнилась, логируем это
             if not result.get('success', False):
                 self.logger.warning(f"[EXECUTOR] Команда {i+1} не выполнилась: {result.get('error', 'Неизвестная ошибка')}")
@@ -301,7 +374,8 @@ class CommandExecutor:
         results_section = "\n\n🔧 **Результаты выполнения команд:**\n"
         
         for i, (command, result) in enumerate(zip(commands, results)):
-            cmd_str = command.get('params', {}).get('command', 'неизвестная команда')
+            params = command.get('params', {})
+            cmd_str = params.get('command') or f"{command.get('tool', 'неизвестная команда')} {json.dumps(params, ensure_ascii=False)}"
             
             if result.get('success', False):
                 results_section += f"✅ `{cmd_str}` - выполнено успешно\n"
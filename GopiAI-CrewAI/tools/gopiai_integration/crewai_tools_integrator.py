@@ -1,15 +1,22 @@
 """
 🛠️ CrewAI Tools Integrator
 Интегратор для подключения и управления инструментами из CrewAI Toolkit
+
+При старте инструменты не импортируются: список строится по статическому
+манифесту (tool_manifest), а класс инструмента импортируется в get_tool
+при первом обращении и кешируется.
 """
 
 import logging
 import importlib
+import threading
 from typing import Dict, List, Optional, Any, Type
 from pathlib import Path
 import sys
 import os
 
+from .tool_manifest import load_manifest
+
 logger = logging.getLogger(__name__)
 
 class CrewAIToolsIntegrator:
@@ -28,15 +35,36 @@ class CrewAIToolsIntegrator:
         self.available_tools = {}
         self.loaded_tools = {}
         self.tool_categories = {}
+        self.manifest_tools = {}
+        self._manifest_index = {}
+        # Аргументы конструкторов и созданные экземпляры инструментов
+        self.tool_init_args: Dict[str, Dict[str, Any]] = {}
+        self.tool_instances: Dict[str, Any] = {}
+        self._instances_lock = threading.Lock()
         
         # Добавляем путь к crewai_toolkit
         toolkit_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "crewai_toolkit")
         if toolkit_path not in sys.path:
             sys.path.insert(0, toolkit_path)
         
+        self._load_manifest()
         self._discover_tools()
         self.logger.info(f"✅ CrewAI Tools Integrator инициализирован. Найдено {len(self.available_tools)} инструментов")
     
+    def _load_manifest(self):
+        """Загружает статический манифест инструментов (без импорта модулей)"""
+        try:
+            manifest = load_manifest()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Не удалось загрузить манифест инструментов: {e}")
+            return
+
+        self.manifest_tools = manifest.get("tools", {})
+        # Индекс для поиска по имени класса и имени инструмента без учета регистра
+        for class_name, entry in self.manifest_tools.items():
+            self._manifest_index.setdefault(class_name.lower(), entry)
+            self._manifest_index.setdefault(entry["name"].lower(), entry)
+
     def _discover_tools(self):
         """Обнаруживает доступные CrewAI инструменты"""
         
@@ -122,7 +150,8 @@ class CrewAIToolsIntegrator:
                 'class': 'FirecrawlSearchTool',
                 'category': 'web_search',
                 'description': 'Поиск в интернете с использованием API Firecrawl',
-                'enabled': has_firecrawl
+                'enabled': has_firecrawl,
+                'init_args': {'api_key': os.environ.get("FIRECRAWL_API_KEY")}
             },
 
             # GitHub интеграция
@@ -184,19 +213,32 @@ class CrewAIToolsIntegrator:
             }
         }
 
+        # Модули, реально присутствующие в тулките (по манифесту)
+        known_modules = {entry['module'] for entry in self.manifest_tools.values()}
+
         # Добавляем инструменты в список доступных
         for tool_name, tool_info in priority_tools.items():
-            if tool_info.get('enabled', True):
-                self.available_tools[tool_name] = tool_info
-                self.tool_categories.setdefault(tool_info['category'], []).append(tool_name)
+            if not tool_info.get('enabled', True):
+                continue
+            if known_modules and tool_info['module'] not in known_modules:
+                self.logger.debug(f"Инструмент {tool_name} отсутствует в тулките ({tool_info['module']})")
+                continue
+            self.available_tools[tool_name] = tool_info
+            self.tool_categories.setdefault(tool_info['category'], []).append(tool_name)
+
+    def _resolve_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Находит описание инструмента: сначала в курируемом списке, затем в манифесте"""
+        if tool_name in self.available_tools:
+            return self.available_tools[tool_name]
+        return self._manifest_index.get(tool_name.lower())
 
     def get_tool(self, tool_name: str) -> Optional[Type[Any]]:
         """Получает инструмент по имени"""
         if tool_name in self.loaded_tools:
             return self.loaded_tools[tool_name]
 
-        if tool_name in self.available_tools:
-            tool_info = self.available_tools[tool_name]
+        tool_info = self._resolve_tool_info(tool_name)
+        if tool_info is not None:
             module_path = tool_info['module']
             class_name = tool_info['class']
 
@@ -220,3 +262,71 @@ class CrewAIToolsIntegrator:
     def get_all_tools(self) -> Dict[str, Dict[str, Any]]:
         """Получает все доступные инструменты"""
         return self.available_tools
+
+    def get_available_tools(self) -> List[str]:
+        """Возвращает имена доступных инструментов (без их импорта)"""
+        return list(self.available_tools)
+
+    def get_manifest_tools(self) -> Dict[str, Dict[str, Any]]:
+        """Возвращает все инструменты тулкита из манифеста"""
+        return self.manifest_tools
+
+    def get_tools_summary(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Сводка инструментов по категориям"""
+        summary: Dict[str, List[Dict[str, Any]]] = {}
+        for category, tool_names in self.tool_categories.items():
+            summary[category] = [
+                {
+                    'name': tool_name,
+                    'description': self.available_tools[tool_name]['description'],
+                    'available': True,
+                    'loaded': tool_name in self.loaded_tools,
+                }
+                for tool_name in tool_names
+            ]
+        return summary
+
+    def configure_tool(self, tool_name: str, **init_args: Any):
+        """Задает аргументы конструктора инструмента (например, gh_token), экземпляр будет пересоздан"""
+        with self._instances_lock:
+            self.tool_init_args[tool_name] = init_args
+            self.tool_instances.pop(tool_name, None)
+
+    def get_tool_instance(self, tool_name: str) -> Any:
+        """
+        Возвращает настроенный экземпляр инструмента
+
+        Экземпляр создается при первом обращении с аргументами из описания
+        инструмента ('init_args') и configure_tool, затем переиспользуется.
+        """
+        with self._instances_lock:
+            if tool_name in self.tool_instances:
+                return self.tool_instances[tool_name]
+
+            tool_class = self.get_tool(tool_name)
+            if tool_class is None:
+                raise ValueError(f"Инструмент {tool_name} недоступен")
+
+            tool_info = self._resolve_tool_info(tool_name) or {}
+            init_args = {**tool_info.get('init_args', {}), **self.tool_init_args.get(tool_name, {})}
+            instance = tool_class(**init_args)
+            self.tool_instances[tool_name] = instance
+            return instance
+
+    def execute_tool(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        """Выполняет инструмент (импортируя и создавая его при первом обращении)"""
+        return self.get_tool_instance(tool_name).run(**params)
+
+
+_integrator_instance: Optional[CrewAIToolsIntegrator] = None
+_integrator_lock = threading.Lock()
+
+
+def get_crewai_tools_integrator() -> CrewAIToolsIntegrator:
+    """Возвращает глобальный экземпляр интегратора инструментов"""
+    global _integrator_instance
+    if _integrator_instance is None:
+        with _integrator_lock:
+            if _integrator_instance is None:
+                _integrator_instance = CrewAIToolsIntegrator()
+    return _integrator_instance
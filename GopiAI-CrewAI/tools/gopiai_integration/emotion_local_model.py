@@ -0,0 +1,225 @@
+"""
+🙂 Локальная модель эмоций для EmotionalClassifier
+
+Дешевый первый уровень классификации без обращения к LLM:
+- LexiconEmotionModel: словарь основ слов с весами, учетом отрицаний
+  («не рад») и признаков интенсивности (восклицания, КАПС, усилители);
+  работает без зависимостей
+- TxtaiEmotionModel: zero-shot классификация txtai Labels, если установлен
+  txtai и задан путь к модели (GOPIAI_EMOTION_MODEL)
+
+predict() возвращает словарь в формате ответа LLM-анализа:
+{"primary_emotion", "confidence", "emotional_intensity", "scores"}.
+"""
+
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Модель txtai для zero-shot классификации (путь или имя на HuggingFace Hub)
+EMOTION_MODEL_ENV = "GOPIAI_EMOTION_MODEL"
+
+NEUTRAL = "neutral"
+
+# Основы слов → вес для каждой эмоции (совпадение по началу слова).
+# Короткие основы, которые являются началом нейтральных слов («радиус», «уравнение»),
+# задаются словоформами: ключ с «$» на конце — регулярное выражение для всего слова
+EMOTION_LEXICON: Dict[str, Dict[str, float]] = {
+    "positive": {
+        "рад[аоы]?$": 1.0, "радост": 1.0, "радуе": 0.9, "радую": 0.9, "счастлив": 1.0, "отличн": 0.9, "замечательн": 0.9, "прекрасн": 0.9,
+        "восхитительн": 1.0, "благодар": 1.0, "спасиб": 0.8, "супер$": 0.7, "классн": 0.6,
+        "доволен": 0.9, "довольн": 0.9, "нравится": 0.7, "ура$": 0.8, "здорово": 0.8,
+        "thank": 0.8, "great$": 0.8, "awesome": 0.9, "happy": 1.0, "glad": 0.9,
+    },
+    "excited": {
+        "восторг": 1.0, "вау$": 0.8, "невероятн": 0.7, "потрясающ": 0.9, "обожаю": 0.9,
+        "не терпится": 1.0, "жду не дождусь": 1.0, "amazing": 0.8, "excited": 1.0,
+    },
+    "negative": {
+        "грустн": 1.0, "плох": 0.6, "ужасн": 0.8, "расстро": 1.0, "печальн": 0.9,
+        "тяжел": 0.6, "жаль": 0.5, "разочаров": 0.9, "обидн": 0.8, "sad$": 1.0, "upset": 0.9,
+    },
+    "frustrated": {
+        "раздража": 1.0, "бесит": 1.0, "достал": 0.9, "надоел": 0.9, "фрустр": 1.0,
+        "сколько можно": 1.0, "не работает": 0.7,
+        "не получается": 0.7, "annoying": 1.0, "frustrat": 1.0,
+    },
+    "angry": {
+        "злит": 0.9, "злюсь": 1.0, "ярост": 1.0, "ненавиж": 1.0, "взбеш": 1.0,
+        "хватит": 0.7, "бесишь": 1.0, "angry": 1.0, "furious": 1.0, "hate": 0.9,
+    },
+    "anxious": {
+        "беспоко": 1.0, "тревож": 1.0, "волну": 0.9, "страшн": 0.9, "нервнича": 1.0,
+        "боюсь": 1.0, "опасаюсь": 0.9, "не успею": 0.8, "паник": 0.8,
+        "worried": 1.0, "anxious": 1.0, "afraid": 0.9, "scared": 0.9,
+    },
+    "confused": {
+        "не понимаю": 1.0, "не понял": 1.0, "запутал": 1.0, "непонятн": 1.0,
+        "что это значит": 1.0, "confus": 1.0,
+    },
+    "depressed": {
+        "отчаян": 1.0, "безнадежн": 1.0, "бессмысл": 0.9, "пустот": 0.7, "депресс": 1.0,
+        "ничего не хочу": 1.0, "нет сил": 0.9, "hopeless": 1.0, "depress": 1.0,
+    },
+    "supportive_needed": {
+        "поддерж": 0.9, "одиноко": 1.0, "одинок": 0.9, "трудно": 0.5,
+        "тяжелый период": 1.0, "не справляюсь": 1.0, "lonely": 1.0,
+    },
+}
+
+# Обычные для запросов к ассистенту слова («объясни», «помоги», «опять»): усиливают эмоцию,
+# только если у нее уже есть совпадение в основном словаре, и сами эмоцию не задают
+CORROBORATING_CUES: Dict[str, Dict[str, float]] = {
+    "frustrated": {"опять": 0.4, "снова": 0.3, "пробовал": 0.4},
+    "confused": {"объясни": 0.7, "разобраться": 0.6},
+    "supportive_needed": {"помоги": 0.5},
+}
+
+# Противоположная эмоция для отрицания («не рад» → negative)
+NEGATED_EMOTION = {"positive": "negative", "excited": "negative"}
+NEGATIONS = {"не", "нет", "ни", "not", "no", "never"}
+INTENSIFIERS = {"очень", "совсем", "крайне", "слишком", "настолько", "абсолютно", "really", "very", "so"}
+
+# Вес «нейтрального» свидетельства: чем меньше совпадений, тем ниже уверенность в эмоции
+NEUTRAL_PRIOR = 0.5
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.casefold().replace("ё", "е"))
+
+
+class LexiconEmotionModel:
+    """Классификатор эмоций по словарю основ слов"""
+
+    name = "lexicon"
+
+    def __init__(self, lexicon: Optional[Dict[str, Dict[str, float]]] = None,
+                 cues: Optional[Dict[str, Dict[str, float]]] = None):
+        self.lexicon = lexicon or EMOTION_LEXICON
+        self._cues = [(emotion, stem, weight)
+                      for emotion, stems in (CORROBORATING_CUES if cues is None else cues).items()
+                      for stem, weight in stems.items()]
+        # Однословные основы проверяются по токенам, фразы — по нормализованному тексту
+        self._stems = [(emotion, stem, weight)
+                       for emotion, stems in self.lexicon.items()
+                       for stem, weight in stems.items() if " " not in stem and not stem.endswith("$")]
+        self._word_forms = [(emotion, re.compile(pattern[:-1]), weight)
+                            for emotion, stems in self.lexicon.items()
+                            for pattern, weight in stems.items() if pattern.endswith("$")]
+        self._phrases = [(emotion, phrase, weight)
+                         for emotion, stems in self.lexicon.items()
+                         for phrase, weight in stems.items() if " " in phrase]
+
+    def predict(self, text: str) -> Dict:
+        tokens = _tokenize(text)
+        normalized = " ".join(tokens)
+        scores: Dict[str, float] = {}
+        hits = 0
+
+        for emotion, phrase, weight in self._phrases:
+            if phrase in normalized:
+                scores[emotion] = scores.get(emotion, 0.0) + weight
+                hits += 1
+
+        for i, token in enumerate(tokens):
+            boost = 1.3 if i > 0 and tokens[i - 1] in INTENSIFIERS else 1.0
+            negated = any(t in NEGATIONS for t in tokens[max(0, i - 2):i])
+            matched = [(emotion, weight) for emotion, stem, weight in self._stems if token.startswith(stem)]
+            matched += [(emotion, weight) for emotion, form, weight in self._word_forms if form.fullmatch(token)]
+            for emotion, weight in matched:
+                if negated:
+                    emotion = NEGATED_EMOTION.get(emotion)
+                    if emotion is None:
+                        continue  # «не тревожно» не добавляет тревоги
+                    weight *= 0.6
+                scores[emotion] = scores.get(emotion, 0.0) + weight * boost
+                hits += 1
+
+        # Подтверждающие слова добавляются только к уже найденным эмоциям
+        for token in tokens:
+            for emotion, stem, weight in self._cues:
+                if emotion in scores and token.startswith(stem):
+                    scores[emotion] += weight
+                    hits += 1
+
+        if not scores:
+            return {"primary_emotion": NEUTRAL, "confidence": 0.75, "emotional_intensity": 0.2,
+                    "scores": {NEUTRAL: 0.75}}
+
+        primary, top = max(scores.items(), key=lambda item: item[1])
+        confidence = top / (sum(scores.values()) + NEUTRAL_PRIOR)
+        return {
+            "primary_emotion": primary,
+            "confidence": round(min(0.95, confidence), 3),
+            "emotional_intensity": round(self._intensity(text, tokens, hits), 3),
+            "scores": {emotion: round(score, 3) for emotion, score in scores.items()},
+        }
+
+    @staticmethod
+    def _intensity(text: str, tokens: List[str], hits: int) -> float:
+        letters = [c for c in text if c.isalpha()]
+        caps_ratio = sum(c.isupper() for c in letters) / len(letters) if len(letters) >= 4 else 0.0
+        intensity = 0.3 + 0.15 * min(hits, 3)
+        intensity += 0.1 * min(text.count("!"), 3)
+        intensity += 0.1 * sum(t in INTENSIFIERS for t in tokens)
+        if caps_ratio > 0.6:
+            intensity += 0.2
+        return min(1.0, intensity)
+
+
+class TxtaiEmotionModel:
+    """Zero-shot классификатор эмоций на txtai Labels"""
+
+    name = "txtai"
+
+    # Описания меток для zero-shot модели
+    LABELS = {
+        "positive": "радость, удовлетворение, благодарность",
+        "excited": "восторг, воодушевление",
+        "negative": "грусть, разочарование, печаль",
+        "frustrated": "раздражение от неудач",
+        "angry": "злость, гнев",
+        "anxious": "тревога, беспокойство, страх",
+        "confused": "непонимание, замешательство",
+        "depressed": "отчаяние, безнадежность",
+        "supportive_needed": "одиночество, просьба о поддержке",
+        NEUTRAL: "нейтральное сообщение",
+    }
+
+    def __init__(self, path: str):
+        from txtai.pipeline import Labels
+
+        self.labels = Labels(path)
+        self.names = list(self.LABELS)
+        self.descriptions = [self.LABELS[name] for name in self.names]
+        self._lexicon = LexiconEmotionModel()
+
+    def predict(self, text: str) -> Dict:
+        ranked = self.labels(text, self.descriptions)
+        index, score = ranked[0]
+        lexical = self._lexicon.predict(text)
+        return {
+            "primary_emotion": self.names[index],
+            "confidence": round(float(score), 3),
+            # Интенсивность zero-shot модель не оценивает — берем из признаков текста
+            "emotional_intensity": lexical["emotional_intensity"],
+            "scores": {self.names[i]: round(float(s), 3) for i, s in ranked},
+        }
+
+
+def create_local_emotion_model():
+    """txtai-модель, если настроена и доступна, иначе словарная"""
+    path = os.getenv(EMOTION_MODEL_ENV)
+    if path:
+        try:
+            model = TxtaiEmotionModel(path)
+            logger.info(f"✅ Локальная модель эмоций txtai: {path}")
+            return model
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось загрузить модель эмоций txtai ({path}): {e}. Используется словарная модель")
+    return LexiconEmotionModel()
@@ -8,6 +8,13 @@ EmotionalClassifier - Анализатор эмоций для GopiAI
 - Адаптация ответов под эмоциональное состояние
 - Детектирование проблемных состояний (стресс, тревога и т.д.)
 
+Режимы анализа (mode):
+- "tiered" (по умолчанию): эвристика + локальная модель; LLM вызывается только
+  при их расхождении, низкой уверенности или кризисных индикаторах
+- "llm": LLM-анализ для каждого сообщения (прежнее поведение)
+- "local": только эвристика и локальная модель, без LLM
+Результаты кешируются по хешу сообщения (для LLM-анализа — вместе с историей диалога).
+
 Поддерживаемые эмоциональные категории:
 1. Позитивные: радость, удовлетворение, воодушевление
 2. Негативные: грусть, фрустрация, злость, тревога
@@ -15,13 +22,29 @@ EmotionalClassifier - Анализатор эмоций для GopiAI
 4. Специальные: стресс, депрессия, суицидальные мысли (требуют особого внимания)
 """
 
+import hashlib
 import logging
 import json
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass
 
+try:
+    from .emotion_local_model import NEUTRAL, create_local_emotion_model
+except ImportError:
+    from emotion_local_model import NEUTRAL, create_local_emotion_model
+
+# Уверенность локальной модели, начиная с которой LLM не нужен
+LOCAL_CONFIDENCE_THRESHOLD = 0.55
+
+# Размер кеша результатов анализа (по хешу сообщения)
+ANALYSIS_CACHE_SIZE = 512
+
+ANALYSIS_MODES = ("tiered", "llm", "local")
+
 
 class EmotionalState(Enum):
     """Основные эмоциональные состояния"""
@@ -57,15 +80,27 @@ class EmotionalClassifier:
     рекомендации для адаптации ответов AI под текущее настроение.
     """
     
-    def __init__(self, ai_router):
+    def __init__(self, ai_router, mode: str = "tiered", local_model: Optional[Any] = None):
         """
         Инициализирует EmotionalClassifier
         
         Args:
             ai_router: AI Router для выполнения анализа
+            mode: Режим анализа: "tiered", "llm" или "local"
+            local_model: Локальная модель с методом predict(text); по умолчанию
+                txtai (если настроена) или словарная
         """
         self.ai_router = ai_router
         self.logger = logging.getLogger(__name__)
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Неизвестный режим анализа эмоций: {mode}")
+        self.mode = mode
+        self.local_model = local_model or create_local_emotion_model()
+        
+        # Кеш результатов по хешу сообщения и счетчики уровней
+        self._cache: "OrderedDict[str, EmotionalAnalysis]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"cache_hits": 0, "local": 0, "llm": 0}
         
         # Проверяем наличие model_config_manager в ai_router
         if hasattr(self.ai_router, 'model_config_manager') and self.ai_router.model_config_manager is not None:
@@ -144,21 +179,55 @@ class EmotionalClassifier:
             EmotionalAnalysis: Результат анализа эмоций
         """
         try:
+            # Локальный результат зависит только от сообщения; результат LLM — еще и от истории диалога
+            cache_key = self._message_hash(current_message)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
             # 1. Быстрая эвристическая оценка
             heuristic_result = self._heuristic_emotion_detection(current_message)
             
-            # 2. Детальный анализ через AI
-            ai_result = self._ai_emotion_analysis(conversation_history, current_message)
-            
-            # 3. Проверка кризисных индикаторов
+            # 2. Проверка кризисных индикаторов
             crisis_indicators = self._detect_crisis_indicators(current_message)
             
+            # 3. Локальная модель; LLM только когда она не справляется
+            local_result = self._local_emotion_analysis(current_message)
+            escalate = self._needs_llm_escalation(heuristic_result, local_result, crisis_indicators)
+            llm_failed = False
+            if escalate:
+                cache_key = self._message_hash(
+                    self._format_conversation_for_analysis(conversation_history, current_message)
+                )
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
+                self.stats["llm"] += 1
+                ai_result = self._ai_emotion_analysis(conversation_history, current_message)
+                llm_failed = bool(ai_result.get("failed"))
+                # При сбое LLM уверенный локальный результат лучше нейтрального, неуверенный — нет
+                if llm_failed and local_result.get("confidence", 0.0) >= LOCAL_CONFIDENCE_THRESHOLD:
+                    ai_result = local_result
+            else:
+                self.stats["local"] += 1
+                ai_result = local_result
+            
             # 4. Объединение результатов
             final_analysis = self._combine_analysis_results(
                 heuristic_result, ai_result, crisis_indicators
             )
             
-            self.logger.info(f"Эмоциональный анализ завершен: {final_analysis.primary_emotion.value} (confidence: {final_analysis.confidence:.2f})")
+            # Запасной результат при сбое LLM не кешируем: следующий вызов повторит запрос
+            if not llm_failed:
+                with self._cache_lock:
+                    self._cache[cache_key] = final_analysis
+                    while len(self._cache) > ANALYSIS_CACHE_SIZE:
+                        self._cache.popitem(last=False)
+            
+            self.logger.info(
+                f"Эмоциональный анализ завершен ({'llm' if escalate else 'local'}): "
+                f"{final_analysis.primary_emotion.value} (confidence: {final_analysis.confidence:.2f})"
+            )
             
             return final_analysis
             
@@ -175,6 +244,52 @@ class EmotionalClassifier:
                 recommendations=["Продолжить диалог в обычном режиме"]
             )
     
+    def _cache_get(self, cache_key: str) -> Optional[EmotionalAnalysis]:
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.stats["cache_hits"] += 1
+            return cached
+    
+    @staticmethod
+    def _message_hash(message: str) -> str:
+        normalized = " ".join(message.casefold().split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    
+    def _local_emotion_analysis(self, message: str) -> Dict[str, Any]:
+        """Анализ локальной моделью (без обращения к LLM)"""
+        try:
+            return self.local_model.predict(message)
+        except Exception as e:
+            self.logger.warning(f"Ошибка локальной модели эмоций: {e}")
+            return {"primary_emotion": NEUTRAL, "confidence": 0.0, "emotional_intensity": 0.5}
+    
+    def _needs_llm_escalation(self, heuristic_result: Dict, local_result: Dict, crisis_indicators: List[str]) -> bool:
+        """
+        Нужен ли LLM-анализ
+        
+        В режиме "tiered" — при кризисных индикаторах, низкой уверенности
+        локальной модели или ее расхождении с эвристикой (нейтральная эвристика,
+        т.е. отсутствие ключевых фраз, расхождением не считается).
+        """
+        if self.mode == "llm":
+            return True
+        if self.mode == "local":
+            return False
+        if crisis_indicators:
+            return True
+        if local_result.get("confidence", 0.0) < LOCAL_CONFIDENCE_THRESHOLD:
+            return True
+        heuristic_emotion = heuristic_result["primary_emotion"].value
+        if heuristic_emotion == EmotionalState.NEUTRAL.value:
+            return False
+        return heuristic_emotion != local_result.get("primary_emotion")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Сколько сообщений обработано из кеша, локально и через LLM"""
+        return dict(self.stats, cache_size=len(self._cache))
+    
     def _heuristic_emotion_detection(self, message: str) -> Dict[str, Any]:
         """
         Быстрое эвристическое определение эмоций по ключевым словам
@@ -234,7 +349,7 @@ class EmotionalClassifier:
             # Проверяем, что ai_router доступен и имеет метод _generate
             if not hasattr(self.ai_router, '_generate'):
                 self.logger.error("❌ ai_router не имеет метода _generate")
-                return {"primary_emotion": "neutral", "confidence": 0.5}
+                return {"primary_emotion": "neutral", "confidence": 0.5, "failed": True}
                 
             # Формируем контекст диалога
             conversation_context = self._format_conversation_for_analysis(conversation_history, current_message)
@@ -282,7 +397,7 @@ class EmotionalClassifier:
                 response_text = result.generations[0][0].text
             except Exception as ai_error:
                 self.logger.error(f"❌ Ошибка при вызове AI: {ai_error}")
-                return {"primary_emotion": "neutral", "confidence": 0.5}
+                return {"primary_emotion": "neutral", "confidence": 0.5, "failed": True}
             
             # Парсим JSON ответ
             try:
@@ -297,11 +412,11 @@ class EmotionalClassifier:
                     
             except (json.JSONDecodeError, ValueError) as parse_error:
                 self.logger.warning(f"Ошибка парсинга AI анализа эмоций: {parse_error}")
-                return {"primary_emotion": "neutral", "confidence": 0.5}
+                return {"primary_emotion": "neutral", "confidence": 0.5, "failed": True}
                 
         except Exception as e:
             self.logger.error(f"Ошибка при AI анализе эмоций: {e}")
-            return {"primary_emotion": "neutral", "confidence": 0.5}
+            return {"primary_emotion": "neutral", "confidence": 0.5, "failed": True}
     
     def _format_conversation_for_analysis(self, conversation_history: List[Dict], current_message: str) -> str:
         """
@@ -361,7 +476,7 @@ class EmotionalClassifier:
         Returns:
             EmotionalAnalysis: Финальный результат анализа
         """
-        # Определяем основную эмоцию (приоритет AI анализу)
+        # Определяем основную эмоцию (приоритет AI/локальной модели)
         ai_emotion_name = ai_result.get("primary_emotion", "neutral")
         
         # Мапим название эмоции на enum
@@ -372,6 +487,9 @@ class EmotionalClassifier:
             "anxious": EmotionalState.ANXIOUS,
             "confused": EmotionalState.CONFUSED,
             "supportive_needed": EmotionalState.SUPPORTIVE_NEEDED,
+            "depressed": EmotionalState.DEPRESSED,
+            "angry": EmotionalState.ANGRY,
+            "excited": EmotionalState.EXCITED,
             "neutral": EmotionalState.NEUTRAL
         }
         
@@ -387,7 +505,7 @@ class EmotionalClassifier:
         
         # Проверяем, нужна ли поддержка
         needs_support = (
-            primary_emotion in [EmotionalState.NEGATIVE, EmotionalState.ANXIOUS, EmotionalState.SUPPORTIVE_NEEDED] or
+            primary_emotion in [EmotionalState.NEGATIVE, EmotionalState.ANXIOUS, EmotionalState.DEPRESSED, EmotionalState.SUPPORTIVE_NEEDED] or
             len(crisis_indicators) > 0 or
             emotional_intensity > 0.8
         )
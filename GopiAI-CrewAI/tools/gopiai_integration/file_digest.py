@@ -0,0 +1,242 @@
+"""
+🔐 Хеши файлов с постоянным кешем
+
+Дайджест файла кешируется по ключу (путь, размер, mtime_ns, inode,
+алгоритм) в SQLite, поэтому повторное хеширование неизмененного файла
+не читает его с диска. Чтение идет крупными блоками в переиспользуемый
+буфер. Поддерживаются алгоритмы hashlib (включая BLAKE2) и, если
+установлен пакет xxhash, xxh64/xxh3_64/xxh128.
+
+Манифест директории — словарь относительный путь → (размер, mtime_ns,
+дайджест); при повторном построении дайджесты неизмененных файлов
+берутся из предыдущего манифеста или кеша.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Размер блока чтения при хешировании
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Файл постоянного кеша дайджестов
+DIGEST_CACHE_FILE = Path.home() / ".gopiai" / "cache" / "file_digests.db"
+
+HASHLIB_ALGORITHMS = ("md5", "sha1", "sha256", "sha512", "blake2b", "blake2s")
+XXHASH_ALGORITHMS = ("xxh64", "xxh3_64", "xxh128")
+
+
+def supported_algorithms() -> tuple:
+    """Алгоритмы, доступные в текущем окружении"""
+    return HASHLIB_ALGORITHMS + (XXHASH_ALGORITHMS if XXHASH_AVAILABLE else ())
+
+
+def _new_hasher(algorithm: str):
+    if algorithm in HASHLIB_ALGORITHMS:
+        return hashlib.new(algorithm)
+    if algorithm in XXHASH_ALGORITHMS and XXHASH_AVAILABLE:
+        return getattr(xxhash, algorithm)()
+    raise ValueError(f"Неподдерживаемый алгоритм: {algorithm}")
+
+
+def compute_digest(path: str, algorithm: str = "md5") -> str:
+    """Хеширует файл целиком (без кеша), читая блоками в переиспользуемый буфер"""
+    hasher = _new_hasher(algorithm)
+    buffer = bytearray(READ_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            hasher.update(view[:read])
+    return hasher.hexdigest()
+
+
+class DigestCache:
+    """Постоянный кеш (path, size, mtime_ns, inode, algorithm) → digest"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or DIGEST_CACHE_FILE)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            " path TEXT NOT NULL, algorithm TEXT NOT NULL,"
+            " size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL,"
+            " digest TEXT NOT NULL, PRIMARY KEY (path, algorithm))")
+        self._conn.commit()
+
+    @staticmethod
+    def _signature(stat: os.stat_result):
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def lookup(self, path: str, stat: os.stat_result, algorithm: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, inode, digest FROM digests WHERE path = ? AND algorithm = ?",
+                (path, algorithm)).fetchone()
+        if row and tuple(row[:3]) == self._signature(stat):
+            return row[3]
+        return None
+
+    def store(self, path: str, stat: os.stat_result, algorithm: str, digest: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO digests (path, algorithm, size, mtime_ns, inode, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (path, algorithm, *self._signature(stat), digest))
+            self._conn.commit()
+
+    def digest(self, path: str, algorithm: str = "md5", stat: Optional[os.stat_result] = None) -> str:
+        """Дайджест файла: из кеша, если файл не менялся, иначе с чтением файла"""
+        path = os.path.abspath(path)
+        stat = stat or os.stat(path)
+        cached = self.lookup(path, stat, algorithm)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        digest = compute_digest(path, algorithm)
+        # Если файл изменился во время чтения, не кешируем результат
+        if self._signature(os.stat(path)) == self._signature(stat):
+            self.store(path, stat, algorithm, digest)
+        return digest
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_digest_cache: Optional[DigestCache] = None
+_digest_cache_lock = threading.Lock()
+
+
+def get_digest_cache() -> DigestCache:
+    """Возвращает глобальный кеш дайджестов"""
+    global _digest_cache
+    if _digest_cache is None:
+        with _digest_cache_lock:
+            if _digest_cache is None:
+                _digest_cache = DigestCache()
+    return _digest_cache
+
+
+def compare_files(path1: str, path2: str, algorithm: str = "md5",
+                  cache: Optional[DigestCache] = None) -> Dict[str, Any]:
+    """
+    Сравнивает два файла; при разных размерах файлы не читаются
+
+    Returns:
+        dict: размеры, дайджесты (None, если не вычислялись) и результат сравнения
+    """
+    stat1, stat2 = os.stat(path1), os.stat(path2)
+    result = {
+        "file1": path1,
+        "file2": path2,
+        "size1": stat1.st_size,
+        "size2": stat2.st_size,
+        "sizes_equal": stat1.st_size == stat2.st_size,
+        "hash1": None,
+        "hash2": None,
+        "content_equal": False,
+    }
+    if not result["sizes_equal"]:
+        return result
+
+    cache = cache or get_digest_cache()
+    result["hash1"] = cache.digest(path1, algorithm, stat1)
+    result["hash2"] = cache.digest(path2, algorithm, stat2)
+    result["content_equal"] = result["hash1"] == result["hash2"]
+    return result
+
+
+def build_manifest(root: str, files: Iterable[str], algorithm: str = "md5",
+                   previous: Optional[Dict[str, Any]] = None,
+                   cache: Optional[DigestCache] = None) -> Dict[str, Any]:
+    """
+    Строит манифест директории инкрементально
+
+    Дайджест файла берется из предыдущего манифеста, если размер и mtime_ns
+    не изменились, иначе — из кеша дайджестов (с чтением файла при промахе).
+    """
+    cache = cache or get_digest_cache()
+    old_files = (previous or {}).get("files", {}) if (previous or {}).get("algorithm") == algorithm else {}
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    reused = 0
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        relative = os.path.relpath(path, root).replace(os.sep, "/")
+        old = old_files.get(relative)
+        if old and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            digest = old["digest"]
+            reused += 1
+        else:
+            digest = cache.digest(path, algorithm, stat)
+        entries[relative] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}
+
+    # Общий дайджест директории по отсортированным (путь, дайджест)
+    combined = hashlib.blake2b(digest_size=16)
+    for relative in sorted(entries):
+        combined.update(f"{relative}\0{entries[relative]['digest']}\n".encode("utf-8"))
+
+    return {
+        "root": os.path.abspath(root),
+        "algorithm": algorithm,
+        "digest": combined.hexdigest(),
+        "files": entries,
+        "reused": reused,
+    }
+
+
+def diff_manifests(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, list]:
+    """Разница между манифестами: добавленные, удаленные и измененные файлы"""
+    old_files = (old or {}).get("files", {})
+    new_files = new.get("files", {})
+    return {
+        "added": sorted(set(new_files) - set(old_files)),
+        "removed": sorted(set(old_files) - set(new_files)),
+        "modified": sorted(
+            path for path in set(old_files) & set(new_files)
+            if old_files[path]["digest"] != new_files[path]["digest"]
+        ),
+    }
+
+
+def load_manifest_file(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest_file(path: str, manifest: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
@@ -5,15 +5,21 @@ import os
 import shutil
 import json
 import csv
-import glob
 import zipfile
 import tarfile
 from pathlib import Path
 from datetime import datetime
-import hashlib
 import mimetypes
 from typing import List, Dict, Any
 
+from .filesystem_walk import (
+    DEFAULT_PAGE_SIZE, build_tree, iter_files, iter_matches, paginate, search_files,
+)
+from .file_digest import (
+    build_manifest, compare_files, diff_manifests, get_digest_cache, load_manifest_file,
+    save_manifest_file, supported_algorithms,
+)
+
 class GopiAIFileSystemTool(BaseTool):
     name: str = Field(default="filesystem_tools", description="Расширенный инструмент файловой системы")
     description: str = Field(default="""Мощный инструмент для работы с файловой системой. 
@@ -111,16 +117,16 @@ class GopiAIFileSystemTool(BaseTool):
                         writer.writerows(csv_data)
                 return f"CSV файл '{path}' успешно записан."
             
-            # Поиск файлов
+            # Поиск файлов (игнорируются .git, venv, node_modules и т.п.).
+            # По умолчанию возвращает список путей; если передан offset или limit -
+            # одну страницу {"items", "offset", "limit", "has_more", "next_offset"}
             elif action == "find":
                 pattern = kwargs.get("pattern", "*")
                 recursive = kwargs.get("recursive", False)
-                if recursive:
-                    pattern = f"**/{pattern}"
-                    results = glob.glob(os.path.join(path, pattern), recursive=True)
-                else:
-                    results = glob.glob(os.path.join(path, pattern))
-                return results
+                matches = iter_matches(path or ".", pattern, recursive, kwargs.get("ignore"))
+                if "offset" in kwargs or "limit" in kwargs:
+                    return paginate(matches, kwargs.get("offset", 0), kwargs.get("limit", DEFAULT_PAGE_SIZE))
+                return list(matches)
             
             # Информация о файле
             elif action == "info":
@@ -145,17 +151,13 @@ class GopiAIFileSystemTool(BaseTool):
                 
                 return info
             
-            # Хеширование файла
+            # Хеширование файла (дайджест кешируется по пути, размеру, mtime и inode)
             elif action == "hash":
                 algorithm = kwargs.get("algorithm", "md5").lower()
-                if algorithm not in ["md5", "sha1", "sha256", "sha512"]:
+                if algorithm not in supported_algorithms():
                     return f"Неподдерживаемый алгоритм: {algorithm}"
                 
-                hash_obj = hashlib.new(algorithm)
-                with open(path, "rb") as f:
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        hash_obj.update(chunk)
-                return hash_obj.hexdigest()
+                return self._get_file_hash(path, algorithm)
             
             # Создание архива
             elif action == "create_zip":
@@ -193,25 +195,31 @@ class GopiAIFileSystemTool(BaseTool):
                 with open(path, "r", encoding="utf-8") as f:
                     return sum(1 for line in f)
             
-            # Поиск текста в файле
+            # Поиск текста в файле или во всех файлах директории
             elif action == "search_text":
                 search_term = kwargs.get("search_term", data)
                 case_sensitive = kwargs.get("case_sensitive", False)
-                results = []
                 
-                with open(path, "r", encoding="utf-8") as f:
-                    for line_num, line in enumerate(f, 1):
-                        line_to_search = line if case_sensitive else line.lower()
-                        term_to_search = search_term if case_sensitive else search_term.lower()
-                        
-                        if term_to_search in line_to_search:
-                            results.append({
-                                "line_number": line_num,
-                                "line_content": line.strip(),
-                                "position": line_to_search.find(term_to_search)
-                            })
+                # Один файл: все совпадения без ограничения, прежний формат ответа
+                if os.path.isfile(path):
+                    results = []
+                    term_to_search = search_term if case_sensitive else search_term.lower()
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line_num, line in enumerate(f, 1):
+                            line_to_search = line if case_sensitive else line.lower()
+                            if term_to_search in line_to_search:
+                                results.append({
+                                    "line_number": line_num,
+                                    "line_content": line.strip(),
+                                    "position": line_to_search.find(term_to_search)
+                                })
+                    return results
                 
-                return results
+                max_results = kwargs.get("max_results", DEFAULT_PAGE_SIZE)
+                files = iter_files(path or ".", kwargs.get("pattern", "*"),
+                                   kwargs.get("recursive", True), kwargs.get("ignore"))
+                return search_files(files, search_term, case_sensitive, max_results,
+                                    kwargs.get("max_workers"))
             
             # Замена текста в файле
             elif action == "replace_text":
@@ -236,6 +244,7 @@ class GopiAIFileSystemTool(BaseTool):
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_path = f"{path}.backup_{timestamp}"
                 shutil.copy2(path, backup_path)
+                self._seed_backup_digest(path, backup_path)
                 return f"Создана резервная копия: '{backup_path}'."
             
             # Сравнение файлов
@@ -247,67 +256,57 @@ class GopiAIFileSystemTool(BaseTool):
                 if not os.path.exists(file2):
                     return f"Второй файл '{file2}' не существует."
                 
-                # Сравнение размеров
-                size1 = os.path.getsize(path)
-                size2 = os.path.getsize(file2)
+                # При разных размерах файлы не читаются (hash1/hash2 = None)
+                return compare_files(path, file2, kwargs.get("algorithm", "md5").lower())
+            
+            # Манифест директории: дайджесты файлов и разница с предыдущим манифестом
+            elif action == "manifest":
+                algorithm = kwargs.get("algorithm", "md5").lower()
+                if algorithm not in supported_algorithms():
+                    return f"Неподдерживаемый алгоритм: {algorithm}"
                 
-                # Сравнение хешей
-                hash1 = self._get_file_hash(path)
-                hash2 = self._get_file_hash(file2)
+                manifest_file = kwargs.get("manifest_file")
+                previous = load_manifest_file(manifest_file) if manifest_file else kwargs.get("previous")
+                files = iter_files(path or ".", kwargs.get("pattern", "*"), True, kwargs.get("ignore"))
+                manifest = build_manifest(path or ".", files, algorithm, previous)
+                if manifest_file:
+                    save_manifest_file(manifest_file, manifest)
                 
-                return {
-                    "file1": path,
-                    "file2": file2,
-                    "size1": size1,
-                    "size2": size2,
-                    "sizes_equal": size1 == size2,
-                    "hash1": hash1,
-                    "hash2": hash2,
-                    "content_equal": hash1 == hash2
+                result = {
+                    "root": manifest["root"],
+                    "algorithm": algorithm,
+                    "digest": manifest["digest"],
+                    "file_count": len(manifest["files"]),
+                    "reused": manifest["reused"],
                 }
+                if previous is not None:
+                    result["changed"] = previous.get("digest") != manifest["digest"]
+                    result["diff"] = diff_manifests(previous, manifest)
+                if not manifest_file:
+                    result["files"] = manifest["files"]
+                return result
             
             # Получение дерева директорий
             elif action == "tree":
                 max_depth = kwargs.get("max_depth", 3)
-                return self._get_directory_tree(path, max_depth)
+                return build_tree(path, max_depth, kwargs.get("ignore"), kwargs.get("max_entries", 2000))
             
             else:
-                return f"Неизвестное действие: {action}. Доступные действия: read, write, append, delete, list, exists, mkdir, remove, copy, move, read_json, write_json, read_csv, write_csv, find, info, hash, create_zip, extract_zip, list_zip, count_lines, search_text, replace_text, backup, compare, tree"
+                return f"Неизвестное действие: {action}. Доступные действия: read, write, append, delete, list, exists, mkdir, remove, copy, move, read_json, write_json, read_csv, write_csv, find, info, hash, create_zip, extract_zip, list_zip, count_lines, search_text, replace_text, backup, compare, manifest, tree"
         
         except Exception as e:
             return f"Ошибка файловой операции: {e}"
     
     def _get_file_hash(self, file_path: str, algorithm: str = "md5") -> str:
-        """Вспомогательный метод для получения хеша файла"""
-        hash_obj = hashlib.new(algorithm)
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
-    
-    def _get_directory_tree(self, root_path: str, max_depth: int, current_depth: int = 0) -> Dict:
-        """Вспомогательный метод для получения дерева директорий"""
-        if current_depth >= max_depth:
-            return {"name": os.path.basename(root_path), "type": "directory", "truncated": True}
-        
-        tree = {
-            "name": os.path.basename(root_path) or root_path,
-            "type": "directory",
-            "children": []
-        }
-        
-        try:
-            for item in sorted(os.listdir(root_path)):
-                item_path = os.path.join(root_path, item)
-                if os.path.isdir(item_path):
-                    tree["children"].append(self._get_directory_tree(item_path, max_depth, current_depth + 1))
-                else:
-                    tree["children"].append({
-                        "name": item,
-                        "type": "file",
-                        "size": os.path.getsize(item_path)
-                    })
-        except PermissionError:
-            tree["error"] = "Permission denied"
-        
-        return tree
+        """Вспомогательный метод для получения хеша файла (через постоянный кеш)"""
+        return get_digest_cache().digest(file_path, algorithm)
+
+    def _seed_backup_digest(self, source_path: str, backup_path: str):
+        """Резервная копия идентична исходнику: переносим известные дайджесты без чтения файла"""
+        cache = get_digest_cache()
+        source_stat = os.stat(source_path)
+        backup_stat = os.stat(backup_path)
+        for algorithm in supported_algorithms():
+            digest = cache.lookup(os.path.abspath(source_path), source_stat, algorithm)
+            if digest is not None:
+                cache.store(os.path.abspath(backup_path), backup_stat, algorithm, digest)
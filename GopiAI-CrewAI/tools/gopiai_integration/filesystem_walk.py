@@ -0,0 +1,310 @@
+"""
+📂 Обход файловой системы для GopiAIFileSystemTool
+
+Обходчики на os.scandir с правилами игнорирования (.git, виртуальные
+окружения, node_modules и т.п.), построение дерева директорий и
+многопоточный поиск текста по файлам через mmap с ранней остановкой.
+Результаты отдаются генераторами и постранично, чтобы большой репозиторий
+не превращался в один гигантский ответ.
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+# Директории, которые не обходятся по умолчанию
+DEFAULT_IGNORE_DIRS: Set[str] = {
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components",
+    "__pycache__", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+    ".venv", "venv", "env", ".env", "site-packages",
+    ".idea", ".vscode",
+}
+
+# Размер страницы результатов по умолчанию
+DEFAULT_PAGE_SIZE = 500
+
+# Сколько байт в начале файла проверять на признак бинарного содержимого
+BINARY_SNIFF_BYTES = 8192
+
+# Файлы больше этого размера не просматриваются при поиске текста
+MAX_SEARCH_FILE_SIZE = 64 * 1024 * 1024
+
+# Максимальная длина строки совпадения в результате
+MAX_LINE_LENGTH = 500
+
+
+def _is_ignored_dir(entry: os.DirEntry, ignore: Set[str]) -> bool:
+    if entry.name in ignore:
+        return True
+    # Виртуальное окружение с нестандартным именем
+    return os.path.exists(os.path.join(entry.path, "pyvenv.cfg"))
+
+
+def iter_entries(root: str, recursive: bool = True, ignore: Optional[Iterable[str]] = None,
+                 follow_symlinks: bool = False) -> Iterator[os.DirEntry]:
+    """
+    Генератор записей директории (файлов и поддиректорий) в порядке обхода в ширину
+
+    Игнорируемые директории не возвращаются и не обходятся.
+    """
+    ignore = DEFAULT_IGNORE_DIRS if ignore is None else set(ignore)
+    pending = deque([root])
+    while pending:
+        directory = pending.popleft()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+            except OSError:
+                continue
+            if is_dir:
+                if _is_ignored_dir(entry, ignore):
+                    continue
+                if recursive:
+                    pending.append(entry.path)
+            yield entry
+
+
+def _matcher(root: str, pattern: str):
+    """Шаблон с разделителем пути сравнивается с относительным путем, иначе — с именем"""
+    if "/" in pattern or os.sep in pattern:
+        pattern = pattern.replace(os.sep, "/")
+        return lambda entry: fnmatch.fnmatch(os.path.relpath(entry.path, root).replace(os.sep, "/"), pattern)
+    return lambda entry: fnmatch.fnmatch(entry.name, pattern)
+
+
+def iter_files(root: str, pattern: str = "*", recursive: bool = True,
+               ignore: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """Генератор путей файлов, имя которых подходит под glob-шаблон"""
+    matches = _matcher(root, pattern)
+    for entry in iter_entries(root, recursive, ignore):
+        try:
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+        if matches(entry):
+            yield entry.path
+
+
+def iter_matches(root: str, pattern: str = "*", recursive: bool = True,
+                 ignore: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """Генератор путей файлов и директорий, подходящих под glob-шаблон (аналог find)"""
+    matches = _matcher(root, pattern)
+    for entry in iter_entries(root, recursive, ignore):
+        if matches(entry):
+            yield entry.path
+
+
+def paginate(items: Iterable[Any], offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Возвращает одну страницу из итератора, не материализуя остальное
+
+    Returns:
+        dict: {"items", "offset", "limit", "has_more", "next_offset"}
+    """
+    offset = max(0, int(offset))
+    limit = max(1, int(limit))
+    page = list(islice(items, offset, offset + limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+    return {
+        "items": page,
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+        "next_offset": offset + len(page) if has_more else None,
+    }
+
+
+def build_tree(root: str, max_depth: int = 3, ignore: Optional[Iterable[str]] = None,
+               max_entries: int = 2000) -> Dict[str, Any]:
+    """
+    Дерево директорий на os.scandir (размеры берутся из кеша DirEntry)
+
+    Общее число узлов ограничено max_entries; обрезанные директории
+    помечаются "truncated": True.
+    """
+    ignore = DEFAULT_IGNORE_DIRS if ignore is None else set(ignore)
+    budget = [max_entries]
+
+    def _node(path: str, name: str, depth: int) -> Dict[str, Any]:
+        if depth >= max_depth:
+            return {"name": name, "type": "directory", "truncated": True}
+
+        node: Dict[str, Any] = {"name": name, "type": "directory", "children": []}
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except PermissionError:
+            node["error"] = "Permission denied"
+            return node
+
+        for entry in entries:
+            if budget[0] <= 0:
+                node["truncated"] = True
+                break
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if _is_ignored_dir(entry, ignore):
+                        continue
+                    budget[0] -= 1
+                    node["children"].append(_node(entry.path, entry.name, depth + 1))
+                else:
+                    budget[0] -= 1
+                    node["children"].append({
+                        "name": entry.name,
+                        "type": "file",
+                        "size": entry.stat(follow_symlinks=False).st_size,
+                    })
+            except OSError:
+                continue
+        return node
+
+    return _node(root, os.path.basename(os.path.normpath(root)) or root, 0)
+
+
+class _SearchState:
+    """Общий счетчик результатов для ранней остановки потоков поиска"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def reserve(self) -> bool:
+        with self.lock:
+            if self.count >= self.limit:
+                self.done.set()
+                return False
+            self.count += 1
+            if self.count >= self.limit:
+                self.done.set()
+            return True
+
+
+def _line_bounds(buffer, start: int, end: int):
+    line_start = buffer.rfind(b"\n", 0, start) + 1
+    line_end = buffer.find(b"\n", end)
+    return line_start, len(buffer) if line_end == -1 else line_end
+
+
+def _search_mmap(path: str, regex: "re.Pattern[bytes]", state: _SearchState) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size > MAX_SEARCH_FILE_SIZE:
+            return results
+        if b"\0" in f.read(BINARY_SNIFF_BYTES):
+            return results
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            line_number, counted_to = 1, 0
+            last_line_start = -1
+            for match in regex.finditer(buffer):
+                if state.done.is_set():
+                    break
+                line_start, line_end = _line_bounds(buffer, match.start(), match.start())
+                if line_start == last_line_start:
+                    continue  # одно совпадение на строку, как в прежней реализации
+                line_number += buffer[counted_to:line_start].count(b"\n")
+                counted_to = line_start
+                last_line_start = line_start
+                if not state.reserve():
+                    break
+                line = buffer[line_start:line_end].decode("utf-8", errors="replace")
+                results.append({
+                    "path": path,
+                    "line_number": line_number,
+                    "line_content": line.strip()[:MAX_LINE_LENGTH],
+                    "position": len(buffer[line_start:match.start()].decode("utf-8", errors="replace")),
+                })
+    return results
+
+
+def _search_text_lines(path: str, term: str, state: _SearchState) -> List[Dict[str, Any]]:
+    """Поиск без учета регистра для не-ASCII запросов (bytes-regex не сворачивает кириллицу)"""
+    results: List[Dict[str, Any]] = []
+    term = term.casefold()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            if state.done.is_set():
+                break
+            position = line.casefold().find(term)
+            if position == -1:
+                continue
+            if not state.reserve():
+                break
+            results.append({
+                "path": path,
+                "line_number": line_number,
+                "line_content": line.strip()[:MAX_LINE_LENGTH],
+                "position": position,
+            })
+    return results
+
+
+def search_files(paths: Iterable[str], term: str, case_sensitive: bool = False,
+                 max_results: int = DEFAULT_PAGE_SIZE, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Ищет подстроку в наборе файлов в пуле потоков
+
+    Файлы читаются через mmap; поиск останавливается, как только набрано
+    max_results совпадений. Бинарные и слишком большие файлы пропускаются.
+
+    Returns:
+        dict: {"items": [...], "files_scanned": int, "truncated": bool}
+    """
+    if not term:
+        return {"items": [], "files_scanned": 0, "truncated": False}
+
+    state = _SearchState(max(1, int(max_results)))
+    use_mmap = case_sensitive or term.isascii()
+    regex = re.compile(re.escape(term.encode("utf-8")), 0 if case_sensitive else re.IGNORECASE)
+
+    def _search(path: str) -> List[Dict[str, Any]]:
+        if state.done.is_set():
+            return []
+        try:
+            if use_mmap:
+                return _search_mmap(path, regex, state)
+            return _search_text_lines(path, term, state)
+        except (OSError, ValueError):
+            return []
+
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    in_flight = workers * 4
+    results: List[Dict[str, Any]] = []
+    files_scanned = 0
+
+    # Файлы отправляются в пул порциями, чтобы не обходить все дерево, если лимит уже набран
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        paths = iter(paths)
+        while True:
+            while len(pending) < in_flight and not state.done.is_set():
+                path = next(paths, None)
+                if path is None:
+                    break
+                pending.append(executor.submit(_search, path))
+            if not pending:
+                break
+            results.extend(pending.popleft().result())
+            files_scanned += 1
+
+    return {
+        "items": results[:state.limit],
+        "files_scanned": files_scanned,
+        "truncated": state.done.is_set() and state.count >= state.limit,
+    }
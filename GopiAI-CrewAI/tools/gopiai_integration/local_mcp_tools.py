@@ -19,8 +19,14 @@ import urllib.parse
 import re
 from urllib.robotparser import RobotFileParser
 
+from .shell_session import DEFAULT_MAX_OUTPUT_BYTES, ResourceLimits, get_shell_pool
+from .web_fetch import ACTION_TAGS, ContentTypeError, get_web_fetcher, parse_html
+
 logger = logging.getLogger(__name__)
 
+# Лимит времени execute_shell по умолчанию, секунд
+EXECUTE_SHELL_TIMEOUT = 120
+
 class LocalMCPTools:
     """Класс для локальных MCP инструментов"""
     
@@ -139,6 +145,14 @@ class LocalMCPTools:
                             "type": "string",
                             "description": "CSS селектор для custom_selector"
                         },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Максимум возвращаемых элементов для custom_selector"
+                        },
+                        "max_chars": {
+                            "type": "integer",
+                            "description": "Максимальная длина текста для get_text"
+                        },
                         "headers": {
                             "type": "object",
                             "description": "HTTP заголовки"
@@ -207,7 +221,14 @@ class LocalMCPTools:
                 "description": "Execute shell command and return output",
                 "parameters": {
                     "type": "object",
-                    "properties": {"command": {"type": "string", "description": "Shell command to execute"}},
+                    "properties": {
+                        "command": {"type": "string", "description": "Shell command to execute"},
+                        "session_id": {"type": "string", "description": "Shell session; cwd and env persist between calls in one session", "default": "default"},
+                        "timeout": {"type": "number", "description": "Timeout in seconds", "default": 120},
+                        "max_output_bytes": {"type": "integer", "description": "Output cap per stream in bytes", "default": 1048576},
+                        "cpu_seconds": {"type": "integer", "description": "CPU time limit for the command"},
+                        "memory_mb": {"type": "integer", "description": "Virtual memory limit for the command, MiB"}
+                    },
                     "required": ["command"]
                 }
             },
@@ -476,27 +497,33 @@ class LocalMCPTools:
             url = params.get("url")
             action = params.get("action")
             selector = params.get("selector")
-            headers = params.get("headers", {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            })
+            headers = params.get("headers")
             
             if not url or not action:
                 return {"error": "Не указан URL или действие"}
             
-            # Получаем страницу
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            # Получаем страницу (потоково, с лимитом размера и общим кешем с url_analyzer)
+            page = get_web_fetcher().fetch(url, headers=headers, max_bytes=params.get("max_bytes"))
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Разбираем только теги, нужные действию
+            soup = parse_html(page, ACTION_TAGS.get(action))
             
             if action == "get_text":
                 # Извлекаем весь текст
-                text = soup.get_text(strip=True, separator='\n')
+                if page.content_type.startswith("text/plain"):
+                    text = page.text()
+                else:
+                    for tag in soup(["script", "style", "noscript"]):
+                        tag.decompose()
+                    text = soup.get_text(strip=True, separator='\n')
+                max_chars = params.get("max_chars")
                 return {
                     "success": True,
                     "url": url,
-                    "text": text,
-                    "length": len(text)
+                    "text": text[:max_chars] if max_chars else text,
+                    "length": len(text),
+                    "truncated": page.truncated or bool(max_chars and len(text) > max_chars),
+                    "from_cache": page.from_cache
                 }
             
             elif action == "get_links":
@@ -644,7 +671,13 @@ class LocalMCPTools:
                 if not selector:
                     return {"error": "Не указан CSS селектор"}
                 
-                elements = soup.select(selector)
+                # Разбор прекращается после нужного количества элементов
+                limit = params.get("limit")
+                if limit == 1:
+                    first = soup.select_one(selector)
+                    elements = [first] if first is not None else []
+                else:
+                    elements = soup.select(selector, limit=limit or None)
                 results = []
                 
                 for elem in elements:
@@ -666,6 +699,8 @@ class LocalMCPTools:
             else:
                 return {"error": f"Неизвестное действие: {action}"}
                 
+        except ContentTypeError as e:
+            return {"error": str(e)}
         except requests.RequestException as e:
             return {"error": f"Ошибка HTTP запроса: {str(e)}"}
         except Exception as e:
@@ -819,13 +854,12 @@ class LocalMCPTools:
                 
                 for sitemap_url in sitemap_urls:
                     try:
-                        response = requests.get(sitemap_url, timeout=10)
-                        if response.status_code == 200:
-                            found_sitemaps.append({
-                                "url": sitemap_url,
-                                "size": len(response.content),
-                                "content_type": response.headers.get('content-type', '')
-                            })
+                        sitemap = get_web_fetcher().fetch(sitemap_url, timeout=10, allowed_types=None)
+                        found_sitemaps.append({
+                            "url": sitemap_url,
+                            "size": len(sitemap.content),
+                            "content_type": sitemap.content_type
+                        })
                     except:
                         continue
                 
@@ -839,12 +873,11 @@ class LocalMCPTools:
             
             elif action == "analyze_performance":
                 # Анализ производительности
-                start_time = time.time()
-                response = requests.get(url, timeout=30)
-                total_time = time.time() - start_time
+                # Время загрузки измеряется свежим запросом: кеш и ревалидация по ETag здесь не используются
+                page = get_web_fetcher().fetch(url, timeout=30, use_cache=False)
                 
-                # Парсим HTML для анализа
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # Парсим только теги, которые считаем
+                soup = parse_html(page, ["img", "script", "link", "a"])
                 
                 # Подсчитываем ресурсы
                 images = len(soup.find_all('img'))
@@ -856,11 +889,12 @@ class LocalMCPTools:
                     "success": True,
                     "url": url,
                     "performance": {
-                        "total_time": round(total_time, 3),
-                        "status_code": response.status_code,
-                        "content_size": len(response.content),
-                        "content_type": response.headers.get('content-type', ''),
-                        "encoding": response.encoding,
+                        "total_time": round(page.elapsed, 3),
+                        "status_code": page.status_code,
+                        "content_size": len(page.content),
+                        "content_type": page.content_type,
+                        "encoding": page.encoding,
+                        "truncated": page.truncated,
                         "resources": {
                             "images": images,
                             "scripts": scripts,
@@ -873,27 +907,47 @@ class LocalMCPTools:
             else:
                 return {"error": f"Неизвестное действие: {action}"}
                 
+        except ContentTypeError as e:
+            return {"error": str(e)}
         except requests.RequestException as e:
             return {"error": f"Ошибка HTTP запроса: {str(e)}"}
         except Exception as e:
             return {"error": f"Ошибка анализа URL: {str(e)}"}
 
     def _execute_shell(self, params: Dict) -> Dict:
+        """Выполнение команды в постоянной сессии оболочки (cwd и env сохраняются между вызовами)"""
         command = params.get("command")
         visible = params.get("visible", False)
         if not command:
             return {"error": "Command not provided"}
         try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
-            output = result.stdout.strip() + '\n' + result.stderr.strip()
+            limits = ResourceLimits(
+                cpu_seconds=params.get("cpu_seconds"),
+                memory_bytes=int(params["memory_mb"]) * 1024 * 1024 if params.get("memory_mb") else None,
+            )
+            result = get_shell_pool().run(
+                command,
+                session_id=params.get("session_id", "default"),
+                timeout=float(params.get("timeout", EXECUTE_SHELL_TIMEOUT)),
+                max_output_bytes=int(params.get("max_output_bytes", DEFAULT_MAX_OUTPUT_BYTES)),
+                limits=limits,
+            )
+            stdout, stderr = result["stdout"].strip(), result["stderr"].strip()
+            if result["timed_out"]:
+                stderr = (stderr + "\n" if stderr else "") + f"Command timed out after {result['duration']} s"
+            output = stdout + '\n' + stderr
             ret = {
                 "success": True,
-                "stdout": result.stdout.strip(),
-                "stderr": result.stderr.strip(),
-                "returncode": result.returncode
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": result["returncode"],
+                "timed_out": result["timed_out"],
+                "truncated": result["truncated"],
+                "cwd": result["cwd"],
+                "session_id": result["session_id"]
             }
             if visible:
-                return {'ui_action': 'terminal_execute', 'command': command, 'output': output, 'returncode': result.returncode}
+                return {'ui_action': 'terminal_execute', 'command': command, 'output': output, 'returncode': result["returncode"]}
             return ret
         except Exception as e:
             return {"error": str(e)}
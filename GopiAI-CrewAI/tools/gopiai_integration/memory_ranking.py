@@ -0,0 +1,128 @@
+"""
+🎯 GopiAI Memory Ranking
+Гибридное ранжирование записей памяти
+
+Кандидаты приходят из полнотекстового поиска (FTS5) и из векторного индекса
+txtai. Позиции в обоих списках сливаются через reciprocal rank fusion (RRF),
+к ним добавляются признаки важности и свежести записи. Все оценки считаются
+одним векторизованным проходом по numpy-массивам.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Константа сглаживания RRF (стандартное значение из литературы)
+RRF_K = 60
+
+# Период полураспада свежести записи, дней
+RECENCY_HALF_LIFE_DAYS = 14.0
+
+# Веса признаков итоговой оценки
+DEFAULT_WEIGHTS = {
+    "text": 1.0,
+    "vector": 1.0,
+    "importance": 0.3,
+    "recency": 0.3,
+}
+
+
+def _candidate_keys(item: Dict[str, Any]) -> List[Any]:
+    """Ключи для объединения кандидатов: id записи и нормализованный текст"""
+    keys = []
+    if item.get("id") is not None:
+        keys.append(("id", item["id"]))
+    text = " ".join(str(item.get("data") or item.get("text") or "").split())
+    if text:
+        keys.append(("text", text))
+    return keys
+
+
+def _epoch(timestamp: Optional[str]) -> float:
+    if not timestamp:
+        return np.nan
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def hybrid_rank(text_hits: List[Dict[str, Any]], vector_hits: List[Dict[str, Any]], limit: int = 5,
+                weights: Optional[Dict[str, float]] = None, k: int = RRF_K,
+                half_life_days: float = RECENCY_HALF_LIFE_DAYS,
+                now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Сливает кандидатов полнотекстового и векторного поиска и возвращает top-k
+
+    Args:
+        text_hits: записи в порядке релевантности FTS (лучшие первыми)
+        vector_hits: результаты векторного поиска в порядке релевантности
+        limit: сколько результатов вернуть
+        weights: веса признаков (см. DEFAULT_WEIGHTS)
+
+    Returns:
+        list: копии кандидатов с полями "score" и "scores" (вклад каждого признака)
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+    # Объединяем кандидатов, запоминая позицию в каждом списке
+    candidates: List[Dict[str, Any]] = []
+    positions: Dict[Any, int] = {}
+    ranks = {"text": [], "vector": []}
+
+    for source, hits in (("text", text_hits), ("vector", vector_hits)):
+        for rank, hit in enumerate(hits, 1):
+            keys = _candidate_keys(hit)
+            index = next((positions[key] for key in keys if key in positions), None)
+            if index is None:
+                index = len(candidates)
+                candidates.append(dict(hit))
+                ranks["text"].append(np.inf)
+                ranks["vector"].append(np.inf)
+            else:
+                # Запись памяти из FTS богаче результата векторного поиска — дополняем ее
+                for field, value in hit.items():
+                    candidates[index].setdefault(field, value)
+            for key in keys:
+                positions.setdefault(key, index)
+            ranks[source][index] = min(ranks[source][index], rank)
+
+    if not candidates or limit <= 0:
+        return []
+
+    text_rank = np.asarray(ranks["text"], dtype=np.float64)
+    vector_rank = np.asarray(ranks["vector"], dtype=np.float64)
+    importance = np.asarray([c.get("importance", np.nan) for c in candidates], dtype=np.float64)
+    timestamps = np.asarray([_epoch(c.get("timestamp")) for c in candidates], dtype=np.float64)
+
+    # RRF, нормированный так, что первая позиция дает 1.0, отсутствие в списке — 0
+    text_score = (k + 1) / (k + text_rank)
+    vector_score = (k + 1) / (k + vector_rank)
+
+    importance_score = np.nan_to_num(np.clip(importance, 0, 10) / 10.0, nan=0.0)
+
+    reference = (now or datetime.now()).timestamp()
+    age_days = np.maximum(reference - timestamps, 0.0) / 86400.0
+    recency_score = np.nan_to_num(np.power(0.5, age_days / half_life_days), nan=0.0)
+
+    features = {
+        "text": text_score,
+        "vector": vector_score,
+        "importance": importance_score,
+        "recency": recency_score,
+    }
+    scores = sum(weights[name] * values for name, values in features.items())
+
+    # Частичная сортировка: полностью упорядочиваем только top-k
+    limit = min(limit, len(candidates))
+    top = np.argpartition(-scores, limit - 1)[:limit] if limit < len(candidates) else np.arange(len(candidates))
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    results = []
+    for index in top:
+        item = candidates[index]
+        item["score"] = round(float(scores[index]), 4)
+        item["scores"] = {name: round(float(values[index]), 4) for name, values in features.items()}
+        results.append(item)
+    return results
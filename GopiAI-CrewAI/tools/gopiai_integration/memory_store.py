@@ -0,0 +1,379 @@
+"""
+🗄️ GopiAI Memory Store
+SQLite-хранилище памяти агентов с полнотекстовым индексом FTS5
+
+Заменяет JSON-файл, который перечитывался и перезаписывался целиком на
+каждую операцию. Записи хранятся в таблице с индексами по категории,
+беседе и времени, поиск по тексту идет через FTS5 (с откатом на поиск
+подстроки, если FTS5 недоступен или ничего не нашел). Существующий
+JSON-файл памяти импортируется один раз при первом открытии.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Сколько сообщений беседы хранить на одну беседу
+MAX_CONVERSATION_MESSAGES = 1000
+
+MEMORY_FIELDS = ("key", "data", "category", "importance", "timestamp", "conversation_id")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT 'general',
+    importance INTEGER NOT NULL DEFAULT 5,
+    timestamp TEXT NOT NULL,
+    conversation_id TEXT NOT NULL DEFAULT 'default'
+);
+CREATE INDEX IF NOT EXISTS idx_memories_category ON memories(category);
+CREATE INDEX IF NOT EXISTS idx_memories_conversation ON memories(conversation_id, category, timestamp);
+CREATE INDEX IF NOT EXISTS idx_memories_timestamp ON memories(timestamp);
+CREATE INDEX IF NOT EXISTS idx_memories_key ON memories(key);
+CREATE TABLE IF NOT EXISTS metadata (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    key, data, content='memories', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts(rowid, key, data) VALUES (new.id, new.key, new.data);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, key, data) VALUES ('delete', old.id, old.key, old.data);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, key, data) VALUES ('delete', old.id, old.key, old.data);
+    INSERT INTO memories_fts(rowid, key, data) VALUES (new.id, new.key, new.data);
+END;
+"""
+
+
+def _casefold(value: Optional[str]) -> str:
+    return (value or "").casefold()
+
+
+def build_fts_query(query: str) -> str:
+    """Преобразует пользовательский запрос в выражение FTS5 (все слова, поиск по префиксу)"""
+    tokens = _TOKEN_RE.findall(query or "")
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+class MemoryStore:
+    """
+    SQLite-хранилище записей памяти
+
+    Записи — словари с полями key, data, category, importance, timestamp,
+    conversation_id (как в прежнем JSON-файле) плюс id строки.
+    """
+
+    def __init__(self, db_path: str, max_conversation_messages: int = MAX_CONVERSATION_MESSAGES):
+        self.db_path = db_path
+        self.max_conversation_messages = max_conversation_messages
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # lower() в SQLite понимает только ASCII — для кириллицы регистрируем casefold
+        self._conn.create_function("casefold", 1, _casefold, deterministic=True)
+        self._conn.executescript(_SCHEMA)
+
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"⚠️ FTS5 недоступен, используется поиск подстроки: {e}")
+            self.fts_enabled = False
+
+    # ------------------------------------------------------------------
+    # Транзакции
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            if self._batch_depth:
+                yield self._conn
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    @contextmanager
+    def batch(self):
+        """Объединяет несколько записей в одну транзакцию"""
+        with self._lock:
+            with self._transaction():
+                self._batch_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Запись
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_values(item: Dict[str, Any]) -> Tuple:
+        return (
+            str(item.get("key", "") or ""),
+            item.get("data", "") if isinstance(item.get("data", ""), str) else json.dumps(item.get("data"), ensure_ascii=False),
+            item.get("category") or "general",
+            int(item.get("importance", 5) or 0),
+            item.get("timestamp") or datetime.now().isoformat(),
+            item.get("conversation_id") or "default",
+        )
+
+    def add(self, item: Dict[str, Any]) -> int:
+        """Добавляет запись и возвращает ее id"""
+        return self.add_many([item])[-1]
+
+    def add_many(self, items: Iterable[Dict[str, Any]]) -> List[int]:
+        """Добавляет записи одной транзакцией; обрезает историю затронутых бесед"""
+        rows = [self._row_values(item) for item in items]
+        if not rows:
+            return []
+
+        ids = []
+        with self._transaction() as conn:
+            for row in rows:
+                cursor = conn.execute(
+                    "INSERT INTO memories (key, data, category, importance, timestamp, conversation_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", row)
+                ids.append(cursor.lastrowid)
+            for conversation_id in {row[5] for row in rows if row[2] == "conversation"}:
+                self._trim_conversation(conn, conversation_id)
+        return ids
+
+    def _trim_conversation(self, conn: sqlite3.Connection, conversation_id: str):
+        """Оставляет в беседе только последние max_conversation_messages сообщений"""
+        limit = self.max_conversation_messages
+        count = conn.execute(
+            "SELECT COUNT(*) FROM memories WHERE conversation_id = ? AND category = 'conversation'",
+            (conversation_id,)).fetchone()[0]
+        if count <= limit:
+            return
+        conn.execute(
+            "DELETE FROM memories WHERE id IN ("
+            "  SELECT id FROM memories WHERE conversation_id = ? AND category = 'conversation'"
+            "  ORDER BY timestamp ASC, id ASC LIMIT ?)",
+            (conversation_id, count - limit))
+
+    def delete(self, key: str, conversation_id: Optional[str] = None) -> int:
+        """Удаляет записи по ключу (и беседе); возвращает количество удаленных"""
+        sql, params = "DELETE FROM memories WHERE key = ?", [key]
+        if conversation_id is not None:
+            sql += " AND conversation_id = ?"
+            params.append(conversation_id)
+        with self._transaction() as conn:
+            return conn.execute(sql, params).rowcount
+
+    # ------------------------------------------------------------------
+    # Чтение
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filters(category: Optional[str], conversation_id: Optional[str], alias: str = "m") -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        if category is not None:
+            clauses.append(f"{alias}.category = ?")
+            params.append(category)
+        if conversation_id is not None:
+            clauses.append(f"{alias}.conversation_id = ?")
+            params.append(conversation_id)
+        return clauses, params
+
+    def _query(self, query: str, category: Optional[str], conversation_id: Optional[str],
+               select: str, order: str = "", limit: Optional[int] = None, use_fts: bool = True) -> List[sqlite3.Row]:
+        clauses, params = self._filters(category, conversation_id)
+        source = "memories m"
+
+        match = build_fts_query(query) if use_fts and self.fts_enabled else ""
+        if match:
+            source = "memories_fts JOIN memories m ON m.id = memories_fts.rowid"
+            clauses.insert(0, "memories_fts MATCH ?")
+            params.insert(0, match)
+        elif query:
+            clauses.append("(instr(casefold(m.data), ?) > 0 OR instr(casefold(m.key), ?) > 0)")
+            params.extend([_casefold(query)] * 2)
+
+        sql = f"SELECT {select} FROM {source}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def search(self, query: str = "", category: Optional[str] = None, conversation_id: Optional[str] = None,
+               limit: Optional[int] = None, order: str = "importance") -> List[Dict[str, Any]]:
+        """
+        Ищет записи по тексту с фильтрами по категории и беседе
+
+        Args:
+            order: "importance" — важные и новые первыми, "timestamp" — по времени
+        """
+        order_sql = "m.importance DESC, m.timestamp DESC, m.id DESC" if order == "importance" \
+            else "m.timestamp ASC, m.id ASC"
+        select = "m.id, m.key, m.data, m.category, m.importance, m.timestamp, m.conversation_id"
+
+        rows = self._query(query, category, conversation_id, select, order_sql, limit)
+        if not rows and query and self.fts_enabled:
+            # FTS ищет по словам; для совместимости пробуем поиск подстроки
+            rows = self._query(query, category, conversation_id, select, order_sql, limit, use_fts=False)
+        return [dict(row) for row in rows]
+
+    def search_candidates(self, query: str, category: Optional[str] = None,
+                          conversation_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Кандидаты для гибридного ранжирования в порядке текстовой релевантности
+
+        При доступном FTS5 порядок задает bm25, иначе (и для пустого запроса)
+        используется обычный поиск по важности и времени.
+        """
+        match = build_fts_query(query) if self.fts_enabled else ""
+        if match:
+            rows = self._query(
+                query, category, conversation_id,
+                "m.id, m.key, m.data, m.category, m.importance, m.timestamp, m.conversation_id, "
+                "bm25(memories_fts) AS bm25",
+                "bm25(memories_fts) ASC", limit)
+            if rows:
+                return [dict(row) for row in rows]
+        return self.search(query, category, conversation_id, limit=limit)
+
+    def count(self, query: str = "", category: Optional[str] = None, conversation_id: Optional[str] = None) -> int:
+        """Количество записей, подходящих под запрос"""
+        total = self._query(query, category, conversation_id, "COUNT(*)")[0][0]
+        if not total and query and self.fts_enabled:
+            total = self._query(query, category, conversation_id, "COUNT(*)", use_fts=False)[0][0]
+        return total
+
+    def get(self, key: str, conversation_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Первая запись с указанным ключом"""
+        sql, params = "SELECT * FROM memories WHERE key = ?", [key]
+        if conversation_id is not None:
+            sql += " AND conversation_id = ?"
+            params.append(conversation_id)
+        sql += " ORDER BY id ASC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def find_by_data(self, texts: List[str], category: Optional[str] = None,
+                     conversation_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Записи с точно совпадающим текстом (с фильтрами по категории и беседе), по тексту"""
+        texts = list(dict.fromkeys(t for t in texts if t))
+        if not texts:
+            return {}
+        clauses, params = self._filters(category, conversation_id)
+        clauses.insert(0, f"m.data IN ({', '.join('?' * len(texts))})")
+        params[:0] = texts
+        sql = ("SELECT m.id, m.key, m.data, m.category, m.importance, m.timestamp, m.conversation_id "
+               f"FROM memories m WHERE {' AND '.join(clauses)} ORDER BY m.id ASC")
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for row in self._conn.execute(sql, params).fetchall():
+                found.setdefault(row["data"], dict(row))
+        return found
+
+    def category_counts(self, category: Optional[str] = None,
+                        conversation_id: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """Количество записей по (категория, беседа)"""
+        clauses, params = self._filters(category, conversation_id)
+        sql = "SELECT m.category, m.conversation_id, COUNT(*) FROM memories m"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY m.category, m.conversation_id"
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    # ------------------------------------------------------------------
+    # Импорт из JSON
+    # ------------------------------------------------------------------
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM metadata WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def import_json(self, json_path: str) -> int:
+        """
+        Импортирует записи из прежнего JSON-файла памяти (один раз на файл)
+
+        Returns:
+            int: количество импортированных записей
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        marker = f"imported:{os.path.abspath(json_path)}"
+        if self._get_meta(marker):
+            return 0
+
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                memories = json.load(f).get("memories", [])
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ Не удалось прочитать JSON памяти {json_path}: {e}")
+            return 0
+
+        with self.batch():
+            self.add_many(m for m in memories if isinstance(m, dict))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+                (marker, datetime.now().isoformat()))
+        logger.info(f"📥 Импортировано {len(memories)} записей памяти из {json_path}")
+        return len(memories)
+
+
+_stores: Dict[str, MemoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_memory_store(db_path: str, legacy_json_path: Optional[str] = None) -> MemoryStore:
+    """Возвращает общий экземпляр хранилища для файла БД (импортируя JSON при первом открытии)"""
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = MemoryStore(db_path)
+            if legacy_json_path:
+                store.import_json(legacy_json_path)
+            _stores[key] = store
+    return store
@@ -5,20 +5,27 @@
 
 import os
 import json
-from typing import Type, Any, List, Dict
+from typing import Type, Any, List, Dict, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 # Импортируем BaseTool из crewai
 from crewai.tools.base_tool import BaseTool
 
+from .memory_store import MemoryStore, get_memory_store
+from .memory_ranking import hybrid_rank
+
+# Сколько кандидатов брать из каждого источника для гибридного ранжирования
+HYBRID_CANDIDATES = 50
+
 class MemoryInput(BaseModel):
     """Схема входных данных для работы с памятью"""
-    action: str = Field(description="Действие: store, search, retrieve, list, delete, summarize, new_conversation, get_conversation_history")
+    action: str = Field(description="Действие: store, search, hybrid_search, retrieve, list, delete, summarize, new_conversation, get_conversation_history")
     query: str = Field(description="Поисковый запрос или ключ")
     data: str = Field(default="", description="Данные для сохранения")
-    category: str = Field(default="general", description="Категория: general, code, docs, research, conversation")
+    category: Optional[str] = Field(default=None, description="Категория: general, code, docs, research, conversation (по умолчанию general; hybrid_search без категории ищет везде)")
     importance: int = Field(default=5, description="Важность от 1 до 10")
-    conversation_id: str = Field(default="default", description="Идентификатор беседы для группировки сообщений")
+    conversation_id: Optional[str] = Field(default=None, description="Идентификатор беседы для группировки сообщений (по умолчанию default; hybrid_search без беседы ищет везде)")
+    limit: int = Field(default=5, description="Количество результатов для hybrid_search")
 
 class GopiAIMemoryTool(BaseTool):
     """
@@ -39,6 +46,7 @@ class GopiAIMemoryTool(BaseTool):
     - new_conversation: начать новую беседу (возвращает conversation_id)
     - store: сохранить информацию (data=текст, category=категория, conversation_id=идентификатор_беседы)
     - search: поиск по запросу (query=поисковый_запрос, conversation_id=идентификатор_беседы)
+    - hybrid_search: ранжированный поиск (текст + векторы + важность + свежесть), возвращает top-k с оценками (query=запрос, limit=количество)
     - retrieve: получить по ключу (query=ключ, conversation_id=идентификатор_беседы)
     - list: список сохраненной информации (category=категория, conversation_id=идентификатор_беседы)
     - delete: удалить запись (query=ключ, conversation_id=идентификатор_беседы)
@@ -60,7 +68,9 @@ class GopiAIMemoryTool(BaseTool):
     - get_conversation_history: conversation_id="123"""
     args_schema: Type[BaseModel] = MemoryInput
     memory_path: str = Field(default_factory=lambda: os.path.join(os.path.dirname(__file__), "../../../rag_memory_system"), description="Путь к директории памяти")
-    local_memory_file: str = Field(default_factory=lambda: os.path.join(os.path.dirname(__file__), "../../memory/crewai_memory.json"), description="Файл локальной памяти")
+    local_memory_file: str = Field(default_factory=lambda: os.path.join(os.path.dirname(__file__), "../../memory/crewai_memory.json"), description="Прежний JSON-файл памяти (импортируется в БД)")
+    local_memory_db: Optional[str] = Field(default=None, description="SQLite база локальной памяти (по умолчанию рядом с local_memory_file, с расширением .db)")
+    rag_system: Optional[Any] = Field(default=None, exclude=True, description="RAG система с векторным индексом txtai (метод search); по умолчанию общий экземпляр get_rag_system()")
     
     def __init__(self, **data):
         super().__init__(**data)
@@ -68,22 +78,26 @@ class GopiAIMemoryTool(BaseTool):
         # Для инициализации файлов вызывайте self.init_files() вручную после создания экземпляра
 
     def init_files(self):
-        self._ensure_memory_file()
-        
-    def _ensure_memory_file(self):
-        """Создает файл памяти если его нет"""
-        os.makedirs(os.path.dirname(self.local_memory_file), exist_ok=True)
-        if not os.path.exists(self.local_memory_file):
-            with open(self.local_memory_file, 'w', encoding='utf-8') as f:
-                json.dump({"memories": [], "metadata": {"created": datetime.now().isoformat()}}, f)
+        self._get_store()
+
+    def _get_store(self) -> MemoryStore:
+        """Открывает SQLite-хранилище (при первом открытии импортирует JSON-файл памяти)"""
+        db_path = self.local_memory_db or os.path.splitext(self.local_memory_file)[0] + ".db"
+        return get_memory_store(db_path, legacy_json_path=self.local_memory_file)
         
-    def _run(self, action: str, query: str = "", data: str = "", category: str = "general", 
-             importance: int = 5, conversation_id: str = "default") -> str:
+    def _run(self, action: str, query: str = "", data: str = "", category: str | None = None, 
+             importance: int = 5, conversation_id: str | None = None, limit: int = 5) -> str:
         """
         Выполнение операции с памятью
         """
         self.init_files()  # Автоматически инициализируем файлы при первом вызове
         try:
+            if action == "hybrid_search":
+                # Фильтруем только по явно заданным категории и беседе, иначе векторные
+                # результаты txtai (сырые сообщения чатов) не совпадут ни с одной записью
+                return self._hybrid_search_memory(query, category, conversation_id, limit)
+            category = category or "general"
+            conversation_id = conversation_id or "default"
             if action == "new_conversation":
                 return self._create_new_conversation()
             elif action == "store":
@@ -134,7 +148,7 @@ class GopiAIMemoryTool(BaseTool):
 
     def _get_conversation_history(self, conversation_id: str) -> str:
         """Возвращает историю сообщений беседы"""
-        memories = self._search_memories("", "conversation", conversation_id)
+        memories = self._get_store().search("", "conversation", conversation_id, order="timestamp")
         if not memories:
             return "История беседы не найдена или пуста"
             
@@ -156,96 +170,38 @@ class GopiAIMemoryTool(BaseTool):
             
         return "\n".join(result) if result else "История беседы пуста"
 
-    def _load_local_memory(self) -> Dict:
-        """Загружает локальную память"""
-        try:
-            with open(self.local_memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {"memories": [], "metadata": {"created": datetime.now().isoformat()}}
-
-    def _save_local_memory(self, memory_data: Dict):
-        """Сохраняет локальную память"""
-        with open(self.local_memory_file, 'w', encoding='utf-8') as f:
-            json.dump(memory_data, f, ensure_ascii=False, indent=2)
-    
     def _store_memory(self, data: str, key: str, category: str = "general", 
                      importance: int = 5, conversation_id: str = "default") -> str:
         """Сохраняет информацию в память с привязкой к беседе"""
-        memory = self._load_local_memory()
-        
-        # Создаем запись памяти
-        memory_item = {
+        # Хранилище само ограничивает историю беседы (последние 1000 сообщений на беседу)
+        self._get_store().add({
             "key": key,
             "data": data,
             "category": category,
             "importance": importance,
             "timestamp": datetime.now().isoformat(),
             "conversation_id": conversation_id
-        }
-        
-        # Добавляем в память
-        memory["memories"].append(memory_item)
-        
-        # Ограничиваем размер истории беседы (последние 1000 сообщений на беседу)
-        if category == "conversation":
-            conv_memories = [m for m in memory["memories"] 
-                           if m.get("category") == "conversation" 
-                           and m.get("conversation_id") == conversation_id]
-            if len(conv_memories) > 1000:
-                # Удаляем самые старые сообщения сверх лимита
-                conv_memories.sort(key=lambda x: x.get("timestamp", ""))
-                for m in conv_memories[:-1000]:
-                    if m in memory["memories"]:
-                        memory["memories"].remove(m)
-        
-        # Сохраняем обратно
-        self._save_local_memory(memory)
+        })
         return f"✅ Информация сохранена в память (категория: {category}, ключ: {key})"
 
     def _search_memories(self, query: str = "", category: str | None = None, 
-                        conversation_id: str | None = None) -> List[Dict]:
-        """Ищет информацию в памяти с фильтрацией по категории и беседе"""
-        # Нормализуем входы, чтобы избежать .lower() на None
-        norm_query = (query or "").lower()
-        memory = self._load_local_memory()
-        
-        # Фильтрация по категории и беседе
-        results: List[Dict] = []
-        for mem in memory.get("memories", []):
-            # Применяем фильтры
-            if category is not None and mem.get("category") != category:
-                continue
-            if conversation_id is not None and mem.get("conversation_id") != conversation_id:
-                continue
-                
-            # Если есть поисковый запрос, проверяем вхождение в данные или ключ
-            data_str = str(mem.get("data", ""))
-            key_str = str(mem.get("key", ""))
-            if norm_query and (norm_query not in data_str.lower() and norm_query not in key_str.lower()):
-                continue
-                
-            results.append(mem)
-            
-        return results
+                        conversation_id: str | None = None, limit: int | None = None) -> List[Dict]:
+        """Ищет информацию в памяти с фильтрацией по категории и беседе (важные и новые первыми)"""
+        return self._get_store().search(query or "", category, conversation_id, limit=limit)
 
     def _search_memory(self, query: str, category: str | None = None, 
                       conversation_id: str | None = None) -> str:
         """Ищет информацию в памяти с фильтрацией по беседе"""
         # Гарантируем строковый тип для совместимости с сигнатурой _search_memories
         query = query or ""
-        memories = self._search_memories(query, category, conversation_id)
+        # Хранилище уже сортирует по важности и времени (новые и важные сначала)
+        memories = self._search_memories(query, category, conversation_id, limit=10)
         if not memories:
             return "Ничего не найдено в памяти."
             
-        # Сортируем по важности и времени (новые и важные сначала)
-        memories.sort(key=lambda x: (x.get("importance", 0), 
-                                   x.get("timestamp", "")), 
-                     reverse=True)
-            
         # Форматируем результаты
         result = ["🔍 Найдены совпадения в памяти:"]
-        for i, mem in enumerate(memories[:10], 1):  # Ограничиваем 10 результатами
+        for i, mem in enumerate(memories, 1):
             # Пытаемся распарсить JSON для сообщений беседы
             display_data = mem.get("data", "")
             if mem.get("category") == "conversation":
@@ -260,17 +216,82 @@ class GopiAIMemoryTool(BaseTool):
             
         return "\n".join(result)
 
+    def _get_rag_system(self) -> Optional[Any]:
+        """RAG система: переданная явно или общий экземпляр процесса (создается при первом гибридном поиске)"""
+        if self.rag_system is None:
+            try:
+                from rag_system import get_rag_system
+                self.rag_system = get_rag_system()
+            except Exception:
+                return None
+        return self.rag_system
+
+    def _search_vectors(self, query: str, limit: int, category: str | None = None,
+                        conversation_id: str | None = None) -> List[Dict]:
+        """Кандидаты из векторного индекса txtai с теми же фильтрами, что и у FTS"""
+        rag_system = self._get_rag_system() if query else None
+        if rag_system is None:
+            return []
+        try:
+            hits = [hit for hit in rag_system.search(query, limit) if hit.get("text")]
+        except Exception:
+            return []
+        if category is None and conversation_id is None:
+            return hits
+
+        # Индекс возвращает только текст: категорию и беседу берем из записи памяти с тем же текстом,
+        # векторные результаты без подходящей записи отбрасываются
+        records = self._get_store().find_by_data(
+            [hit["text"] for hit in hits if "category" not in hit and "conversation_id" not in hit],
+            category, conversation_id)
+        filtered = []
+        for hit in hits:
+            meta = hit if ("category" in hit or "conversation_id" in hit) else records.get(hit["text"])
+            if meta is None:
+                continue
+            if category is not None and meta.get("category") != category:
+                continue
+            if conversation_id is not None and meta.get("conversation_id") != conversation_id:
+                continue
+            filtered.append(hit)
+        return filtered
+
+    def _hybrid_search(self, query: str, category: str | None = None,
+                       conversation_id: str | None = None, limit: int = 5) -> List[Dict]:
+        """Гибридный поиск: сливает FTS и векторных кандидатов с учетом важности и свежести"""
+        text_hits = self._get_store().search_candidates(query or "", category, conversation_id,
+                                                        limit=HYBRID_CANDIDATES)
+        vector_hits = self._search_vectors(query or "", HYBRID_CANDIDATES, category, conversation_id)
+        return hybrid_rank(text_hits, vector_hits, limit=limit)
+
+    def _hybrid_search_memory(self, query: str, category: str | None = None,
+                              conversation_id: str | None = None, limit: int = 5) -> str:
+        """Форматирует результаты гибридного поиска с оценками"""
+        memories = self._hybrid_search(query, category, conversation_id, limit)
+        if not memories:
+            return "Ничего не найдено в памяти."
+
+        result = ["🎯 Наиболее релевантные записи памяти:"]
+        for i, mem in enumerate(memories, 1):
+            display_data = mem.get("data") or mem.get("text", "")
+            if mem.get("category") == "conversation":
+                try:
+                    msg = json.loads(display_data)
+                    display_data = f"{msg.get('role', 'unknown')}: {msg.get('content', '')}"
+                except:
+                    pass
+            source = mem.get("category", "rag")
+            result.append(f"{i}. [{source}, score={mem['score']:.3f}] "
+                          f"{display_data[:200]}{'...' if len(display_data) > 200 else ''}")
+
+        return "\n".join(result)
+
     def _retrieve_memory(self, key: str | None, conversation_id: str | None = None) -> str:
         """Получает информацию по ключу с учетом беседы"""
         key = key or ""
-        memory = self._load_local_memory()
-        
-        # Ищем по ключу и conversation_id
-        for mem in memory.get("memories", []):
-            if mem.get("key") == key:
-                if conversation_id is not None and mem.get("conversation_id") != conversation_id:
-                    continue
-                return f"🔑 Найдено по ключу '{key}':\n{mem.get('data', '')}"
+        mem = self._get_store().get(key, conversation_id)
+        if mem is not None:
+            return f"🔑 Найдено по ключу '{key}':\n{mem.get('data', '')}"
                 
         return f"❌ Запись с ключом '{key}' не найдена" + \
                (f" в беседе {conversation_id}" if conversation_id else "")
@@ -278,19 +299,9 @@ class GopiAIMemoryTool(BaseTool):
     def _delete_memory(self, key: str | None, conversation_id: str | None = None) -> str:
         """Удаляет информацию из памяти с учетом беседы"""
         key = key or ""
-        memory = self._load_local_memory()
-        
-        # Ищем и удаляем по ключу и conversation_id
-        removed = False
-        for mem in memory["memories"][:]:
-            if mem.get("key") == key:
-                if conversation_id is not None and mem.get("conversation_id") != conversation_id:
-                    continue
-                memory["memories"].remove(mem)
-                removed = True
+        removed = self._get_store().delete(key, conversation_id)
                 
         if removed:
-            self._save_local_memory(memory)
             return f"✅ Запись с ключом '{key}' удалена" + \
                   (f" из беседы {conversation_id}" if conversation_id else "")
         else:
@@ -301,22 +312,14 @@ class GopiAIMemoryTool(BaseTool):
         """Создает сводку по теме с учетом контекста беседы"""
         # Получаем релевантные записи
         topic_str = topic or ""
-        memories = self._search_memories(topic_str, conversation_id=conversation_id)
+        # Ограничиваем количество записей для сводки (важные и новые первыми)
+        max_entries = 10
+        memories = self._search_memories(topic_str, conversation_id=conversation_id, limit=max_entries)
         
         if not memories:
             return f"Не найдено информации по теме '{topic}'" + \
                   (f" в беседе {conversation_id}" if conversation_id else "")
         
-        # Сортируем по важности и времени
-        memories.sort(key=lambda x: (x.get("importance", 0), 
-                                   x.get("timestamp", "")), 
-                     reverse=True)
-        
-        # Ограничиваем количество записей для сводки
-        max_entries = 10
-        if len(memories) > max_entries:
-            memories = memories[:max_entries]
-            
         # Формируем сводку
         result = [f"📝 Сводка по теме '{topic}':"]
         
@@ -333,7 +336,7 @@ class GopiAIMemoryTool(BaseTool):
                 
             result.append(f"{i}. {content[:200]}{'...' if len(content) > 200 else ''}")
         
-        total_found = len(self._search_memories(topic_str, conversation_id=conversation_id))
+        total_found = self._get_store().count(topic_str, conversation_id=conversation_id)
         if len(memories) < total_found:
             result.append(f"\nПоказано {len(memories)} из {total_found} записей. Уточните запрос для более точных результатов.")
             
@@ -341,8 +344,8 @@ class GopiAIMemoryTool(BaseTool):
 
     def _list_memories(self, category: str | None = None, conversation_id: str | None = None) -> str:
         """Выводит список сохраненной информации с фильтрацией по категории и беседе"""
-        memories = self._search_memories("", category, conversation_id)
-        if not memories:
+        counts = self._get_store().category_counts(category, conversation_id)
+        if not counts:
             filters = []
             if category:
                 filters.append(f"категория: {category}")
@@ -353,18 +356,13 @@ class GopiAIMemoryTool(BaseTool):
             
         # Группируем по категориям
         categories = {}
-        for mem in memories:
-            cat = mem.get("category", "без категории")
-            conv_id = mem.get("conversation_id", "без беседы")
-            
+        for cat, conv_id, count in counts:
             if conversation_id:  # Если фильтр по беседе, не показываем её в группировке
                 key = cat
             else:
                 key = f"{cat} (беседа: {conv_id})"
                 
-            if key not in categories:
-                categories[key] = 0
-            categories[key] += 1
+            categories[key] = categories.get(key, 0) + count
             
         # Сортируем категории по количеству записей
         sorted_cats = sorted(categories.items(), key=lambda x: x[1], reverse=True)
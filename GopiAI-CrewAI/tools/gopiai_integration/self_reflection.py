@@ -10,20 +10,64 @@ Based on patterns:
 
 Work process:
 1. Generation of initial response
-2. Critical quality assessment (by several criteria)
-3. If quality is below threshold - generation of improved response
-4. Repeat until achieving desired quality or iteration limit
+2. Early exit if the heuristic quality score is already high
+3. Critical quality assessment (by several criteria)
+4. If quality is below threshold - several improved candidates are generated
+   in parallel and scored together in one critique call
+5. Repeat until achieving desired quality, iteration limit, exhausted
+   latency/token budget or too small quality gain
 """
 
 import logging
 import time
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any, Tuple
 from pydantic import Field
 from langchain.schema import LLMResult, Generation
 
 
+class _ReflectionBudget:
+    """Бюджет времени и токенов на один запрос"""
+    
+    def __init__(self, max_seconds: float, max_tokens: int):
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+        self.started = time.time()
+        self.tokens = 0
+        self.calls = 0
+        self.call_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    def charge(self, seconds: float, tokens: int):
+        # Варианты улучшения генерируются параллельно
+        with self._lock:
+            self.calls += 1
+            self.call_seconds += seconds
+            self.tokens += tokens
+    
+    def _average_call(self) -> Tuple[float, float]:
+        if not self.calls:
+            return 0.0, 0.0
+        return self.call_seconds / self.calls, self.tokens / self.calls
+    
+    def calls_affordable(self) -> int:
+        """Сколько параллельных вызовов средней стоимости укладывается в остаток токенов"""
+        _, avg_tokens = self._average_call()
+        if avg_tokens <= 0:
+            return 1
+        return max(0, int((self.max_tokens - self.tokens) // avg_tokens))
+    
+    def allows_call(self, calls: int = 1) -> bool:
+        """Хватит ли бюджета на calls последовательных вызовов средней стоимости"""
+        avg_seconds, avg_tokens = self._average_call()
+        elapsed = time.time() - self.started
+        return (elapsed + avg_seconds * calls <= self.max_seconds
+                and self.tokens + avg_tokens * calls <= self.max_tokens)
+
+
 class ReflectionEnabledAIRouter:
     """
     AI Router с функциональностью саморефлексии и улучшения ответов
@@ -60,7 +104,12 @@ class ReflectionEnabledAIRouter:
                 'usefulness'              # Полезность для пользователя
             ],
             'enable_detailed_critique': True,  # Детальная критика с пояснениями
-            'enable_iterative_improvement': True  # Итеративное улучшение
+            'enable_iterative_improvement': True,  # Итеративное улучшение
+            'early_exit_score': 7.0,       # Эвристическая оценка (макс. 8.0), при которой критика не нужна
+            'max_latency_seconds': 30.0,   # Бюджет времени на запрос (включая первичный ответ)
+            'max_tokens': 8000,            # Бюджет токенов на запрос (оценка по всем вызовам LLM)
+            'candidates_per_iteration': 2, # Сколько вариантов улучшения генерировать за итерацию
+            'min_quality_gain': 0.3        # Остановка, если итерация улучшила оценку меньше
         }
         
         self.reflection_config = {**default_config, **(reflection_config or {})}
@@ -73,7 +122,14 @@ class ReflectionEnabledAIRouter:
             'quality_improvements': 0,
             'average_initial_quality': 0.0,
             'average_final_quality': 0.0,
-            'processing_time_total': 0.0
+            'processing_time_total': 0.0,
+            'early_exits': 0,
+            'budget_exhausted': 0,
+            'llm_calls': 0,
+            'tokens_used': 0,
+            # Суммарный прирост оценки и число итераций по номеру итерации
+            'iteration_gain_total': [],
+            'iteration_gain_count': []
         }
         
         self.logger.info(f"ReflectionEnabledAIRouter инициализирован (reflection={'enabled' if enable_reflection else 'disabled'})")
@@ -121,8 +177,8 @@ class ReflectionEnabledAIRouter:
         elif response_length > 5000:
             score -= 1.0
         
-        # Наличие структуры (абзацы, списки, заголовки)
-        if '\n\n' in response or '\n-' in response or '\n*' in response:
+        # Наличие структуры (абзацы, списки, заголовки, блоки кода)
+        if any(marker in response for marker in ('\n\n', '\n-', '\n*', '```')):
             score += 0.5
         
         # Отсутствие ошибок или предупреждений
@@ -130,14 +186,176 @@ class ReflectionEnabledAIRouter:
         if any(indicator in response.lower() for indicator in error_indicators):
             score -= 1.5
         
-        # Релевантность ключевых слов
-        prompt_words = set(prompt.lower().split())
-        response_words = set(response.lower().split())
-        word_overlap = len(prompt_words.intersection(response_words)) / max(len(prompt_words), 1)
+        # Релевантность ключевых слов: значимые слова запроса (от 4 букв) сравниваются по основе
+        # из первых 5 символов, чтобы пунктуация и словоформы не занижали совпадение
+        prompt_stems = {word[:5] for word in re.findall(r'\w{4,}', prompt.lower())}
+        response_stems = {word[:5] for word in re.findall(r'\w{4,}', response.lower())}
+        word_overlap = len(prompt_stems & response_stems) / max(len(prompt_stems), 1)
         score += word_overlap * 1.5
         
         return min(max(score, 0.0), 10.0)
     
+    def _call_llm(self, prompt: str, budget: "_ReflectionBudget", stop: Optional[List[str]] = None) -> str:
+        """Один вызов базового роутера с учетом бюджета"""
+        started = time.time()
+        result = self.ai_router._generate(prompts=[prompt], stop=stop)
+        text = result.generations[0][0].text
+        usage = (getattr(result, 'llm_output', None) or {}).get('token_usage') or {}
+        tokens = usage.get('total_tokens') or (len(prompt) + len(text)) // 3
+        budget.charge(time.time() - started, tokens)
+        with budget._lock:
+            self.reflection_stats['llm_calls'] += 1
+            self.reflection_stats['tokens_used'] += tokens
+        return text
+    
+    def _score_candidates(self, prompt: str, candidates: List[str], budget: "_ReflectionBudget") -> List[Tuple[float, str]]:
+        """
+        Оценивает все варианты ответа одним вызовом LLM
+        
+        Returns:
+            List[Tuple[float, str]]: (оценка 0-10, критика) для каждого варианта;
+            при ошибке или нехватке бюджета — эвристическая оценка
+        """
+        fallback = [(self._fallback_quality_assessment(prompt, c), "") for c in candidates]
+        if not budget.allows_call():
+            return fallback
+        
+        criteria = ", ".join(self.reflection_config['quality_criteria'])
+        numbered = "\n\n".join(f"<candidate index=\"{i}\">\n{c}\n</candidate>" for i, c in enumerate(candidates, 1))
+        critique_prompt = f"""Оцени варианты ответа на запрос пользователя по критериям: {criteria}.
+Для каждого варианта поставь общую оценку от 0 до 10 и кратко укажи, что улучшить.
+
+Запрос пользователя:
+<request>
+{prompt}
+</request>
+
+Варианты ответа:
+{numbered}
+
+Верни только JSON:
+{{"scores": [{{"index": 1, "score": 7.5, "critique": "что улучшить"}}]}}
+"""
+        try:
+            text = self._call_llm(critique_prompt, budget)
+            match = re.search(r'\{.*\}', text, re.DOTALL)
+            if not match:
+                raise ValueError("JSON не найден в ответе критика")
+            scored = dict(enumerate(fallback, 1))
+            for item in json.loads(match.group(0)).get('scores', []):
+                index = int(item.get('index', 0))
+                if index in scored:
+                    score = min(max(float(item.get('score', scored[index][0])), 0.0), 10.0)
+                    scored[index] = (score, str(item.get('critique', '')))
+            return [scored[i] for i in range(1, len(candidates) + 1)]
+        except Exception as e:
+            self.logger.warning(f"Критика не удалась, используется эвристическая оценка: {e}")
+            return fallback
+    
+    def _generate_candidates(self, prompt: str, response: str, critique: str,
+                             count: int, budget: "_ReflectionBudget", stop: Optional[List[str]] = None) -> List[str]:
+        """Генерирует улучшенные варианты параллельно (в пределах бюджета)"""
+        improve_prompt = f"""Улучши ответ на запрос пользователя с учетом критики.
+
+Запрос пользователя:
+<request>
+{prompt}
+</request>
+
+Текущий ответ:
+<response>
+{response}
+</response>
+
+Критика:
+{critique or "Сделай ответ точнее, полнее и понятнее."}
+
+Верни только улучшенный ответ, без пояснений.
+"""
+        count = min(count, budget.calls_affordable())
+        if count <= 0:
+            return []
+        if count == 1:
+            return [self._call_llm(improve_prompt, budget, stop)]
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(self._call_llm, improve_prompt, budget, stop) for _ in range(count)]
+            candidates = []
+            for future in futures:
+                try:
+                    candidates.append(future.result())
+                except Exception as e:
+                    self.logger.warning(f"Ошибка генерации варианта ответа: {e}")
+            return candidates
+    
+    def _record_iteration_gain(self, iteration: int, gain: float):
+        totals = self.reflection_stats['iteration_gain_total']
+        counts = self.reflection_stats['iteration_gain_count']
+        while len(totals) < iteration:
+            totals.append(0.0)
+            counts.append(0)
+        totals[iteration - 1] += gain
+        counts[iteration - 1] += 1
+    
+    def _update_quality_averages(self, initial: float, final: float):
+        stats = self.reflection_stats
+        n = stats['reflection_triggered']
+        stats['average_initial_quality'] += (initial - stats['average_initial_quality']) / n
+        stats['average_final_quality'] += (final - stats['average_final_quality']) / n
+    
+    def _reflect(self, prompt: str, stop: Optional[List[str]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Цикл генерация → критика → улучшение в пределах бюджета
+        
+        Returns:
+            Tuple[str, Dict]: лучший ответ и сведения о рефлексии
+        """
+        config = self.reflection_config
+        budget = _ReflectionBudget(config['max_latency_seconds'], config['max_tokens'])
+        
+        response = self._call_llm(prompt, budget, stop)
+        heuristic_score = self._fallback_quality_assessment(prompt, response)
+        info = {'iterations': 0, 'heuristic_score': heuristic_score, 'early_exit': False, 'budget_exhausted': False}
+        
+        # Ранний выход: эвристика уже высокая или улучшение отключено
+        if heuristic_score >= config['early_exit_score'] or not config['enable_iterative_improvement']:
+            self.reflection_stats['early_exits'] += 1
+            info['early_exit'] = True
+            return response, info
+        
+        self.reflection_stats['reflection_triggered'] += 1
+        best_score, critique = self._score_candidates(prompt, [response], budget)[0]
+        initial_score = best_score
+        
+        iteration = 0
+        while best_score < config['min_quality_threshold'] and iteration < config['max_iterations']:
+            if not budget.allows_call(calls=2):
+                info['budget_exhausted'] = True
+                self.reflection_stats['budget_exhausted'] += 1
+                break
+            
+            iteration += 1
+            self.reflection_stats['improvement_iterations'] += 1
+            candidates = self._generate_candidates(prompt, response, critique,
+                                                   config['candidates_per_iteration'], budget, stop)
+            if not candidates:
+                break
+            scored = self._score_candidates(prompt, candidates, budget)
+            index = max(range(len(candidates)), key=lambda i: scored[i][0])
+            gain = scored[index][0] - best_score
+            self._record_iteration_gain(iteration, gain)
+            self.logger.info(f"Итерация рефлексии {iteration}: оценка {best_score:.1f} → {scored[index][0]:.1f}")
+            
+            if gain > 0:
+                response, (best_score, critique) = candidates[index], scored[index]
+            if gain < config['min_quality_gain']:
+                break
+        
+        if best_score > initial_score:
+            self.reflection_stats['quality_improvements'] += 1
+        self._update_quality_averages(initial_score, best_score)
+        info.update({'iterations': iteration, 'initial_score': initial_score, 'final_score': best_score})
+        return response, info
+    
     def _generate(self, prompts: List[str], stop: Optional[List[str]] = None) -> LLMResult:
         """
         Основной метод генерации с поддержкой рефлексии
@@ -147,10 +365,19 @@ class ReflectionEnabledAIRouter:
             stop: Стоп-последовательности
             
         Returns:
-            LLMResult: Результат генерации
+            LLMResult: Результат генерации (сведения о рефлексии в generation_info)
         """
-        # Пока что простая реализация без полной рефлексии для тестирования
-        return self.ai_router._generate(prompts, stop)
+        if not self.enable_reflection:
+            return self.ai_router._generate(prompts, stop)
+        
+        generations = []
+        for prompt in prompts:
+            started = time.time()
+            self.reflection_stats['total_requests'] += 1
+            text, info = self._reflect(prompt, stop)
+            self.reflection_stats['processing_time_total'] += time.time() - started
+            generations.append([Generation(text=text, generation_info={'reflection': info})])
+        return LLMResult(generations=generations)
     
     def get_llm_instance(self):
         """
@@ -189,6 +416,11 @@ class ReflectionEnabledAIRouter:
             Dict: Статистика рефлексии
         """
         stats = self.reflection_stats.copy()
+        # Средний прирост оценки на каждой итерации — для настройки max_iterations и порогов
+        stats['marginal_gain_by_iteration'] = [
+            round(total / count, 3) if count else 0.0
+            for total, count in zip(stats.pop('iteration_gain_total'), stats.pop('iteration_gain_count'))
+        ]
         stats['reflection_enabled'] = self.enable_reflection
         stats['reflection_config'] = self.reflection_config
         return stats
@@ -0,0 +1,419 @@
+"""
+🖥️ Постоянные shell-сессии для выполнения команд
+
+Вместо нового процесса на каждую команду в сессии живет один процесс bash,
+поэтому cwd и переменные окружения сохраняются между вызовами, а короткие
+команды не платят за запуск интерпретатора. Команда передается через eval
+(синтаксические ошибки не ломают протокол), конец вывода отмечается
+уникальным маркером в stdout и stderr, после маркера в stdout передаются
+код возврата и текущая директория.
+
+Вывод читается потоково, отдается в колбэк по мере поступления и
+ограничивается по размеру; лишнее вычитывается и отбрасывается. Лимиты
+CPU/памяти/размера файлов задаются через мягкие ulimit на время команды.
+По таймауту процесс сессии убивается и при следующем вызове запускается
+заново. Без bash (например, в Windows) каждая команда выполняется
+отдельным процессом с теми же ограничениями вывода и времени.
+"""
+
+import codecs
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMMAND_TIMEOUT = 30.0
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+# Пул сессий: сколько держать одновременно и через сколько секунд простоя закрывать
+MAX_SESSIONS = 8
+SESSION_IDLE_SECONDS = 15 * 60
+
+OutputCallback = Callable[[str, str], None]
+
+
+class ResourceLimits:
+    """Ограничения ресурсов одной команды (None — без ограничения)"""
+
+    __slots__ = ("cpu_seconds", "memory_bytes", "file_size_bytes")
+
+    def __init__(self, cpu_seconds: Optional[int] = None, memory_bytes: Optional[int] = None,
+                 file_size_bytes: Optional[int] = None):
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.file_size_bytes = file_size_bytes
+
+    def ulimit_args(self) -> Dict[str, int]:
+        """Флаги ulimit → значения (память и файлы в КиБ / блоках по 1024 байт)"""
+        args = {}
+        if self.cpu_seconds:
+            args["-t"] = int(self.cpu_seconds)
+        if self.memory_bytes:
+            args["-v"] = max(1, int(self.memory_bytes) // 1024)
+        if self.file_size_bytes:
+            args["-f"] = max(1, int(self.file_size_bytes) // 1024)
+        return args
+
+
+class _OutputBuffer:
+    """Вывод одного потока с ограничением размера и потоковой отдачей в колбэк"""
+
+    def __init__(self, name: str, max_bytes: int, on_output: Optional[OutputCallback]):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.on_output = on_output
+        self.data = bytearray()
+        self.total = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def write(self, chunk: bytes):
+        if not chunk:
+            return
+        self.total += len(chunk)
+        room = self.max_bytes - len(self.data)
+        if room > 0:
+            kept = chunk[:room]
+            self.data += kept
+            if self.on_output is not None:
+                text = self._decoder.decode(kept)
+                if text:
+                    self.on_output(self.name, text)
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.data)
+
+    def text(self) -> str:
+        return self.data.decode("utf-8", errors="replace")
+
+
+class _MarkerScanner:
+    """Отделяет вывод команды от маркера конца в потоке байт"""
+
+    def __init__(self, marker: bytes, sink: _OutputBuffer):
+        self.marker = marker
+        self.sink = sink
+        self.pending = bytearray()
+        self.trailer: Optional[bytes] = None
+
+    @property
+    def done(self) -> bool:
+        return self.trailer is not None
+
+    def feed(self, chunk: bytes):
+        if self.done:
+            return
+        self.pending += chunk
+        index = self.pending.find(self.marker)
+        if index != -1:
+            line_end = self.pending.find(b"\n", index + len(self.marker))
+            if line_end == -1:
+                return  # ждем окончания строки с маркером
+            self.sink.write(bytes(self.pending[:index]))
+            self.trailer = bytes(self.pending[index + len(self.marker):line_end]).strip()
+            self.pending.clear()
+            return
+        # Хвост, с которого может начинаться маркер, оставляем до следующей порции
+        safe = len(self.pending)
+        start = max(0, len(self.pending) - len(self.marker) + 1)
+        first = self.marker[:1]
+        position = self.pending.find(first, start)
+        while position != -1:
+            if self.marker.startswith(bytes(self.pending[position:])):
+                safe = position
+                break
+            position = self.pending.find(first, position + 1)
+        if safe > 0:
+            self.sink.write(bytes(self.pending[:safe]))
+            del self.pending[:safe]
+
+
+def _result(command: str, stdout: _OutputBuffer, stderr: _OutputBuffer, returncode: Optional[int],
+            started: float, timed_out: bool = False, cwd: Optional[str] = None,
+            persistent: bool = False) -> Dict:
+    return {
+        "command": command,
+        "stdout": stdout.text(),
+        "stderr": stderr.text(),
+        "returncode": returncode,
+        "timed_out": timed_out,
+        "truncated": stdout.truncated or stderr.truncated,
+        "stdout_bytes": stdout.total,
+        "stderr_bytes": stderr.total,
+        "duration": round(time.monotonic() - started, 3),
+        "cwd": cwd,
+        "persistent": persistent,
+    }
+
+
+def _ansi_c_quote(text: str) -> str:
+    """Строка bash вида $'...' — безопасна для любых символов команды"""
+    escaped = (text.replace("\\", "\\\\").replace("'", "\\'")
+               .replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t"))
+    return f"$'{escaped}'"
+
+
+def _kill_process_tree(process: subprocess.Popen):
+    try:
+        if os.name != "nt":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+class ShellSession:
+    """Один долгоживущий процесс bash, команды выполняются по очереди"""
+
+    def __init__(self, session_id: str = "default", cwd: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None, shell: Optional[str] = None):
+        self.session_id = session_id
+        self.initial_cwd = cwd or os.getcwd()
+        self.env = env
+        self.shell = shell or shutil.which("bash")
+        self.cwd = self.initial_cwd
+        self.last_used = time.monotonic()
+        self.commands_run = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def persistent(self) -> bool:
+        return bool(self.shell) and os.name != "nt"
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self):
+        env = dict(os.environ if self.env is None else self.env)
+        env.setdefault("TERM", "dumb")
+        self._process = subprocess.Popen(
+            [self.shell, "--noprofile", "--norc"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=self.cwd, env=env, start_new_session=True,
+        )
+        self._queue = queue.Queue()
+        for name, stream in (("stdout", self._process.stdout), ("stderr", self._process.stderr)):
+            threading.Thread(target=self._pump, args=(name, stream, self._queue),
+                             name=f"shell-{self.session_id}-{name}", daemon=True).start()
+        logger.info(f"[SHELL] Запущена сессия '{self.session_id}' (pid {self._process.pid})")
+
+    @staticmethod
+    def _pump(name: str, stream, sink: "queue.Queue"):
+        fd = stream.fileno()
+        while True:
+            try:
+                chunk = os.read(fd, READ_CHUNK_SIZE)
+            except OSError:
+                chunk = b""
+            sink.put((name, chunk))
+            if not chunk:
+                return
+
+    def run(self, command: str, timeout: float = DEFAULT_COMMAND_TIMEOUT,
+            max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+            limits: Optional[ResourceLimits] = None,
+            on_output: Optional[OutputCallback] = None) -> Dict:
+        """
+        Выполняет команду в сессии
+
+        Returns:
+            dict: stdout, stderr, returncode, timed_out, truncated, duration, cwd, persistent
+        """
+        with self._lock:
+            self.last_used = time.monotonic()
+            self.commands_run += 1
+            if not self.persistent:
+                return self._run_once(command, timeout, max_output_bytes, on_output)
+            if not self.alive:
+                self._start()
+            return self._run_framed(command, timeout, max_output_bytes, limits, on_output)
+
+    def _run_framed(self, command: str, timeout: float, max_output_bytes: int,
+                    limits: Optional[ResourceLimits], on_output: Optional[OutputCallback]) -> Dict:
+        started = time.monotonic()
+        token = uuid.uuid4().hex
+        marker = f"__GOPIAI_END_{token}__"
+        stdout = _OutputBuffer("stdout", max_output_bytes, on_output)
+        stderr = _OutputBuffer("stderr", max_output_bytes, on_output)
+        scanners = {
+            "stdout": _MarkerScanner(b"\n" + marker.encode(), stdout),
+            "stderr": _MarkerScanner(b"\n" + marker.encode(), stderr),
+        }
+
+        # Мягкие лимиты действуют только на время команды и восстанавливаются после нее
+        ulimits = (limits.ulimit_args() if limits else {})
+        set_limits = "".join(f"__gopiai_old{flag[1]}=$(ulimit -S {flag}); ulimit -S {flag} {value} 2>/dev/null; "
+                             for flag, value in ulimits.items())
+        restore_limits = "".join(f"ulimit -S {flag} \"$__gopiai_old{flag[1]}\" 2>/dev/null; " for flag in ulimits)
+        script = (
+            f"{set_limits}eval {_ansi_c_quote(command)} </dev/null; __gopiai_rc=$?; {restore_limits}"
+            f"printf '\\n%s %d %s\\n' '{marker}' \"$__gopiai_rc\" \"$PWD\"; "
+            f"printf '\\n%s\\n' '{marker}' >&2\n"
+        )
+
+        try:
+            self._process.stdin.write(script.encode("utf-8"))
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.close()
+            stderr.write(f"Сессия оболочки завершилась: {e}".encode("utf-8"))
+            return _result(command, stdout, stderr, None, started, persistent=True)
+
+        deadline = started + timeout
+        closed = set()
+        while not all(s.done for s in scanners.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"[SHELL] Команда превысила {timeout} сек, сессия '{self.session_id}' перезапускается")
+                self.close()
+                return _result(command, stdout, stderr, None, started, timed_out=True, persistent=True)
+            try:
+                name, chunk = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if not chunk:
+                closed.add(name)
+                if len(closed) == 2:
+                    # Команда завершила оболочку (exit) — следующая команда запустит новую
+                    for scanner in scanners.values():
+                        scanner.sink.write(bytes(scanner.pending))
+                    returncode = self._process.wait()
+                    self._process = None
+                    self.cwd = self.initial_cwd
+                    return _result(command, stdout, stderr, returncode, started, persistent=True)
+                continue
+            scanners[name].feed(chunk)
+
+        returncode, _, cwd = scanners["stdout"].trailer.decode("utf-8", errors="replace").partition(" ")
+        self.cwd = cwd or self.cwd
+        return _result(command, stdout, stderr, int(returncode), started, cwd=self.cwd, persistent=True)
+
+    def _run_once(self, command: str, timeout: float, max_output_bytes: int,
+                  on_output: Optional[OutputCallback]) -> Dict:
+        """Отдельный процесс на команду (нет bash), с потоковым чтением и ограничением вывода"""
+        started = time.monotonic()
+        stdout = _OutputBuffer("stdout", max_output_bytes, on_output)
+        stderr = _OutputBuffer("stderr", max_output_bytes, on_output)
+        process = subprocess.Popen(command, shell=True, cwd=self.cwd, env=self.env,
+                                   stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output: "queue.Queue" = queue.Queue()
+        for name, stream in (("stdout", process.stdout), ("stderr", process.stderr)):
+            threading.Thread(target=self._pump, args=(name, stream, output), daemon=True).start()
+
+        buffers = {"stdout": stdout, "stderr": stderr}
+        closed = set()
+        deadline = started + timeout
+        while len(closed) < 2:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _kill_process_tree(process)
+                process.wait()
+                return _result(command, stdout, stderr, None, started, timed_out=True)
+            try:
+                name, chunk = output.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if chunk:
+                buffers[name].write(chunk)
+            else:
+                closed.add(name)
+        return _result(command, stdout, stderr, process.wait(), started, cwd=self.cwd)
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        _kill_process_tree(process)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        self.cwd = self.initial_cwd
+
+
+class ShellSessionPool:
+    """Пул сессий по идентификатору с вытеснением давно не используемых"""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_seconds: float = SESSION_IDLE_SECONDS):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, ShellSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str = "default", cwd: Optional[str] = None) -> ShellSession:
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = ShellSession(session_id, cwd=cwd)
+                self._sessions[session_id] = session
+                self._evict_lru(session_id)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def _evict_lru(self, session_id: str):
+        """Вытесняет давно не используемые сессии сверх лимита, пропуская занятые командой
+        и сессии той же группы, что и запрошенная (основная сессия и ее слоты чтения ":readN")"""
+        base = session_id.split(":read", 1)[0]
+        for sid, session in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if sid == base or sid.startswith(base + ":read") or session._lock.locked():
+                continue
+            del self._sessions[sid]
+            session.close()
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if now - session.last_used > self.idle_seconds and not session._lock.locked():
+                del self._sessions[session_id]
+                session.close()
+
+    def run(self, command: str, session_id: str = "default", **kwargs) -> Dict:
+        """Выполняет команду в сессии session_id (см. ShellSession.run)"""
+        result = self.get(session_id).run(command, **kwargs)
+        result["session_id"] = session_id
+        return result
+
+    def close(self, session_id: Optional[str] = None):
+        """Закрывает одну сессию или все"""
+        with self._lock:
+            ids = [session_id] if session_id else list(self._sessions)
+            for sid in ids:
+                session = self._sessions.pop(sid, None)
+                if session is not None:
+                    session.close()
+
+
+_pool: Optional[ShellSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_shell_pool() -> ShellSessionPool:
+    """Глобальный пул shell-сессий"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ShellSessionPool()
+    return _pool
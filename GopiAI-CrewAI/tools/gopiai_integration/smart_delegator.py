@@ -246,8 +246,8 @@ except Exception:
 # Старый MCP импорт удален, используем новую систему инструкций
 # from tools.gopiai_integration.mcp_integration_fixed import get_mcp_tools_manager
 from .local_mcp_tools import get_local_mcp_tools
-# Legacy CommandExecutor отключен — переходим полностью на современные tool_calls CrewAI/MCP
-# from .command_executor import CommandExecutor
+# CommandExecutor выполняет только команды из строгого JSON ответа LLM (см. process_request, шаг 5)
+from .command_executor import CommandExecutor
 from .response_formatter import ResponseFormatter
 from .openrouter_client import get_openrouter_client
 from .model_config_manager import get_model_config_manager, ModelProvider
@@ -295,9 +295,22 @@ class SmartDelegator:
         self.mcp_available = False
         logger.info("[INFO] Внешняя MCP интеграция отключена, используем локальные инструменты")
         
-        # Полностью отключаем устаревший CommandExecutor — используем прямые tool_calls
+        # Устаревший CommandExecutor по умолчанию отключён — используем прямые tool_calls.
+        # Включается явно: SmartDelegator(enable_json_commands=True) или ENV GOPIAI_JSON_COMMANDS=1.
+        # Тогда строгие JSON-команды из ответа LLM исполняются пакетом (независимые — параллельно)
+        # через те же локальные/CrewAI инструменты, что и tool_calls
         self.command_executor = None
-        logger.info("[INFO] CommandExecutor отключён: используется современная система tool_calls")
+        json_commands = kwargs.get('enable_json_commands')
+        if json_commands is None:
+            json_commands = str(os.getenv('GOPIAI_JSON_COMMANDS', '')).strip().lower() in {"1", "true", "yes", "on"}
+        if json_commands:
+            try:
+                self.command_executor = CommandExecutor(tool_handler=self._run_command_tool)
+                logger.info("[OK] CommandExecutor включён для строгих JSON-команд")
+            except Exception as e:
+                logger.warning(f"[WARNING] Не удалось инициализировать CommandExecutor: {str(e)}")
+        else:
+            logger.info("[INFO] CommandExecutor отключён: используется современная система tool_calls")
         
         # Инициализируем форматтер ответов
         try:
@@ -503,31 +516,27 @@ class SmartDelegator:
         if self.command_executor and response_text:
             try:
                 logger.info("[COMMAND-PROCESSOR] Проверяем ответ на наличие СТРОГОГО JSON команд (strict_mode=True)...")
-                # Унифицированный вызов процессора команд в строгом режиме
-                updated_response, command_results = self.command_executor.process_gemini_response(
-                    response_text,
-                )
-                # Дополнительная валидация верхнего уровня: допускаем только объекты/массивы с полями tool+params
-                if command_results:
-                    try:
-                        parsed = json.loads(response_text)
-                    except Exception:
-                        parsed = None
-                    def _valid_cmd(obj: Any) -> bool:
-                        return isinstance(obj, dict) and "tool" in obj and "params" in obj and isinstance(obj["params"], dict)
-                    is_valid_top_level = False
-                    if isinstance(parsed, dict):
-                        is_valid_top_level = _valid_cmd(parsed)
-                    elif isinstance(parsed, list):
-                        is_valid_top_level = all(_valid_cmd(x) for x in parsed)
-                    # Если верхний уровень невалидный — не исполняем
-                    if not is_valid_top_level:
-                        logger.info("[COMMAND-PROCESSOR] Строгий JSON не валиден на верхнем уровне — команды не будут исполнены")
-                    else:
-                        logger.info(f"[COMMAND-PROCESSOR] Выполнено команд: {len(command_results)}")
-                        response_text = updated_response
-                        analysis['executed_commands'] = len(command_results)
-                        analysis['command_results'] = command_results
+                # Валидация верхнего уровня ДО исполнения: допускаем только объект/массив с полями tool+params
+                try:
+                    parsed = json.loads(response_text)
+                except Exception:
+                    parsed = None
+                def _valid_cmd(obj: Any) -> bool:
+                    return isinstance(obj, dict) and "tool" in obj and "params" in obj and isinstance(obj["params"], dict)
+                commands: List[Dict[str, Any]] = []
+                if isinstance(parsed, dict) and _valid_cmd(parsed):
+                    commands = [parsed]
+                elif isinstance(parsed, list) and parsed and all(_valid_cmd(x) for x in parsed):
+                    commands = parsed
+                if commands:
+                    # Независимые команды выполняются параллельно, порядок результатов сохраняется
+                    command_results = self.command_executor.execute_commands(commands)
+                    logger.info(f"[COMMAND-PROCESSOR] Выполнено команд: {len(command_results)}")
+                    response_text = self.command_executor._update_response_with_results(
+                        response_text, commands, command_results
+                    )
+                    analysis['executed_commands'] = len(command_results)
+                    analysis['command_results'] = command_results
                 else:
                     logger.info("[COMMAND-PROCESSOR] Команды в ответе не найдены (строгий режим)")
             except Exception as e:
@@ -1180,6 +1189,18 @@ class SmartDelegator:
             logger.info(f"Получен результат от внешнего MCP инструмента: {str(result)[:200]}...")
             return result
     
+    def _run_command_tool(self, tool_name: str, params: Dict) -> Any:
+        """
+        Обработчик CommandExecutor для не-терминальных команд из строгого JSON ответа LLM.
+        Вызывает локальный или CrewAI инструмент напрямую: команды выполняются из потоков
+        пакета, а диспетчер сам вызывает _call_tool.
+        """
+        if self.local_tools_available and self.local_tools and tool_name in self.local_tools.tools_registry:
+            return self.local_tools.call_tool(tool_name, params)
+        if self.crewai_tools_available and self.crewai_tools and tool_name in self.crewai_tools.get_available_tools():
+            return self.crewai_tools.execute_tool(tool_name, params)
+        return self._call_tool(tool_name, 'local', params)
+    
     def _adapt_params_for_crewai(self, original_tool: str, crewai_tool: str, params: Dict) -> Dict:
         """Адаптирует параметры для CrewAI инструментов"""
         adapted = params.copy()
@@ -9,16 +9,26 @@ Terminal Tool для GopiAI-CrewAI
 # Используем BaseTool из crewai_tools вместо langchain
 from crewai.tools import BaseTool
 from typing import Dict, Any, Optional
-import subprocess
 import logging
 import json
 from pathlib import Path
 import re
 import os
+import threading
+from collections import deque
+
+from .shell_session import get_shell_pool
 
 # Настраиваем логгер
 logger = logging.getLogger(__name__)
 
+# Сессия оболочки для команд из UI-терминала и лимит времени одной команды, секунд
+TERMINAL_SESSION_ID = "terminal"
+TERMINAL_COMMAND_TIMEOUT = 300
+
+# Сколько команд AI хранить до регистрации терминального виджета (UI создает его при первом открытии)
+PENDING_AI_COMMANDS_LIMIT = 200
+
 def _bool_env(val: str) -> bool:
     return str(val).strip().lower() in {"1", "true", "yes", "on"}
 
@@ -90,11 +100,30 @@ FORBIDDEN_COMMANDS = [
 # Глобальная переменная для хранения ссылки на терминальный виджет
 _terminal_widget_instance = None
 
+# Команды AI, выполненные до регистрации виджета: (команда, вывод)
+_pending_ai_commands = deque(maxlen=PENDING_AI_COMMANDS_LIMIT)
+_terminal_lock = threading.Lock()
+
 def set_terminal_widget(terminal_widget):
-    """Устанавливает глобальную ссылку на терминальный виджет"""
+    """Устанавливает глобальную ссылку на терминальный виджет и выводит в него накопленные команды AI"""
     global _terminal_widget_instance
-    _terminal_widget_instance = terminal_widget
+    with _terminal_lock:
+        _terminal_widget_instance = terminal_widget
+        pending = list(_pending_ai_commands) if terminal_widget is not None else []
+        if pending:
+            _pending_ai_commands.clear()
     logger.info(f"Терминальный виджет установлен: {terminal_widget}")
+    for command, output in pending:
+        terminal_widget.log_ai_command(command, output)
+
+def log_ai_command(command: str, output: str):
+    """Показывает команду AI в терминале UI; до регистрации виджета вывод буферизуется"""
+    with _terminal_lock:
+        terminal = _terminal_widget_instance
+        if terminal is None:
+            _pending_ai_commands.append((command, output))
+            return
+    terminal.log_ai_command(command, output)
 
 def get_terminal_widget():
     """Возвращает глобальную ссылку на терминальный виджет"""
@@ -152,29 +181,24 @@ class TerminalTool(BaseTool):
                 output = mcp_result.get('output', '')
                 error = mcp_result.get('error', '')
                 success = mcp_result.get('success', False)
-                terminal = get_terminal_widget()
-                if terminal:
-                    terminal.log_ai_command(command, output + ("\n" + error if error else ""))
+                log_ai_command(command, output + ("\n" + error if error else ""))
                 return {"terminal_output": {"command": command, "output": output, "error": error, "success": success}}
             except Exception as e:
                 logger.warning(f"MCP execution failed, falling back to subprocess: {e}")
                 # Продолжаем к subprocess
         
-        # 2) Fallback: прямое выполнение через subprocess (разрешено особенно в UNSAFE_MODE)
+        # 2) Fallback: выполнение в постоянной сессии оболочки (cwd/env сохраняются между командами)
         try:
-            completed = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-            )
-            output = completed.stdout or ''
-            error = completed.stderr or ''
-            success = completed.returncode == 0
-            terminal = get_terminal_widget()
-            if terminal:
-                terminal.log_ai_command(command, output + ("\n" + error if error else ""))
-            return {"terminal_output": {"command": command, "output": output, "error": error, "success": success}}
+            result = get_shell_pool().run(command, session_id=TERMINAL_SESSION_ID, timeout=TERMINAL_COMMAND_TIMEOUT)
+            output = result['stdout']
+            error = result['stderr']
+            if result['timed_out']:
+                error = (error + "\n" if error else "") + f"Команда превысила лимит времени ({TERMINAL_COMMAND_TIMEOUT} сек)"
+            elif result['truncated']:
+                error = (error + "\n" if error else "") + "Вывод обрезан"
+            success = result['returncode'] == 0
+            log_ai_command(command, output + ("\n" + error if error else ""))
+            return {"terminal_output": {"command": command, "output": output, "error": error, "success": success, "cwd": result['cwd']}}
         except Exception as e:
             error_msg = f"Subprocess error: {str(e)}"
             return {"terminal_output": {"command": command, "output": "", "error": error_msg, "success": False}}
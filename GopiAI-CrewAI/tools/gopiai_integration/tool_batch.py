@@ -0,0 +1,229 @@
+"""
+⚡ Параллельное выполнение пакета команд инструментов
+
+Команды вида {"tool": ..., "params": {...}} из ответа LLM выполняются в
+ограниченном пуле потоков. Зависимости строятся по ресурсам: записи в один
+и тот же путь выполняются в исходном порядке, чтения идут параллельно,
+а неизвестные команды с побочными эффектами выполняются эксклюзивно.
+Для каждого инструмента можно ограничить число одновременных вызовов и
+время ожидания результата. Порядок результатов совпадает с порядком команд.
+"""
+
+import logging
+import os
+import shlex
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ресурс, конфликтующий со всеми остальными (команда выполняется эксклюзивно)
+GLOBAL_RESOURCE = "*"
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 60.0
+
+# Ограничения одновременных вызовов по инструментам
+DEFAULT_TOOL_LIMITS: Dict[str, int] = {
+    "terminal": 2,
+    "execute_shell": 2,
+    "browser_tools": 1,
+}
+
+# Время ожидания результата по инструментам, секунд
+DEFAULT_TOOL_TIMEOUTS: Dict[str, float] = {
+    "terminal": 35.0,
+    "execute_shell": 35.0,
+}
+
+# Инструменты без побочных эффектов
+READ_ONLY_TOOLS: Set[str] = {
+    "web_search", "web_scraper", "url_analyzer", "api_client", "system_info",
+    "time_helper", "json_processor", "text_processor", "gopiai_web_search",
+}
+
+# Действия файловых инструментов, которые только читают
+READ_ONLY_ACTIONS: Set[str] = {
+    "read", "list", "exists", "info", "find", "search_text", "tree", "hash", "compare",
+    "read_json", "read_csv",
+}
+
+# Команды терминала без побочных эффектов
+READ_ONLY_SHELL_COMMANDS: Set[str] = {
+    "ls", "dir", "pwd", "echo", "type", "cat", "tree", "find", "grep", "whoami", "date", "time",
+}
+
+# Параметры команд, в которых передаются пути/адреса
+PATH_PARAMS = ("path", "file_path", "directory", "destination", "dest", "source", "src", "target", "url")
+
+
+def _normalize_path(value: str) -> str:
+    if "://" in value:
+        return value
+    return os.path.normcase(os.path.abspath(os.path.expanduser(value)))
+
+
+def command_resources(command: Dict[str, Any]) -> Tuple[bool, Set[str]]:
+    """
+    Ресурсы, которые затрагивает команда
+
+    Returns:
+        (is_write, resources): запись ли это и набор путей/адресов;
+        GLOBAL_RESOURCE означает, что команда должна выполняться эксклюзивно
+    """
+    tool = str(command.get("tool", "")).lower()
+    params = command.get("params") or {}
+
+    if tool in ("terminal", "execute_shell"):
+        line = str(params.get("command", ""))
+        try:
+            parts = shlex.split(line, posix=os.name != "nt")
+        except ValueError:
+            return True, {GLOBAL_RESOURCE}
+        if not parts:
+            return False, set()
+        base = parts[0].lower()
+        # Перенаправления и конвейеры могут писать куда угодно
+        if base not in READ_ONLY_SHELL_COMMANDS or any(c in line for c in (">", "|", ";", "&")):
+            paths = {_normalize_path(p) for p in parts[1:] if not p.startswith("-")}
+            if base in ("mkdir", "touch", "rm", "del", "rmdir", "cp", "copy", "mv", "move") and paths:
+                return True, paths
+            return True, {GLOBAL_RESOURCE}
+        # Команда без аргументов-путей читает текущую директорию
+        return False, {_normalize_path(p) for p in parts[1:] if not p.startswith("-")} or {_normalize_path(".")}
+
+    resources = {
+        _normalize_path(str(params[key])) for key in PATH_PARAMS if params.get(key)
+    }
+    action = str(params.get("action", params.get("operation", ""))).lower()
+    if tool in READ_ONLY_TOOLS or (action and action in READ_ONLY_ACTIONS):
+        return False, resources
+    return True, resources or {GLOBAL_RESOURCE}
+
+
+def _conflicts(a: Tuple[bool, Set[str]], b: Tuple[bool, Set[str]]) -> bool:
+    write_a, res_a = a
+    write_b, res_b = b
+    if not (write_a or write_b):
+        return False
+    if GLOBAL_RESOURCE in res_a or GLOBAL_RESOURCE in res_b:
+        return True
+    for x in res_a:
+        for y in res_b:
+            # Запись в директорию конфликтует с операциями внутри нее
+            if x == y or x.startswith(y + os.sep) or y.startswith(x + os.sep):
+                return True
+    return False
+
+
+def build_dependencies(commands: List[Dict[str, Any]]) -> List[Set[int]]:
+    """Для каждой команды — индексы предыдущих команд, после которых она должна выполняться"""
+    access = [command_resources(command) for command in commands]
+    return [
+        {j for j in range(i) if _conflicts(access[j], access[i])}
+        for i in range(len(commands))
+    ]
+
+
+def run_batch(commands: List[Dict[str, Any]], execute: Callable[[Dict[str, Any]], Dict[str, Any]],
+              max_workers: int = DEFAULT_MAX_WORKERS,
+              tool_limits: Optional[Dict[str, int]] = None,
+              timeouts: Optional[Dict[str, float]] = None,
+              default_timeout: float = DEFAULT_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Выполняет команды параллельно с учетом зависимостей
+
+    Args:
+        commands: Команды {"tool", "params"}
+        execute: Функция выполнения одной команды, возвращает dict результата
+        max_workers: Размер пула потоков
+        tool_limits: Максимум одновременных вызовов по инструментам
+        timeouts: Время ожидания результата по инструментам
+        default_timeout: Время ожидания для остальных инструментов
+
+    Returns:
+        Результаты в порядке команд. Команда, не уложившаяся во время,
+        и зависящие от нее команды получают результат с ошибкой.
+    """
+    count = len(commands)
+    if count == 0:
+        return []
+    tool_limits = {**DEFAULT_TOOL_LIMITS, **(tool_limits or {})}
+    timeouts = {**DEFAULT_TOOL_TIMEOUTS, **(timeouts or {})}
+
+    dependencies = build_dependencies(commands)
+    tools = [str(command.get("tool", "")).lower() for command in commands]
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    finished: Set[int] = set()
+    failed: Set[int] = set()
+    running: Dict[Any, int] = {}
+    deadlines: Dict[Any, float] = {}
+    active_by_tool: Dict[str, int] = {}
+    pending = list(range(count))
+
+    def _call(index: int) -> Dict[str, Any]:
+        try:
+            return execute(commands[index])
+        except Exception as e:
+            logger.error(f"[BATCH] Ошибка выполнения команды {index + 1}: {e}")
+            return {"success": False, "error": str(e), "output": ""}
+
+    def _finish(index: int, result: Dict[str, Any], ok: bool = True):
+        results[index] = result
+        finished.add(index)
+        if not ok:
+            failed.add(index)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        while len(finished) < count:
+            # Запускаем все готовые команды в пределах лимитов инструментов
+            for index in list(pending):
+                deps = dependencies[index]
+                if deps & failed:
+                    pending.remove(index)
+                    _finish(index, {
+                        "success": False,
+                        "error": "Не выполнена: предыдущая команда, от которой она зависит, не завершилась",
+                        "output": "",
+                    }, ok=False)
+                    continue
+                if not deps <= finished:
+                    continue
+                tool = tools[index]
+                if active_by_tool.get(tool, 0) >= max(1, tool_limits.get(tool, max_workers)):
+                    continue
+                pending.remove(index)
+                active_by_tool[tool] = active_by_tool.get(tool, 0) + 1
+                future = executor.submit(_call, index)
+                running[future] = index
+                deadlines[future] = time.monotonic() + timeouts.get(tool, default_timeout)
+
+            if not running:
+                continue
+
+            nearest = min(deadlines.values()) - time.monotonic()
+            done, _ = wait(list(running), timeout=max(0.0, nearest), return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in list(running):
+                if future not in done and deadlines[future] > now:
+                    continue
+                index = running.pop(future)
+                del deadlines[future]
+                active_by_tool[tools[index]] -= 1
+                if future in done:
+                    _finish(index, future.result())
+                else:
+                    # Поток нельзя прервать: результат будет отброшен, зависимые команды не запускаются
+                    timeout = timeouts.get(tools[index], default_timeout)
+                    logger.warning(f"[BATCH] Команда {index + 1} ({tools[index]}) превысила {timeout} сек")
+                    _finish(index, {
+                        "success": False,
+                        "error": f"Превышено время ожидания ({timeout} сек)",
+                        "output": "",
+                    }, ok=False)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
@@ -0,0 +1,158 @@
+"""
+📋 Tool Manifest
+Статический манифест инструментов CrewAI Toolkit без их импорта
+
+Манифест строится разбором исходников (ast) и содержит имена классов,
+имена инструментов, категории и пути импорта. Он кешируется в JSON и
+перестраивается только при изменении файлов тулкита (по подписи из
+количества файлов и максимального mtime).
+"""
+
+import ast
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Корень тулкита и пакет, от которого строятся пути импорта
+TOOLKIT_DIR = Path(__file__).resolve().parent.parent / "crewai_toolkit" / "tools"
+TOOLKIT_PACKAGE = "tools.crewai_toolkit.tools"
+
+# Файл кеша манифеста
+MANIFEST_CACHE_FILE = Path.home() / ".gopiai" / "cache" / "crewai_tools_manifest.json"
+
+# Базовые классы, наследники которых считаются инструментами
+TOOL_BASE_NAMES = {"BaseTool", "RagTool", "Tool"}
+
+# Категории по ключевым словам в имени пакета инструмента (первое совпадение)
+CATEGORY_KEYWORDS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("code_execution", ("code_interpreter",)),
+    ("data_storage", ("mysql", "pg_", "snowflake", "databricks", "qdrant", "weaviate", "nl2sql")),
+    ("file_operations", ("file", "directory", "csv", "json", "xml", "pdf", "docx", "txt", "mdx")),
+    ("web_search", ("search_tool", "serper", "serpapi", "serply", "brave", "tavily", "exa", "linkup")),
+    ("web_scraping", ("scrape", "scraping", "crawl", "browserbase", "hyperbrowser", "spider", "stagehand", "apify", "firecrawl")),
+    ("vision", ("vision", "ocr", "dalle")),
+    ("security", ("patronus",)),
+]
+
+
+def _categorize(package: str) -> str:
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in package for keyword in keywords):
+            return category
+    return "other"
+
+
+def _base_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Subscript):
+        return _base_name(node.value)
+    return ""
+
+
+def _string_default(class_node: ast.ClassDef, field: str) -> Optional[str]:
+    """Возвращает строковое значение по умолчанию поля класса (name/description)"""
+    for stmt in class_node.body:
+        target, value = None, None
+        if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            target, value = stmt.target.id, stmt.value
+        elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            target, value = stmt.targets[0].id, stmt.value
+        if target == field and isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value.value
+    return None
+
+
+def _scan_file(path: Path, toolkit_dir: Path, package: str) -> List[Dict[str, Any]]:
+    """Находит классы-инструменты в одном файле без его импорта"""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (SyntaxError, UnicodeDecodeError, OSError) as e:
+        logger.debug(f"Не удалось разобрать {path}: {e}")
+        return []
+
+    relative = path.relative_to(toolkit_dir).with_suffix("")
+    module = ".".join((package,) + relative.parts)
+    tool_package = relative.parts[0] if len(relative.parts) > 1 else relative.stem
+
+    tools = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or node.name.startswith("_"):
+            continue
+        bases = {_base_name(base) for base in node.bases}
+        if not bases & TOOL_BASE_NAMES and not any(b.endswith("Tool") for b in bases if b):
+            continue
+        description = _string_default(node, "description") or ast.get_docstring(node) or ""
+        tools.append({
+            "class": node.name,
+            "module": module,
+            "name": _string_default(node, "name") or node.name,
+            "category": _categorize(tool_package),
+            "description": " ".join(description.split())[:300],
+        })
+    return tools
+
+
+def _source_files(toolkit_dir: Path) -> List[Path]:
+    return sorted(
+        p for p in toolkit_dir.rglob("*.py")
+        if p.name != "__init__.py" and "tests" not in p.parts and not p.name.startswith("test_")
+    )
+
+
+def compute_signature(toolkit_dir: Path = TOOLKIT_DIR) -> str:
+    """Подпись исходников тулкита: меняется при добавлении/удалении/изменении файлов"""
+    files = _source_files(toolkit_dir)
+    latest = max((p.stat().st_mtime_ns for p in files), default=0)
+    return f"v{MANIFEST_VERSION}:{len(files)}:{latest}"
+
+
+def build_manifest(toolkit_dir: Path = TOOLKIT_DIR, package: str = TOOLKIT_PACKAGE) -> Dict[str, Any]:
+    """Строит манифест разбором исходников (без импорта инструментов)"""
+    tools: Dict[str, Dict[str, Any]] = {}
+    for path in _source_files(toolkit_dir):
+        for tool in _scan_file(path, toolkit_dir, package):
+            # Ключ — имя класса: оно уникально в тулките и используется в импортах
+            tools.setdefault(tool["class"], tool)
+    return {"signature": compute_signature(toolkit_dir), "tools": tools}
+
+
+def load_manifest(toolkit_dir: Path = TOOLKIT_DIR, cache_file: Optional[Path] = MANIFEST_CACHE_FILE,
+                  package: str = TOOLKIT_PACKAGE) -> Dict[str, Any]:
+    """
+    Загружает манифест из кеша или перестраивает его, если исходники изменились
+
+    Returns:
+        dict: {"signature": str, "tools": {class_name: {...}}}
+    """
+    signature = compute_signature(toolkit_dir)
+
+    if cache_file is not None and cache_file.exists():
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("signature") == signature:
+                return cached
+        except (OSError, ValueError) as e:
+            logger.debug(f"Кеш манифеста поврежден, перестраиваем: {e}")
+
+    manifest = build_manifest(toolkit_dir, package)
+    logger.info(f"📋 Манифест инструментов построен: {len(manifest['tools'])} инструментов")
+
+    if cache_file is not None:
+        try:
+            os.makedirs(cache_file.parent, exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"⚠️ Не удалось сохранить манифест инструментов: {e}")
+
+    return manifest
@@ -0,0 +1,223 @@
+"""
+🌐 Загрузка веб-страниц для локальных MCP инструментов
+
+Потоковая загрузка с ограничением размера и проверкой Content-Type до
+чтения тела, общий кеш ответов с ревалидацией по ETag/Last-Modified
+и разбор HTML самым быстрым доступным парсером (lxml, иначе html.parser)
+только тех тегов, которые нужны действию.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Максимальный размер загружаемого тела ответа
+MAX_FETCH_BYTES = 5 * 1024 * 1024
+FETCH_CHUNK_SIZE = 64 * 1024
+
+# Типы содержимого, которые имеет смысл разбирать как HTML/XML/текст
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_CONTENT_TYPES = HTML_CONTENT_TYPES + ("text/plain", "text/xml", "application/xml", "application/rss+xml", "application/atom+xml")
+
+# Кеш ответов: сколько записей/байт хранить и сколько секунд считать ответ свежим без ревалидации
+FETCH_CACHE_MAX_ENTRIES = 128
+FETCH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FETCH_CACHE_FRESH_SECONDS = 60.0
+
+# Теги, которые нужно разбирать для каждого действия скрапера (None — весь документ)
+ACTION_TAGS = {
+    "get_links": ["a"],
+    "get_images": ["img"],
+    "get_tables": ["table"],
+    "get_forms": ["form"],
+    "get_metadata": ["title", "meta", "link"],
+}
+
+
+class ContentTypeError(ValueError):
+    """Ответ имеет неподходящий Content-Type"""
+
+
+class FetchResult:
+    """Загруженный ответ (возможно, взятый из кеша)"""
+
+    __slots__ = ("url", "final_url", "status_code", "headers", "content", "encoding",
+                 "truncated", "elapsed", "from_cache", "fetched_at")
+
+    def __init__(self, url: str, final_url: str, status_code: int, headers: Dict[str, str],
+                 content: bytes, encoding: Optional[str], truncated: bool, elapsed: float):
+        self.url = url
+        self.final_url = final_url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.truncated = truncated
+        self.elapsed = elapsed
+        self.from_cache = False
+        self.fetched_at = time.time()
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "")
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class FetchCache:
+    """LRU-кеш ответов по URL с ограничением по количеству и суммарному размеру"""
+
+    def __init__(self, max_entries: int = FETCH_CACHE_MAX_ENTRIES, max_bytes: int = FETCH_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, FetchResult]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, url: str) -> Optional[FetchResult]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, result: FetchResult):
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= len(old.content)
+            if len(result.content) > self.max_bytes:
+                return
+            self._entries[url] = result
+            self._bytes += len(result.content)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.content)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class WebFetcher:
+    """Загрузчик страниц с общей сессией и кешем"""
+
+    def __init__(self, cache: Optional[FetchCache] = None, max_bytes: int = MAX_FETCH_BYTES,
+                 fresh_seconds: float = FETCH_CACHE_FRESH_SECONDS):
+        self.session = requests.Session()
+        self.cache = cache or FetchCache()
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+              allowed_types: Optional[Iterable[str]] = TEXT_CONTENT_TYPES,
+              max_bytes: Optional[int] = None, use_cache: bool = True) -> FetchResult:
+        """
+        Загружает URL потоково, не читая больше max_bytes
+
+        Свежий ответ из кеша возвращается без запроса; устаревший
+        ревалидируется условным запросом (If-None-Match/If-Modified-Since).
+
+        Raises:
+            ContentTypeError: Content-Type не входит в allowed_types
+            requests.RequestException: ошибка HTTP
+        """
+        max_bytes = max_bytes or self.max_bytes
+        request_headers = {"User-Agent": DEFAULT_USER_AGENT, **(headers or {})}
+
+        cached = self.cache.get(url) if use_cache else None
+        if cached is not None:
+            if time.time() - cached.fetched_at < self.fresh_seconds:
+                self.cache.hits += 1
+                cached.from_cache = True
+                return cached
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        started = time.time()
+        with self.session.get(url, headers=request_headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and cached is not None:
+                self.cache.revalidated += 1
+                cached.fetched_at = time.time()
+                cached.from_cache = True
+                return cached
+
+            response.raise_for_status()
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+
+            content_type = response_headers.get("content-type", "").split(";")[0].strip().lower()
+            if allowed_types is not None and content_type and content_type not in allowed_types:
+                raise ContentTypeError(f"Неподдерживаемый тип содержимого: {content_type}")
+
+            # Читаем тело порциями и прекращаем чтение на лимите
+            chunks, size, truncated = [], 0, False
+            for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                if size + len(chunk) > max_bytes:
+                    chunks.append(chunk[:max_bytes - size])
+                    truncated = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+
+            content = b"".join(chunks)
+            encoding = response.encoding if "charset" in response_headers.get("content-type", "") else None
+            result = FetchResult(url, response.url, response.status_code, response_headers,
+                                 content, encoding, truncated, time.time() - started)
+
+        self.cache.misses += 1
+        if use_cache and not truncated:
+            self.cache.put(url, result)
+        return result
+
+
+def parse_html(result: FetchResult, tags: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """
+    Разбирает HTML быстрым парсером; при заданных tags строится только их поддерево
+    """
+    parse_only = SoupStrainer(list(tags)) if tags else None
+    return BeautifulSoup(result.content, HTML_PARSER, parse_only=parse_only,
+                         from_encoding=result.encoding)
+
+
+_fetcher: Optional[WebFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_web_fetcher() -> WebFetcher:
+    """Общий загрузчик (и кеш) для web_scraper и url_analyzer"""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = WebFetcher()
+    return _fetcher
@@ -0,0 +1,186 @@
+"""
+🔍 Вспомогательные структуры для GopiAIWebSearchTool
+
+- SearchResultCache: TTL-кеш результатов по (нормализованный запрос, движок, язык)
+- EngineStats: скользящая задержка и доля ошибок каждого поискового движка
+- merge_results: слияние результатов нескольких движков с дедупликацией по URL
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+# Время жизни закешированных результатов поиска, секунд
+SEARCH_CACHE_TTL_SECONDS = 15 * 60
+SEARCH_CACHE_MAX_ENTRIES = 256
+
+# Сглаживание скользящих средних статистики движков
+STATS_ALPHA = 0.3
+
+# Сколько секунд не использовать движок после серии ошибок
+ENGINE_COOLDOWN_SECONDS = 120.0
+ENGINE_COOLDOWN_FAILURES = 3
+
+# Параметры отслеживания, которые не влияют на адрес страницы
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "yclid", "ref_src")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").casefold().split())
+
+
+def normalize_url(url: str) -> str:
+    """Каноническая форма URL для дедупликации (разворачивает редиректы DuckDuckGo)"""
+    if not url:
+        return ""
+    if url.startswith("//"):
+        url = "https:" + url
+    parts = urlsplit(url)
+    # Ссылки DuckDuckGo HTML ведут на //duckduckgo.com/l/?uddg=<настоящий URL>
+    if parts.netloc.endswith("duckduckgo.com") and parts.path.startswith("/l/"):
+        target = dict(parse_qsl(parts.query)).get("uddg")
+        if target:
+            return normalize_url(unquote(target))
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, query, ""))
+
+
+class SearchResultCache:
+    """TTL + LRU кеш результатов поиска"""
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL_SECONDS, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, engine: str, language: str) -> Tuple[str, str, str]:
+        return normalize_query(query), engine, (language or "").lower()
+
+    def get(self, query: str, engine: str, language: str, num_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Результаты из кеша, если они свежие и их запрашивали не меньше num_results"""
+        key = self.key(query, engine, language)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, requested, results = entry
+                if time.monotonic() - stored_at <= self.ttl and (requested >= num_results or len(results) < requested):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return results[:num_results]
+                if time.monotonic() - stored_at > self.ttl:
+                    del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, query: str, engine: str, language: str, num_results: int, results: List[Dict[str, Any]]):
+        """Сохраняет непустые результаты (пустой ответ может означать блокировку движка)"""
+        if not results:
+            return
+        key = self.key(query, engine, language)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), num_results, list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class EngineStats:
+    """Скользящие задержка и доля ошибок поисковых движков"""
+
+    def __init__(self, alpha: float = STATS_ALPHA):
+        self.alpha = alpha
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, engine: str) -> Dict[str, float]:
+        return self._stats.setdefault(engine, {
+            "latency": 0.0, "error_rate": 0.0, "calls": 0, "errors": 0,
+            "consecutive_failures": 0, "last_failure": 0.0,
+        })
+
+    def record(self, engine: str, latency: float, success: bool):
+        with self._lock:
+            entry = self._entry(engine)
+            first = entry["calls"] == 0
+            entry["calls"] += 1
+            if success:
+                entry["latency"] = latency if first else (1 - self.alpha) * entry["latency"] + self.alpha * latency
+                entry["consecutive_failures"] = 0
+            else:
+                entry["errors"] += 1
+                entry["consecutive_failures"] += 1
+                entry["last_failure"] = time.monotonic()
+            failure = 0.0 if success else 1.0
+            entry["error_rate"] = failure if first else (1 - self.alpha) * entry["error_rate"] + self.alpha * failure
+
+    def is_cooling_down(self, engine: str) -> bool:
+        with self._lock:
+            entry = self._stats.get(engine)
+            return bool(entry and entry["consecutive_failures"] >= ENGINE_COOLDOWN_FAILURES
+                        and time.monotonic() - entry["last_failure"] < ENGINE_COOLDOWN_SECONDS)
+
+    def score(self, engine: str, prior_latency: float) -> float:
+        """Ожидаемая «стоимость» движка: задержка с штрафом за ошибки (меньше — лучше)"""
+        with self._lock:
+            entry = self._stats.get(engine)
+            if not entry or entry["calls"] == 0:
+                return prior_latency
+            latency = entry["latency"] or prior_latency
+            return latency * (1.0 + 4.0 * entry["error_rate"])
+
+    def choose(self, engines: Sequence[str], prior_latency: Optional[Dict[str, float]] = None) -> Optional[str]:
+        """Движок с наименьшей стоимостью; движки на «остывании» пропускаются, если есть другие"""
+        if not engines:
+            return None
+        prior_latency = prior_latency or {}
+        available = [e for e in engines if not self.is_cooling_down(e)] or list(engines)
+        # При равной стоимости сохраняется порядок предпочтения из engines
+        return min(available, key=lambda e: (self.score(e, prior_latency.get(e, 1.0)), engines.index(e)))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {engine: dict(entry) for engine, entry in self._stats.items()}
+
+
+def merge_results(result_lists: Sequence[Tuple[str, List[Dict[str, Any]]]], limit: int) -> List[Dict[str, Any]]:
+    """
+    Сливает результаты движков по очереди позиций (1-е места всех движков, затем 2-е...)
+    и убирает дубликаты по нормализованному URL; у результата перечисляются все движки
+    """
+    merged: List[Dict[str, Any]] = []
+    by_url: Dict[str, Dict[str, Any]] = {}
+    depth = max((len(results) for _, results in result_lists), default=0)
+    for position in range(depth):
+        for engine, results in result_lists:
+            if position >= len(results):
+                continue
+            result = results[position]
+            key = normalize_url(result.get("link", "")) or f"{engine}:{position}"
+            existing = by_url.get(key)
+            if existing is not None:
+                existing["engines"].append(engine)
+                if not existing.get("snippet") and result.get("snippet"):
+                    existing["snippet"] = result["snippet"]
+                continue
+            item = dict(result, engines=[engine])
+            by_url[key] = item
+            merged.append(item)
+    return merged[:limit]
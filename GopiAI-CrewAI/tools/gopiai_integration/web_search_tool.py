@@ -11,15 +11,33 @@ from pydantic import BaseModel, Field
 from bs4 import BeautifulSoup
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import quote_plus
 
 # Импортируем BaseTool из crewai
 from crewai.tools.base_tool import BaseTool
 
+from .web_search_support import EngineStats, SearchResultCache, merge_results
+
+ENGINE_LABELS = {
+    "duckduckgo": "DuckDuckGo",
+    "google_scrape": "Google",
+    "serper": "Serper",
+    "serpapi": "SerpAPI",
+}
+
+# Порядок предпочтения для режима "auto" и априорная задержка (сек) движков без статистики
+ENGINE_PREFERENCE = ["serper", "serpapi", "duckduckgo", "google_scrape"]
+ENGINE_PRIOR_LATENCY = {"serper": 0.8, "serpapi": 1.0, "duckduckgo": 1.5, "google_scrape": 2.0}
+
+# Общие для всех экземпляров инструмента кеш результатов и статистика движков
+_search_cache = SearchResultCache()
+_engine_stats = EngineStats()
+
 class WebSearchInput(BaseModel):
     """Схема входных данных для инструмента поиска в интернете"""
     query: str = Field(description="Поисковый запрос")
-    search_engine: str = Field(default="duckduckgo", description="Поисковая система: duckduckgo, google_scrape, serper, serpapi")
+    search_engine: str = Field(default="duckduckgo", description="Поисковая система: duckduckgo, google_scrape, serper, serpapi, auto; multi или список через запятую — параллельный поиск в нескольких")
     num_results: int = Field(default=10, description="Количество результатов (максимум 20)")
     language: str = Field(default="ru", description="Язык поиска (ru, en)")
 
@@ -32,7 +50,9 @@ class GopiAIWebSearchTool(BaseTool):
     - Поиск через Google (скрапинг)
     - Поиск через Serper API (с ключом)
     - Поиск через SerpAPI (с ключом)
-    - Автоматический выбор доступного метода
+    - Автоматический выбор движка по задержке и доле ошибок
+    - Параллельный поиск в нескольких движках с дедупликацией по URL
+    - Кеширование результатов (TTL)
     """
     
     name: str = Field(default="gopiai_web_search", description="Инструмент поиска в интернете")
@@ -87,258 +107,306 @@ class GopiAIWebSearchTool(BaseTool):
             # Ограничиваем количество результатов
             num_results = min(max(num_results, 1), 20)
             
+            # Несколько движков параллельно: "multi" или список через запятую
+            if search_engine == "multi" or "," in search_engine:
+                engines = self._resolve_engines(search_engine)
+                return self._search_multi(query, engines, num_results, language)
+            
             # Выбираем метод поиска
             if search_engine == "auto":
                 search_engine = self._choose_best_search_engine()
             
-            # Выполняем поиск
-            if search_engine == "duckduckgo":
-                return self._search_duckduckgo(query, num_results, language)
-            elif search_engine == "google_scrape":
-                return self._search_google_scrape(query, num_results, language)
-            elif search_engine == "serper" and self.serper_key:
-                return self._search_serper(query, num_results, language)
-            elif search_engine == "serpapi" and self.serpapi_key:
-                return self._search_serpapi(query, num_results, language)
-            else:
+            if search_engine not in self.get_available_engines():
                 # Fallback к DuckDuckGo
-                return self._search_duckduckgo(query, num_results, language)
+                search_engine = "duckduckgo"
+            
+            label = ENGINE_LABELS[search_engine]
+            try:
+                results = self._search_cached(search_engine, query, num_results, language)
+            except Exception as e:
+                return f"❌ Ошибка поиска в {label}: {str(e)}"
+            return self._format_results(label, query, results)
                 
         except Exception as e:
             self.logger.error(f"Ошибка поиска в интернете: {e}")
             return f"❌ Ошибка поиска в интернете: {str(e)}"
     
     def _choose_best_search_engine(self) -> str:
-        """Выбирает лучший доступный поисковый движок"""
-        if self.serper_key:
-            return "serper"
-        elif self.serpapi_key:
-            return "serpapi"
-        else:
-            return "duckduckgo"
+        """
+        Выбирает лучший доступный поисковый движок
+        
+        Без статистики порядок предпочтения прежний (serper > serpapi > duckduckgo);
+        по мере вызовов учитываются скользящие задержка и доля ошибок движков.
+        """
+        preferred = [engine for engine in ENGINE_PREFERENCE if engine in self.get_available_engines()]
+        return _engine_stats.choose(preferred, ENGINE_PRIOR_LATENCY) or "duckduckgo"
     
-    def _search_duckduckgo(self, query: str, num_results: int, language: str) -> str:
-        """Поиск через DuckDuckGo (без API ключа)"""
+    def _resolve_engines(self, search_engine: str) -> List[str]:
+        """Список доступных движков для параллельного поиска"""
+        available = self.get_available_engines()
+        if search_engine == "multi":
+            engines = [engine for engine in ENGINE_PREFERENCE if engine in available]
+            # Движки после серии ошибок временно пропускаются
+            return [e for e in engines if not _engine_stats.is_cooling_down(e)] or engines
+        engines = []
+        for engine in search_engine.split(","):
+            engine = engine.strip()
+            if engine in available and engine not in engines:
+                engines.append(engine)
+        return engines or ["duckduckgo"]
+    
+    def _search_cached(self, engine: str, query: str, num_results: int, language: str) -> List[Dict[str, Any]]:
+        """
+        Результаты движка из TTL-кеша или свежим запросом с учетом статистики движка
+        
+        Raises:
+            Exception: ошибка запроса к движку (результат не кешируется)
+        
+        Пустой список результатов тоже не кешируется.
+        """
+        cached = _search_cache.get(query, engine, language, num_results)
+        if cached is not None:
+            self.logger.debug(f"Результаты {engine} для '{query}' взяты из кеша")
+            return cached
+        
+        fetch = getattr(self, f"_fetch_{engine}")
+        started = time.monotonic()
         try:
-            # Формируем URL для поиска
-            encoded_query = quote_plus(query)
-            url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
-            
-            if language == "ru":
-                url += "&kl=ru-ru"
-            
-            # Выполняем запрос
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Парсим результаты
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Ищем результаты поиска
-            search_results = soup.find_all('div', class_='result')
-            
-            for result in search_results[:num_results]:
+            results = fetch(query, num_results, language)
+        except Exception:
+            _engine_stats.record(engine, time.monotonic() - started, success=False)
+            raise
+        # Пустой ответ (например, заблокированный скрапинг с HTTP 200) считается ошибкой движка и не кешируется
+        _engine_stats.record(engine, time.monotonic() - started, success=bool(results))
+        _search_cache.put(query, engine, language, num_results, results)
+        return results
+    
+    def _search_multi(self, query: str, engines: List[str], num_results: int, language: str) -> str:
+        """Параллельный поиск в нескольких движках с дедупликацией результатов по URL"""
+        collected: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+            futures = {
+                executor.submit(self._search_cached, engine, query, num_results, language): engine
+                for engine in engines
+            }
+            for future in as_completed(futures):
+                engine = futures[future]
                 try:
-                    # Извлекаем заголовок и ссылку
-                    title_elem = result.find('a', class_='result__a')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
-                    
-                    # Извлекаем описание
-                    snippet_elem = result.find('a', class_='result__snippet')
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                    
-                    if title and link:
-                        results.append({
-                            'title': title,
-                            'link': link,
-                            'snippet': snippet
-                        })
-                        
+                    collected[engine] = future.result()
                 except Exception as e:
-                    self.logger.warning(f"Ошибка парсинга результата DuckDuckGo: {e}")
-                    continue
-            
-            # Формируем ответ
-            if results:
-                response_text = f"🔍 Результаты поиска DuckDuckGo для '{query}' ({len(results)} результатов):\n\n"
-                for i, result in enumerate(results, 1):
-                    response_text += f"{i}. **{result['title']}**\n"
-                    response_text += f"   {result['link']}\n"
-                    if result['snippet']:
-                        response_text += f"   {result['snippet']}\n"
-                    response_text += "\n"
-                return response_text
-            else:
-                return f"❌ Результаты поиска не найдены для запроса '{query}' в DuckDuckGo"
-                
+                    self.logger.warning(f"Ошибка поиска в {ENGINE_LABELS[engine]}: {e}")
+                    errors[engine] = str(e)
+        
+        if not collected:
+            details = "; ".join(f"{ENGINE_LABELS[e]}: {msg}" for e, msg in errors.items())
+            return f"❌ Ошибка поиска в интернете: {details}"
+        
+        # Порядок слияния — порядок движков в запросе, а не порядок завершения
+        merged = merge_results([(e, collected[e]) for e in engines if e in collected], num_results)
+        labels = ", ".join(ENGINE_LABELS[e] for e in engines if e in collected)
+        response_text = self._format_results(labels, query, merged)
+        if errors:
+            response_text += "⚠️ Не ответили: " + ", ".join(ENGINE_LABELS[e] for e in errors) + "\n"
+        return response_text
+    
+    def _format_results(self, label: str, query: str, results: List[Dict[str, Any]]) -> str:
+        """Текстовый ответ по списку результатов"""
+        if not results:
+            return f"❌ Результаты поиска не найдены для запроса '{query}' в {label}"
+        
+        response_text = f"🔍 Результаты поиска {label} для '{query}' ({len(results)} результатов):\n\n"
+        for i, result in enumerate(results, 1):
+            response_text += f"{i}. **{result['title']}**\n"
+            response_text += f"   {result['link']}\n"
+            if result['snippet']:
+                response_text += f"   {result['snippet']}\n"
+            if len(result.get('engines', [])) > 1:
+                response_text += f"   (найдено: {', '.join(ENGINE_LABELS[e] for e in result['engines'])})\n"
+            response_text += "\n"
+        return response_text
+    
+    def _search_engine_text(self, engine: str, query: str, num_results: int, language: str) -> str:
+        label = ENGINE_LABELS[engine]
+        try:
+            return self._format_results(label, query, self._search_cached(engine, query, num_results, language))
         except Exception as e:
-            return f"❌ Ошибка поиска в DuckDuckGo: {str(e)}"
+            return f"❌ Ошибка поиска в {label}: {str(e)}"
+    
+    def _search_duckduckgo(self, query: str, num_results: int, language: str) -> str:
+        """Поиск через DuckDuckGo (без API ключа)"""
+        return self._search_engine_text("duckduckgo", query, num_results, language)
     
     def _search_google_scrape(self, query: str, num_results: int, language: str) -> str:
         """Поиск через Google (скрапинг)"""
-        try:
-            # Формируем URL для поиска
-            encoded_query = quote_plus(query)
-            url = f"https://www.google.com/search?q={encoded_query}&num={num_results}"
-            
-            if language == "ru":
-                url += "&hl=ru&lr=lang_ru"
-            
-            # Выполняем запрос
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Парсим результаты
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Ищем результаты поиска (Google часто меняет классы)
-            search_results = soup.find_all('div', class_='g')
-            
-            for result in search_results[:num_results]:
-                try:
-                    # Извлекаем заголовок и ссылку
-                    title_elem = result.find('h3')
-                    link_elem = result.find('a')
-                    
-                    if not title_elem or not link_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = link_elem.get('href', '')
-                    
-                    # Извлекаем описание
-                    snippet_elem = result.find('span', class_='aCOpRe') or result.find('div', class_='VwiC3b')
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                    
-                    if title and link and link.startswith('http'):
-                        results.append({
-                            'title': title,
-                            'link': link,
-                            'snippet': snippet
-                        })
-                        
-                except Exception as e:
-                    self.logger.warning(f"Ошибка парсинга результата Google: {e}")
-                    continue
-            
-            # Формируем ответ
-            if results:
-                response_text = f"🔍 Результаты поиска Google для '{query}' ({len(results)} результатов):\n\n"
-                for i, result in enumerate(results, 1):
-                    response_text += f"{i}. **{result['title']}**\n"
-                    response_text += f"   {result['link']}\n"
-                    if result['snippet']:
-                        response_text += f"   {result['snippet']}\n"
-                    response_text += "\n"
-                return response_text
-            else:
-                return f"❌ Результаты поиска не найдены для запроса '{query}' в Google"
-                
-        except Exception as e:
-            return f"❌ Ошибка поиска в Google: {str(e)}"
+        return self._search_engine_text("google_scrape", query, num_results, language)
     
     def _search_serper(self, query: str, num_results: int, language: str) -> str:
         """Поиск через Serper API"""
-        try:
-            url = "https://google.serper.dev/search"
-            
-            payload = {
-                "q": query,
-                "num": num_results
-            }
-            
-            if language == "ru":
-                payload["gl"] = "ru"
-                payload["hl"] = "ru"
-            
-            headers = {
-                "X-API-KEY": self.serper_key,
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            # Извлекаем органические результаты
-            if 'organic' in data:
-                for result in data['organic'][:num_results]:
-                    results.append({
-                        'title': result.get('title', ''),
-                        'link': result.get('link', ''),
-                        'snippet': result.get('snippet', '')
-                    })
-            
-            # Формируем ответ
-            if results:
-                response_text = f"🔍 Результаты поиска Serper для '{query}' ({len(results)} результатов):\n\n"
-                for i, result in enumerate(results, 1):
-                    response_text += f"{i}. **{result['title']}**\n"
-                    response_text += f"   {result['link']}\n"
-                    if result['snippet']:
-                        response_text += f"   {result['snippet']}\n"
-                    response_text += "\n"
-                return response_text
-            else:
-                return f"❌ Результаты поиска не найдены для запроса '{query}' в Serper"
-                
-        except Exception as e:
-            return f"❌ Ошибка поиска в Serper: {str(e)}"
+        return self._search_engine_text("serper", query, num_results, language)
     
     def _search_serpapi(self, query: str, num_results: int, language: str) -> str:
         """Поиск через SerpAPI"""
-        try:
-            url = "https://serpapi.com/search"
-            
-            params = {
-                "engine": "google",
-                "q": query,
-                "num": num_results,
-                "api_key": self.serpapi_key
-            }
-            
-            if language == "ru":
-                params["gl"] = "ru"
-                params["hl"] = "ru"
-            
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            # Извлекаем органические результаты
-            if 'organic_results' in data:
-                for result in data['organic_results'][:num_results]:
+        return self._search_engine_text("serpapi", query, num_results, language)
+    
+    def _fetch_duckduckgo(self, query: str, num_results: int, language: str) -> List[Dict[str, Any]]:
+        """Результаты DuckDuckGo (HTML-версия)"""
+        # Формируем URL для поиска
+        encoded_query = quote_plus(query)
+        url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
+        
+        if language == "ru":
+            url += "&kl=ru-ru"
+        
+        # Выполняем запрос
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        
+        # Парсим результаты
+        soup = BeautifulSoup(response.text, 'html.parser')
+        results = []
+        
+        # Ищем результаты поиска
+        search_results = soup.find_all('div', class_='result')
+        
+        for result in search_results[:num_results]:
+            try:
+                # Извлекаем заголовок и ссылку
+                title_elem = result.find('a', class_='result__a')
+                if not title_elem:
+                    continue
+                
+                title = title_elem.get_text(strip=True)
+                link = title_elem.get('href', '')
+                
+                # Извлекаем описание
+                snippet_elem = result.find('a', class_='result__snippet')
+                snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+                
+                if title and link:
                     results.append({
-                        'title': result.get('title', ''),
-                        'link': result.get('link', ''),
-                        'snippet': result.get('snippet', '')
+                        'title': title,
+                        'link': link,
+                        'snippet': snippet
                     })
-            
-            # Формируем ответ
-            if results:
-                response_text = f"🔍 Результаты поиска SerpAPI для '{query}' ({len(results)} результатов):\n\n"
-                for i, result in enumerate(results, 1):
-                    response_text += f"{i}. **{result['title']}**\n"
-                    response_text += f"   {result['link']}\n"
-                    if result['snippet']:
-                        response_text += f"   {result['snippet']}\n"
-                    response_text += "\n"
-                return response_text
-            else:
-                return f"❌ Результаты поиска не найдены для запроса '{query}' в SerpAPI"
+                    
+            except Exception as e:
+                self.logger.warning(f"Ошибка парсинга результата DuckDuckGo: {e}")
+                continue
+        
+        return results
+    
+    def _fetch_google_scrape(self, query: str, num_results: int, language: str) -> List[Dict[str, Any]]:
+        """Результаты Google (скрапинг)"""
+        # Формируем URL для поиска
+        encoded_query = quote_plus(query)
+        url = f"https://www.google.com/search?q={encoded_query}&num={num_results}"
+        
+        if language == "ru":
+            url += "&hl=ru&lr=lang_ru"
+        
+        # Выполняем запрос
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        
+        # Парсим результаты
+        soup = BeautifulSoup(response.text, 'html.parser')
+        results = []
+        
+        # Ищем результаты поиска (Google часто меняет классы)
+        search_results = soup.find_all('div', class_='g')
+        
+        for result in search_results[:num_results]:
+            try:
+                # Извлекаем заголовок и ссылку
+                title_elem = result.find('h3')
+                link_elem = result.find('a')
                 
-        except Exception as e:
-            return f"❌ Ошибка поиска в SerpAPI: {str(e)}"
+                if not title_elem or not link_elem:
+                    continue
+                
+                title = title_elem.get_text(strip=True)
+                link = link_elem.get('href', '')
+                
+                # Извлекаем описание
+                snippet_elem = result.find('span', class_='aCOpRe') or result.find('div', class_='VwiC3b')
+                snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+                
+                if title and link and link.startswith('http'):
+                    results.append({
+                        'title': title,
+                        'link': link,
+                        'snippet': snippet
+                    })
+                    
+            except Exception as e:
+                self.logger.warning(f"Ошибка парсинга результата Google: {e}")
+                continue
+        
+        return results
+    
+    def _fetch_serper(self, query: str, num_results: int, language: str) -> List[Dict[str, Any]]:
+        """Результаты Serper API"""
+        url = "https://google.serper.dev/search"
+        
+        payload = {
+            "q": query,
+            "num": num_results
+        }
+        
+        if language == "ru":
+            payload["gl"] = "ru"
+            payload["hl"] = "ru"
+        
+        headers = {
+            "X-API-KEY": self.serper_key,
+            "Content-Type": "application/json"
+        }
+        
+        response = requests.post(url, json=payload, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        # Извлекаем органические результаты
+        return [
+            {
+                'title': result.get('title', ''),
+                'link': result.get('link', ''),
+                'snippet': result.get('snippet', '')
+            }
+            for result in data.get('organic', [])[:num_results]
+        ]
+    
+    def _fetch_serpapi(self, query: str, num_results: int, language: str) -> List[Dict[str, Any]]:
+        """Результаты SerpAPI"""
+        url = "https://serpapi.com/search"
+        
+        params = {
+            "engine": "google",
+            "q": query,
+            "num": num_results,
+            "api_key": self.serpapi_key
+        }
+        
+        if language == "ru":
+            params["gl"] = "ru"
+            params["hl"] = "ru"
+        
+        response = requests.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        # Извлекаем органические результаты
+        return [
+            {
+                'title': result.get('title', ''),
+                'link': result.get('link', ''),
+                'snippet': result.get('snippet', '')
+            }
+            for result in data.get('organic_results', [])[:num_results]
+        ]
     
     def get_available_engines(self) -> List[str]:
         """Возвращает список доступных поисковых движков"""
@@ -350,4 +418,11 @@ class GopiAIWebSearchTool(BaseTool):
         if self.serpapi_key:
             engines.append("serpapi")
         
-        return engines
\ No newline at end of file
+        return engines
+    
+    def get_engine_stats(self) -> Dict[str, Dict[str, float]]:
+        """Статистика движков (задержка, доля ошибок, число вызовов) и кеша результатов"""
+        return {
+            "engines": _engine_stats.snapshot(),
+            "cache": {"hits": _search_cache.hits, "misses": _search_cache.misses},
+        }
@@ -19,17 +19,8 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtWidgets import QMenu
 from PySide6.QtWidgets import QMessageBox
 
-# Импорт виджетов моделей
-try:
-    from .unified_model_widget import UnifiedModelWidget
-    # Оставляем старые импорты для совместимости
-    from .openrouter_model_widget import OpenRouterModelWidget
-    from .model_selector_widget import ModelSelectorWidget
-except ImportError as e:
-    print(f"Не удалось импортировать виджеты моделей: {e}")
-    UnifiedModelWidget = None
-    OpenRouterModelWidget = None
-    ModelSelectorWidget = None
+# Виджеты моделей и браузер (QtWebEngine) импортируются лениво,
+# при первом создании соответствующей вкладки — это ускоряет запуск UI
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +31,6 @@ from .chat_async_handler import ChatAsyncHandler
 # from .optimized_chat_widget import OptimizedChatWidget  # Модуль не найден, закомментировано
 from .terminal_widget import TerminalWidget
 from gopiai.ui.utils.icon_helpers import create_icon_button
-from .enhanced_browser_widget import EnhancedBrowserWidget
 
 class ChatWidget(QWidget):
     
@@ -204,6 +194,11 @@ class ChatWidget(QWidget):
             logger.warning("⚠️ UnifiedModelsTab недоступен, используем fallback")
             
             # Fallback: старая вкладка OpenRouter
+            try:
+                from .openrouter_model_widget import OpenRouterModelWidget
+            except ImportError as e:
+                logger.warning(f"⚠️ OpenRouterModelWidget недоступен: {e}")
+                OpenRouterModelWidget = None
             if OpenRouterModelWidget:
                 self.openrouter_widget = OpenRouterModelWidget()
                 self.tab_widget.addTab(self.openrouter_widget, "OpenRouter")
@@ -316,6 +311,7 @@ class ChatWidget(QWidget):
                 return False
                 
             if self.browser_widget is None:
+                from .enhanced_browser_widget import EnhancedBrowserWidget
                 self.browser_widget = EnhancedBrowserWidget()
                 self.browser_widget.page_loaded.connect(self._on_browser_page_loaded)
                 logger.info("[BROWSER] Виджет браузера создан")
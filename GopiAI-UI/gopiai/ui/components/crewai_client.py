@@ -217,36 +217,53 @@ class CrewAIClient:
         # MCP клиент отключен по умолчанию, чтобы избежать ошибок отсутствия атрибута
         self.mcp_client = None
         
-        # Инициализация эмоционального классификатора
-        self.emotional_classifier = None
-        if EMOTIONAL_CLASSIFIER_AVAILABLE and AIRouterLLM and EmotionalClassifier:
-            try:
-                # Создаем AI Router для эмоционального классификатора
-                model_config_manager = None
-                try:
-                    from gopiai_integration.model_config_manager import get_model_config_manager
-                    model_config_manager = get_model_config_manager()
-                    logger.info("[INIT] ✅ ModelConfigManager успешно получен")
-                except Exception as mcm_error:
-                    logger.warning(f"[INIT] ⚠️ Не удалось получить ModelConfigManager: {mcm_error}")
-                    logger.info("[INIT] ℹ️ Будет использована заглушка ModelConfigManager")
-                
-                # Создаем экземпляр AIRouterLLM с явной передачей model_config_manager
-                # AIRouterLLM сам создаст заглушку, если model_config_manager=None
-                ai_router = AIRouterLLM(model_config_manager=model_config_manager)
-                
-                # Проверяем, что model_config_manager успешно инициализирован в ai_router
-                if hasattr(ai_router, 'model_config_manager') and ai_router.model_config_manager is not None:
-                    self.emotional_classifier = EmotionalClassifier(ai_router)
-                    logger.info("[INIT] ✅ Эмоциональный классификатор инициализирован с AI Router")
-                else:
-                    logger.error("[INIT] ❌ model_config_manager не инициализирован в AIRouterLLM")
-                    self.emotional_classifier = None
-            except Exception as e:
-                logger.error(f"[INIT] ❌ Ошибка инициализации эмоционального классификатора: {e}")
-                self.emotional_classifier = None
-        else:
+        # Эмоциональный классификатор (AIRouterLLM + EmotionalClassifier) создается
+        # лениво при первом анализе эмоций, чтобы не замедлять запуск UI
+        self._emotional_classifier = None
+        self._emotional_classifier_initialized = False
+
+    @property
+    def emotional_classifier(self):
+        """Эмоциональный классификатор, создаваемый при первом обращении"""
+        if not self._emotional_classifier_initialized:
+            self._emotional_classifier_initialized = True
+            self._emotional_classifier = self._create_emotional_classifier()
+        return self._emotional_classifier
+
+    @emotional_classifier.setter
+    def emotional_classifier(self, value):
+        self._emotional_classifier = value
+        self._emotional_classifier_initialized = True
+
+    def _create_emotional_classifier(self):
+        """Создает AIRouterLLM и EmotionalClassifier; None, если модули недоступны"""
+        if not (EMOTIONAL_CLASSIFIER_AVAILABLE and AIRouterLLM and EmotionalClassifier):
             logger.debug("[INIT] Эмоциональный классификатор недоступен или модули не импортированы")
+            return None
+        try:
+            # Создаем AI Router для эмоционального классификатора
+            model_config_manager = None
+            try:
+                from gopiai_integration.model_config_manager import get_model_config_manager
+                model_config_manager = get_model_config_manager()
+                logger.info("[INIT] ✅ ModelConfigManager успешно получен")
+            except Exception as mcm_error:
+                logger.warning(f"[INIT] ⚠️ Не удалось получить ModelConfigManager: {mcm_error}")
+                logger.info("[INIT] ℹ️ Будет использована заглушка ModelConfigManager")
+            
+            # Создаем экземпляр AIRouterLLM с явной передачей model_config_manager
+            # AIRouterLLM сам создаст заглушку, если model_config_manager=None
+            ai_router = AIRouterLLM(model_config_manager=model_config_manager)
+            
+            # Проверяем, что model_config_manager успешно инициализирован в ai_router
+            if hasattr(ai_router, 'model_config_manager') and ai_router.model_config_manager is not None:
+                logger.info("[INIT] ✅ Эмоциональный классификатор инициализирован с AI Router")
+                return EmotionalClassifier(ai_router)
+            logger.error("[INIT] ❌ model_config_manager не инициализирован в AIRouterLLM")
+            return None
+        except Exception as e:
+            logger.error(f"[INIT] ❌ Ошибка инициализации эмоционального классификатора: {e}")
+            return None
 
     def brave_search_site(self, query):
         """
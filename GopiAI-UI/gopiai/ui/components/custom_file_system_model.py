@@ -5,7 +5,7 @@ Custom File System Model с поддержкой иконок
 Кастомная модель файловой системы для интеграции с системой иконок GopiAI.
 """
 
-from typing import Any, Union
+from typing import Any, Dict, Optional, Union
 from PySide6.QtWidgets import QFileSystemModel
 from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt
 from PySide6.QtGui import QIcon
@@ -20,8 +20,9 @@ class CustomFileSystemModel(QFileSystemModel):
         self.icon_manager = icon_manager
         self.file_type_detector = FileTypeDetector()
         
-        # Кеш иконок для улучшения производительности
-        self._icon_cache = {}
+        # Кеш иконок по имени иконки (а не по пути файла): тысяча .py файлов
+        # использует одну запись. Сама растеризация кешируется в icon_manager.
+        self._icon_cache: Dict[str, QIcon] = {}
         
         print(f"[FILE SYSTEM] CustomFileSystemModel инициализирована с icon_manager: {type(icon_manager)}")
     
@@ -33,18 +34,22 @@ class CustomFileSystemModel(QFileSystemModel):
             return super().data(index, role)
 
         if role == Qt.ItemDataRole.DecorationRole and index.column() == 0:
-            # Получаем путь к файлу
-            file_path = self.filePath(index)
+            # Имя иконки определяем по имени файла, без лишних обращений к диску
+            icon_name = self.file_type_detector.get_icon_for_name(self.fileName(index), self.isDir(index))
 
             # Проверяем кеш
-            if file_path in self._icon_cache:
-                return self._icon_cache[file_path]
+            icon = self._icon_cache.get(icon_name)
+            if icon is not None:
+                return icon
 
             # Определяем иконку на основе типа файла
-            icon = self._get_icon_for_file(file_path)
+            icon = self._get_icon_by_name(icon_name)
+            if icon is None:
+                # Системные иконки не кешируем: их кеширует сам QFileSystemModel
+                return super().data(index, role)
 
             # Кешируем результат
-            self._icon_cache[file_path] = icon
+            self._icon_cache[icon_name] = icon
 
             return icon
 
@@ -53,27 +58,25 @@ class CustomFileSystemModel(QFileSystemModel):
     
     def _get_icon_for_file(self, file_path: str) -> QIcon:
         """Получает иконку для файла на основе его типа"""
-        if not self.icon_manager:
-            # Если нет менеджера иконок, возвращаем системную иконку
+        icon_name = self.file_type_detector.get_icon_for_file(file_path)
+        icon = self._get_icon_by_name(icon_name)
+        if icon is None:
+            # Fallback к системной иконке
             return super().data(self.index(file_path), Qt.ItemDataRole.DecorationRole) or QIcon()
+        return icon
+    
+    def _get_icon_by_name(self, icon_name: str) -> Optional[QIcon]:
+        """Получает иконку от менеджера иконок; None — использовать системную"""
+        if not self.icon_manager:
+            return None
         
         try:
-            # Определяем иконку через детектор типов файлов
-            icon_name = self.file_type_detector.get_icon_for_file(file_path)
-            
-            # Получаем иконку от менеджера
             icon = self.icon_manager.get_icon(icon_name)
-            
             if icon and not icon.isNull():
                 return icon
-            else:
-                # Fallback к системной иконке
-                return super().data(self.index(file_path), Qt.ItemDataRole.DecorationRole) or QIcon()
-                
         except Exception as e:
-            print(f"⚠️ Ошибка получения иконки для {file_path}: {e}")
-            # Fallback к системной иконке
-            return super().data(self.index(file_path), Qt.ItemDataRole.DecorationRole) or QIcon()
+            print(f"⚠️ Ошибка получения иконки {icon_name}: {e}")
+        return None
     
     def clear_icon_cache(self):
         """Очищает кеш иконок"""
@@ -61,7 +61,8 @@ class FileExplorerWidget(QWidget):
         # Импорт системы иконок
         try:
             from .icon_file_system_model import UniversalIconManager
-            self.icon_manager = UniversalIconManager()
+            # Общий экземпляр: кеш растеризованных иконок разделяется со всем UI
+            self.icon_manager = UniversalIconManager.instance()
             print("[OK] Загружена система иконок UniversalIconManager")
         except ImportError:
             self.icon_manager = None
@@ -151,7 +151,21 @@ class FileTypeDetector:
         Returns:
             Кортеж (тип_файла, имя_иконки)
         """
-        if os.path.isdir(file_path):
+        return cls.get_file_type_and_icon_by_name(file_path, os.path.isdir(file_path))
+    
+    @classmethod
+    def get_file_type_and_icon_by_name(cls, file_path: str, is_dir: bool = False) -> tuple[str, str]:
+        """
+        Определяет тип файла и иконку только по имени, без обращения к диску
+        
+        Args:
+            file_path: Путь или имя файла
+            is_dir: Является ли путь директорией (если уже известно вызывающему)
+            
+        Returns:
+            Кортеж (тип_файла, имя_иконки)
+        """
+        if is_dir:
             return ('folder', 'folder')
         
         # Получаем расширение файла
@@ -210,6 +224,21 @@ class FileTypeDetector:
         _, icon_name = cls.get_file_type_and_icon(file_path)
         return icon_name
     
+    @classmethod
+    def get_icon_for_name(cls, file_name: str, is_dir: bool = False) -> str:
+        """
+        Получает имя иконки по имени файла без обращения к диску
+        
+        Args:
+            file_name: Имя или путь файла
+            is_dir: Является ли элемент директорией
+            
+        Returns:
+            Имя иконки
+        """
+        _, icon_name = cls.get_file_type_and_icon_by_name(file_name, is_dir)
+        return icon_name
+    
     @classmethod
     def get_file_type(cls, file_path: str) -> str:
         """
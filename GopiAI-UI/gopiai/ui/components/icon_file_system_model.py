@@ -13,13 +13,15 @@ GopiAI Universal Icon Manager - Универсальный менеджер ик
 
 import os
 import sys
+import json
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Union, List
+from typing import Dict, Optional, Union, List, Tuple
 import logging
 
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QSize, Qt, QRect
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QPen, QFont
+from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QPen, QFont, QGuiApplication
 from PySide6.QtGui import QPainter
 
 # Константы
@@ -39,6 +41,24 @@ handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
 logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
+# Максимальное число растеризованных иконок в LRU-кеше
+ICON_CACHE_MAX_SIZE = 512
+
+# Дисковый атлас заранее отрисованных иконок (строится при первом запуске)
+ICON_ATLAS_DIR = Path.home() / ".gopiai" / "icon_atlas"
+ICON_ATLAS_VERSION = 1
+# Иконки, которые отрисовываются в атлас: типы файлов проводника и базовые действия
+ICON_ATLAS_PRELOAD = [
+    "folder", "file", "file-text", "code", "image", "table", "presentation",
+    "archive", "music", "video", "play", "settings", "type", "database",
+    "info", "box", "git-branch", "package", "hammer", "eye-off",
+    "file-plus", "folder-open", "save", "x", "plus", "minus", "menu",
+    "maximize", "minimize",
+]
+
+# Ключ кеша иконки: (имя, цвет, ширина, высота, device pixel ratio)
+IconCacheKey = Tuple[str, Optional[str], int, int, float]
+
 class UniversalIconManager:
     """Универсальный менеджер иконок"""
     
@@ -53,7 +73,11 @@ class UniversalIconManager:
     
     def __init__(self):
         """Инициализация менеджера иконок"""
-        self.icon_cache = {}
+        # LRU-кеш растеризованных иконок, ключ не зависит от пути файла
+        self.icon_cache: "OrderedDict[IconCacheKey, QIcon]" = OrderedDict()
+        self.max_cache_size = ICON_CACHE_MAX_SIZE
+        # Растеризованные иконки из дискового атласа (заполняется в load_icon_atlas)
+        self._atlas_pixmaps: Dict[IconCacheKey, QPixmap] = {}
         self.lucide_manager = None
         self.fallback_icons = {}
         self._fallback_icons_created = False
@@ -137,61 +161,36 @@ class UniversalIconManager:
         if isinstance(size, int):
             size = QSize(size, size)
         
-        # Создаем ключ для кеша
-        cache_key = f"{icon_name}_{color}_{size.width()}x{size.height()}"
+        # Создаем ключ для кеша: одна запись на (имя, цвет, размер, DPR)
+        dpr = self._device_pixel_ratio()
+        cache_key: IconCacheKey = (icon_name, color, size.width(), size.height(), dpr)
         
         # Проверяем кеш
-        if cache_key in self.icon_cache:
-            return self.icon_cache[cache_key]        # Пытаемся получить иконку из Lucide
-        icon = None
-        if self.lucide_manager is self and hasattr(self, 'lucide_icons'):
+        icon = self.icon_cache.get(cache_key)
+        if icon is not None:
+            self.icon_cache.move_to_end(cache_key)
+            return icon
+        
+        # Пытаемся взять готовую растровую иконку из атласа
+        atlas_pixmap = self._atlas_pixmaps.get(cache_key)
+        if atlas_pixmap is not None:
+            icon = QIcon(atlas_pixmap)
+        
+        # Пытаемся получить иконку из Lucide
+        if icon is None and self.lucide_manager is self and hasattr(self, 'lucide_icons'):
             # Используем встроенный менеджер Lucide иконок
             try:
                 if icon_name in self.lucide_icons:
-                    # Создаем QIcon из SVG данных
-                    svg_data = self.lucide_icons[icon_name]
-                    if color:
-                        # Заменяем цвет в SVG, если указан
-                        from PySide6.QtSvg import QSvgRenderer
-                        from PySide6.QtGui import QPixmap, QPainter
-                        
-                        # Создаем временный QPixmap для отрисовки иконки
-                        pixmap = QPixmap(size)
-                        pixmap.fill(Qt.GlobalColor.transparent)
-                        
-                        # Создаем рендерер SVG
-                        renderer = QSvgRenderer(bytes(svg_data, 'utf-8'))
-                        
-                        # Отрисовываем SVG на QPixmap с нужным цветом
-                        painter = QPainter(pixmap)
-                        renderer.render(painter)
-                        
-                        # Создаем QIcon из QPixmap
+                    pixmap = self._render_lucide_pixmap(icon_name, size, dpr)
+                    if pixmap is not None:
                         icon = QIcon(pixmap)
-                        painter.end()
-                    else:
-                        # Создаем QIcon напрямую из SVG данных, если цвет не указан
-                        from PySide6.QtSvg import QSvgRenderer
-                        from PySide6.QtGui import QPixmap, QPainter
-
-                        pixmap = QPixmap(size)
-                        pixmap.fill(Qt.GlobalColor.transparent)
-                        
-                        renderer = QSvgRenderer(bytes(svg_data, 'utf-8'))
-                        
-                        painter = QPainter(pixmap)
-                        renderer.render(painter)
-                        painter.end()
-                        
-                        icon = QIcon(pixmap)
-                    
                     logger.debug(f"Загружена Lucide иконка: {icon_name}")
                 else:
                     logger.debug(f"Lucide иконка не найдена: {icon_name}")
             except Exception as e:
                 logger.error(f"Ошибка при создании иконки {icon_name} из SVG: {e}")
                 icon = None
-        elif self.lucide_manager and self.lucide_manager is not self:
+        elif icon is None and self.lucide_manager and self.lucide_manager is not self:
             # Используем внешний менеджер Lucide иконок, если он есть
             try:
                 if hasattr(self.lucide_manager, "get_icon"):
@@ -218,10 +217,150 @@ class UniversalIconManager:
             else:
                 # Создаем универсальную fallback иконку
                 icon = self._create_fallback_icon(icon_name, size)
-          # Кешируем и возвращаем результат
-        self.icon_cache[cache_key] = icon
+        
+        # Кешируем и возвращаем результат
+        self._cache_icon(cache_key, icon)
         return icon
 
+    def _cache_icon(self, cache_key: IconCacheKey, icon: QIcon):
+        """Кладет иконку в LRU-кеш, вытесняя самые давно использованные"""
+        self.icon_cache[cache_key] = icon
+        self.icon_cache.move_to_end(cache_key)
+        while len(self.icon_cache) > self.max_cache_size:
+            self.icon_cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Очищает кеш растеризованных иконок"""
+        self.icon_cache.clear()
+
+    @staticmethod
+    def _device_pixel_ratio() -> float:
+        """Возвращает DPR основного экрана (1.0, если приложение еще не создано)"""
+        try:
+            screen = QGuiApplication.primaryScreen()
+            if screen is not None:
+                return float(screen.devicePixelRatio())
+        except Exception:
+            pass
+        return 1.0
+
+    def _render_lucide_pixmap(self, icon_name: str, size: QSize, dpr: float = 1.0) -> Optional[QPixmap]:
+        """Растеризует Lucide SVG в QPixmap с учетом device pixel ratio"""
+        from PySide6.QtSvg import QSvgRenderer
+
+        svg_data = self.lucide_icons.get(icon_name)
+        if svg_data is None:
+            return None
+
+        renderer = QSvgRenderer(bytes(svg_data, 'utf-8'))
+        if not renderer.isValid():
+            return None
+
+        pixmap = QPixmap(round(size.width() * dpr), round(size.height() * dpr))
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        renderer.render(painter)
+        painter.end()
+
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    # ------------------------------------------------------------------
+    # Дисковый атлас
+    # ------------------------------------------------------------------
+
+    def _atlas_signature(self) -> str:
+        """Подпись набора иконок: атлас перестраивается, если набор изменился"""
+        return f"v{ICON_ATLAS_VERSION}:{len(getattr(self, 'lucide_icons', {}))}"
+
+    def load_icon_atlas(self, size: int = 24, atlas_dir: Optional[Path] = None, build: bool = True) -> bool:
+        """
+        Загружает дисковый атлас заранее отрисованных иконок.
+
+        Атлас — один PNG со всеми иконками ICON_ATLAS_PRELOAD и JSON-индекс
+        с координатами. Если атласа нет или он устарел и build=True,
+        атлас строится и сохраняется (обычно при первом запуске).
+
+        Returns:
+            bool: True, если атлас загружен
+        """
+        if self.lucide_manager is not self:
+            return False
+
+        atlas_dir = Path(atlas_dir or ICON_ATLAS_DIR)
+        dpr = self._device_pixel_ratio()
+        stem = f"atlas_{size}_{dpr:g}x"
+        image_path = atlas_dir / f"{stem}.png"
+        index_path = atlas_dir / f"{stem}.json"
+
+        try:
+            index = None
+            if image_path.exists() and index_path.exists():
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get("signature") != self._atlas_signature():
+                    index = None
+
+            if index is None:
+                if not build:
+                    return False
+                index = self._build_icon_atlas(size, dpr, image_path, index_path)
+                if index is None:
+                    return False
+
+            atlas = QPixmap(str(image_path))
+            if atlas.isNull():
+                return False
+
+            for icon_name, (x, y, w, h) in index["icons"].items():
+                pixmap = atlas.copy(QRect(x, y, w, h))
+                pixmap.setDevicePixelRatio(dpr)
+                self._atlas_pixmaps[(icon_name, None, size, size, dpr)] = pixmap
+
+            logger.info(f"[OK] Загружен атлас иконок: {len(index['icons'])} иконок ({image_path.name})")
+            return True
+        except Exception as e:
+            logger.warning(f"Не удалось загрузить атлас иконок: {e}")
+            return False
+
+    def _build_icon_atlas(self, size: int, dpr: float, image_path: Path, index_path: Path) -> Optional[dict]:
+        """Отрисовывает иконки ICON_ATLAS_PRELOAD в один PNG и сохраняет индекс"""
+        names = [name for name in ICON_ATLAS_PRELOAD if name in self.lucide_icons]
+        if not names:
+            return None
+
+        cell = round(size * dpr)
+        columns = 16
+        rows = (len(names) + columns - 1) // columns
+        atlas = QPixmap(cell * columns, cell * rows)
+        atlas.fill(Qt.GlobalColor.transparent)
+
+        icons = {}
+        painter = QPainter(atlas)
+        try:
+            for i, name in enumerate(names):
+                pixmap = self._render_lucide_pixmap(name, QSize(size, size), dpr)
+                if pixmap is None:
+                    continue
+                x, y = (i % columns) * cell, (i // columns) * cell
+                painter.drawPixmap(QRect(x, y, cell, cell), pixmap)
+                icons[name] = [x, y, cell, cell]
+        finally:
+            painter.end()
+
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        if not atlas.save(str(image_path), "PNG"):
+            return None
+
+        index = {"signature": self._atlas_signature(), "size": size, "dpr": dpr, "icons": icons}
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+        logger.info(f"[OK] Построен атлас иконок: {len(icons)} иконок -> {image_path}")
+        return index
+
     def get_lucide_icon(self, icon_name: str, color: Optional[str] = None, size: Union[QSize, int] = 24) -> QIcon:
         """
         Совместимый шим-метод для Lucide: перенаправляет в get_icon.
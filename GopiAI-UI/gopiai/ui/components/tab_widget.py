@@ -22,8 +22,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QUrl, QPoint, QEvent, QSize
 from PySide6.QtGui import QPixmap
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEnginePage
+# QtWebEngine импортируется лениво в add_browser_tab: модуль тяжелый и нужен только браузеру
 from gopiai.ui.utils.icon_helpers import create_icon_button, get_icon
 
 import chardet
@@ -1136,7 +1135,8 @@ class TabDocumentWidget(QWidget):
             # 🔥 ИСПРАВЛЕНИЕ: Создаем персистентный профиль для сохранения данных
             import os
             from pathlib import Path
-            from PySide6.QtWebEngineCore import QWebEngineProfile
+            from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+            from PySide6.QtWebEngineWidgets import QWebEngineView
 
             # Создаем папку для профиля браузера в рабочей директории
             profile_dir = Path.home() / ".gopiai" / "browser_profile"
@@ -36,6 +36,14 @@ except ImportError:
             return ansi_escape.sub('', text)
 
 
+# Интервал сброса буфера вывода (~один кадр при 60 Гц)
+OUTPUT_FLUSH_INTERVAL_MS = 16
+# Максимальное число строк (блоков документа) в истории терминала
+MAX_SCROLLBACK_BLOCKS = 5000
+# Признак ANSI escape-последовательности
+ANSI_ESCAPE_CHAR = '\x1b'
+
+
 class InteractiveTerminal(QTextEdit):
     """Интерактивный терминал с поддержкой ввода команд (строго ВСТРОЕННЫЙ виджет, не окно)"""
     
@@ -57,6 +65,18 @@ class InteractiveTerminal(QTextEdit):
         self.setFont(QFont("Consolas", 10))
         self.setReadOnly(False)
 
+        # Ограничиваем историю: Qt сам удаляет старые блоки при превышении лимита
+        self.document().setMaximumBlockCount(MAX_SCROLLBACK_BLOCKS)
+
+        # Буфер вывода: куски stdout/stderr копятся и выводятся одним пакетом по таймеру,
+        # чтобы поток вывода в несколько мегабайт не блокировал GUI
+        self._output_buffer: list[tuple[str, bool]] = []  # (текст, is_stderr)
+        self._ansi_converter: Any = Ansi2HTMLConverter()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(OUTPUT_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush_output)
+
         # Процесс терминала
         self.process = QProcess(self)
         self.process.readyReadStandardOutput.connect(self.handle_stdout)
@@ -77,19 +97,50 @@ class InteractiveTerminal(QTextEdit):
 
     def handle_stdout(self):
         data = bytes(self.process.readAllStandardOutput().data()).decode('cp866')  # Декодируем в CP866 (для cmd.exe на русском)
-        converter: Any = Ansi2HTMLConverter()
-        html = converter.convert(data, full=False)
-        self.insertHtml(html)
-        self.insertPlainText(self.prompt)
-        self._scroll_to_bottom()
+        self._enqueue_output(data, is_stderr=False)
 
     def handle_stderr(self):
         data = bytes(self.process.readAllStandardError().data()).decode('cp866')  # Декодируем в CP866
-        # Не используем жесткие цвета — выводим как простой текст с пометкой stderr
-        converter: Any = Ansi2HTMLConverter()
-        text = converter.convert(data, full=False)
-        self.insertPlainText(f"[stderr] {text}")
-        self.insertPlainText(self.prompt)
+        self._enqueue_output(data, is_stderr=True)
+
+    def _enqueue_output(self, data: str, is_stderr: bool):
+        """Добавляет кусок вывода в буфер и планирует сброс на следующий кадр"""
+        if not data:
+            return
+        # Соседние куски одного потока склеиваем сразу, чтобы конвертировать их одним вызовом
+        if self._output_buffer and self._output_buffer[-1][1] == is_stderr:
+            text, _ = self._output_buffer[-1]
+            self._output_buffer[-1] = (text + data, is_stderr)
+        else:
+            self._output_buffer.append((data, is_stderr))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush_output(self):
+        """Выводит накопленный буфер одним пакетом и один раз прокручивает вниз"""
+        if not self._output_buffer:
+            return
+        chunks, self._output_buffer = self._output_buffer, []
+
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        try:
+            for text, is_stderr in chunks:
+                if is_stderr:
+                    # Не используем жесткие цвета — выводим как простой текст с пометкой stderr
+                    if ANSI_ESCAPE_CHAR in text:
+                        text = self._ansi_converter.convert(text, full=False)
+                    cursor.insertText(f"[stderr] {text}")
+                elif ANSI_ESCAPE_CHAR in text:
+                    cursor.insertHtml(self._ansi_converter.convert(text, full=False))
+                else:
+                    # Быстрый путь: без ANSI-кодов HTML-конвертация не нужна
+                    cursor.insertText(text)
+            cursor.insertText(self.prompt)
+        finally:
+            cursor.endEditBlock()
+        self.setTextCursor(cursor)
         self._scroll_to_bottom()
 
     def handle_state(self, state):
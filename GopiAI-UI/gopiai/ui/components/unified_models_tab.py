@@ -23,11 +23,8 @@ try:
 except ImportError:
     icon_manager = None
 
-# Импорт компонентов
-try:
-    from .openrouter_model_widget import OpenRouterModelWidget
-except ImportError:
-    OpenRouterModelWidget = None
+# OpenRouterModelWidget импортируется лениво при первом показе страницы OpenRouter
+from ..utils.lazy_components import LazyWidget
 
 logger = logging.getLogger(__name__)
 
@@ -123,17 +120,9 @@ class UnifiedModelsTab(QWidget):
         self.gemini_page = self._create_gemini_page()
         self.stacked_widget.addWidget(self.gemini_page)
         
-        # Страница OpenRouter
-        if OpenRouterModelWidget:
-            self.openrouter_page = OpenRouterModelWidget()
-            self.stacked_widget.addWidget(self.openrouter_page)
-            
-            # Подключаем сигналы OpenRouter
-            self.openrouter_page.model_selected.connect(self._on_openrouter_model_selected)
-        else:
-            # Заглушка, если OpenRouter недоступен
-            self.openrouter_page = self._create_openrouter_fallback()
-            self.stacked_widget.addWidget(self.openrouter_page)
+        # Страница OpenRouter: создается при первом показе
+        self.openrouter_page = LazyWidget(self._create_openrouter_page)
+        self.stacked_widget.addWidget(self.openrouter_page)
         
         layout.addWidget(self.stacked_widget)
         
@@ -177,6 +166,25 @@ class UnifiedModelsTab(QWidget):
         layout.addStretch()
         return page
     
+    def _create_openrouter_page(self):
+        """Создает страницу OpenRouter (импорт виджета откладывается до первого показа)"""
+        try:
+            from .openrouter_model_widget import OpenRouterModelWidget
+        except ImportError:
+            # Заглушка, если OpenRouter недоступен
+            return self._create_openrouter_fallback()
+        
+        page = OpenRouterModelWidget()
+        # Подключаем сигналы OpenRouter
+        page.model_selected.connect(self._on_openrouter_model_selected)
+        return page
+    
+    def _get_openrouter_widget(self):
+        """Возвращает виджет OpenRouter, если страница уже создана"""
+        if self.openrouter_page.is_created():
+            return self.openrouter_page.widget()
+        return None
+    
     def _create_openrouter_fallback(self):
         """Создает заглушку для OpenRouter, если он недоступен"""
         page = QWidget()
@@ -217,7 +225,7 @@ class UnifiedModelsTab(QWidget):
             logger.info(f"Переключение на провайдера: {new_provider}")
             # Синхронизируем провайдера с сервером (с текущей моделью, если есть)
             try:
-                current_model_getter = getattr(getattr(self, "openrouter_page", None), "get_selected_model_id", None)
+                current_model_getter = getattr(self._get_openrouter_widget(), "get_selected_model_id", None)
                 model_id = current_model_getter() if callable(current_model_getter) else None
                 model_id_str = str(model_id) if model_id is not None else None
                 self._sync_state_with_server(provider=new_provider, model_id=model_id_str)
@@ -262,7 +270,7 @@ class UnifiedModelsTab(QWidget):
             self.provider_changed.emit(provider)
             # Синхронизируем провайдера с сервером (с актуальной моделью если выбрана)
             try:
-                current_model_getter = getattr(getattr(self, "openrouter_page", None), "get_selected_model_id", None)
+                current_model_getter = getattr(self._get_openrouter_widget(), "get_selected_model_id", None)
                 model_id = current_model_getter() if callable(current_model_getter) else None
                 model_id_str = str(model_id) if model_id is not None else None
                 self._sync_state_with_server(provider=provider, model_id=model_id_str)
@@ -289,7 +297,7 @@ class UnifiedModelsTab(QWidget):
                 # Для OpenRouter нужно указать конкретную модель
                 # Пробуем получить текущую модель из OpenRouter виджета
                 try:
-                    current_model_getter = getattr(getattr(self, "openrouter_page", None), "get_selected_model_id", None)
+                    current_model_getter = getattr(self._get_openrouter_widget(), "get_selected_model_id", None)
                     if callable(current_model_getter):
                         model_id = current_model_getter()
                 except Exception:
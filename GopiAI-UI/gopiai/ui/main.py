@@ -13,6 +13,21 @@ GopiAI Standalone Interface - Модульная версия с централ
 
 import sys
 import os
+
+# --profile-startup[=путь.json]: профилировщик импортов (общий с GopiAI-CrewAI)
+# ставится раньше всех остальных импортов; отчет сохраняется после показа окна
+_crewai_root = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "GopiAI-CrewAI",
+)
+if any(arg.startswith("--profile-startup") for arg in sys.argv) and os.path.isdir(_crewai_root):
+    if _crewai_root not in sys.path:
+        sys.path.insert(0, _crewai_root)
+    import startup_profiler
+    startup_profiler.enable_from_argv(default_output="ui_startup_profile.json")
+else:
+    startup_profiler = None
+
 import warnings
 import logging
 from pathlib import Path
@@ -90,6 +105,11 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QAction, QPalette
 
+from gopiai.ui.utils.lazy_components import LazyComponentRegistry, StartupTimer
+
+# Замер фаз запуска (сводка печатается после показа окна)
+STARTUP_TIMER = StartupTimer()
+
 # Импорт компонентов тем
 try:
     from gopiai.ui.utils.theme_manager import ThemeManager
@@ -98,11 +118,15 @@ except ImportError as e:
     print(f"⚠️ Не удалось импортировать ThemeManager: {e}")
     ThemeManager = None
 
-try:
-    from gopiai.ui.dialogs.settings_dialog import GopiAISettingsDialog
-except ImportError as e:
-    print(f"⚠️ Не удалось импортировать GopiAISettingsDialog: {e}")
-    GopiAISettingsDialog = None
+
+def _get_settings_dialog_class():
+    """Ленивый импорт диалога настроек: модуль нужен только при открытии диалога"""
+    try:
+        from gopiai.ui.dialogs.settings_dialog import GopiAISettingsDialog
+        return GopiAISettingsDialog
+    except ImportError as e:
+        print(f"⚠️ Не удалось импортировать GopiAISettingsDialog: {e}")
+        return None
 
 # Добавляем правильные пути к tools для импорта gopiai_integration
 # Правильное формирование project_root
@@ -142,6 +166,7 @@ for p in module_paths:
     print(f"- {p} (существует: {os.path.exists(p)})")
 
 # Импорт модульных компонентов UI
+_components_import_started = datetime.now()
 try:
     from gopiai.ui.components import (
         StandaloneMenuBar,
@@ -155,6 +180,9 @@ try:
     )
 
     print("[OK] Все основные модули UI загружены успешно")
+    STARTUP_TIMER.record(
+        "import:components", (datetime.now() - _components_import_started).total_seconds()
+    )
     
     # Инициализация системы памяти GopiAI
     try:
@@ -296,22 +324,37 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
         self.TITLEBAR_HEIGHT = 40
         self.GRIP_SIZE = 10
         
+        # Тяжелые компоненты создаются при первом обращении
+        self._components = LazyComponentRegistry(STARTUP_TIMER)
+
         # Инициализация систем
-        self._init_theme_system()
-        self._setup_ui()
-        self._init_grips()
-        self._connect_menu_signals()
-        self._apply_vscode_like_layout()
-        self._setup_panel_shortcuts()
-
-        self.terminal_widget = TerminalWidget()
-        set_terminal_widget(self.terminal_widget)
+        with STARTUP_TIMER.phase("window:theme_system"):
+            self._init_theme_system()
+        with STARTUP_TIMER.phase("window:setup_ui"):
+            self._setup_ui()
+        with STARTUP_TIMER.phase("window:grips_menu_shortcuts"):
+            self._init_grips()
+            self._connect_menu_signals()
+            self._apply_vscode_like_layout()
+            self._setup_panel_shortcuts()
+
+        print("[OK] FramelessGopiAIStandaloneWindow готов к работе!")
+
+    @property
+    def terminal_widget(self):
+        """Терминал создается при первом обращении: он запускает процесс оболочки"""
+        return self._components.get("terminal")
+
+    def _create_terminal_widget(self):
+        """Фабрика терминала для реестра ленивых компонентов"""
+        terminal_widget = TerminalWidget(self)
+        set_terminal_widget(terminal_widget)
         try:
-            setattr(TerminalWidget, "instance", self.terminal_widget)  # type: ignore[attr-defined]
+            setattr(TerminalWidget, "instance", terminal_widget)  # type: ignore[attr-defined]
         except Exception:
             pass  # безопасно игнорируем, если класс не поддерживает атрибут
-
-        print("[OK] FramelessGopiAIStandaloneWindow готов к работе!")
+        self.terminal_dock.setWidget(terminal_widget)
+        return terminal_widget
 
 
     def _setup_ui(self):
@@ -357,13 +400,9 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
         self.tab_document.setMinimumWidth(500)
         center_vertical_splitter.addWidget(self.tab_document)
 
-        # Терминал — ТОЛЬКО по требованию через меню (по умолчанию скрыт)
-        self.terminal_widget = TerminalWidget(self)
-        set_terminal_widget(self.terminal_widget)
-        try:
-            setattr(TerminalWidget, "instance", self.terminal_widget)  # type: ignore[attr-defined]
-        except Exception:
-            pass
+        # Терминал — ТОЛЬКО по требованию через меню (по умолчанию скрыт).
+        # Сам виджет создается при первом показе дока (см. terminal_widget)
+        self._components.register("terminal", self._create_terminal_widget)
 
         self.terminal_dock = QDockWidget("Терминал", self)
         self.terminal_dock.setObjectName("terminal_dock")
@@ -375,7 +414,6 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
         self.terminal_dock.setFloating(True)
         # Убираем изначальную привязку: не добавляем в конкретную область дока
         # но оставляем как дочерний док-виджет главного окна
-        self.terminal_dock.setWidget(self.terminal_widget)
         # Не добавляем через addDockWidget, чтобы избежать принудительной привязки
         # self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.terminal_dock)
 
@@ -612,6 +650,8 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
                     return self.icon_manager.get_icon(name)
 
             self.icon_manager = SimpleIconManager()
+            # Готовые растровые иконки из дискового атласа (строится при первом запуске)
+            self.icon_manager.icon_manager.load_icon_atlas()
             self.icon_manager.get_icon("example")
             print("[OK] Система иконок SimpleIconManager инициализирована")
         except ImportError:
@@ -782,6 +822,7 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
             print("🔧 Создание диалога настроек...")
             
             # Проверяем доступность класса диалога настроек
+            GopiAISettingsDialog = _get_settings_dialog_class()
             if GopiAISettingsDialog is None:
                 print("⚠️ GopiAISettingsDialog недоступен")
                 from PySide6.QtWidgets import QMessageBox
@@ -856,7 +897,7 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
                 panels = settings_dict["show_panels"]
                 if "file_explorer" in panels:
                     self.file_explorer.setVisible(panels["file_explorer"])
-                if "terminal" in panels:
+                if "terminal" in panels and (panels["terminal"] or self._components.is_created("terminal")):
                     self.terminal_widget.setVisible(panels["terminal"])
                 if "chat" in panels:
                     self.chat_widget.setVisible(panels["chat"])
@@ -874,6 +915,7 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
         """Показать диалог настроек - упрощенная версия"""
         try:
             # Проверяем, что диалог настроек доступен
+            GopiAISettingsDialog = _get_settings_dialog_class()
             if GopiAISettingsDialog is None:
                 print("⚠️ GopiAISettingsDialog недоступен")
                 from PySide6.QtWidgets import QMessageBox
@@ -967,6 +1009,8 @@ class FramelessGopiAIStandaloneWindow(QMainWindow):
         """Переключение видимости терминала (плавающее окно по умолчанию)"""
         try:
             if not self.terminal_dock.isVisible():
+                # Создаем терминал при первом показе
+                self._components.get("terminal")
                 # Перед показом гарантируем плавающий режим
                 self.terminal_dock.setFloating(True)
                 # Опционально: выставим разумный стартовый размер и позицию
@@ -1142,6 +1186,10 @@ def main():
     except ImportError as e:
         print(f"[WARNING] Не удалось настроить логирование: {e}")
     
+    # QtWebEngine импортируется лениво (при открытии браузера), поэтому
+    # общий OpenGL-контекст нужно включить до создания QApplication
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+
     # Создание приложения
     app = QApplication(sys.argv)
     app.setApplicationName("GopiAI")
@@ -1156,8 +1204,19 @@ def main():
 
     try:
         # Создание и показ главного окна
-        window = FramelessGopiAIStandaloneWindow()
-        window.show()
+        with STARTUP_TIMER.phase("window:create"):
+            window = FramelessGopiAIStandaloneWindow()
+        with STARTUP_TIMER.phase("window:show"):
+            window.show()
+        # Сводку печатаем после первой итерации цикла событий (окно уже отрисовано)
+        QTimer.singleShot(0, lambda: print(STARTUP_TIMER.report()))
+
+        # Режим профилирования запуска: сохраняем отчет об импортах и выходим
+        if startup_profiler is not None and startup_profiler.get_active_profiler() is not None:
+            def _finish_startup_profile():
+                startup_profiler.finish()
+                app.quit()
+            QTimer.singleShot(0, _finish_startup_profile)
 
         print("[SUCCESS] GopiAI v0.3.0 успешно запущен!")
         print("[INFO] Модульная архитектура активна")
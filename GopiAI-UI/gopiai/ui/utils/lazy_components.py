@@ -0,0 +1,124 @@
+"""
+Ленивое создание компонентов UI и замер фаз запуска
+===================================================
+
+Тяжелые панели (браузер, OpenRouter, терминал, диалог настроек) не создаются
+при старте окна: они регистрируются фабриками и строятся при первом показе.
+StartupTimer замеряет фазы запуска и печатает сводку.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Замер длительности фаз запуска приложения"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Контекстный менеджер: замеряет одну фазу запуска"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float):
+        """Добавляет длительность фазы (в секундах)"""
+        self.phases.append((name, seconds))
+
+    def total(self) -> float:
+        """Время с момента создания таймера (в секундах)"""
+        return time.perf_counter() - self._started
+
+    def report(self) -> str:
+        """Формирует текстовую сводку по фазам запуска"""
+        lines = ["[STARTUP] Фазы запуска:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<32} {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'итого':<32} {self.total() * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+class LazyComponentRegistry:
+    """Реестр компонентов, создаваемых при первом обращении"""
+
+    def __init__(self, timer: Optional[StartupTimer] = None):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._timer = timer
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Регистрирует фабрику компонента (сам компонент не создается)"""
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Возвращает компонент, создавая его при первом обращении"""
+        if name in self._instances:
+            return self._instances[name]
+
+        factory = self._factories[name]
+        started = time.perf_counter()
+        instance = factory()
+        elapsed = time.perf_counter() - started
+
+        self._instances[name] = instance
+        if self._timer is not None:
+            self._timer.record(f"lazy:{name}", elapsed)
+        logger.info(f"[LAZY] Компонент '{name}' создан за {elapsed * 1000:.1f} ms")
+        return instance
+
+    def peek(self, name: str) -> Any:
+        """Возвращает компонент, только если он уже создан"""
+        return self._instances.get(name)
+
+    def is_created(self, name: str) -> bool:
+        """Проверяет, создан ли компонент"""
+        return name in self._instances
+
+    def reset(self, name: str):
+        """Забывает созданный экземпляр (следующий get создаст новый)"""
+        self._instances.pop(name, None)
+
+
+class LazyWidget(QWidget):
+    """Контейнер-заглушка, который строит содержимое при первом показе"""
+
+    def __init__(self, factory: Callable[[], QWidget],
+                 on_created: Optional[Callable[[QWidget], None]] = None, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._on_created = on_created
+        self._widget: Optional[QWidget] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def widget(self) -> QWidget:
+        """Возвращает содержимое, создавая его при необходимости"""
+        if self._widget is None:
+            self._widget = self._factory()
+            layout = self.layout()
+            if layout is not None:
+                layout.addWidget(self._widget)
+            if self._on_created is not None:
+                self._on_created(self._widget)
+        return self._widget
+
+    def is_created(self) -> bool:
+        """Проверяет, создано ли содержимое"""
+        return self._widget is not None
+
+    def showEvent(self, event):
+        self.widget()
+        super().showEvent(event)
@@ -0,0 +1,107 @@
+"""
+Benchmarks NumPy ANN search. Compares the blocked top n search with a full dense sort.
+
+Reports query latency and peak RSS for each method and checks both methods return the same ids.
+
+Install txtai to run (peak RSS uses the resource module, Unix only):
+    pip install txtai
+"""
+
+import argparse
+import multiprocessing
+
+import numpy as np
+
+from txtai.ann import ANNFactory
+
+from benchmarkutil import peakrss, timeit
+
+
+def fullsort(ann, queries, limit):
+    """
+    Original search method. Scores all rows at once and runs a full argsort.
+
+    Args:
+        ann: NumPy ANN
+        queries: queries array
+        limit: maximum results
+
+    Returns:
+        [(id, score)] per query
+    """
+
+    scores = np.dot(queries, ann.backend.T)
+    ids = np.argsort(-scores, kind="stable")[:, :limit]
+    return [list(zip(ids[x].tolist(), score[ids[x]].tolist())) for x, score in enumerate(scores)]
+
+
+def run(method, rows, dimensions, queries, limit, runs, output):
+    """
+    Runs a benchmark in the current process.
+
+    Args:
+        method: "blocked" or "fullsort"
+        rows: number of index rows
+        dimensions: vector dimensions
+        queries: number of queries per search call
+        limit: maximum results
+        runs: number of timed search calls
+        output: queue for results
+    """
+
+    generator = np.random.default_rng(0)
+    data = generator.random((rows, dimensions), dtype=np.float32)
+
+    # Normalize in place, np.linalg.norm allocates a temporary copy that would hide the search peak
+    data /= np.sqrt(np.einsum("ij,ij->i", data, data))[:, None]
+
+    query = generator.random((queries, dimensions), dtype=np.float32)
+    query /= np.linalg.norm(query, axis=1, keepdims=True)
+
+    ann = ANNFactory.create({"backend": "numpy", "dimensions": dimensions})
+    ann.index(data)
+    baseline = peakrss()
+
+    search = ann.search if method == "blocked" else lambda x, y: fullsort(ann, x, y)
+
+    timings, results = timeit(lambda: search(query, limit), runs)
+    output.put((np.median(timings), peakrss() - baseline, [[uid for uid, _ in result] for result in results]))
+
+
+def benchmark(rows, dimensions, queries, limit, runs):
+    """
+    Runs both methods in separate processes so peak RSS is measured independently.
+
+    Args:
+        rows: number of index rows
+        dimensions: vector dimensions
+        queries: number of queries per search call
+        limit: maximum results
+        runs: number of timed search calls
+    """
+
+    results = {}
+    for method in ["fullsort", "blocked"]:
+        output = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run, args=(method, rows, dimensions, queries, limit, runs, output))
+        process.start()
+        results[method] = output.get()
+        process.join()
+
+    for method, (latency, rss, _) in results.items():
+        print(f"{rows:>9} rows | {method:<8} | {latency:9.2f} ms/search | {rss:8.1f} MB peak RSS over index")
+
+    print(f"{rows:>9} rows | identical ids: {results['fullsort'][2] == results['blocked'][2]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NumPy ANN search benchmark")
+    parser.add_argument("-r", "--rows", type=int, nargs="+", default=[100000, 1000000], help="index sizes")
+    parser.add_argument("-d", "--dimensions", type=int, default=384, help="vector dimensions")
+    parser.add_argument("-q", "--queries", type=int, default=16, help="queries per search call")
+    parser.add_argument("-l", "--limit", type=int, default=10, help="maximum results")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="timed search calls")
+
+    args = parser.parse_args()
+    for size in args.rows:
+        benchmark(size, args.dimensions, args.queries, args.limit, args.runs)
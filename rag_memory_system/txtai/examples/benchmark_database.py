@@ -0,0 +1,87 @@
+"""
+Benchmarks loading content into the SQLite database backend. Compares bulk inserts with the previous row at a time inserts.
+
+Reports rows per second and final database file size for each method.
+
+Install txtai to run:
+    pip install txtai
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+from txtai.database import SQLite
+from txtai.database.schema import Statement
+
+from benchmarkutil import documents
+
+
+class RowSQLite(SQLite):
+    """
+    Previous insert method. Executes a statement per row and adapts the entry date for each row.
+    """
+
+    def entrydate(self):
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    def insertdocument(self, uid, data, tags, entry):
+        self.cursor.execute(Statement.INSERT_DOCUMENT, [uid, data, tags, entry])
+
+    def insertobject(self, uid, data, tags, entry):
+        self.cursor.execute(Statement.INSERT_OBJECT, [uid, data, tags, entry])
+
+    def insertsection(self, index, uid, text, tags, entry):
+        self.cursor.execute(Statement.INSERT_SECTION, [index, uid, text, tags, entry])
+
+
+def run(database, count, batch, path):
+    """
+    Loads documents into a database and saves it to path.
+
+    Args:
+        database: database instance
+        count: number of documents
+        batch: documents per insert call
+        path: output database file
+
+    Returns:
+        (rows per second, file size in MB)
+    """
+
+    start, index, rows = time.perf_counter(), 0, []
+    for document in documents(count):
+        rows.append(document)
+        if len(rows) == batch:
+            database.insert(rows, index)
+            index, rows = index + len(rows), []
+
+    if rows:
+        database.insert(rows, index)
+
+    database.save(path)
+    elapsed = time.perf_counter() - start
+    database.close()
+
+    # Each document writes a documents row and a sections row
+    return (count * 2) / elapsed, os.path.getsize(path) / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite content loading benchmark")
+    parser.add_argument("-d", "--documents", type=int, default=200000, help="number of documents")
+    parser.add_argument("-b", "--batch", type=int, default=1024, help="documents per insert call, matches the embeddings batch default")
+    parser.add_argument("-t", "--transaction", type=int, nargs="*", default=[0, 10000], help="bulk insert transaction sizes, 0 commits on save")
+
+    args = parser.parse_args()
+    output = tempfile.mkdtemp()
+
+    methods = [("row", RowSQLite({"content": "sqlite"}), None)]
+    for size in args.transaction:
+        methods.append((f"bulk tx={size}", SQLite({"content": "sqlite", "sqlite": {"transaction": size}}), size))
+
+    for name, db, _ in methods:
+        throughput, size = run(db, args.documents, args.batch, os.path.join(output, f"{name.replace(' ', '')}.sqlite"))
+        print(f"{name:<14} | {throughput:12.0f} rows/s | {size:8.1f} MB")
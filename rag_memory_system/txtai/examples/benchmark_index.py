@@ -0,0 +1,64 @@
+"""
+Benchmarks embeddings indexing throughput. Compares overlapped indexing stages with serial indexing.
+
+Reports documents per second for each mode. Uses a small local model, by default a randomly initialized
+BERT model is built in a temporary directory so that no model download is required.
+
+Install txtai and the following dependencies to run:
+    pip install txtai[vectors]
+"""
+
+import argparse
+
+import numpy as np
+
+from txtai import Embeddings
+
+from benchmarkutil import model, texts, timeit
+
+
+def run(path, data, stages, runs):
+    """
+    Indexes data and returns the best throughput.
+
+    Args:
+        path: model path
+        data: list of (id, text, tags)
+        stages: number of batches queued between stages, 0 for serial
+        runs: number of timed runs
+
+    Returns:
+        (documents per second, index embeddings)
+    """
+
+    embeddings = Embeddings(path=path, content=True, stages=stages, backend="numpy")
+
+    timings, _ = timeit(lambda: embeddings.index(data), runs)
+    vectors = np.array(embeddings.ann.backend)
+
+    embeddings.close()
+    return len(data) / (timings.min() / 1000), vectors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embeddings indexing throughput benchmark")
+    parser.add_argument("-d", "--documents", type=int, default=20000, help="number of documents")
+    parser.add_argument("-p", "--path", help="model path, defaults to a small randomly initialized local model")
+    parser.add_argument("-s", "--stages", type=int, default=2, help="batches queued between stages")
+    parser.add_argument("-n", "--runs", type=int, default=3, help="timed runs")
+
+    args = parser.parse_args()
+    random = np.random.default_rng(0)
+
+    words = [f"word{x}" for x in range(5000)]
+    path = args.path if args.path else model(words)
+    corpus = [(x, text, None) for x, text in enumerate(texts(args.documents, words, random))]
+
+    # Warm up model
+    run(path, corpus[:1000], 0, 1)
+
+    serial, expected = run(path, corpus, 0, args.runs)
+    overlapped, result = run(path, corpus, args.stages, args.runs)
+
+    print(f"serial     | {serial:10.1f} docs/s")
+    print(f"overlapped | {overlapped:10.1f} docs/s | {overlapped / serial:.2f}x | identical: {np.array_equal(expected, result)}")
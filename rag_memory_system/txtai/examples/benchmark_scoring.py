@@ -0,0 +1,137 @@
+"""
+Benchmarks sparse term index search on a synthetic Zipfian corpus. Compares the default term-at-a-time search
+with block-max search over impact ordered postings.
+
+Reports postings visited and p50/p99 query latency for each method.
+
+Install txtai to run:
+    pip install txtai
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from txtai.scoring import ScoringFactory
+
+
+def corpus(documents, vocabulary, length, exponent, generator):
+    """
+    Generates a synthetic corpus with Zipfian term frequencies.
+
+    Args:
+        documents: number of documents
+        vocabulary: vocabulary size
+        length: average document length
+        exponent: Zipf exponent
+        generator: random generator
+
+    Yields:
+        (id, tokens, tags)
+    """
+
+    # Term probabilities
+    probabilities = 1.0 / np.arange(1, vocabulary + 1) ** exponent
+    probabilities /= probabilities.sum()
+
+    # Document lengths and tokens, generated in chunks
+    for start in range(0, documents, 10000):
+        lengths = generator.poisson(length, min(10000, documents - start)) + 1
+        tokens = generator.choice(vocabulary, size=lengths.sum(), p=probabilities)
+        for x, chunk in enumerate(np.split(tokens, np.cumsum(lengths)[:-1])):
+            yield start + x, [f"t{token}" for token in chunk], None
+
+
+def queries(count, vocabulary, generator):
+    """
+    Generates queries mixing head and long-tail terms.
+
+    Args:
+        count: number of queries
+        vocabulary: vocabulary size
+        generator: random generator
+
+    Returns:
+        list of queries
+    """
+
+    results = []
+    for _ in range(count):
+        # One to four terms, at least one long-tail term
+        head = generator.integers(0, 100, generator.integers(0, 3))
+        tail = generator.integers(100, vocabulary, generator.integers(1, 3))
+        results.append([f"t{x}" for x in np.concatenate([head, tail])])
+
+    return results
+
+
+def run(terms, method, queryset, limit):
+    """
+    Runs a set of queries.
+
+    Args:
+        terms: terms index
+        method: "default" or "blockmax"
+        queryset: list of queries
+        limit: maximum results
+
+    Returns:
+        (latencies in ms, postings visited)
+    """
+
+    # Search delegates to block-max when it's enabled, disable it to time the default search
+    blocksize = terms.blocksize
+    if method != "blockmax":
+        terms.blocksize = None
+
+    latencies, visited = [], 0
+    for query in queryset:
+        start = time.perf_counter()
+        if method == "blockmax":
+            _, count = terms.blockmax(query, limit)
+        else:
+            terms.search(query, limit)
+
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        # Default search reads every posting of every query term
+        if method != "blockmax":
+            count = sum(len(uids) for uids, _ in (terms.weights(term) for term in set(query)) if uids is not None)
+
+        visited += count
+
+    terms.blocksize = blocksize
+    return latencies, visited
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sparse term index search benchmark")
+    parser.add_argument("-d", "--documents", type=int, default=1000000, help="number of documents")
+    parser.add_argument("-v", "--vocabulary", type=int, default=100000, help="vocabulary size")
+    parser.add_argument("-a", "--average", type=int, default=30, help="average document length")
+    parser.add_argument("-z", "--zipf", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("-q", "--queries", type=int, default=200, help="number of queries")
+    parser.add_argument("-l", "--limit", type=int, default=10, help="maximum results")
+    parser.add_argument("-b", "--blocksize", type=int, default=1024, help="block-max block size")
+
+    args = parser.parse_args()
+    random = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    scoring = ScoringFactory.create({"method": "bm25", "terms": {"blockmax": args.blocksize}})
+    scoring.index(corpus(args.documents, args.vocabulary, args.average, args.zipf, random))
+    print(f"Indexed {args.documents} documents in {time.perf_counter() - start:.1f}s")
+
+    index, queryset = scoring.terms, queries(args.queries, args.vocabulary, random)
+
+    # Warm up term weight and impact caches so both methods are timed on scoring only
+    for name in ["default", "blockmax"]:
+        run(index, name, queryset, args.limit)
+
+    for name in ["default", "blockmax"]:
+        timings, postings = run(index, name, queryset, args.limit)
+        print(
+            f"{name:<8} | postings visited {postings:>12} | "
+            f"p50 {np.percentile(timings, 50):8.2f} ms | p99 {np.percentile(timings, 99):8.2f} ms"
+        )
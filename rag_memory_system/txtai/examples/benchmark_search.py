@@ -0,0 +1,124 @@
+"""
+Benchmarks hybrid score fusion. Compares array based fusion with the previous per result dictionary loop.
+
+Runs a fusion only microbenchmark with synthetic candidates and an end to end batchsearch over a hybrid index.
+
+Install txtai to run:
+    pip install txtai
+"""
+
+import argparse
+
+import numpy as np
+
+from txtai import Embeddings
+from txtai.embeddings.search import Search
+
+from benchmarkutil import timeit, transform
+
+
+def loop(self, dense, sparse, weights, limit):
+    """
+    Previous fusion method. Combines scores one result at a time with a dictionary per query.
+
+    Args:
+        dense: list of dense (id, score) per query
+        sparse: list of sparse (id, score) per query
+        weights: [dense weight, sparse weight]
+        limit: maximum results
+
+    Returns:
+        list of (id, score) per query
+    """
+
+    results = []
+    for vectors in zip(dense, sparse):
+        uids = {}
+        for v, scores in enumerate(vectors):
+            for r, (uid, score) in enumerate(scores if weights[v] > 0 else []):
+                if uid not in uids:
+                    uids[uid] = 0.0
+
+                if self.scoring.isnormalized():
+                    uids[uid] += score * weights[v]
+                else:
+                    uids[uid] += (1.0 / (r + 1)) * weights[v]
+
+        results.append(sorted(uids.items(), key=lambda x: x[1], reverse=True)[:limit])
+
+    return results
+
+
+def fusion(embeddings, queries, depth, runs):
+    """
+    Benchmarks fusion only with synthetic candidates.
+
+    Args:
+        embeddings: hybrid embeddings instance
+        queries: number of queries
+        depth: candidates per query and index
+        runs: number of runs
+    """
+
+    generator = np.random.default_rng(0)
+    search = Search(embeddings)
+
+    def candidates():
+        results = []
+        for _ in range(queries):
+            ids = generator.choice(depth * 4, depth, replace=False).tolist()
+            scores = np.sort(generator.random(depth))[::-1].tolist()
+            results.append(list(zip(ids, scores)))
+
+        return results
+
+    dense, sparse = candidates(), candidates()
+    for normalize in [False, True]:
+        embeddings.scoring.normalize = normalize
+        name = "convex" if normalize else "rrf"
+
+        baseline, expected = timeit(lambda: loop(search, dense, sparse, [0.5, 0.5], depth), runs)
+        latency, result = timeit(lambda: search.fuse(dense, sparse, [0.5, 0.5], depth), runs)
+        print(f"fusion {name:<6} | loop {np.median(baseline):8.2f} ms | array {np.median(latency):8.2f} ms | identical: {result == expected}")
+
+    embeddings.scoring.normalize = False
+
+
+def batchsearch(embeddings, queries, depth, runs):
+    """
+    Benchmarks an end to end hybrid batchsearch.
+
+    Args:
+        embeddings: hybrid embeddings instance
+        queries: number of queries
+        depth: search limit
+        runs: number of runs
+    """
+
+    texts = [f"document {x} topic {x % 97} group {x % 13}" for x in range(queries)]
+
+    fuse = Search.fuse
+    try:
+        Search.fuse = loop
+        baseline, expected = timeit(lambda: embeddings.batchsearch(texts, depth), runs)
+    finally:
+        Search.fuse = fuse
+
+    latency, result = timeit(lambda: embeddings.batchsearch(texts, depth), runs)
+    print(f"batchsearch   | loop {np.median(baseline):8.2f} ms | array {np.median(latency):8.2f} ms | identical: {result == expected}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hybrid score fusion benchmark")
+    parser.add_argument("-d", "--documents", type=int, default=20000, help="number of indexed documents")
+    parser.add_argument("-q", "--queries", type=int, default=64, help="number of queries per batch")
+    parser.add_argument("-k", "--depth", type=int, default=1000, help="candidate depth")
+    parser.add_argument("-n", "--runs", type=int, default=10, help="timed runs")
+
+    args = parser.parse_args()
+
+    index = Embeddings(method="external", transform=transform, hybrid=True, backend="numpy")
+    index.index(f"document {x} topic {x % 97} group {x % 13}" for x in range(args.documents))
+
+    fusion(index, args.queries, args.depth, args.runs)
+    batchsearch(index, args.queries, args.depth, args.runs)
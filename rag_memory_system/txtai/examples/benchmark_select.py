@@ -0,0 +1,65 @@
+"""
+Benchmarks large select queries over a content index. Compares the default list of dicts output with columnar and Arrow outputs.
+
+Reports rows per second for each output format and database backend. Vectors are randomly generated, no model download is required.
+
+Install txtai and the following dependencies to run:
+    pip install txtai[database]
+"""
+
+import argparse
+
+from txtai import Embeddings
+
+from benchmarkutil import documents, timeit, transform
+
+
+def run(embeddings, query, limit, output, repeat):
+    """
+    Runs query and returns the best rows per second over repeat runs.
+
+    Args:
+        embeddings: embeddings instance
+        query: query to run
+        limit: maximum results
+        output: result format
+        repeat: number of runs
+
+    Returns:
+        (rows per second, number of rows)
+    """
+
+    timings, result = timeit(lambda: embeddings.search(query, limit, output=output), repeat)
+    rows = result.num_rows if output == "arrow" else len(next(iter(result.values()))) if output else len(result)
+
+    return rows / (timings.min() / 1000), rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Select query output format benchmark")
+    parser.add_argument("-b", "--backends", nargs="+", default=["sqlite"], help="content backends, sqlite and/or duckdb")
+    parser.add_argument("-d", "--documents", type=int, default=100000, help="number of documents")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="number of runs per query, best run is reported")
+
+    args = parser.parse_args()
+
+    queries = [
+        ("select", "select id, text, topic from txtai"),
+        ("similar", "select id, score from txtai where similar('document about topic 5')"),
+    ]
+
+    for backend in args.backends:
+        embeddings = Embeddings(method="external", transform=transform, content=backend)
+        embeddings.index(documents(args.documents))
+
+        for name, query in queries:
+            baseline = None
+            for output in [None, "columns", "arrow"]:
+                throughput, rows = run(embeddings, query, args.documents, output, args.repeat)
+                baseline = baseline if baseline else throughput
+
+                print(
+                    f"{backend:<7} | {name:<8} | {output if output else 'dicts':<8} | {rows:7d} rows | {throughput:12.0f} rows/s | {throughput / baseline:5.2f}x"
+                )
+
+        embeddings.close()
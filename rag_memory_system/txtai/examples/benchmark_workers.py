@@ -0,0 +1,77 @@
+"""
+Benchmarks CPU encoding with encoder worker processes. Reports throughput, speedup over a single process and peak memory
+per worker for each worker count.
+
+Uses a small local model, by default a randomly initialized BERT model is built in a temporary directory so that no model
+download is required.
+
+Install txtai and the following dependencies to run:
+    pip install txtai[vectors]
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from txtai.vectors import VectorsFactory
+
+from benchmarkutil import model, texts, timeit
+
+
+def run(path, data, batch, workers):
+    """
+    Encodes data in batches and returns throughput and peak memory per worker.
+
+    Args:
+        path: model path
+        data: list of text
+        batch: number of inputs per vectorize call
+        workers: number of encoder worker processes, 0 encodes in the current process
+
+    Returns:
+        (documents per second, peak MB per worker, embeddings)
+    """
+
+    vectors = VectorsFactory.create({"path": path, "gpu": False, "workers": workers}, None)
+
+    # Warm up worker processes
+    vectors.vectorize(data[:batch], workers=True)
+
+    timings, embeddings = timeit(
+        lambda: np.concatenate([vectors.vectorize(data[x : x + batch], workers=True) for x in range(0, len(data), batch)]), 1
+    )
+    throughput = len(data) / (timings[0] / 1000)
+
+    memory = [x / (1024 * 1024) for x in vectors.workers.memory.values()] if vectors.workers else []
+    vectors.close()
+
+    return throughput, memory, embeddings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encoder worker processes benchmark")
+    parser.add_argument("-d", "--documents", type=int, default=8192, help="number of documents")
+    parser.add_argument("-b", "--batch", type=int, default=1024, help="inputs per vectorize call")
+    parser.add_argument("-p", "--path", help="model path, defaults to a small randomly initialized local model")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts")
+
+    args = parser.parse_args()
+    random = np.random.default_rng(0)
+
+    words = [f"word{x}" for x in range(5000)]
+    path = args.path if args.path else model(words, hidden=256, layers=4)
+    corpus = texts(args.documents, words, random)
+
+    print(f"CPU cores: {os.cpu_count()}")
+
+    baseline, _, expected = run(path, corpus, args.batch, 0)
+    print(f"single process | {baseline:9.1f} docs/s")
+
+    for count in args.workers:
+        throughput, memory, result = run(path, corpus, args.batch, count)
+        print(
+            f"{count:>2} workers     | {throughput:9.1f} docs/s | {throughput / baseline:5.2f}x | "
+            f"peak MB per worker: {', '.join(f'{x:.0f}' for x in memory)} | "
+            f"max abs diff: {np.abs(result - expected).max():.1e}"
+        )
@@ -0,0 +1,127 @@
+"""
+Shared helpers for the component benchmark scripts (benchmark_*.py). Builds synthetic data and models, times functions
+and reports peak memory.
+
+Scripts import this module as a sibling, run them from this directory or as examples/benchmark_<name>.py.
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+def model(vocabulary, hidden=128, layers=2):
+    """
+    Builds a small randomly initialized BERT model, so that no model download is required.
+
+    Args:
+        vocabulary: list of words
+        hidden: hidden size, attention heads and intermediate size are derived from it
+        layers: number of hidden layers
+
+    Returns:
+        model path
+    """
+
+    # Only the model based benchmarks require transformers
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    path = tempfile.mkdtemp()
+
+    # Write vocabulary and create tokenizer
+    vocab = os.path.join(path, "vocab.txt")
+    with open(vocab, "w", encoding="utf-8") as output:
+        output.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + vocabulary))
+
+    BertTokenizerFast(vocab).save_pretrained(path)
+
+    # Create model
+    config = BertConfig(
+        vocab_size=len(vocabulary) + 5, hidden_size=hidden, num_hidden_layers=layers, num_attention_heads=hidden // 64, intermediate_size=hidden * 4
+    )
+    BertModel(config).save_pretrained(path)
+
+    return path
+
+
+def texts(count, vocabulary, generator):
+    """
+    Generates random texts of 10 to 60 words.
+
+    Args:
+        count: number of texts
+        vocabulary: list of words
+        generator: random generator
+
+    Returns:
+        list of text
+    """
+
+    return [" ".join(generator.choice(vocabulary, length)) for length in generator.integers(10, 60, count)]
+
+
+def documents(count):
+    """
+    Generates synthetic documents with a text field and metadata.
+
+    Args:
+        count: number of documents
+
+    Returns:
+        generator of (id, data, tags)
+    """
+
+    for x in range(count):
+        yield (x, {"text": f"document {x} about topic {x % 97} in group {x % 13}", "topic": x % 97, "group": x % 13}, None)
+
+
+def transform(data):
+    """
+    Deterministic normalized pseudo embeddings, avoids downloading a model.
+
+    Args:
+        data: list of inputs
+
+    Returns:
+        embeddings array
+    """
+
+    vectors = np.array([np.random.default_rng(abs(hash(x)) % (2**32)).random(64) for x in data], dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def timeit(function, runs):
+    """
+    Runs function and times each run.
+
+    Args:
+        function: function to run
+        runs: number of runs
+
+    Returns:
+        (latencies in ms, last result)
+    """
+
+    timings, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return np.array(timings), result
+
+
+def peakrss():
+    """
+    Peak resident set size of this process in MB. Uses the resource module, Unix only.
+
+    Returns:
+        peak RSS
+    """
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
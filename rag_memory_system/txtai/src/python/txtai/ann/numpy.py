@@ -25,6 +25,12 @@ class NumPy(ANN):
         quantize = self.config.get("quantize")
         self.qbits = quantize if quantize and isinstance(quantize, int) and not isinstance(quantize, bool) else None
 
+        # Number of rows scored at a time during search
+        self.blocksize = self.setting("blocksize", 32768)
+
+        # Lookup table with the number of bits set for each uint8 value, built on first hamming search
+        self.table = None
+
     def load(self, path):
         # Load array from file
         try:
@@ -57,23 +63,33 @@ class NumPy(ANN):
         self.backend[ids] = self.tensor(self.zeros((len(ids), self.backend.shape[1])))
 
     def search(self, queries, limit):
-        if self.qbits:
-            # Calculate hamming score for integer vectors
-            scores = self.hammingscore(queries)
-        else:
-            # Dot product on normalized vectors is equal to cosine similarity
-            scores = self.dot(self.tensor(queries), self.backend.T)
+        # Running top n ids and scores per query
+        ids, scores = None, None
 
-        # Get topn ids
-        ids = self.argsort(-scores)[:, :limit]
+        # Convert queries once, blocks are scored against the same queries
+        queries = self.tensor(queries)
 
-        # Map results to [(id, score)]
-        results = []
-        for x, score in enumerate(scores):
-            # Add results
-            results.append(list(zip(ids[x].tolist(), score[ids[x]].tolist())))
+        # Score the index in blocks to bound memory and keep a running top n per query
+        for start in range(0, self.backend.shape[0], self.blocksize):
+            block = self.backend[start : start + self.blocksize]
+
+            if self.qbits:
+                # Calculate hamming score for integer vectors
+                blockscores = self.hammingscore(queries, block)
+            else:
+                # Dot product on normalized vectors is equal to cosine similarity
+                blockscores = self.dot(queries, block.T)
 
-        return results
+            # Select top n from block and merge with running results
+            blockids, blockscores = self.topn(blockscores, limit, start)
+            ids, scores = (blockids, blockscores) if ids is None else self.merge(ids, scores, blockids, blockscores, limit)
+
+        if ids is None:
+            return [[] for _ in range(queries.shape[0])]
+
+        # Map results to [(id, score)]
+        ids, scores = np.asarray(self.numpy(ids)), np.asarray(self.numpy(scores))
+        return [list(zip(x.tolist(), score.tolist())) for x, score in zip(ids, scores)]
 
     def count(self):
         # Get count of non-zero rows (ignores deleted rows)
@@ -134,7 +150,68 @@ class NumPy(ANN):
 
         return {"numpy": np.__version__}
 
-    def hammingscore(self, queries):
+    def topn(self, scores, limit, offset):
+        """
+        Selects the top n scores for each query using a partial sort. Ties are ordered by id.
+
+        Args:
+            scores: scores array with a row per query
+            limit: maximum results
+            offset: id of the first column in scores
+
+        Returns:
+            (ids, scores) sorted by score descending
+        """
+
+        scores = np.asarray(scores)
+        if limit < scores.shape[1]:
+            # Partial selection of the top n columns
+            ids = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+
+            # Rows where ties at the boundary score were partially selected need a stable selection
+            kth = np.take_along_axis(scores, ids, axis=1).min(axis=1, keepdims=True)
+            ties = (scores == kth).sum(axis=1) != (np.take_along_axis(scores, ids, axis=1) == kth).sum(axis=1)
+            for x in np.flatnonzero(ties):
+                ids[x] = np.argsort(-scores[x], kind="stable")[:limit]
+        else:
+            ids = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+
+        return self.order(ids + offset, np.take_along_axis(scores, ids, axis=1), limit)
+
+    def merge(self, ids, scores, blockids, blockscores, limit):
+        """
+        Merges running top n results with the top n results of the next block.
+
+        Args:
+            ids: running ids
+            scores: running scores
+            blockids: block ids
+            blockscores: block scores
+            limit: maximum results
+
+        Returns:
+            (ids, scores) sorted by score descending
+        """
+
+        return self.order(self.cat((ids, blockids), axis=1), self.cat((scores, blockscores), axis=1), limit)
+
+    def order(self, ids, scores, limit):
+        """
+        Sorts results by score descending then id ascending and keeps the top n.
+
+        Args:
+            ids: ids array
+            scores: scores array
+            limit: maximum results
+
+        Returns:
+            (ids, scores)
+        """
+
+        indices = np.lexsort((ids, -scores), axis=1)[:, :limit]
+        return np.take_along_axis(ids, indices, axis=1), np.take_along_axis(scores, indices, axis=1)
+
+    def hammingscore(self, queries, backend=None):
         """
         Calculates a hamming distance score.
 
@@ -144,21 +221,22 @@ class NumPy(ANN):
 
         Args:
             queries: queries array
+            backend: rows to score, defaults to the full index
 
         Returns:
             scores
         """
 
-        # Build table of number of bits for each distinct uint8 value
-        table = 1 << np.arange(8)
-        table = self.tensor(np.array([np.count_nonzero(x & table) for x in np.arange(256)]))
+        # Build table of number of bits for each distinct uint8 value once
+        if self.table is None:
+            self.table = self.tensor(np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64))
 
         # Number of different bits
-        delta = self.xor(self.tensor(queries[:, None]), self.backend)
+        delta = self.xor(self.tensor(queries[:, None]), self.backend if backend is None else backend)
 
         # Cast to long array
         delta = self.totype(delta, np.int64)
 
         # Calculate score as 1.0 - percentage of different bits
         # Bound score from 0 to 1
-        return self.clip(1.0 - (table[delta].sum(axis=2) / (self.config["dimensions"] * 8)), 0.0, 1.0)
+        return self.clip(1.0 - (self.table[delta].sum(axis=2) / (self.config["dimensions"] * 8)), 0.0, 1.0)
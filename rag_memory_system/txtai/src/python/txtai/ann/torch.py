@@ -36,3 +36,14 @@ class Torch(NumPy):
 
     def settings(self):
         return {"torch": torch.__version__}
+
+    def topn(self, scores, limit, offset):
+        # Select top n on the device
+        scores, ids = torch.topk(scores, min(limit, scores.shape[1]), dim=1)
+        return self.order(ids + offset, scores, limit)
+
+    def order(self, ids, scores, limit):
+        # Sort by id then stable sort by score descending, same order as NumPy
+        ids, indices = torch.sort(ids, dim=1)
+        scores, indices = torch.sort(torch.gather(scores, 1, indices), dim=1, descending=True, stable=True)
+        return torch.gather(ids, 1, indices)[:, :limit], scores[:, :limit]
@@ -3,11 +3,15 @@ Cluster module
 """
 
 import asyncio
+import atexit
 import json
 import random
 import urllib.parse
 import zlib
 
+from queue import Queue
+from threading import Lock, Thread
+
 import aiohttp
 
 from ..database.sql import Aggregate
@@ -18,6 +22,9 @@ class Cluster:
     Aggregates multiple embeddings shards into a single logical embeddings instance.
     """
 
+    # End of responses message
+    COMPLETE = object()
+
     # pylint: disable = W0231
     def __init__(self, config=None):
         """
@@ -35,9 +42,16 @@ class Cluster:
         if "shards" in self.config:
             self.shards = self.config["shards"]
 
+        # Search deadline per shard in seconds, shards that miss the deadline are dropped from search results
+        self.timeout = self.config.get("timeout")
+
         # Query aggregator
         self.aggregate = Aggregate()
 
+        # Long-lived event loop thread and HTTP session, started on first request
+        self.loop, self.thread, self.session = None, None, None
+        self.lock = Lock()
+
     def search(self, query, limit=None, weights=None, index=None, parameters=None, graph=False):
         """
         Finds documents most similar to the input query. This method will run either an index search
@@ -52,7 +66,8 @@ class Cluster:
             graph: return graph results if True
 
         Returns:
-            list of {id: value, score: value} for index search, list of dict for an index + database search
+            list of {id: value, score: value} for index search, list of dict for an index + database search.
+            Shards that missed the search deadline are listed in the dropped attribute.
         """
 
         # Build URL
@@ -68,16 +83,12 @@ class Cluster:
         if graph is not None:
             action += f"&graph={graph}"
 
-        # Run query and flatten results into single results list
-        results = []
-        for result in self.execute("get", action):
-            results.extend(result)
-
-        # Combine aggregate functions and sort
-        results = self.aggregate(query, results)
+        # Run query and merge results as each shard responds
+        merge = Merge(self.aggregate, query, limit if limit else 10)
+        for x, result in self.stream("get", action, timeout=self.timeout):
+            merge(self.shards[x], result)
 
-        # Limit results
-        return results[: (limit if limit else 10)]
+        return merge.results()
 
     def batchsearch(self, queries, limit=None, weights=None, index=None, parameters=None, graph=False):
         """
@@ -93,7 +104,8 @@ class Cluster:
             graph: return graph results if True
 
         Returns:
-            list of {id: value, score: value} per query for index search, list of dict per query for an index + database search
+            list of {id: value, score: value} per query for index search, list of dict per query for an index + database search.
+            Shards that missed the search deadline are listed in the dropped attribute of each query result.
         """
 
         # POST parameters
@@ -109,20 +121,13 @@ class Cluster:
         if graph is not None:
             params["graph"] = graph
 
-        # Run query
-        batch = self.execute("post", "batchsearch", [params] * len(self.shards))
-
-        # Combine results per query
-        results = []
-        for x, query in enumerate(queries):
-            result = []
-            for section in batch:
-                result.extend(section[x])
+        # Run query and merge results per query as each shard responds
+        merges = [Merge(self.aggregate, query, limit if limit else 10) for query in queries]
+        for x, batch in self.stream("post", "batchsearch", [params] * len(self.shards), self.timeout):
+            for y, merge in enumerate(merges):
+                merge(self.shards[x], batch[y] if batch is not None else None)
 
-            # Aggregate, sort and limit results
-            results.append(self.aggregate(query, result)[: (limit if limit else 10)])
-
-        return results
+        return [merge.results() for merge in merges]
 
     def add(self, documents):
         """
@@ -182,6 +187,23 @@ class Cluster:
 
         return sum(self.execute("get", "count"))
 
+    def close(self):
+        """
+        Closes the HTTP session and stops the event loop thread.
+        """
+
+        with self.lock:
+            if self.loop:
+                if self.session:
+                    asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result()
+
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join()
+                self.loop.close()
+
+                self.loop, self.thread, self.session = None, None, None
+                atexit.unregister(self.close)
+
     def shard(self, documents):
         """
         Splits documents into equal sized shards.
@@ -209,7 +231,7 @@ class Cluster:
 
     def execute(self, method, action, data=None):
         """
-        Executes a HTTP action asynchronously.
+        Executes a HTTP action against all shards and waits for all shards to respond.
 
         Args:
             method: get or post
@@ -217,28 +239,61 @@ class Cluster:
             data: post parameters
 
         Returns:
-            json results if any
+            json results if any, in shard order
+        """
+
+        results = dict(self.stream(method, action, data))
+        return [results[x] for x in sorted(results)]
+
+    def stream(self, method, action, data=None, timeout=None):
+        """
+        Executes a HTTP action against all shards. Results are yielded as each shard responds.
+
+        Args:
+            method: get or post
+            action: url action to perform
+            data: post parameters
+            timeout: deadline per shard in seconds, shards that miss the deadline return None
+
+        Returns:
+            generator of (shard index, json results)
         """
 
         # Get urls
         urls = [f"{shard}/{action}" for shard in self.shards]
-        close = False
 
-        # Use existing loop if available, otherwise create one
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            close = True
+        # Run requests on the event loop thread, responses are queued as each shard responds
+        queue = Queue()
+        future = asyncio.run_coroutine_threadsafe(self.run(urls, method, data, timeout, queue), self.start())
 
-        try:
-            return loop.run_until_complete(self.run(urls, method, data))
-        finally:
-            # Close loop if it was created in this method
-            if close:
-                loop.close()
+        response = queue.get()
+        while response is not Cluster.COMPLETE:
+            yield response
+            response = queue.get()
+
+        # Raise request errors, if any
+        future.result()
+
+    def start(self):
+        """
+        Starts the event loop thread that runs HTTP requests, if necessary.
+
+        Returns:
+            event loop
+        """
 
-    async def run(self, urls, method, data):
+        with self.lock:
+            if not self.loop:
+                self.loop = asyncio.new_event_loop()
+                self.thread = Thread(target=self.loop.run_forever, daemon=True)
+                self.thread.start()
+
+                # Close session at exit while the event loop thread is still running
+                atexit.register(self.close)
+
+        return self.loop
+
+    async def run(self, urls, method, data, timeout, queue):
         """
         Runs an async action.
 
@@ -246,22 +301,46 @@ class Cluster:
             urls: run against this list of urls
             method: get or post
             data: list of data for each url or None
-
-        Returns:
-            json results if any
+            timeout: deadline per url in seconds
+            queue: output queue for (url index, json results)
         """
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
-            tasks = []
+        # Create long-lived session. Each shard has a pool of keepalive connections that are reused across requests.
+        if not self.session:
+            connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.config.get("connections", 32))
+            self.session = aiohttp.ClientSession(connector=connector, raise_for_status=True)
 
+        try:
+            tasks = []
             for x, url in enumerate(urls):
                 if method == "post":
                     if not data or data[x]:
-                        tasks.append(asyncio.ensure_future(self.post(session, url, data[x] if data else None)))
+                        tasks.append(self.request(x, self.post(self.session, url, data[x] if data else None), timeout, queue))
                 else:
-                    tasks.append(asyncio.ensure_future(self.get(session, url)))
+                    tasks.append(self.request(x, self.get(self.session, url), timeout, queue))
+
+            await asyncio.gather(*tasks)
+
+        finally:
+            queue.put(Cluster.COMPLETE)
+
+    async def request(self, x, request, timeout, queue):
+        """
+        Runs an async request with a deadline and queues the result.
+
+        Args:
+            x: url index
+            request: request coroutine
+            timeout: deadline in seconds, waits until the request completes if None
+            queue: output queue for (url index, json results)
+        """
 
-            return await asyncio.gather(*tasks)
+        try:
+            result = await asyncio.wait_for(request, timeout)
+        except asyncio.TimeoutError:
+            result = None
+
+        queue.put((x, result))
 
     async def get(self, session, url):
         """
@@ -293,3 +372,73 @@ class Cluster:
 
         async with session.post(url, json=data) as resp:
             return await resp.json()
+
+
+class Merge:
+    """
+    Merges partial search results as each shard responds. Results are sorted and limited as shards respond. Results with
+    aggregate columns are combined once all shards respond.
+    """
+
+    def __init__(self, aggregate, query, limit):
+        """
+        Creates a new Merge.
+
+        Args:
+            aggregate: query aggregator
+            query: input query
+            limit: maximum results
+        """
+
+        self.aggregate, self.query, self.limit = aggregate, query, limit
+
+        # Merged rows, shards that missed the deadline and if rows have aggregate columns
+        self.rows, self.dropped, self.combine = [], [], False
+
+    def __call__(self, shard, result):
+        """
+        Merges results from a shard.
+
+        Args:
+            shard: shard url
+            result: shard results, None if the shard missed the deadline
+        """
+
+        if result is None:
+            self.dropped.append(shard)
+
+        elif result:
+            self.rows.extend(result)
+
+            # Aggregate columns can only be combined once all shards respond
+            self.combine = self.combine or (isinstance(result[0], dict) and bool(self.aggregate.aggcolumns(result[0].keys())))
+            if not self.combine:
+                self.rows = self.aggregate(self.query, self.rows)[: self.limit]
+
+    def results(self):
+        """
+        Gets merged results.
+
+        Returns:
+            Results
+        """
+
+        return Results(self.aggregate(self.query, self.rows)[: self.limit] if self.combine else self.rows, self.dropped)
+
+
+class Results(list):
+    """
+    List of merged cluster search results. Shards that missed the search deadline are listed in dropped.
+    """
+
+    def __init__(self, results, dropped):
+        """
+        Creates a new Results list.
+
+        Args:
+            results: merged results
+            dropped: list of shard urls that missed the search deadline
+        """
+
+        super().__init__(results)
+        self.dropped = dropped
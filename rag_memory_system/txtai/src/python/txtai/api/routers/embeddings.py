@@ -37,6 +37,9 @@ def search(query: str, request: Request):
     # Execute search
     results = application.get().search(query, request=request)
 
+    # Cluster shards that missed the search deadline
+    dropped = getattr(results, "dropped", None)
+
     # Encode using standard FastAPI encoder but skip certain classes
     results = jsonable_encoder(
         results, custom_encoder={bytes: lambda x: x, BytesIO: lambda x: x, PIL.Image.Image: lambda x: x, Graph: lambda x: x.savedict()}
@@ -44,7 +47,7 @@ def search(query: str, request: Request):
 
     # Return raw response to prevent duplicate encoding
     response = ResponseFactory.create(request)
-    return response(results)
+    return response(results, headers={"X-Dropped-Shards": ",".join(dropped)} if dropped else None)
 
 
 # pylint: disable=W0621
@@ -77,6 +80,9 @@ def batchsearch(
     # Execute search
     results = application.get().batchsearch(queries, limit, weights, index, parameters, graph)
 
+    # Cluster shards that missed the search deadline
+    dropped = sorted({shard for result in results for shard in getattr(result, "dropped", [])})
+
     # Encode using standard FastAPI encoder but skip certain classes
     results = jsonable_encoder(
         results, custom_encoder={bytes: lambda x: x, BytesIO: lambda x: x, PIL.Image.Image: lambda x: x, Graph: lambda x: x.savedict()}
@@ -84,7 +90,7 @@ def batchsearch(
 
     # Return raw response to prevent duplicate encoding
     response = ResponseFactory.create(request)
-    return response(results)
+    return response(results, headers={"X-Dropped-Shards": ",".join(dropped)} if dropped else None)
 
 
 @router.post("/add")
@@ -113,7 +113,7 @@ class Database:
 
         raise NotImplementedError
 
-    def search(self, query, similarity=None, limit=None, parameters=None, indexids=False):
+    def search(self, query, similarity=None, limit=None, parameters=None, indexids=False, output=None):
         """
         Runs a search against the database. Supports the following methods:
 
@@ -134,10 +134,14 @@ class Database:
             similarity: similarity results as [(indexid, score)]
             limit: maximum number of results to return
             parameters: dict of named parameters to bind to placeholders
+            indexids: results are returned as [(indexid, score)] regardless of select clause parameters if True
+            output: result format, defaults to a list of dicts, "columns" returns {column: list of values} and
+                    "arrow" returns a pyarrow.Table
 
         Returns:
             query results as a list of dicts
             list of ([indexid, score]) if indexids is True
+            columnar results if output is set
         """
 
         # Parse query if necessary
@@ -161,7 +165,7 @@ class Database:
         query["where"] = where
 
         # Run query
-        return self.query(query, limit, parameters, indexids)
+        return self.query(query, limit, parameters, indexids, output)
 
     def parse(self, query):
         """
@@ -202,7 +206,7 @@ class Database:
 
         raise NotImplementedError
 
-    def query(self, query, limit, parameters, indexids):
+    def query(self, query, limit, parameters, indexids, output=None):
         """
         Executes query against database.
 
@@ -211,6 +215,8 @@ class Database:
             limit: maximum number of results to return
             parameters: dict of named parameters to bind to placeholders
             indexids: results are returned as [(indexid, score)] regardless of select clause parameters if True
+            output: result format, defaults to a list of dicts, "columns" returns {column: list of values} and
+                    "arrow" returns a pyarrow.Table
 
         Returns:
             query results
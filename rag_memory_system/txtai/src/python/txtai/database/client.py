@@ -93,15 +93,22 @@ class Client(RDBMS):
         # Flush cached objects
         self.connection.flush()
 
-    def insertdocument(self, uid, data, tags, entry):
-        self.connection.add(Document(id=uid, data=data, tags=tags, entry=entry))
+    def commit(self):
+        # Commit session and database connection
+        self.connection.commit()
+        self.dbconnection.commit()
+
+    def insertdocuments(self, rows):
+        self.connection.execute(insert(Document), [{"id": uid, "data": data, "tags": tags, "entry": entry} for uid, data, tags, entry in rows])
 
-    def insertobject(self, uid, data, tags, entry):
-        self.connection.add(Object(id=uid, object=data, tags=tags, entry=entry))
+    def insertobjects(self, rows):
+        self.connection.execute(insert(Object), [{"id": uid, "object": data, "tags": tags, "entry": entry} for uid, data, tags, entry in rows])
 
-    def insertsection(self, index, uid, text, tags, entry):
-        # Save text section
-        self.connection.add(Section(indexid=index, id=uid, text=text, tags=tags, entry=entry))
+    def insertsections(self, rows):
+        # Save text sections
+        self.connection.execute(
+            insert(Section), [{"indexid": index, "id": uid, "text": text, "tags": tags, "entry": entry} for index, uid, text, tags, entry in rows]
+        )
 
     def createbatch(self):
         # Create temporary batch table, if necessary
@@ -38,19 +38,32 @@ class DuckDB(Embedded):
         # Call parent method with DuckDB compatible arguments
         return super().execute(function, *self.formatargs(args))
 
-    def insertdocument(self, uid, data, tags, entry):
-        # Delete existing document
-        self.cursor.execute(DuckDB.DELETE_DOCUMENT, [uid])
+    def commit(self):
+        # Commit and start a new transaction
+        self.connection.commit()
+        self.connection.begin()
+
+    def insertdocuments(self, rows):
+        # Delete existing documents
+        self.cursor.executemany(DuckDB.DELETE_DOCUMENT, [[uid] for uid, _, _, _ in rows])
+
+        # Call parent method
+        super().insertdocuments(rows)
+
+    def insertobjects(self, rows):
+        # Delete existing objects
+        self.cursor.executemany(DuckDB.DELETE_OBJECT, [[uid] for uid, _, _, _ in rows])
 
         # Call parent method
-        super().insertdocument(uid, data, tags, entry)
+        super().insertobjects(rows)
 
-    def insertobject(self, uid, data, tags, entry):
-        # Delete existing object
-        self.cursor.execute(DuckDB.DELETE_OBJECT, [uid])
+    def arrow(self, names):
+        # Fetch Arrow table directly from DuckDB when there are no duplicate columns to merge
+        if len(set(names)) == len(names):
+            return self.cursor.fetch_arrow_table()
 
         # Call parent method
-        super().insertobject(uid, data, tags, entry)
+        return super().arrow(names)
 
     def connect(self, path=":memory:"):
         # Create connection and start a transaction
@@ -5,6 +5,17 @@ RDBMS module
 import datetime
 import json
 
+from itertools import islice
+from operator import itemgetter
+
+# Conditional import
+try:
+    import pyarrow as pa
+
+    PYARROW = True
+except ImportError:
+    PYARROW = False
+
 from .base import Database
 from .schema import Statement
 
@@ -30,6 +41,13 @@ class RDBMS(Database):
         self.connection = None
         self.cursor = None
 
+        # Rows queued for bulk inserts
+        self.documents, self.objects, self.sections = [], [], []
+
+        # Number of rows per transaction, commits only on save when not set
+        self.transaction = self.setting("transaction")
+        self.written = 0
+
     def load(self, path):
         # Load an existing database. Thread locking must be handled externally.
         self.session(path)
@@ -39,7 +57,7 @@ class RDBMS(Database):
         self.initialize()
 
         # Get entry date
-        entry = datetime.datetime.now(datetime.timezone.utc)
+        entry = self.entrydate()
 
         # Insert documents
         for uid, document, tags in documents:
@@ -62,6 +80,13 @@ class RDBMS(Database):
                 self.loadsection(index, uid, document, tags, entry)
                 index += 1
 
+            # Write queued rows once a full transaction is queued
+            if self.transaction and self.queued() >= self.transaction:
+                self.flush()
+
+        # Write remaining queued rows
+        self.flush()
+
         # Post processing logic
         self.finalize()
 
@@ -174,7 +199,11 @@ class RDBMS(Database):
         return Statement.IDS_CLAUSE % batch
 
     # pylint: disable=R0912
-    def query(self, query, limit, parameters, indexids):
+    def query(self, query, limit, parameters, indexids, output=None):
+        # Validate output format
+        if output not in (None, "columns", "arrow"):
+            raise ValueError(f"Invalid output format: {output}")
+
         # Extract query components
         select = query.get("select", self.defaults())
         where = query.get("where")
@@ -217,9 +246,17 @@ class RDBMS(Database):
         args = (query, parameters) if parameters else (query,)
         self.execute(self.cursor.execute, *args)
 
+        # Return (indexid, score) rows, select clause is always "indexid, score" when indexids is True
+        if indexids:
+            return [(row[0], row[1]) for row in self.rows()]
+
         # Retrieve column list from query
         columns = [c[0] for c in self.cursor.description]
 
+        # Return columnar results, if necessary
+        if output:
+            return self.arrow(columns) if output == "arrow" else self.columns(columns)
+
         # Map results and return
         results = []
         for row in self.rows():
@@ -236,8 +273,7 @@ class RDBMS(Database):
 
             results.append(result)
 
-        # Transform results, if necessary
-        return [(x["indexid"], x["score"]) for x in results] if indexids else results
+        return results
 
     def initialize(self):
         """
@@ -286,6 +322,56 @@ class RDBMS(Database):
         Post processing logic run after inserting a batch of documents. Default method is no-op.
         """
 
+    def entrydate(self):
+        """
+        Generates the entry date for a batch of inserted rows.
+
+        Returns:
+            entry date
+        """
+
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    def queued(self):
+        """
+        Number of rows queued for insert.
+
+        Returns:
+            number of queued rows
+        """
+
+        return len(self.documents) + len(self.objects) + len(self.sections)
+
+    def flush(self):
+        """
+        Inserts all queued rows in bulk. Commits the current transaction once the configured transaction size is reached.
+        """
+
+        rows = self.queued()
+
+        # Bulk insert queued rows
+        if self.documents:
+            self.insertdocuments(self.documents)
+        if self.objects:
+            self.insertobjects(self.objects)
+        if self.sections:
+            self.insertsections(self.sections)
+
+        self.documents, self.objects, self.sections = [], [], []
+
+        # Commit every transaction rows, if enabled
+        self.written += rows
+        if self.transaction and self.written >= self.transaction:
+            self.commit()
+            self.written = 0
+
+    def commit(self):
+        """
+        Commits the current transaction.
+        """
+
+        self.connection.commit()
+
     def loaddocument(self, uid, document, tags, entry):
         """
         Applies pre-processing logic and inserts a document.
@@ -319,7 +405,7 @@ class RDBMS(Database):
 
     def insertdocument(self, uid, data, tags, entry):
         """
-        Inserts a document.
+        Queues a document for insert.
 
         Args:
             uid: unique id
@@ -328,7 +414,17 @@ class RDBMS(Database):
             entry: generated entry date
         """
 
-        self.cursor.execute(Statement.INSERT_DOCUMENT, [uid, data, tags, entry])
+        self.documents.append((uid, data, tags, entry))
+
+    def insertdocuments(self, rows):
+        """
+        Inserts a batch of documents.
+
+        Args:
+            rows: list of (uid, data, tags, entry)
+        """
+
+        self.cursor.executemany(Statement.INSERT_DOCUMENT, rows)
 
     def loadobject(self, uid, obj, tags, entry):
         """
@@ -347,7 +443,7 @@ class RDBMS(Database):
 
     def insertobject(self, uid, data, tags, entry):
         """
-        Inserts an object.
+        Queues an object for insert.
 
         Args:
             uid: unique id
@@ -356,7 +452,17 @@ class RDBMS(Database):
             entry: generated entry date
         """
 
-        self.cursor.execute(Statement.INSERT_OBJECT, [uid, data, tags, entry])
+        self.objects.append((uid, data, tags, entry))
+
+    def insertobjects(self, rows):
+        """
+        Inserts a batch of objects.
+
+        Args:
+            rows: list of (uid, data, tags, entry)
+        """
+
+        self.cursor.executemany(Statement.INSERT_OBJECT, rows)
 
     def loadsection(self, index, uid, text, tags, entry):
         """
@@ -374,7 +480,7 @@ class RDBMS(Database):
 
     def insertsection(self, index, uid, text, tags, entry):
         """
-        Inserts a section.
+        Queues a section for insert.
 
         Args:
             index: index id
@@ -384,8 +490,17 @@ class RDBMS(Database):
             entry: generated entry date
         """
 
-        # Save text section
-        self.cursor.execute(Statement.INSERT_SECTION, [index, uid, text, tags, entry])
+        self.sections.append((index, uid, text, tags, entry))
+
+    def insertsections(self, rows):
+        """
+        Inserts a batch of sections.
+
+        Args:
+            rows: list of (index, uid, text, tags, entry)
+        """
+
+        self.cursor.executemany(Statement.INSERT_SECTION, rows)
 
     def reindexstart(self):
         """
@@ -492,6 +607,55 @@ class RDBMS(Database):
         if scores:
             self.cursor.executemany(Statement.INSERT_SCORE, [(i, sum(s) / len(s)) for i, s in scores.items()])
 
+    def columns(self, names, decode=True):
+        """
+        Reads results for last executed query as columns. Rows are transposed into columns without creating a dict per row.
+
+        Args:
+            names: list of result column names
+            decode: decodes the object column when True, otherwise objects are returned as encoded bytes
+
+        Returns:
+            {column name: list of values}
+        """
+
+        # Transpose rows into columns a chunk at a time. Rows are released after each chunk, which keeps large
+        # results from triggering full garbage collection passes.
+        values, rows = [[] for _ in names], iter(self.rows())
+        chunk = list(islice(rows, 1024))
+        while chunk:
+            for x, column in enumerate(values):
+                column.extend(map(itemgetter(x), chunk))
+
+            chunk = list(islice(rows, 1024))
+
+        results = {}
+        for name, column in zip(names, values):
+            # In cases with duplicate column names, find one with a value
+            results[name] = [x if x is not None else y for x, y in zip(results[name], column)] if name in results else column
+
+        # Decode objects
+        if decode and self.encoder and self.object in results:
+            results[self.object] = [self.encoder.decode(x) for x in results[self.object]]
+
+        return results
+
+    def arrow(self, names):
+        """
+        Reads results for last executed query as an Arrow table. Objects are returned as encoded bytes.
+
+        Args:
+            names: list of result column names
+
+        Returns:
+            pyarrow.Table
+        """
+
+        if not PYARROW:
+            raise ImportError('PyArrow is not available - install "database" extra to enable')
+
+        return pa.table(self.columns(names, False))
+
     def defaults(self):
         """
         Returns a list of default columns when there is no select clause.
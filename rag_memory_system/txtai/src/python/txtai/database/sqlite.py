@@ -23,6 +23,10 @@ class SQLite(Embedded):
 
         return connection
 
+    def entrydate(self):
+        # Format once per batch instead of once per row, same format as the default sqlite3 datetime adapter
+        return super().entrydate().isoformat(" ")
+
     def getcursor(self):
         return self.connection.cursor()
 
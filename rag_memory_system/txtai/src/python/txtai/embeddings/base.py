@@ -355,7 +355,7 @@ class Embeddings:
         # Default to 0 when no suitable method found
         return 0
 
-    def search(self, query, limit=None, weights=None, index=None, parameters=None, graph=False):
+    def search(self, query, limit=None, weights=None, index=None, parameters=None, graph=False, output=None):
         """
         Finds documents most similar to the input query. This method runs an index search, index + database search
         or a graph search, depending on the embeddings configuration and query.
@@ -367,17 +367,20 @@ class Embeddings:
             index: index name, if applicable
             parameters: dict of named parameters to bind to placeholders
             graph: return graph results if True
+            output: index + database search result format, defaults to a list of dicts, "columns" returns
+                    {column: list of values} and "arrow" returns a pyarrow.Table
 
         Returns:
             list of (id, score) for index search
             list of dict for an index + database search
+            columnar results for an index + database search when output is set
             graph when graph is set to True
         """
 
-        results = self.batchsearch([query], limit, weights, index, [parameters], graph)
+        results = self.batchsearch([query], limit, weights, index, [parameters], graph, output)
         return results[0] if results else results
 
-    def batchsearch(self, queries, limit=None, weights=None, index=None, parameters=None, graph=False):
+    def batchsearch(self, queries, limit=None, weights=None, index=None, parameters=None, graph=False, output=None):
         """
         Finds documents most similar to the input query. This method runs an index search, index + database search
         or a graph search, depending on the embeddings configuration and query.
@@ -389,10 +392,13 @@ class Embeddings:
             index: index name, if applicable
             parameters: list of dicts of named parameters to bind to placeholders
             graph: return graph results if True
+            output: index + database search result format, defaults to a list of dicts, "columns" returns
+                    {column: list of values} and "arrow" returns a pyarrow.Table
 
         Returns:
             list of (id, score) per query for index search
             list of dict per query for an index + database search
+            columnar results per query for an index + database search when output is set
             list of graph per query when graph is set to True
         """
 
@@ -400,7 +406,7 @@ class Embeddings:
         graph = graph if self.graph else False
 
         # Execute search
-        results = Search(self, indexids=graph)(queries, limit, weights, index, parameters)
+        results = Search(self, indexids=graph, output=output)(queries, limit, weights, index, parameters)
 
         # Create subgraphs using results, if necessary
         return [self.graph.filter(x) if isinstance(x, list) else x for x in results] if graph else results
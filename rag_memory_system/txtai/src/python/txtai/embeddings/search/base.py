@@ -4,6 +4,10 @@ Search module
 
 import logging
 
+from operator import itemgetter
+
+import numpy as np
+
 from .errors import IndexNotFoundError
 from .scan import Scan
 
@@ -16,7 +20,7 @@ class Search:
     Executes a batch search action. A search can be both index and/or database driven.
     """
 
-    def __init__(self, embeddings, indexids=False, indexonly=False):
+    def __init__(self, embeddings, indexids=False, indexonly=False, output=None):
         """
         Creates a new search action.
 
@@ -24,11 +28,14 @@ class Search:
             embeddings: embeddings instance
             indexids: searches return indexids when True, otherwise run standard search
             indexonly: always runs an index search even when a database is available
+            output: index + database search result format, defaults to a list of dicts, "columns" returns
+                    {column: list of values} and "arrow" returns a pyarrow.Table
         """
 
         self.embeddings = embeddings
         self.indexids = indexids or indexonly
         self.indexonly = indexonly
+        self.output = output
 
         # Alias embeddings attributes
         self.ann = embeddings.ann
@@ -55,6 +62,7 @@ class Search:
         Returns:
             list of (id, score) per query for index search
             list of dict per query for an index + database search
+            columnar results per query for an index + database search when output is set
             list of graph results for a graph index search
         """
 
@@ -112,27 +120,7 @@ class Search:
             if isinstance(weights, (int, float)):
                 weights = [weights, 1 - weights]
 
-            # Create weighted scores
-            results = []
-            for vectors in zip(dense, sparse):
-                uids = {}
-                for v, scores in enumerate(vectors):
-                    for r, (uid, score) in enumerate(scores if weights[v] > 0 else []):
-                        # Initialize score
-                        if uid not in uids:
-                            uids[uid] = 0.0
-
-                        # Create hybrid score
-                        #  - Convex Combination when sparse scores are normalized
-                        #  - Reciprocal Rank Fusion (RRF) when sparse scores aren't normalized
-                        if self.scoring.isnormalized():
-                            uids[uid] += score * weights[v]
-                        else:
-                            uids[uid] += (1.0 / (r + 1)) * weights[v]
-
-                results.append(sorted(uids.items(), key=lambda x: x[1], reverse=True)[:limit])
-
-            return results
+            return self.fuse(dense, sparse, weights, limit)
 
         # Raise an error if when no indexes are available
         if not sparse and not dense:
@@ -141,6 +129,122 @@ class Search:
         # Return single query results
         return dense if dense else sparse
 
+    def fuse(self, dense, sparse, weights, limit):
+        """
+        Combines dense and sparse results into hybrid scores. Candidates for the whole batch are grouped and scored
+        with array operations.
+
+        Hybrid scores are calculated as follows.
+
+          - Convex Combination when sparse scores are normalized
+          - Reciprocal Rank Fusion (RRF) when sparse scores aren't normalized
+
+        Results are sorted by hybrid score. Ties are ordered by first appearance, dense results first.
+
+        Args:
+            dense: list of dense (id, score) per query
+            sparse: list of sparse (id, score) per query
+            weights: [dense weight, sparse weight]
+            limit: maximum results
+
+        Returns:
+            list of (id, score) per query
+        """
+
+        normalized = self.scoring.isnormalized()
+
+        # Flatten candidates for all queries into uids, weighted scores and query index
+        uids, scores, queries = [], [], []
+        for x, vectors in enumerate(zip(dense, sparse)):
+            for v, result in enumerate(vectors):
+                if weights[v] > 0 and result:
+                    uids.extend(map(itemgetter(0), result))
+
+                    values = (
+                        np.fromiter(map(itemgetter(1), result), dtype=np.float64, count=len(result))
+                        if normalized
+                        else 1.0 / np.arange(1, len(result) + 1)
+                    )
+                    scores.append(values * weights[v])
+                    queries.append(np.full(len(result), x))
+
+        if not uids:
+            return [[] for _ in dense]
+
+        # Group by (query, uid). Groups are sorted by query and keep the position of their first appearance.
+        queries = np.concatenate(queries)
+        codes = self.codes(uids)
+        first, inverse = self.group(queries * (int(codes.max()) + 1) + codes)
+
+        # Hybrid scores per group. Scores are summed in order of appearance, same as sequential addition.
+        scores = np.bincount(inverse, weights=np.concatenate(scores), minlength=len(first))
+        starts = np.searchsorted(queries[first], np.arange(len(dense) + 1))
+
+        # Object array of ids for fast gathers
+        ids = np.empty(len(uids), dtype=object)
+        ids[:] = uids
+
+        results = []
+        for x in range(len(dense)):
+            # Sort query groups by score descending and then first appearance
+            segment = slice(starts[x], starts[x + 1])
+            order = np.argsort(first[segment])
+            order = order[np.argsort(-scores[segment][order], kind="stable")[:limit]]
+
+            results.append(list(zip(ids[first[segment][order]].tolist(), scores[segment][order].tolist())))
+
+        return results
+
+    def group(self, keys):
+        """
+        Groups equal keys. Same as np.unique with return_index and return_inverse without requiring a stable sort.
+
+        Args:
+            keys: keys array
+
+        Returns:
+            (position of first appearance per group, group index per key)
+        """
+
+        # Sort keys and find group boundaries
+        order = np.argsort(keys)
+        boundaries = np.empty(len(keys), dtype=bool)
+        boundaries[0] = True
+        np.not_equal(keys[order][1:], keys[order][:-1], out=boundaries[1:])
+
+        # First appearance is the minimum position within each group
+        first = np.minimum.reduceat(order, np.flatnonzero(boundaries))
+
+        # Group index for each key
+        inverse = np.empty(len(keys), dtype=np.int64)
+        inverse[order] = np.cumsum(boundaries) - 1
+
+        return first, inverse
+
+    def codes(self, uids):
+        """
+        Maps ids to non-negative integer codes.
+
+        Args:
+            uids: list of ids
+
+        Returns:
+            codes array
+        """
+
+        # Non-negative integer ids are used as is
+        if isinstance(uids[0], int):
+            try:
+                codes = np.fromiter(uids, dtype=np.int64, count=len(uids))
+                if codes.min() >= 0 and int(codes.max()) < 2**40:
+                    return codes
+            except (TypeError, ValueError, OverflowError):
+                pass
+
+        # Map other ids with a dictionary
+        mapping = {}
+        return np.array([mapping.setdefault(uid, len(mapping)) for uid in uids], dtype=np.int64)
+
     def subindex(self, queries, limit, weights, index):
         """
         Executes a subindex search.
@@ -230,7 +334,7 @@ class Search:
             parameters: list of dicts of named parameters to bind to placeholders
 
         Returns:
-            list of dict per query
+            list of dict per query, columnar results per query when output is set
         """
 
         # Parse queries
@@ -247,7 +351,12 @@ class Search:
         for x, query in enumerate(queries):
             # Run the database query, get matching bulk searches for current query
             result = self.database.search(
-                query, [r for y, r in scan if x == y], limit, parameters[x] if parameters and parameters[x] else None, self.indexids
+                query,
+                [r for y, r in scan if x == y],
+                limit,
+                parameters[x] if parameters and parameters[x] else None,
+                self.indexids,
+                self.output,
             )
             results.append(result)
 
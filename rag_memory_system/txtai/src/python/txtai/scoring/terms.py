@@ -30,6 +30,22 @@ class Terms:
 
     INSERT_TERM = "INSERT OR REPLACE INTO terms VALUES (?, ?, ?)"
     SELECT_TERMS = "SELECT ids, freqs FROM terms WHERE term = ?"
+    SELECT_ALL_TERMS = "SELECT term, ids, freqs FROM terms"
+
+    # Impact ordered term weights and block maxima, used for block-max search
+    CREATE_IMPACTS = """
+        CREATE TABLE IF NOT EXISTS impacts (
+            term TEXT PRIMARY KEY,
+            ids BLOB,
+            weights BLOB,
+            maxima BLOB
+        )
+    """
+
+    DELETE_IMPACTS = "DELETE FROM impacts"
+    INSERT_IMPACT = "INSERT INTO impacts VALUES (?, ?, ?, ?)"
+    SELECT_IMPACTS = "SELECT ids, weights, maxima FROM impacts WHERE term = ?"
+    HAS_IMPACTS = "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'impacts'"
 
     # Documents table
     CREATE_DOCUMENTS = """
@@ -60,11 +76,18 @@ class Terms:
         self.cachelimit = self.config.get("cachelimit", 250000000)
         self.cutoff = self.config.get("cutoff", 0.1)
 
+        # Block-max top n search over impact ordered postings, True uses the default block size
+        blockmax = self.config.get("blockmax")
+        self.blocksize = (1024 if blockmax is True else blockmax) if blockmax else None
+
         # Scoring function
         self.score, self.idf = score, idf
 
         # Document attributes
-        self.ids, self.deletes, self.lengths = [], [], array("q")
+        self.ids, self.deletes, self.lengths = [], set(), array("q")
+
+        # Id to internal index id mapping and cached array of deleted index ids
+        self.positions, self.deleted = {}, None
 
         # Terms cache
         self.terms, self.cachesize = {}, 0
@@ -72,6 +95,9 @@ class Terms:
         # Terms database
         self.connection, self.cursor, self.path = None, None, None
 
+        # Flag if impacts are stored in the terms database, checked on first use
+        self.stored = None
+
         # Database thread lock
         self.lock = RLock()
 
@@ -103,12 +129,15 @@ class Terms:
 
         # Flush cached terms to the database
         if self.cachesize >= self.cachelimit:
-            self.index()
+            self.flush()
 
         # Save id and length
         self.ids.append(uid)
         self.lengths.append(length)
 
+        # Map id to latest internal index id
+        self.positions[uid] = indexid
+
     def delete(self, ids):
         """
         Mark ids as deleted. This prevents deleted results from showing up in search results.
@@ -119,11 +148,33 @@ class Terms:
         """
 
         # Set index ids as deleted
-        self.deletes.extend([self.ids.index(i) for i in ids])
+        for uid in ids:
+            indexid = self.positions.pop(uid, None)
+            if indexid is not None:
+                self.deletes.add(indexid)
+
+        # Reset cached deletes array
+        self.deleted = None
 
     def index(self):
         """
-        Saves any remaining cached terms to the database.
+        Saves any remaining cached terms to the database. When block-max search is enabled, this also stores
+        impact ordered postings for each term.
+        """
+
+        self.flush()
+
+        # Impacts depend on index statistics, rebuild them once statistics are final
+        if self.blocksize:
+            self.buildimpacts()
+
+        # Clear cached weights
+        self.weights.cache_clear()
+        self.impacts.cache_clear()
+
+    def flush(self):
+        """
+        Writes cached terms to the database.
         """
 
         for term, (nuids, nfreqs) in self.terms.items():
@@ -144,9 +195,6 @@ class Terms:
             # Insert or replace term
             self.cursor.execute(Terms.INSERT_TERM, [term, uids.tobytes(), freqs.tobytes()])
 
-        # Clear cached weights
-        self.weights.cache_clear()
-
         # Reset term cache size
         self.terms, self.cachesize = {}, 0
 
@@ -170,6 +218,10 @@ class Terms:
             list of (id, score)
         """
 
+        # Exact top n search with early termination
+        if self.blocksize:
+            return self.blockmax(terms, limit)[0]
+
         # Initialize scores array
         scores = np.zeros(len(self.ids), dtype=np.float32)
 
@@ -192,6 +244,88 @@ class Terms:
         # Merge in common term scores and return top n matches
         return self.topn(scores, limit, hasscores, skipped)
 
+    def blockmax(self, terms, limit):
+        """
+        Searches term index a block at a time using impact ordered postings. Each term's postings are stored sorted
+        by weight along with the maximum weight of each block. Blocks are scored in order of their maximum weight
+        across all terms. Partial scores are accumulated only for documents seen in scored blocks.
+
+        Scoring stops once the maximum score left in the remaining blocks falls below the nth best partial score,
+        at which point documents that haven't been seen can't reach the top n. Seen documents that can still reach
+        the top n are then scored exactly with the document ordered term weights. Unlike search, common terms are
+        scored for all documents, so results are exact.
+
+        Args:
+            terms: query terms
+            limit: maximum results
+
+        Returns:
+            (list of (id, score), number of postings visited)
+        """
+
+        # Impact ordered postings per term as [query frequency, uids, weights, block maxima, position]
+        postings = []
+        for term, freq in Counter(terms).items():
+            uids, weights, maxima = self.impacts(term)
+            if uids is not None:
+                postings.append([freq, uids, weights, maxima, 0])
+
+        # Deleted documents are never candidates
+        if self.deletes and self.deleted is None:
+            self.deleted = np.fromiter(self.deletes, dtype=np.int64, count=len(self.deletes))
+
+        # Sparse accumulator of partial scores. Visited blocks are buffered and merged into sorted candidate ids
+        # with summed partial scores at each early termination check.
+        candidates, scores = np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        buffer, visited, checkpoint, threshold = [], 0, 0, None
+        while True:
+            # Upper bound of the score contribution left in each term, from stored block maxima
+            bounds = [
+                freq * maxima[position // self.blocksize] if position < len(uids) else 0.0 for freq, uids, _, maxima, position in postings
+            ]
+            remaining = sum(bounds)
+            if not remaining:
+                break
+
+            # Check for early termination each time the number of visited postings grows by half since the last check.
+            # This keeps the total cost of merges proportional to the number of postings visited.
+            if visited >= limit and visited - checkpoint >= max(checkpoint // 2, self.blocksize):
+                checkpoint = visited
+                candidates, scores = self.accumulate(candidates, scores, buffer)
+                if len(candidates) >= limit:
+                    threshold = self.threshold(scores, limit)
+                    if remaining < threshold:
+                        break
+
+            # Score next block of term with the highest upper bound
+            entry = postings[int(np.argmax(bounds))]
+            freq, uids, weights, _, position = entry
+            uids, weights = uids[position : position + self.blocksize], weights[position : position + self.blocksize]
+            entry[4] += self.blocksize
+            visited += len(uids)
+
+            if self.deletes:
+                keep = ~np.isin(uids, self.deleted)
+                uids, weights = uids[keep], weights[keep]
+
+            buffer.append((uids, freq * weights))
+
+        candidates, scores = self.accumulate(candidates, scores, buffer)
+        if remaining:
+            # Keep candidates that can still reach the top n and score them exactly
+            candidates = candidates[scores + remaining >= threshold]
+            visited += len(candidates) * len(postings)
+        elif len(candidates) > limit:
+            # All postings scored, partial scores are final
+            candidates = np.sort(candidates[np.argpartition(-scores, limit - 1)[:limit]])
+
+        # Calculate scores in query term order, same as search
+        scores = self.complete(terms, candidates)
+        order = np.argsort(-scores)[:limit]
+
+        # Combine ids with scores. Require score > 0.
+        return [(self.ids[candidates[x]], float(scores[x])) for x in order if scores[x] > 0], visited
+
     def count(self):
         """
         Number of elements in the scoring index.
@@ -216,7 +350,7 @@ class Terms:
         self.path = path
 
         # Load document attributes
-        self.ids, self.deletes, self.lengths = [], [], array("q")
+        self.ids, self.deletes, self.lengths = [], set(), array("q")
 
         self.cursor.execute(Terms.SELECT_DOCUMENTS)
         for indexid, uid, deleted, length in self.cursor:
@@ -225,7 +359,7 @@ class Terms:
 
             # Deleted flag
             if deleted:
-                self.deletes.append(indexid)
+                self.deletes.add(indexid)
 
             # Index id - length
             self.lengths.append(length)
@@ -234,8 +368,13 @@ class Terms:
         if all(uid.isdigit() for uid in self.ids):
             self.ids = [int(uid) for uid in self.ids]
 
+        # Map ids to internal index ids for documents that aren't deleted
+        self.positions = {uid: indexid for indexid, uid in enumerate(self.ids) if indexid not in self.deletes}
+        self.deleted, self.stored = None, None
+
         # Clear cache
         self.weights.cache_clear()
+        self.impacts.cache_clear()
 
     def save(self, path):
         """
@@ -249,8 +388,9 @@ class Terms:
         self.cursor.execute(Terms.DELETE_DOCUMENTS)
 
         # Save document attributes
-        for i, uid in enumerate(self.ids):
-            self.cursor.execute(Terms.INSERT_DOCUMENT, [i, uid, 1 if i in self.deletes else 0, self.lengths[i]])
+        self.cursor.executemany(
+            Terms.INSERT_DOCUMENT, ((i, uid, 1 if i in self.deletes else 0, self.lengths[i]) for i, uid in enumerate(self.ids))
+        )
 
         # Temporary database
         if not self.path:
@@ -298,6 +438,7 @@ class Terms:
             # Create initial schema
             self.cursor.execute(Terms.CREATE_TERMS)
             self.cursor.execute(Terms.CREATE_DOCUMENTS)
+            self.cursor.execute(Terms.CREATE_IMPACTS)
 
     def connect(self, path=""):
         """
@@ -417,6 +558,128 @@ class Terms:
 
         return uids, weights
 
+    def buildimpacts(self):
+        """
+        Stores term weights sorted by weight descending along with the maximum weight of each block for all terms.
+        Impacts depend on index statistics, so they are rebuilt each time the index is built.
+        """
+
+        lengths = np.frombuffer(self.lengths, dtype=np.int64)
+
+        def impacts():
+            for term, uids, freqs in self.connection.execute(Terms.SELECT_ALL_TERMS):
+                # Storage format is always little endian
+                uids, freqs = np.frombuffer(uids, dtype="<i8"), np.frombuffer(freqs, dtype="<i8")
+                weights = self.score(freqs, self.idf[term], lengths[uids]).astype(np.float32)
+
+                # Sort by weight descending, block maxima are the first weight of each block
+                order = np.argsort(-weights, kind="stable")
+                uids, weights = uids[order], weights[order]
+                maxima = weights[:: self.blocksize]
+
+                yield (term, uids.astype("<i8").tobytes(), weights.astype("<f4").tobytes(), maxima.astype("<f4").tobytes())
+
+        self.cursor.execute(Terms.CREATE_IMPACTS)
+        self.cursor.execute(Terms.DELETE_IMPACTS)
+        self.cursor.executemany(Terms.INSERT_IMPACT, impacts())
+        self.stored = True
+
+    @functools.lru_cache(maxsize=500)
+    def impacts(self, term):
+        """
+        Gets term weights sparse array sorted by weight descending along with block maxima. Impacts are read from the
+        impacts table built at index time. Indexes without the table derive impacts from the term weights.
+
+        Args:
+            term: term
+
+        Returns:
+            (uids, weights, maxima) sorted by weight descending
+        """
+
+        with self.lock:
+            # Check once if impacts are stored
+            if self.stored is None:
+                self.stored = bool(self.cursor.execute(Terms.HAS_IMPACTS).fetchone())
+
+            result = self.cursor.execute(Terms.SELECT_IMPACTS, [term]).fetchone() if self.stored else None
+
+        if result:
+            uids, weights, maxima = result
+            return np.frombuffer(uids, dtype="<i8"), np.frombuffer(weights, dtype="<f4"), np.frombuffer(maxima, dtype="<f4")
+
+        uids, weights = self.weights(term)
+        if uids is None:
+            return None, None, None
+
+        order = np.argsort(-weights, kind="stable")
+        uids, weights = uids[order], weights[order]
+        return uids, weights, weights[:: self.blocksize]
+
+    def accumulate(self, candidates, scores, buffer):
+        """
+        Merges buffered block scores into the sparse partial scores accumulator. The buffer is cleared.
+
+        Args:
+            candidates: sorted candidate ids
+            scores: candidate partial scores
+            buffer: list of (uids, scores) blocks
+
+        Returns:
+            (candidates, scores) with sorted unique candidate ids and summed partial scores
+        """
+
+        if not buffer:
+            return candidates, scores
+
+        uids = np.concatenate([candidates] + [uids for uids, _ in buffer])
+        weights = np.concatenate([scores] + [weights for _, weights in buffer])
+        buffer.clear()
+
+        candidates, inverse = np.unique(uids, return_inverse=True)
+        return candidates, np.bincount(inverse.ravel(), weights=weights, minlength=len(candidates))
+
+    def threshold(self, scores, limit):
+        """
+        Gets the nth highest partial score, which is a lower bound of the nth highest final score.
+
+        Args:
+            scores: candidate partial scores
+            limit: maximum results
+
+        Returns:
+            nth highest partial score
+        """
+
+        # Partial scores are summed in a different order than final scores, allow for rounding differences
+        return -np.partition(-scores, limit - 1)[limit - 1] * (1 - 1e-6)
+
+    def complete(self, terms, uids):
+        """
+        Calculates full scores for a set of documents. Terms are added in query order to match search.
+
+        Args:
+            terms: query terms
+            uids: internal index ids
+
+        Returns:
+            scores array
+        """
+
+        scores = np.zeros(len(uids), dtype=np.float32)
+        order = np.argsort(uids)
+
+        for term, freq in Counter(terms).items():
+            # Document ordered term weights
+            tuids, weights = self.weights(term)
+            if tuids is not None:
+                indices = np.searchsorted(tuids, uids[order])
+                matches = indices < len(tuids)
+                matches[matches] = tuids[indices[matches]] == uids[order][matches]
+                scores[order[matches]] += freq * weights[indices[matches]]
+
+        return scores
+
     def topn(self, scores, limit, hasscores, skipped):
         """
         Get topn scores from an partial scores array.
@@ -493,7 +756,11 @@ class Terms:
         """
 
         # Clear deletes
-        scores[self.deletes] = 0
+        if self.deletes:
+            if self.deleted is None:
+                self.deleted = np.fromiter(self.deletes, dtype=np.int64, count=len(self.deletes))
+
+            scores[self.deleted] = 0
 
         # Get topn candidates
         return np.argpartition(scores, -topn)[-topn:]
@@ -3,6 +3,7 @@ Vectors import
 """
 
 from .base import Vectors
+from .cache import Cache
 from .external import External
 from .factory import VectorsFactory
 from .huggingface import HFVectors
@@ -11,4 +12,6 @@ from .llama import LlamaCpp
 from .m2v import Model2Vec
 from .recovery import Recovery
 from .sbert import STVectors
+from .stages import Stages
 from .words import WordVectors
+from .workers import Workers
@@ -11,7 +11,10 @@ import numpy as np
 
 from ..pipeline import Tokenizer
 
+from .cache import Cache
 from .recovery import Recovery
+from .stages import Stages
+from .workers import Workers
 
 
 class Vectors:
@@ -57,6 +60,18 @@ class Vectors:
             quantize = config.get("quantize")
             self.qbits = max(min(quantize, 8), 1) if isinstance(quantize, int) and not isinstance(quantize, bool) else None
 
+        # Number of batches queued between overlapped indexing stages, defaults to 0 which runs indexing serially
+        self.stages = config.get("stages", 0) if config else 0
+
+        # Optional on-disk vectors cache, keyed by vectors uid and input text
+        self.cache = Cache(config["cache"], self.vectorsid()) if config and config.get("cache") else None
+
+        # Encoder worker processes, started on first indexing batch and stopped when indexing finishes
+        self.workers = None
+
+        # Peak memory in bytes by worker process id, from the last stopped worker pool
+        self.workermemory = {}
+
     def loadmodel(self, path):
         """
         Loads vector model at path.
@@ -125,28 +140,88 @@ class Vectors:
         vectorsid = self.vectorsid() if checkpoint else None
         recovery = Recovery(checkpoint, vectorsid) if checkpoint else None
 
-        # Convert all documents to embedding arrays, stream embeddings to disk to control memory usage
-        with self.spool(checkpoint, vectorsid) as output:
-            stream = output.name
-            batch = []
-            for document in documents:
-                batch.append(document)
-
-                if len(batch) == batchsize:
-                    # Convert batch to embeddings
-                    uids, dimensions = self.batch(batch, output, recovery)
+        try:
+            # Convert all documents to embedding arrays, stream embeddings to disk to control memory usage
+            with self.spool(checkpoint, vectorsid) as output:
+                stream = output.name
+                run = self.overlapped if self.stages else self.serial
+                for uids, dimensions in run(documents, batchsize, output, recovery):
                     ids.extend(uids)
                     batches += 1
+        finally:
+            # Worker processes each hold a copy of the model, don't keep them after indexing
+            self.stopworkers()
 
-                    batch = []
+        return (ids, dimensions, batches, stream)
 
-            # Final batch
-            if batch:
-                uids, dimensions = self.batch(batch, output, recovery)
-                ids.extend(uids)
-                batches += 1
+    def serial(self, documents, batchsize, output, recovery):
+        """
+        Builds embeddings one batch at a time. Each batch is read, prepared, encoded and written before reading the next batch.
 
-        return (ids, dimensions, batches, stream)
+        Args:
+            documents: list of (id, data, tags)
+            batchsize: index batch size
+            output: output temp file to store embeddings
+            recovery: optional recovery instance
+
+        Returns:
+            list of (ids, dimensions) per batch
+        """
+
+        return [self.batch(batch, output, recovery) for batch in self.batches(documents, batchsize)]
+
+    def overlapped(self, documents, batchsize, output, recovery):
+        """
+        Builds embeddings with overlapped stages. Documents are read on the calling thread, which also runs any data store
+        loads in the document stream. Preparing, encoding and writing batches each run on a separate thread with bounded queues.
+
+        Args:
+            documents: list of (id, data, tags)
+            batchsize: index batch size
+            output: output temp file to store embeddings
+            recovery: optional recovery instance
+
+        Returns:
+            list of (ids, dimensions) per batch
+        """
+
+        results = []
+
+        functions = [
+            self.inputs,
+            lambda inputs: (inputs[0], self.embed(inputs[1], recovery)),
+            lambda inputs: results.append((inputs[0], self.write(inputs[1], output))),
+        ]
+
+        with Stages(functions, self.stages) as stages:
+            for batch in self.batches(documents, batchsize):
+                stages(batch)
+
+        return results
+
+    def batches(self, documents, batchsize):
+        """
+        Splits documents into batches.
+
+        Args:
+            documents: list of (id, data, tags)
+            batchsize: index batch size
+
+        Returns:
+            generator of batches
+        """
+
+        batch = []
+        for document in documents:
+            batch.append(document)
+
+            if len(batch) == batchsize:
+                yield batch
+                batch = []
+
+        # Final batch
+        if batch:
+            yield batch
 
     def close(self):
         """
@@ -155,6 +230,24 @@ class Vectors:
 
         self.model = None
 
+        # Stop encoder worker processes
+        self.stopworkers()
+
+        # Close vectors cache
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+
+    def stopworkers(self):
+        """
+        Stops encoder worker processes, if running. Peak memory per worker process is kept in workermemory.
+        """
+
+        if self.workers:
+            self.workermemory = dict(self.workers.memory)
+            self.workers.close()
+            self.workers = None
+
     def transform(self, document):
         """
         Transforms document into an embeddings vector.
@@ -239,19 +332,56 @@ class Vectors:
             (ids, dimensions) list of ids and number of dimensions in embeddings
         """
 
-        # Extract ids and prepare input documents for vectors model
-        ids = [uid for uid, _, _ in documents]
-        documents = [self.prepare(data, "data") for _, data, _ in documents]
-        dimensions = None
+        ids, documents = self.inputs(documents)
+        return (ids, self.write(self.embed(documents, recovery), output))
+
+    def inputs(self, documents):
+        """
+        Extracts ids and prepares input documents for vectors model.
+
+        Args:
+            documents: list of documents used to build embeddings
+
+        Returns:
+            (ids, prepared documents)
+        """
+
+        return ([uid for uid, _, _ in documents], [self.prepare(data, "data") for _, data, _ in documents])
+
+    def embed(self, documents, recovery):
+        """
+        Builds embeddings for a batch of prepared documents.
+
+        Args:
+            documents: prepared documents
+            recovery: optional recovery instance
+
+        Returns:
+            embeddings
+        """
 
         # Attempt to read embeddings from a recovery file
         embeddings = recovery() if recovery else None
-        embeddings = self.vectorize(documents) if embeddings is None else embeddings
+        return self.vectorize(documents, cache=True, workers=True) if embeddings is None else embeddings
+
+    def write(self, embeddings, output):
+        """
+        Writes a batch of embeddings to output.
+
+        Args:
+            embeddings: embeddings array
+            output: output temp file to store embeddings
+
+        Returns:
+            number of dimensions in embeddings
+        """
+
+        dimensions = None
         if embeddings is not None:
             dimensions = embeddings.shape[1]
             np.save(output, embeddings)
 
-        return (ids, dimensions)
+        return dimensions
 
     def prepare(self, data, category=None):
         """
@@ -299,22 +429,86 @@ class Vectors:
 
         return data
 
-    def vectorize(self, data):
+    def vectorize(self, data, cache=False, workers=False):
         """
         Runs data vectorization, which consists of the following steps.
 
-          1. Encode data into vectors using underlying model
-          2. Truncate vectors, if necessary
-          3. Normalize vectors
-          4. Quantize vectors, if necessary
+          1. Lookup vectors in cache, if enabled
+          2. Encode data into vectors using underlying model
+          3. Truncate vectors, if necessary
+          4. Normalize vectors
+          5. Quantize vectors, if necessary
 
         Args:
             data: input data
+            cache: use the vectors cache, only set when indexing documents so one-off query vectors don't evict document vectors
+            workers: shard large batches across encoder worker processes, if configured, only set when indexing documents
 
         Returns:
             embeddings vectors
         """
 
+        if self.cache and cache and data:
+            return self.cached(data, workers)
+
+        return self.compute(data, workers)
+
+    def cached(self, data, workers=False):
+        """
+        Runs vectorization with the vectors cache. Only cache misses are encoded, newly computed vectors
+        are added to the cache.
+
+        Args:
+            data: input data
+            workers: shard large batches across encoder worker processes, if configured
+
+        Returns:
+            embeddings vectors
+        """
+
+        keys = self.cache.keys(data)
+        vectors = self.cache.get(keys)
+
+        # Compute each unique cache miss once
+        misses = {}
+        for x, vector in enumerate(vectors):
+            if vector is None:
+                misses.setdefault(keys[x] if keys[x] else x, []).append(x)
+
+        if misses:
+            embeddings = self.compute([data[indices[0]] for indices in misses.values()], workers)
+            if embeddings is None:
+                return None
+
+            # Store new vectors in cache
+            self.cache.put(list(misses), embeddings)
+
+            for row, indices in zip(embeddings, misses.values()):
+                for x in indices:
+                    vectors[x] = row
+
+        return np.array(vectors)
+
+    def compute(self, data, workers=False):
+        """
+        Encodes, truncates, normalizes and quantizes data.
+
+        Args:
+            data: input data
+            workers: shard large batches across encoder worker processes, if configured
+
+        Returns:
+            embeddings vectors
+        """
+
+        # Shard batches larger than encodebatch across encoder worker processes, if enabled
+        count = self.config.get("workers") if workers else None
+        if count and len(data) > self.encodebatch:
+            if not self.workers:
+                self.workers = Workers(self.config, self.scoring, count, self.encodebatch)
+
+            return self.workers(data)
+
         # Transform data into vectors
         embeddings = self.encode(data)
 
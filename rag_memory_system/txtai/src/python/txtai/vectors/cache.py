@@ -0,0 +1,228 @@
+"""
+Cache module
+"""
+
+import hashlib
+import os
+import sqlite3
+
+from threading import RLock
+
+import numpy as np
+
+
+class Cache:
+    """
+    Content-addressed on-disk cache of vectors. Vectors are keyed by the vectors model id and a hash of the input text.
+    The cache has a size cap and evicts least recently used vectors once the cap is exceeded. Access times for cache hits
+    are kept in memory and written with the next put, eviction or close, so lookups don't write to the database.
+    """
+
+    # Cache schema
+    CREATE = """
+        CREATE TABLE IF NOT EXISTS vectors (
+            key TEXT PRIMARY KEY,
+            data BLOB,
+            dtype TEXT,
+            size INTEGER,
+            accessed INTEGER
+        )
+    """
+
+    # Lookup batch size, stays under SQLite's bound parameter limit
+    BATCH = 500
+
+    def __init__(self, config, vectorsid):
+        """
+        Creates a new Cache instance.
+
+        Args:
+            config: cache configuration, either a path or a dict with path and maxsize
+            vectorsid: vectors uid for current configuration
+        """
+
+        config = {"path": config} if isinstance(config, str) else config
+
+        # Cache parameters. The maxsize default is 1 GB.
+        self.path = config["path"]
+        self.maxsize = config.get("maxsize", 1024**3)
+        self.vectorsid = vectorsid
+
+        # Lookup statistics
+        self.hits, self.misses = 0, 0
+
+        # Connection is shared across threads, guard with a lock
+        self.lock = RLock()
+        self.connection = self.connect()
+
+        # Pending access times for cache hits, key -> clock
+        self.accessed = {}
+
+        # Current cache size and LRU clock
+        self.size, self.clock = self.connection.execute("SELECT COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) FROM vectors").fetchone()
+
+    def keys(self, data):
+        """
+        Generates cache keys for a batch of data. Only text is cached, all other data types have a key of None.
+
+        Args:
+            data: batch of data
+
+        Returns:
+            list of keys
+        """
+
+        return [hashlib.sha256(f"{self.vectorsid}\0{x}".encode("utf-8")).hexdigest() if isinstance(x, str) else None for x in data]
+
+    def get(self, keys):
+        """
+        Looks up cached vectors for a list of keys.
+
+        Args:
+            keys: list of keys
+
+        Returns:
+            list of vectors, None for keys not in cache
+        """
+
+        results = {}
+        with self.lock:
+            unique = list({key for key in keys if key})
+            for x in range(0, len(unique), Cache.BATCH):
+                batch = unique[x : x + Cache.BATCH]
+                query = f"SELECT key, data, dtype FROM vectors WHERE key IN ({','.join('?' * len(batch))})"
+                for key, data, dtype in self.connection.execute(query, batch):
+                    results[key] = np.frombuffer(data, dtype=dtype)
+
+            # Mark hits as most recently used, written with the next flush
+            for key in results:
+                self.accessed[key] = self.tick()
+
+            vectors = [results.get(key) for key in keys]
+            hits = sum(1 for x in vectors if x is not None)
+            self.hits += hits
+            self.misses += len(vectors) - hits
+
+        return vectors
+
+    def put(self, keys, embeddings):
+        """
+        Stores vectors in the cache. Evicts least recently used vectors when the cache exceeds maxsize.
+
+        Args:
+            keys: list of keys
+            embeddings: embeddings array with a row per key
+        """
+
+        rows = {key: embeddings[x] for x, key in enumerate(keys) if isinstance(key, str)}
+        if not rows:
+            return
+
+        with self.lock:
+            # Pending access times for replaced keys are superseded by the insert below
+            for key in rows:
+                self.accessed.pop(key, None)
+
+            # Subtract sizes of vectors being replaced
+            for x in range(0, len(rows), Cache.BATCH):
+                batch = list(rows)[x : x + Cache.BATCH]
+                query = f"SELECT COALESCE(SUM(size), 0) FROM vectors WHERE key IN ({','.join('?' * len(batch))})"
+                self.size -= self.connection.execute(query, batch).fetchone()[0]
+
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?, ?)",
+                [(key, row.tobytes(), row.dtype.str, row.nbytes, self.tick()) for key, row in rows.items()],
+            )
+            self.size += sum(row.nbytes for row in rows.values())
+
+            # Evict least recently used vectors
+            if self.size > self.maxsize:
+                self.evict(self.size - self.maxsize)
+            else:
+                self.flush()
+
+            self.connection.commit()
+
+    def evict(self, excess):
+        """
+        Deletes least recently used vectors until at least excess bytes are freed.
+
+        Args:
+            excess: number of bytes to free
+        """
+
+        # Write pending access times so eviction order reflects recent hits
+        self.flush()
+
+        keys, freed = [], 0
+        for key, size in self.connection.execute("SELECT key, size FROM vectors ORDER BY accessed"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self.connection.executemany("DELETE FROM vectors WHERE key = ?", keys)
+        self.size -= freed
+
+    def flush(self):
+        """
+        Writes pending access times for cache hits. Callers commit the transaction.
+        """
+
+        if self.accessed:
+            self.connection.executemany("UPDATE vectors SET accessed = ? WHERE key = ?", [(clock, key) for key, clock in self.accessed.items()])
+            self.accessed = {}
+
+    def stats(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict with hits, misses, count and size in bytes
+        """
+
+        with self.lock:
+            count = self.connection.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "count": count, "size": self.size}
+
+    def close(self):
+        """
+        Closes the cache connection.
+        """
+
+        with self.lock:
+            if self.connection:
+                self.flush()
+                self.connection.commit()
+                self.connection.close()
+                self.connection = None
+
+    def connect(self):
+        """
+        Opens the cache database and creates the schema, if necessary.
+
+        Returns:
+            connection
+        """
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute(Cache.CREATE)
+        connection.execute("CREATE INDEX IF NOT EXISTS vectors_accessed ON vectors(accessed)")
+        connection.commit()
+
+        return connection
+
+    def tick(self):
+        """
+        Advances the LRU clock.
+
+        Returns:
+            current clock value
+        """
+
+        self.clock += 1
+        return self.clock
@@ -0,0 +1,98 @@
+"""
+Stages module
+"""
+
+from queue import Queue
+from threading import Thread
+
+
+class Stages:
+    """
+    Runs a chain of functions as overlapped stages. Each stage runs on its own thread and passes outputs to the next stage
+    through a bounded queue. Inputs are processed in order and the first error raised by a stage is raised on the calling thread.
+    """
+
+    # End of stream message
+    COMPLETE = object()
+
+    def __init__(self, functions, size):
+        """
+        Creates and starts a new set of stages.
+
+        Args:
+            functions: list of functions, each function takes the output of the previous function
+            size: maximum number of queued inputs per stage
+        """
+
+        self.queues = [Queue(maxsize=size) for _ in functions]
+        self.error, self.failed = None, None
+
+        self.threads = [Thread(target=self.run, args=(x, function), daemon=True) for x, function in enumerate(functions)]
+        for thread in self.threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __call__(self, inputs):
+        """
+        Queues inputs for the first stage. Blocks when the first stage queue is full.
+
+        Args:
+            inputs: first stage inputs
+        """
+
+        # Stop early if a stage failed
+        if self.error:
+            raise self.error
+
+        self.queues[0].put(inputs)
+
+    def close(self):
+        """
+        Waits for all queued inputs to be processed. Raises the first stage error, if any.
+        """
+
+        if self.threads:
+            self.queues[0].put(Stages.COMPLETE)
+            for thread in self.threads:
+                thread.join()
+
+            self.threads = None
+
+            if self.error:
+                raise self.error
+
+    def run(self, x, function):
+        """
+        Stage thread loop. After an error, the failed stage and upstream stages stop processing inputs. Downstream stages finish
+        processing outputs produced before the error. All stages keep draining inputs so that upstream stages never block.
+
+        Args:
+            x: stage index
+            function: stage function
+        """
+
+        queue, output = self.queues[x], self.queues[x + 1] if x + 1 < len(self.queues) else None
+        while True:
+            inputs = queue.get()
+            if inputs is Stages.COMPLETE:
+                break
+
+            if self.failed is None or x > self.failed:
+                try:
+                    outputs = function(inputs)
+                    if output:
+                        output.put(outputs)
+
+                # pylint: disable=W0718
+                except Exception as e:
+                    self.error = self.error if self.error else e
+                    self.failed = max(x, self.failed) if self.failed is not None else x
+
+        # Signal end of stream to next stage
+        if output:
+            output.put(Stages.COMPLETE)
@@ -0,0 +1,141 @@
+"""
+Workers module
+"""
+
+import math
+import os
+
+from multiprocessing import get_context
+
+import numpy as np
+
+# Conditional import
+try:
+    import resource
+
+    RESOURCE = True
+except ImportError:
+    RESOURCE = False
+
+# Multiprocessing helper methods
+# pylint: disable=W0603
+VECTORS = None
+
+
+def create(config, scoring, threads):
+    """
+    Multiprocessing helper method. Creates a global vectors object in a new subprocess. The vectors model is loaded once
+    per worker process.
+
+    Args:
+        config: vector configuration
+        scoring: scoring instance
+        threads: number of torch threads per worker
+    """
+
+    # pylint: disable=C0415
+    from .factory import VectorsFactory
+
+    global VECTORS
+
+    # Limit intra-op threads so that workers don't oversubscribe CPU cores
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    VECTORS = VectorsFactory.create(config, scoring)
+
+
+def compute(data):
+    """
+    Multiprocessing helper method. Computes vectors for a shard of data.
+
+    Args:
+        data: shard of input data
+
+    Returns:
+        (process id, peak memory in bytes, embeddings)
+    """
+
+    embeddings = VECTORS.compute(data)
+    return (os.getpid(), memory(), embeddings)
+
+
+def memory():
+    """
+    Peak resident set size of the current process in bytes.
+
+    Returns:
+        peak memory in bytes, None if not available on this platform
+    """
+
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if RESOURCE else None
+
+
+class Workers:
+    """
+    Pool of encoder worker processes. Data is split into ordered shards and each shard is computed on a separate worker.
+    Workers run on CPU, this is designed for indexing on machines without an accelerator.
+    """
+
+    def __init__(self, config, scoring, workers, shardsize):
+        """
+        Creates a new Workers pool. Worker processes start with the spawn method and load the vectors model once.
+
+        Args:
+            config: vector configuration
+            scoring: scoring instance
+            workers: number of worker processes
+            shardsize: minimum number of inputs per shard
+        """
+
+        # Worker configuration, encode on CPU without nested workers, stages or cache
+        config = {k: v for k, v in config.items() if k not in ("workers", "stages", "cache")}
+        config["gpu"] = False
+
+        self.workers, self.shardsize = workers, shardsize
+
+        # Split CPU cores evenly across workers
+        threads = max(1, (os.cpu_count() or 1) // workers)
+
+        # Spawn is used since parent processes with initialized torch threads are not safe to fork
+        self.pool = get_context("spawn").Pool(workers, initializer=create, initargs=(config, scoring, threads))
+
+        # Peak memory by worker process id
+        self.memory = {}
+
+    def __call__(self, data):
+        """
+        Computes vectors for data. Shards are computed in parallel and vectors are returned in input order.
+
+        Args:
+            data: input data
+
+        Returns:
+            embeddings
+        """
+
+        # Split into at most one shard per worker, each shard has at least shardsize inputs
+        size = max(self.shardsize, math.ceil(len(data) / self.workers))
+        shards = [data[x : x + size] for x in range(0, len(data), size)]
+
+        embeddings = []
+        for pid, peak, result in self.pool.map(compute, shards, chunksize=1):
+            self.memory[pid] = peak
+            embeddings.append(result)
+
+        return np.concatenate(embeddings) if embeddings and all(x is not None for x in embeddings) else None
+
+    def close(self):
+        """
+        Stops all worker processes.
+        """
+
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
@@ -159,6 +159,51 @@ class TestANN(unittest.TestCase):
         # Validate count
         self.assertEqual(ann.count(), 100)
 
+    def testNumPySearchBlocks(self):
+        """
+        Test NumPy backend blocked top n search matches a full sort
+        """
+
+        # Generate data with deleted rows to create tied scores
+        data = np.random.rand(1000, 240).astype(np.float32)
+        self.normalize(data)
+        data[::10] = 0
+
+        queries = np.random.rand(3, 240).astype(np.float32)
+        self.normalize(queries)
+        queries[2] = 0
+
+        for limit in [1, 10, 150, 2000]:
+            ann = ANNFactory.create({"backend": "numpy", "dimensions": 240, "numpy": {"blocksize": 128}})
+            ann.index(data)
+            results = ann.search(queries, limit)
+
+            # Full sort with ties ordered by id. Score blocks separately, BLAS rounding can vary with matrix shape.
+            scores = np.concatenate([np.dot(queries, data[x : x + 128].T) for x in range(0, data.shape[0], 128)], axis=1)
+            ids = np.argsort(-scores, kind="stable")[:, :limit]
+
+            for x, result in enumerate(results):
+                self.assertEqual(result, list(zip(ids[x].tolist(), scores[x][ids[x]].tolist())))
+
+    def testNumPySearchQuantize(self):
+        """
+        Test NumPy backend blocked hamming search matches a full sort
+        """
+
+        data = np.random.randint(0, 256, (500, 30), dtype=np.uint8)
+
+        ann = ANNFactory.create({"backend": "numpy", "dimensions": 30, "quantize": 8, "numpy": {"blocksize": 64}})
+        ann.index(data)
+        results = ann.search(data[:2], 25)
+
+        # Full hamming score with ties ordered by id
+        table = np.array([bin(x).count("1") for x in range(256)])
+        scores = 1.0 - table[np.bitwise_xor(data[:2, None], data).astype(np.int64)].sum(axis=2) / (30 * 8)
+        ids = np.argsort(-scores, kind="stable")[:, :25]
+
+        for x, result in enumerate(results):
+            self.assertEqual(result, list(zip(ids[x].tolist(), scores[x][ids[x]].tolist())))
+
     @patch("sqlalchemy.orm.Query.limit")
     def testPGVector(self, query):
         """
@@ -253,6 +298,31 @@ class TestANN(unittest.TestCase):
 
         self.runTests("torch")
 
+    def testTorchSearchBlocks(self):
+        """
+        Test Torch backend selects the top n on the device and matches NumPy
+        """
+
+        data = np.random.rand(500, 24).astype(np.float32)
+        self.normalize(data)
+
+        for config in [{"dimensions": 24}, {"dimensions": 24, "quantize": 8}]:
+            inputs = (data * 255).astype(np.uint8) if "quantize" in config else data
+            expected = ANNFactory.create({**config, "backend": "numpy", "numpy": {"blocksize": 64}})
+            expected.index(inputs)
+
+            ann = ANNFactory.create({**config, "backend": "torch", "torch": {"blocksize": 64}})
+            ann.index(inputs)
+
+            # Results are only moved off the device once
+            with patch.object(ann, "numpy", wraps=ann.numpy) as numpy:
+                results = ann.search(inputs[:3], 10)
+                self.assertEqual(numpy.call_count, 2)
+
+            for result, target in zip(results, expected.search(inputs[:3], 10)):
+                self.assertEqual([uid for uid, _ in result], [uid for uid, _ in target])
+                self.assertTrue(np.allclose([score for _, score in result], [score for _, score in target], atol=1e-5))
+
     def runTests(self, name, params=None, update=True):
         """
         Runs a series of standard backend tests.
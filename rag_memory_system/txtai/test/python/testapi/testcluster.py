@@ -2,9 +2,11 @@
 Cluster API module tests
 """
 
+import contextlib
 import json
 import os
 import tempfile
+import time
 import unittest
 import urllib.parse
 
@@ -14,7 +16,7 @@ from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
-from txtai.api import application
+from txtai.api import Cluster, application
 
 # Configuration for an embeddings cluster
 CLUSTER = """
@@ -91,6 +93,34 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.wfile.flush()
 
 
+class SlowRequestHandler(RequestHandler):
+    """
+    Test HTTP handler for a slow shard.
+    """
+
+    def do_GET(self):
+        """
+        GET request handler.
+        """
+
+        time.sleep(1)
+
+        # Client disconnects after the search deadline
+        with contextlib.suppress(ConnectionError):
+            super().do_GET()
+
+    def do_POST(self):
+        """
+        POST request handler.
+        """
+
+        time.sleep(1)
+
+        # Client disconnects after the search deadline
+        with contextlib.suppress(ConnectionError):
+            super().do_POST()
+
+
 @unittest.skipIf(os.name == "nt", "TestCluster skipped on Windows")
 class TestCluster(unittest.TestCase):
     """
@@ -134,6 +164,11 @@ class TestCluster(unittest.TestCase):
         server2 = Thread(target=cls.httpd2.serve_forever, daemon=True)
         server2.start()
 
+        cls.httpd3 = HTTPServer(("127.0.0.1", 8004), SlowRequestHandler)
+
+        server3 = Thread(target=cls.httpd3.serve_forever, daemon=True)
+        server3.start()
+
         # Index data
         cls.client.post("add", json=[{"id": 0, "text": "test"}])
         cls.client.get("index")
@@ -146,6 +181,7 @@ class TestCluster(unittest.TestCase):
 
         cls.httpd1.shutdown()
         cls.httpd2.shutdown()
+        cls.httpd3.shutdown()
 
     def testCount(self):
         """
@@ -154,6 +190,33 @@ class TestCluster(unittest.TestCase):
 
         self.assertEqual(self.client.get("count").json(), 52)
 
+    def testDeadline(self):
+        """
+        Test cluster search with a shard that misses the search deadline
+        """
+
+        cluster = Cluster({"shards": ["http://127.0.0.1:8002", "http://127.0.0.1:8004"], "timeout": 0.25})
+
+        # Slow shard is dropped
+        start = time.time()
+        results = cluster.search("feel good story", 1)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(results[0]["id"], 4)
+        self.assertEqual(results.dropped, ["http://127.0.0.1:8004"])
+
+        # Session is reused across requests
+        session = cluster.session
+
+        results = cluster.batchsearch(["feel good story", "climate change"], 1)
+        self.assertEqual([result[0]["id"] for result in results], [4, 1])
+        self.assertEqual([result.dropped for result in results], [["http://127.0.0.1:8004"]] * 2)
+        self.assertIs(cluster.session, session)
+
+        # Write actions wait for all shards
+        self.assertEqual(cluster.count(), 52)
+
+        cluster.close()
+
     def testDelete(self):
         """
         Test cluster delete
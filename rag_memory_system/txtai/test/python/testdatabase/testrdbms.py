@@ -512,6 +512,30 @@ class Common:
             obj = embeddings.search("select object from txtai where id = 0")[0]["object"]
             self.assertEqual(str(obj.getvalue(), "utf-8"), "binary data")
 
+        def testOutput(self):
+            """
+            Test columnar and arrow search results
+            """
+
+            # Create an index for the list of text
+            self.embeddings.index([(uid, {"text": text, "length": len(text)}, None) for uid, text in enumerate(self.data)])
+
+            query = "select id, text, score from txtai where similar('feel good story')"
+            expected = self.embeddings.search(query)
+
+            # Test columns
+            result = self.embeddings.search(query, output="columns")
+            self.assertEqual(result, {column: [x[column] for x in expected] for column in ["id", "text", "score"]})
+
+            # Test arrow
+            result = self.embeddings.search(query, output="arrow")
+            self.assertEqual(result.column_names, ["id", "text", "score"])
+            self.assertEqual(result.column("text").to_pylist(), [x["text"] for x in expected])
+
+            # Test invalid output format
+            with self.assertRaises(ValueError):
+                self.embeddings.search(query, output="invalid")
+
         def testPickle(self):
             """
             Test pickle configuration
@@ -627,6 +651,25 @@ class Common:
 
             self.assertEqual(result["text"], self.data[4])
 
+        def testTransaction(self):
+            """
+            Test bulk inserts with a custom transaction size
+            """
+
+            # Commit every 4 rows, documents and sections are both counted
+            embeddings = Embeddings({"path": "sentence-transformers/nli-mpnet-base-v2", "content": self.backend, self.backend: {"transaction": 4}})
+
+            # Create an index for the list of text
+            embeddings.index([(uid, {"text": text, "length": len(text)}, None) for uid, text in enumerate(self.data)])
+
+            # Validate all rows were written and committed
+            result = embeddings.search("select id, text, length from txtai where similar('feel good story') limit 1")[0]
+            self.assertEqual((result["text"], int(result["length"])), (self.data[4], len(self.data[4])))
+            self.assertEqual(embeddings.count(), len(self.data))
+            self.assertLess(embeddings.database.written, 4)
+
+            embeddings.close()
+
         def testSQL(self):
             """
             Test running a SQL query
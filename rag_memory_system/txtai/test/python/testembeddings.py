@@ -12,6 +12,7 @@ from unittest.mock import patch
 import numpy as np
 
 from txtai.embeddings import Embeddings, Reducer
+from txtai.embeddings.search import Search
 from txtai.serialize import SerializeFactory
 
 
@@ -234,6 +235,39 @@ class TestEmbeddings(unittest.TestCase):
         uid = embeddings.search("feel good story", 1)[0][0]
         self.assertEqual(uid, 0)
 
+    def testHybridFusion(self):
+        """
+        Test hybrid score fusion for a batch of queries
+        """
+
+        def transform(data):
+            embeddings = np.array([[len(x), x.count(" "), sum(ord(c) for c in x) % 97] for x in data], dtype=np.float32)
+            return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        # Index data with sparse + dense vectors
+        embeddings = Embeddings({"method": "external", "transform": transform, "hybrid": True})
+        embeddings.index(self.data)
+
+        queries = ["feel good story", "bear attack", "ice shelf collapsed", "profits"]
+        for normalize, weights in [(True, 0.5), (True, 0.3), (False, 0.5), (False, 0.0)]:
+            embeddings.scoring.normalize = normalize
+
+            # Expected results, combined one result at a time
+            search = Search(embeddings)
+            dense, sparse = search.dense(queries, 4), search.sparse(queries, 4)
+
+            expected = []
+            for results in zip(dense, sparse):
+                uids = {}
+                for v, scores in enumerate(results):
+                    weight = [weights, 1 - weights][v]
+                    for r, (uid, score) in enumerate(scores if weight > 0 else []):
+                        uids[uid] = uids.get(uid, 0.0) + (score if normalize else 1.0 / (r + 1)) * weight
+
+                expected.append(sorted(uids.items(), key=lambda x: x[1], reverse=True)[:4])
+
+            self.assertEqual(embeddings.batchsearch(queries, 4, weights=weights), expected)
+
     def testIds(self):
         """
         Test legacy config ids loading
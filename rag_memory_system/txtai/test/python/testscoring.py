@@ -4,11 +4,15 @@ Scoring module tests
 
 import os
 import tempfile
+import time
 import unittest
 
+from collections import Counter
 from unittest.mock import patch
 
-from txtai.scoring import ScoringFactory, Scoring
+import numpy as np
+
+from txtai.scoring import ScoringFactory, Scoring, Terms
 
 
 class TestScoring(unittest.TestCase):
@@ -129,6 +133,96 @@ class TestScoring(unittest.TestCase):
 
         self.runTests("tfidf")
 
+    def testTermsBlockMax(self):
+        """
+        Test block-max search returns the same ranking as scoring every posting
+        """
+
+        # Zipfian corpus
+        generator = np.random.default_rng(0)
+        probabilities = 1.0 / np.arange(1, 501)
+        probabilities /= probabilities.sum()
+        data = [(uid, [f"t{x}" for x in generator.choice(500, size=20, p=probabilities)], None) for uid in range(5000)]
+
+        scoring = ScoringFactory.create({"method": "bm25", "terms": {"blockmax": 16}})
+        scoring.index(data)
+        scoring.delete(list(range(0, 5000, 50)))
+        terms = scoring.terms
+
+        visited, total = 0, 0
+        for query in [["t0", "t250"], ["t1", "t2", "t400"], ["t3"], ["t450", "t451", "t452"], ["t0", "t0", "t100"]]:
+            for limit in [1, 10, 200]:
+                results, count = terms.blockmax(query, limit)
+
+                # Score every posting
+                scores = np.zeros(len(terms.ids), dtype=np.float32)
+                for term, freq in Counter(query).items():
+                    uids, weights = terms.weights(term)
+                    scores[uids] += freq * weights
+                    total += len(uids)
+
+                scores[list(terms.deletes)] = 0
+                expected = [(terms.ids[x], float(scores[x])) for x in np.argsort(-scores)[:limit] if scores[x] > 0]
+
+                # Same scores in the same order and same ids, except for ties with the last score
+                self.assertEqual([score for _, score in results], [score for _, score in expected])
+                last = expected[-1][1]
+                self.assertEqual({x for x in results if x[1] > last}, {x for x in expected if x[1] > last})
+
+                visited += count
+
+        # Search uses block-max when enabled
+        self.assertEqual(scoring.search(["t0", "t250"], 5), terms.blockmax(["t0", "t250"], 5)[0])
+        self.assertLess(visited, total)
+
+        # Impacts are stored at index time and reloaded with the index
+        uids, weights, maxima = terms.impacts("t0")
+        self.assertTrue(terms.stored)
+        self.assertTrue(np.all(np.diff(weights) <= 0))
+        self.assertEqual(maxima.tolist(), weights[::16].tolist())
+
+        config = {"method": "bm25", "terms": {"blockmax": 16}}
+        reloaded = self.save(scoring, config, "scoring.blockmax")
+        self.assertTrue(reloaded.terms.impacts("t0")[0].tolist() == uids.tolist() and reloaded.terms.stored)
+        self.assertEqual(reloaded.search(["t0", "t250"], 5), scoring.search(["t0", "t250"], 5))
+
+    def testTermsDelete(self):
+        """
+        Test bulk deletes and upserts scale linearly with a large terms index
+        """
+
+        terms = Terms({}, lambda freqs, idf, lengths: idf * freqs / lengths, {"a": 1.0, "b": 2.0})
+        for uid in range(500000):
+            terms.insert(uid, ["a", "b"] if uid % 2 else ["a"])
+        terms.index()
+
+        start = time.time()
+
+        # Delete 50k ids and re-insert half of them to simulate an upsert
+        deletes = list(range(0, 500000, 10))
+        terms.delete(deletes)
+        for uid in deletes[::2]:
+            terms.insert(uid, ["b"])
+        terms.index()
+
+        # Save and reload
+        path = os.path.join(tempfile.gettempdir(), "scoring.terms.delete")
+        terms.save(path)
+        terms.load(path)
+
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(terms.count(), 475000)
+
+        # Deleted ids no longer match, upserted ids match their new terms
+        deleted = set(deletes[1::2])
+        self.assertFalse([uid for uid, _ in terms.search(["a"], 100000) if uid in deleted])
+        self.assertIn(0, [uid for uid, _ in terms.search(["b"], 500000)])
+
+        # Delete an upserted id again
+        terms.delete([0])
+        self.assertNotIn(0, [uid for uid, _ in terms.search(["b"], 500000)])
+        terms.close()
+
     def runTests(self, method):
         """
         Runs a series of tests for a scoring method.
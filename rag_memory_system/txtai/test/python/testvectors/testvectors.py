@@ -8,7 +8,10 @@ import unittest
 
 import numpy as np
 
-from txtai.vectors import Vectors, Recovery
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+from txtai import Embeddings
+from txtai.vectors import Cache, Stages, Vectors, VectorsFactory, Recovery
 
 
 class TestVectors(unittest.TestCase):
@@ -16,6 +19,68 @@ class TestVectors(unittest.TestCase):
     Vectors tests.
     """
 
+    def testCache(self):
+        """
+        Test a full reindex of an unchanged corpus is served from the vectors cache
+        """
+
+        calls = []
+
+        def transform(data):
+            calls.append(len(data))
+            return np.array([[len(x), x.count("a") + 1, 1] for x in data], dtype=np.float32)
+
+        path = os.path.join(tempfile.mkdtemp(), "vectors.cache")
+        data = [f"document {x} {'a' * (x % 7)}" for x in range(1200)]
+
+        embeddings = Embeddings(method="external", transform=transform, content=True, cache={"path": path})
+        embeddings.index(data)
+
+        # First index encodes every unique text
+        self.assertEqual(sum(calls), len(data))
+        self.assertEqual(embeddings.model.cache.stats()["misses"], len(data))
+
+        expected = embeddings.search("document 1 aaa", 5)
+
+        # Reindex with a new instance, no encoder calls for the data
+        calls.clear()
+        embeddings = Embeddings(method="external", transform=transform, content=True, cache={"path": path})
+        embeddings.index(data)
+
+        # Only indexed documents are cached, search queries bypass the cache
+        self.assertEqual(calls, [])
+        self.assertEqual(embeddings.model.cache.stats(), {"hits": len(data), "misses": 0, "count": len(data), "size": len(data) * 12})
+        self.assertEqual(embeddings.search("document 1 aaa", 5), expected)
+        self.assertEqual(embeddings.model.cache.stats(), {"hits": len(data), "misses": 0, "count": len(data), "size": len(data) * 12})
+
+        embeddings.close()
+
+    def testCacheEvict(self):
+        """
+        Test vectors cache evicts least recently used vectors
+        """
+
+        cache = Cache({"path": os.path.join(tempfile.mkdtemp(), "vectors.cache"), "maxsize": 48}, "id")
+        keys = cache.keys(["a", "b", "c", "d", 1])
+        self.assertIsNone(keys[-1])
+
+        # Cache fits 3 vectors
+        cache.put(keys[:3], np.ones((3, 4), dtype=np.float32))
+
+        # Lookups don't write, access times are written with the next put
+        changes = cache.connection.total_changes
+        cache.get(keys[:1])
+        self.assertEqual(cache.connection.total_changes, changes)
+        cache.put(keys[3:], np.zeros((2, 4), dtype=np.float32))
+
+        # Least recently used vector is evicted, non-text data is not cached
+        vectors = cache.get(keys)
+        self.assertEqual([x is not None for x in vectors], [True, False, True, True, False])
+        self.assertEqual(vectors[3].tolist(), [0.0] * 4)
+        self.assertEqual(cache.stats(), {"hits": 4, "misses": 2, "count": 3, "size": 48})
+
+        cache.close()
+
     def testNotImplemented(self):
         """
         Test exceptions for non-implemented methods
@@ -49,6 +114,96 @@ class TestVectors(unittest.TestCase):
         self.assertTrue(np.allclose(data1, data2))
         self.assertFalse(np.allclose(data1, original))
 
+    def testStages(self):
+        """
+        Test overlapped indexing stages build the same embeddings as serial indexing
+        """
+
+        # Stages are opt-in
+        self.assertEqual(VectorsFactory.create({"method": "external"}, None).stages, 0)
+
+        data = np.random.rand(1050, 24).astype(np.float32)
+        documents = [(x, data[x], None) for x in range(1050)]
+
+        outputs = []
+        for stages in [0, 2]:
+            model = VectorsFactory.create({"method": "external", "stages": stages}, None)
+            ids, dimensions, batches, stream = model.index(documents, 100)
+
+            with open(stream, "rb") as queue:
+                outputs.append((ids, dimensions, batches, np.concatenate([np.load(queue) for _ in range(batches)])))
+
+            os.remove(stream)
+
+        # Validate batches are written in order
+        self.assertEqual(outputs[0][:3], outputs[1][:3])
+        self.assertEqual(outputs[1][:3], (list(range(1050)), 24, 11))
+        self.assertTrue(np.array_equal(outputs[0][3], outputs[1][3]))
+
+    def testStagesError(self):
+        """
+        Test a stage error is raised on the calling thread
+        """
+
+        def fail(x):
+            if x == 3:
+                raise ValueError("stage error")
+
+            return x
+
+        results = []
+        with self.assertRaises(ValueError):
+            with Stages([fail, results.append], 1) as stages:
+                for x in range(100):
+                    stages(x)
+
+        # Inputs before the error are processed in order, nothing after
+        self.assertEqual(results, [0, 1, 2])
+
+    def testWorkers(self):
+        """
+        Test encoder worker processes return the same vectors in input order
+        """
+
+        # Build a small local model
+        path = tempfile.mkdtemp()
+        vocab = os.path.join(path, "vocab.txt")
+        with open(vocab, "w", encoding="utf-8") as output:
+            output.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + [f"word{x}" for x in range(100)]))
+
+        BertTokenizerFast(vocab).save_pretrained(path)
+        BertModel(BertConfig(vocab_size=105, hidden_size=32, num_hidden_layers=1, num_attention_heads=2, intermediate_size=64)).save_pretrained(path)
+
+        data = [" ".join(f"word{(x * y) % 100}" for y in range(x % 20 + 1)) for x in range(300)]
+
+        model = VectorsFactory.create({"path": path, "gpu": False}, None)
+        expected = model.vectorize(data)
+
+        model = VectorsFactory.create({"path": path, "gpu": False, "workers": 2, "encodebatch": 16}, None)
+
+        # Queries and other vectorize calls outside of indexing are encoded in the main process
+        self.assertEqual(model.vectorize(data).shape, (300, 32))
+        self.assertIsNone(model.workers)
+
+        ids, dimensions, batches, stream = model.index([(x, text, None) for x, text in enumerate(data)], batchsize=150)
+
+        # Worker processes are stopped once indexing finishes
+        self.assertIsNone(model.workers)
+        memory = model.workermemory
+        model.close()
+
+        embeddings = []
+        with open(stream, "rb") as queue:
+            for _ in range(batches):
+                embeddings.append(np.load(queue))
+        os.remove(stream)
+
+        self.assertEqual((ids, dimensions), (list(range(300)), 32))
+        self.assertTrue(np.allclose(np.concatenate(embeddings), expected, atol=1e-5))
+        # Peak memory is reported by each worker that computed a shard
+        self.assertIn(len(memory), [1, 2])
+        self.assertTrue(all(x > 0 for x in memory.values()))
+
     def testRecovery(self):
         """
         Test vectors recovery failure
@@ -794,6 +794,7 @@ class TestMemorySystemIntegration:
             # Test tool initialization
             memory_tool = GopiAIMemoryTool()
             memory_tool.local_memory_file = os.path.join(temp_memory_dir, "test_memory.json")
+            memory_tool.local_memory_db = os.path.join(temp_memory_dir, "test_memory.db")
             memory_tool.init_files()
             
             # Test basic operations